@@ -0,0 +1,274 @@
+"""CLIのコマンドごとの所要時間・ピークメモリ・スループットをローカルの代替サーバーに対して計測するベンチマーク
+
+代替サーバー（FakeEStatServer）を起動し、各コマンドを別プロセスで実行する。
+遅延・エラーの割合・レスポンスの件数を指定でき、録画した実際のAPIのレスポンスを再生することもできる。
+結果はリリースごとに比較できるように、バージョン（git describe）とともにjson linesで追記する。
+
+usage:
+    pipenv run python -m benchmarks.bench_cli run --repeat 3
+    pipenv run python -m benchmarks.bench_cli run --commands stats,merge-boundary --latency 0.05 --error_rate 0.1
+    pipenv run python -m benchmarks.bench_cli run --recordings ./recorded
+    pipenv run python -m benchmarks.bench_cli record -r ./recorded \
+        -u "http://api.e-stat.go.jp/rest/3.0/app/getSimpleMetaInfo?appId=<APP_ID>&lang=J&statsDataId=0000020201"
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import click
+
+from tests.fake_api_server import FakeEStatServer, record_api_response
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+CLI_COMMANDS = ("ids", "meta", "stats", "stats-batch", "boundary", "merge-boundary")
+STATS_TABLE_ID = "0000020201"
+PREF_NAME = "東京都"
+PREF_CODE = "13"
+
+
+def _area_codes(polygons):
+    """代替サーバーの境界データに含まれる市区町村の標準地域コードをカンマ区切り文字列で返す
+
+    Args:
+        polygons (int): 境界データの小地域のポリゴン数（10ポリゴンごとに市区町村を分ける）
+
+    Returns:
+        str: 標準地域コードのカンマ区切り文字列
+
+    """
+    return ",".join(f"{PREF_CODE}{101 + i:03d}" for i in range((polygons + 9) // 10))
+
+
+def command_args(command, work_dir, areas):
+    """コマンドの引数を返す
+
+    Args:
+        command (str): コマンド名
+        work_dir (Path): 1回の実行ごとの作業ディレクトリ
+        areas (str): 統計データを取得する標準地域コードのカンマ区切り文字列
+
+    Returns:
+        list: `python -m e_stat`に渡す引数のリスト
+
+    """
+    output_dir = str(work_dir / "created")
+    download_dir = str(work_dir / "download_file")
+    if command == "ids":
+        return ["ids", "-g", "00200502", "-o", output_dir, "--no-cache"]
+    if command == "meta":
+        return ["meta", "-st", STATS_TABLE_ID, "-o", output_dir, "--no-cache"]
+    if command == "stats":
+        return ["stats", "-a", areas, "-c", "A1101,A1102", "-y", "2000,2010", "-st", STATS_TABLE_ID,
+                "-o", output_dir, "--no-cache"]
+    if command == "stats-batch":
+        jobs_file = work_dir / "jobs.csv"
+        jobs_file.write_text(
+            "stats_table_id,areas,class_codes,years\n"
+            + "".join(f'{STATS_TABLE_ID},"{areas}",A110{i},"2000,2010"\n' for i in range(1, 5)),
+            encoding="utf-8")
+        return ["stats-batch", "-j", str(jobs_file), "-o", output_dir, "--no-cache"]
+    if command == "boundary":
+        return ["boundary", "-p", PREF_NAME, "-d", download_dir, "-o", output_dir]
+    if command == "merge-boundary":
+        return ["merge-boundary", "-p", PREF_NAME, "-d", download_dir, "-a", areas, "-c", "A1101",
+                "-y", "2000", "-st", STATS_TABLE_ID, "-o", output_dir, "--no-cache"]
+    raise click.BadParameter(f"{command}は計測できません（{', '.join(CLI_COMMANDS)}）")
+
+
+# CLIを実行し、終了時に自身のピークメモリ（VmHWM）をファイルに書き出すスクリプト
+RUN_CLI_SCRIPT = """
+import atexit, resource, runpy, sys
+peak_rss_path = sys.argv[1]
+def _write_peak_rss():
+    try:
+        with open("/proc/self/status") as f:
+            kb = next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+    except OSError:
+        kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with open(peak_rss_path, "w") as f:
+        f.write(str(kb))
+atexit.register(_write_peak_rss)
+sys.argv = ["e_stat", *sys.argv[2:]]
+runpy.run_module("e_stat", run_name="__main__")
+"""
+
+
+def run_command(args, env, peak_rss_path):
+    """別プロセスでCLIを実行し、所要時間とピークメモリを返す
+
+    Args:
+        args (list): `python -m e_stat`に渡す引数のリスト
+        env (dict): 環境変数
+        peak_rss_path (Path): ピークメモリを書き出すファイルのパス
+
+    Returns:
+        tuple: (所要時間(秒), ピークメモリ(MB), 終了コード)
+
+    Notes:
+        wait4の最大RSSはexec前の（代替サーバーを動かしている）親プロセスの値を引き継ぐため、
+        子プロセス自身がLinuxではVmHWM、それ以外ではgetrusageの値を書き出す
+
+    """
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-c", RUN_CLI_SCRIPT, str(peak_rss_path), *args], cwd=REPO_DIR,
+                               env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    seconds = time.perf_counter() - start
+    peak_rss_mb = int(peak_rss_path.read_text()) / 1024 if peak_rss_path.is_file() else 0.0
+    return seconds, peak_rss_mb, completed.returncode
+
+
+def measure_command(server, command, repeat, base_dir):
+    """コマンドをrepeat回実行し、計測結果を集計する
+
+    Args:
+        server (FakeEStatServer): 起動済みの代替サーバー
+        command (str): コマンド名
+        repeat (int): 実行回数
+        base_dir (Path): 作業ディレクトリを作成するディレクトリ
+
+    Returns:
+        dict: 所要時間（中央値）・ピークメモリ（最大値）・リクエスト数・スループット等の辞書
+
+    """
+    env = dict(os.environ, app_id="bench", api_base_url=server.base_url,
+               statmap_base_url=server.statmap_base_url, cache_dir=str(base_dir / "cache"))
+    runs = []
+    for i in range(repeat):
+        work_dir = base_dir / f"{command}-{i}"
+        work_dir.mkdir()
+        server.reset_metrics()
+        seconds, peak_rss_mb, returncode = run_command(
+            command_args(command, work_dir, _area_codes(server.shapefile_polygons)), env, work_dir / "peak_rss")
+        durations = [seconds for _, _, seconds in server.request_durations]
+        runs.append({
+            "seconds": seconds,
+            "peak_rss_mb": peak_rss_mb,
+            "returncode": returncode,
+            "requests": len(durations),
+            "errors": sum(status >= 500 for _, status, _ in server.request_durations),
+            "bytes": server.bytes_sent,
+            "server_latency_ms": statistics.median(durations) * 1000 if durations else 0.0})
+
+    seconds = statistics.median(run["seconds"] for run in runs)
+    requests = statistics.median(run["requests"] for run in runs)
+    received_mb = statistics.median(run["bytes"] for run in runs) / 1024 ** 2
+    return {
+        "command": command,
+        "seconds": round(seconds, 4),
+        "peak_rss_mb": round(max(run["peak_rss_mb"] for run in runs), 1),
+        "requests": requests,
+        "injected_errors": statistics.median(run["errors"] for run in runs),
+        "received_mb": round(received_mb, 3),
+        "mb_per_second": round(received_mb / seconds, 3),
+        "requests_per_second": round(requests / seconds, 2),
+        "server_latency_ms": round(statistics.median(run["server_latency_ms"] for run in runs), 2),
+        "failed_runs": sum(run["returncode"] != 0 for run in runs)}
+
+
+def current_version():
+    """計測したコードのバージョン（git describe）を返す"""
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=REPO_DIR, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def previous_results(output_path, conditions):
+    """過去の計測結果から、同じ条件でのコマンドごとの最新の結果を返す
+
+    Args:
+        output_path (Path): 計測結果のjson linesのパス
+        conditions (dict): 代替サーバーの条件
+
+    Returns:
+        dict: コマンド名をキー、計測結果を値とする辞書
+
+    """
+    results = {}
+    if not output_path.is_file():
+        return results
+    with output_path.open(encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            if record.get("conditions") == conditions:
+                results[record["command"]] = record
+    return results
+
+
+def _change(current, previous, key):
+    """前回の計測結果からの変化率の文字列を返す"""
+    if previous is None or not previous.get(key):
+        return ""
+    return f"({(current[key] - previous[key]) / previous[key]:+.0%})"
+
+
+@click.group()
+def main():
+    """CLIのベンチマーク"""
+
+
+@main.command()
+@click.option('--commands', default=",".join(CLI_COMMANDS), show_default=True, type=str,
+              help="計測するコマンドのカンマ区切り文字列")
+@click.option('--repeat', default=3, show_default=True, type=int, help="コマンドごとの実行回数")
+@click.option('--latency', default=0.0, show_default=True, type=float, help="代替サーバーの1リクエストごとの遅延(秒)")
+@click.option('--error_rate', default=0.0, show_default=True, type=float,
+              help="代替サーバーが503を返すリクエストの割合（0〜1）")
+@click.option('--rows', type=int, help="統計データの総件数（未指定ならリクエストした地域・項目・年度の組み合わせ数）")
+@click.option('--page_size', default=100000, show_default=True, type=int, help="統計データの1レスポンスあたりの件数")
+@click.option('--polygons', default=400, show_default=True, type=int, help="境界データの小地域のポリゴン数")
+@click.option('--recordings', type=str, help="再生する録画したレスポンスのディレクトリ")
+@click.option('--output', default="./benchmarks/results/bench_cli.jsonl", show_default=True, type=str,
+              help="計測結果を追記するjson linesのパス")
+def run(commands, repeat, latency, error_rate, rows, page_size, polygons, recordings, output):
+    """コマンドごとの所要時間・ピークメモリ・スループットを計測して表示し、結果を追記する"""
+    conditions = {"latency": latency, "error_rate": error_rate, "rows": rows, "page_size": page_size,
+                  "polygons": polygons, "recordings": recordings}
+    output_path = Path(output)
+    previous = previous_results(output_path, conditions)
+    version = current_version()
+    timestamp = datetime.now().isoformat(timespec="seconds")
+
+    server = FakeEStatServer(total_rows=rows, page_size=page_size, shapefile_polygons=polygons,
+                             latency=latency, error_rate=error_rate, recordings_dir=recordings)
+    results = []
+    with server, tempfile.TemporaryDirectory() as tmp_dir:
+        # 境界データのzipの生成時間を計測に含めないように先に生成しておく
+        server.shapefile_response(PREF_CODE)
+        for command in commands.split(","):
+            result = measure_command(server, command, repeat, Path(tmp_dir))
+            before = previous.get(command)
+            print(f"{command:<15} {result['seconds']:8.3f}s{_change(result, before, 'seconds'):>7} "
+                  f"peak={result['peak_rss_mb']:7.1f}MB{_change(result, before, 'peak_rss_mb'):>7} "
+                  f"requests={result['requests']:<4} errors={result['injected_errors']:<3} "
+                  f"{result['mb_per_second']:8.2f}MB/s {result['requests_per_second']:7.2f}req/s "
+                  f"server={result['server_latency_ms']:.1f}ms"
+                  + (f"  failed={result['failed_runs']}" if result["failed_runs"] else ""))
+            results.append({"version": version, "timestamp": timestamp, "conditions": conditions, **result})
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("a", encoding="utf-8") as f:
+        for result in results:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+    print(f"{output_path}に{version}の計測結果を追記しました")
+
+
+@main.command()
+@click.option('-u', '--url', 'urls', required=True, multiple=True, type=str,
+              help="録画するAPI・境界データのダウンロードのURL（複数指定可）")
+@click.option('-r', '--recordings', required=True, type=str, help="録画したレスポンスを保存するディレクトリ")
+def record(urls, recordings):
+    """実際のAPIのレスポンスを代替サーバーで再生できる形式で保存する"""
+    for url in urls:
+        print(record_api_response(url, recordings))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""統計データ取得APIのレスポンスの解析時間とピークメモリを計測するベンチマーク
+
+正規表現で切り出してStringIOで読み込む方式と、ストリームから逐次読み込む方式を比較する。
+--httpでは同じプロセス内の代替サーバーがレスポンスを生成するメモリもピークに含まれる。
+
+usage:
+    pipenv run python -m benchmarks.bench_csv_stream --rows 100000
+    pipenv run python -m benchmarks.bench_csv_stream --input ./recorded/getSimpleStatsData.csv
+    pipenv run python -m benchmarks.bench_csv_stream --rows 100000 --http
+"""
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import click
+
+from e_stat.utils import CSV_CHUNK_ROWS, build_stats_data_url, configure_http_client, configure_response_cache, \
+    csv_string_to_df, http_get, iter_csv_chunks, iter_stats_data_pages, read_until_section, \
+    split_stats_data_response
+from tests.fake_api_server import FakeEStatServer
+
+
+def record_stats_data_response(path, rows):
+    """代替サーバーと同じ形式の統計データのレスポンスをファイルに書き出す
+
+    Args:
+        path (Path): 書き出し先のパス
+        rows (int): 件数
+
+    """
+    with FakeEStatServer(total_rows=rows, page_size=rows) as server:
+        text = server.stats_data_response({"cdArea": "01101,01102,01103", "cdCat01": "A1101,A1102"})
+    path.write_text(text, encoding="utf-8")
+
+
+def _parse_with_regex(path, chunk_rows):
+    text = path.read_text(encoding="utf-8")
+    csv_str, _ = split_stats_data_response(text)
+    return len(csv_string_to_df(csv_str))
+
+
+def _parse_with_stream(path, chunk_rows):
+    rows = 0
+    with path.open(encoding="utf-8", newline="") as stream:
+        read_until_section(stream, "VALUE")
+        for df in iter_csv_chunks(stream, chunk_rows):
+            rows += len(df)
+    return rows
+
+
+def _fetch_with_regex(url, chunk_rows):
+    csv_str, _ = split_stats_data_response(http_get(url).text)
+    return len(csv_string_to_df(csv_str))
+
+
+def _fetch_with_stream(url, chunk_rows):
+    return sum(len(df) for df in iter_stats_data_pages(url, chunk_rows))
+
+
+def _measure(func, *args):
+    """関数の所要時間とtracemallocで計測したピークメモリを返す
+
+    Returns:
+        tuple: (件数, 秒, ピークメモリ(MB))
+
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = func(*args)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, seconds, peak / 1024 ** 2
+
+
+@click.command()
+@click.option('--input', 'input_path', type=str, help="計測に使う記録済みレスポンスのファイル（未指定なら生成データ）")
+@click.option('--rows', default=100000, show_default=True, type=int, help="生成データの件数")
+@click.option('--chunk_rows', default=CSV_CHUNK_ROWS, show_default=True, type=int, help="1チャンクあたりの行数")
+@click.option('--http', 'use_http', is_flag=True, help="ローカルの代替サーバー経由で取得して計測する")
+def main(input_path, rows, chunk_rows, use_http):
+    """解析方式ごとの所要時間とピークメモリを表示する"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if use_http:
+            configure_response_cache(enabled=False)
+            with FakeEStatServer(total_rows=rows, page_size=rows) as server:
+                configure_http_client(api_base_url=server.base_url)
+                url = build_stats_data_url("bench", "0000000000", ["01101"], ["A1101"], ["2015"])
+                targets = [("regex + StringIO", _fetch_with_regex, url),
+                           ("stream", _fetch_with_stream, url)]
+                results = [(label, _measure(func, arg, chunk_rows)) for label, func, arg in targets]
+        else:
+            path = Path(input_path) if input_path else Path(tmp_dir) / "getSimpleStatsData.csv"
+            if not input_path:
+                record_stats_data_response(path, rows)
+            print(f"{path}: {path.stat().st_size / 1024 ** 2:.1f}MB")
+            targets = [("regex + StringIO", _parse_with_regex, path),
+                       ("stream", _parse_with_stream, path)]
+            results = [(label, _measure(func, arg, chunk_rows)) for label, func, arg in targets]
+
+    for label, (parsed_rows, seconds, peak_mb) in results:
+        print(f"{label:<18} rows={parsed_rows:<10} {seconds:8.3f}s  peak={peak_mb:8.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
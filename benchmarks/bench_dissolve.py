@@ -0,0 +1,93 @@
+"""小地域の境界を市区町村単位に結合（dissolve）する時間を方式ごとに計測するベンチマーク
+
+GeoDataFrame.dissolveとcoverage（ポリゴン同士が重ならない前提の結合）を比較し、結果が一致するか確認する。
+
+usage:
+    pipenv run python -m benchmarks.bench_dissolve --grid 300 --areas 150 --workers 1,4
+    pipenv run python -m benchmarks.bench_dissolve --input ./download_file/A002005212015DDSWC13.zip
+"""
+import random
+import time
+
+import click
+import geopandas as gpd
+from shapely.geometry import box
+
+from e_stat.lib import GdfDissolve, ShapeToGeoPandas
+from e_stat.lib.boundary_batch import BOUNDARY_COLUMNS
+
+
+def synthetic_small_area_cells(grid, areas, seed=0):
+    """小地域（町丁目）を模した格子のgdfを生成する
+
+    Args:
+        grid (int): 1辺の格子数
+        areas (int): 市区町村数（格子は最も近い市区町村の代表点のAREA_CODEを持つ）
+        seed (int): 乱数のシード
+
+    Returns:
+        gpd.GeoDataFrame: 格子ごとのポリゴンとAREA_CODEを持つgdf
+
+    """
+    rng = random.Random(seed)
+    cell = 1.0 / grid
+    seeds = [(rng.random(), rng.random()) for _ in range(areas)]
+    rows = []
+    for i in range(grid):
+        for j in range(grid):
+            # 隣接する格子の座標が完全に一致するように、格子番号から座標を計算する
+            x0, y0, x1, y1 = 139 + i * cell, 35 + j * cell, 139 + (i + 1) * cell, 35 + (j + 1) * cell
+            nearest = min(range(areas),
+                          key=lambda k: (139 + seeds[k][0] - x0) ** 2 + (35 + seeds[k][1] - y0) ** 2)
+            rows.append({"AREA_CODE": str(nearest).zfill(5), "KEY_CODE": f"{i:04d}{j:04d}",
+                         "geometry": box(x0, y0, x1, y1)})
+    return gpd.GeoDataFrame(rows, crs="EPSG:4612")
+
+
+def _input_gdf(input_path):
+    """shp（zip）を境界データの変換と同じくAREA_CODEを付与したgdfとして読み込む"""
+    geo_d = GdfDissolve(ShapeToGeoPandas(input_path).gdf, BOUNDARY_COLUMNS)
+    geo_d.join_columns("AREA_CODE", "PREF", "CITY")
+    return geo_d.new_gdf
+
+
+def _dissolve(gdf, engine, workers):
+    geo_d = GdfDissolve(gdf, list(gdf.columns))
+    geo_d.dissolve_poly("AREA_CODE", engine, workers)
+    return geo_d.new_gdf
+
+
+def _max_difference_area(expected, actual):
+    """2つのdissolve結果のジオメトリの対称差の面積の最大値を返す（カラム・キーが異なればNone）"""
+    if list(expected.columns) != list(actual.columns) or \
+            not expected["AREA_CODE"].equals(actual["AREA_CODE"]):
+        return None
+    return max(a.symmetric_difference(b).area for a, b in zip(expected.geometry, actual.geometry))
+
+
+@click.command()
+@click.option('--input', 'input_path', type=str, help="計測に使う小地域のshpまたはzip（未指定なら生成データ）")
+@click.option('--grid', default=200, show_default=True, type=int, help="生成データの1辺の格子数")
+@click.option('--areas', default=100, show_default=True, type=int, help="生成データの市区町村数")
+@click.option('--workers', default="1,4", show_default=True, type=str,
+              help="coverageで結合を行うプロセス数のカンマ区切り文字列")
+def main(input_path, grid, areas, workers):
+    """方式ごとのdissolveの所要時間と、GeoDataFrame.dissolveの結果との差を表示する"""
+    gdf = _input_gdf(input_path) if input_path else synthetic_small_area_cells(grid, areas)
+    print(f"polygons={len(gdf)} groups={gdf['AREA_CODE'].nunique()}")
+
+    start = time.perf_counter()
+    expected = _dissolve(gdf, "geopandas", 1)
+    print(f"{'geopandas':<22} {time.perf_counter() - start:8.3f}s")
+
+    for worker_count in (int(w) for w in workers.split(",")):
+        start = time.perf_counter()
+        actual = _dissolve(gdf, "coverage", worker_count)
+        seconds = time.perf_counter() - start
+        difference = _max_difference_area(expected, actual)
+        result = "columns/keys differ" if difference is None else f"max symmetric difference={difference:.2e}"
+        print(f"{f'coverage workers={worker_count}':<22} {seconds:8.3f}s  {result}")
+
+
+if __name__ == '__main__':
+    main()
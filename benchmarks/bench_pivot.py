@@ -0,0 +1,159 @@
+"""縦持ちの統計データを地域×(項目, 年度)の横持ちに変換する時間とピークメモリを計測するベンチマーク
+
+全国の市区町村別の統計表を模したデータ（既定は1,900地域×100項目×10年度）で、
+従来のpandasの文字列連結+unstack・pivot_tableと、pivot_stats_df（密行列・疎行列）を比較する。
+--densityで値のある組み合わせの割合を下げると、疎行列の効果を確認できる。
+
+usage:
+    pipenv run python -m benchmarks.bench_pivot
+    pipenv run python -m benchmarks.bench_pivot --density 0.05 --typed
+    pipenv run python -m benchmarks.bench_pivot --input ./created/stats.csv
+"""
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import click
+import numpy as np
+import pandas as pd
+
+from e_stat.utils import VALUE_COLUMN, apply_stats_schema, pivot_stats_df
+
+
+def synthetic_stats_df(areas, classes, years, density, seed=0):
+    """全国の市区町村別の統計データ（sectionHeaderFlg=2の縦持ち）を模したdfを生成する
+
+    Args:
+        areas (int): 地域数
+        classes (int): 項目数
+        years (int): 年度数
+        density (float): 値のある組み合わせの割合（0〜1）
+        seed (int): 乱数のシード
+
+    Returns:
+        pd.DataFrame: 全カラムstrの統計データのdf
+
+    """
+    rng = np.random.default_rng(seed)
+    area_codes = np.array([f"{1 + i // 40:02d}{100 + i % 40 * 2:03d}" for i in range(areas)], dtype=object)
+    class_codes = np.array([f"A{1101 + i}" for i in range(classes)], dtype=object)
+    time_codes = np.array([f"{2020 - 5 * i}100000" for i in range(years)], dtype=object)
+    a, c, t = (grid.ravel() for grid in np.meshgrid(
+        np.arange(areas), np.arange(classes), np.arange(years), indexing="ij"))
+    keep = rng.random(len(a)) < density
+    a, c, t = a[keep], c[keep], t[keep]
+    values = rng.integers(0, 100000, len(a)).astype(str).astype(object)
+    # 秘匿等の特殊記号を混ぜる
+    values[rng.random(len(a)) < 0.01] = "x"
+    return pd.DataFrame({
+        "tab_code": "020",
+        "cat01_code": class_codes[c],
+        "area_code": area_codes[a],
+        "time_code": time_codes[t],
+        "unit": "人",
+        VALUE_COLUMN: values,
+    })
+
+
+def _adhoc_unstack(df):
+    """従来の方法（列名を文字列で連結し、set_index+unstackで横持ちにする）"""
+    long_df = pd.DataFrame({
+        "area_code": df["area_code"].astype(str).values,
+        "column": (df["cat01_code"].astype(str) + "_" + df["time_code"].astype(str).str[:4]).values,
+        VALUE_COLUMN: df[VALUE_COLUMN].values,
+    })
+    wide_df = long_df.set_index(["area_code", "column"])[VALUE_COLUMN].unstack("column")
+    return wide_df.shape
+
+
+def _adhoc_pivot_table(df):
+    """従来の方法（数値に変換してからpivot_tableで横持ちにする）"""
+    numeric_df = df.assign(**{VALUE_COLUMN: pd.to_numeric(df[VALUE_COLUMN], errors="coerce")})
+    wide_df = numeric_df.pivot_table(index="area_code", columns=["cat01_code", "time_code"], values=VALUE_COLUMN,
+                                     aggfunc="first", observed=True)
+    return wide_df.shape
+
+
+def _engine(df, sparse):
+    matrix = pivot_stats_df(df, sparse=sparse)
+    return matrix.shape
+
+
+def _engine_numpy(df, sparse):
+    return pivot_stats_df(df, sparse=sparse).to_numpy().shape
+
+
+def _engine_parquet(df, sparse, path):
+    matrix = pivot_stats_df(df, sparse=sparse)
+    matrix.to_parquet(path)
+    return matrix.shape
+
+
+def _adhoc_parquet(df, path):
+    long_df = pd.DataFrame({
+        "area_code": df["area_code"].astype(str).values,
+        "column": (df["cat01_code"].astype(str) + "_" + df["time_code"].astype(str).str[:4]).values,
+        VALUE_COLUMN: pd.to_numeric(df[VALUE_COLUMN], errors="coerce").values,
+    })
+    wide_df = long_df.set_index(["area_code", "column"])[VALUE_COLUMN].unstack("column")
+    wide_df.reset_index().to_parquet(path, index=False)
+    return wide_df.shape
+
+
+def _measure(func, *args):
+    """関数の所要時間とtracemallocで計測したピークメモリを返す
+
+    Returns:
+        tuple: (結果の行列の形, 秒, ピークメモリ(MB))
+
+    Notes:
+        tracemallocは文字列のobject配列の確保を1件ずつ追跡して遅くなるため、所要時間は計測せずに実行した値とする
+
+    """
+    start = time.perf_counter()
+    shape = func(*args)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return shape, seconds, peak / 1024 ** 2
+
+
+@click.command()
+@click.option('--input', 'input_path', type=str, help="計測に使うstatsコマンドで書き出したcsv（未指定なら生成データ）")
+@click.option('--areas', default=1900, show_default=True, type=int, help="生成データの地域数（全国の市区町村程度）")
+@click.option('--classes', default=100, show_default=True, type=int, help="生成データの項目数")
+@click.option('--years', default=10, show_default=True, type=int, help="生成データの年度数")
+@click.option('--density', default=1.0, show_default=True, type=float, help="生成データの値のある組み合わせの割合")
+@click.option('--typed', is_flag=True, help="apply_stats_schemaで型付き（カテゴリ・数値）にしたdfで計測する")
+@click.option('--skip_pivot_table', is_flag=True, help="時間のかかるpivot_tableの計測を省く")
+def main(input_path, areas, classes, years, density, typed, skip_pivot_table):
+    """横持ちへの変換方法ごとの所要時間とピークメモリを表示する"""
+    if input_path:
+        df = pd.read_csv(input_path, dtype=str)
+    else:
+        df = synthetic_stats_df(areas, classes, years, density)
+    if typed:
+        df = apply_stats_schema(df)
+    print(f"rows={len(df)} typed={typed} memory={df.memory_usage(deep=True).sum() / 1024 ** 2:.1f}MB")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        targets = [("adhoc unstack", _adhoc_unstack, df)]
+        if not skip_pivot_table:
+            targets.append(("adhoc pivot_table", _adhoc_pivot_table, df))
+        targets += [
+            ("pivot dense", _engine, df, False),
+            ("pivot sparse", _engine, df, True),
+            ("pivot to_numpy", _engine_numpy, df, None),
+            ("adhoc to_parquet", _adhoc_parquet, df, str(Path(tmp_dir) / "adhoc.parquet")),
+            ("pivot to_parquet", _engine_parquet, df, None, str(Path(tmp_dir) / "pivot.parquet")),
+        ]
+        for label, func, *args in targets:
+            shape, seconds, peak_mb = _measure(func, *args)
+            print(f"{label:<18} shape={str(shape):<13} {seconds:8.3f}s  peak={peak_mb:8.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
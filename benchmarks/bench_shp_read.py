@@ -0,0 +1,100 @@
+"""小地域のshp（zip）の読み込み時間を読み込み方式・絞り込み条件ごとに計測するベンチマーク
+
+現在の読み込み（gpd.read_fileで全カラム）と、境界データとして残すカラム・市区町村のみを読み込む場合を比較する。
+実データでは最もデータ量の多い都道府県（北海道・東京都等）のzipを--inputに指定する。
+
+usage:
+    pipenv run python -m benchmarks.bench_shp_read --rows 50000
+    pipenv run python -m benchmarks.bench_shp_read --input ./download_file/A002005212015DDSWC13.zip --cities 101,102
+"""
+import math
+import statistics
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+import click
+import geopandas as gpd
+from shapely.geometry import Polygon
+
+from e_stat.lib import ShapeToGeoPandas
+from e_stat.lib.boundary_batch import BOUNDARY_COLUMNS
+from e_stat.lib.shp_to_geopandas import default_read_engine
+
+# 国勢調査の小地域境界データの属性を模したカラム（境界データとして残すカラム以外）
+EXTRA_COLUMNS = ["S_AREA", "S_NAME", "KIGO_E", "HCODE", "AREA", "PERIMETER", "KEN", "KEN_NAME", "SITYO_NAME",
+                 "GST_NAME", "CSS_NAME", "KIHON1", "DUMMY1", "KIHON2", "KEYCODE1", "KEYCODE2", "AREA_MAX_F",
+                 "KIGO_D", "N_KEN", "N_CITY", "KIGO_I", "MOJI", "KBSUM", "JINKO", "SETAI", "X_CODE", "Y_CODE"]
+
+
+def write_synthetic_shp_zip(path, rows, vertices=40, cities=60):
+    """小地域のshpを模したzipを書き出す
+
+    Args:
+        path (Path): 書き出すzipのパス
+        rows (int): ポリゴン数
+        vertices (int): 1ポリゴンあたりの頂点数
+        cities (int): 市区町村数
+
+    """
+    side = math.ceil(math.sqrt(rows))
+    records = []
+    for i in range(rows):
+        cx, cy = 139 + (i % side) * 0.01, 35 + (i // side) * 0.01
+        city = str(101 + i * cities // rows).zfill(3)
+        record = {"KEY_CODE": f"13{city}{i:06d}", "PREF": "13", "CITY": city, "PREF_NAME": "東京都",
+                  "CITY_NAME": f"市区町村{city}"}
+        record.update({column: f"{column}_{i}" for column in EXTRA_COLUMNS})
+        record["geometry"] = Polygon([
+            (cx + 0.005 * math.cos(2 * math.pi * v / vertices),
+             cy + 0.005 * math.sin(2 * math.pi * v / vertices)) for v in range(vertices)])
+        records.append(record)
+    shp_dir = path.parent / "shp"
+    shp_dir.mkdir(exist_ok=True)
+    gpd.GeoDataFrame(records, crs="EPSG:4612").to_file(str(shp_dir / "h27ka13.shp"))
+    with zipfile.ZipFile(path, "w") as zip_file:
+        for file in shp_dir.iterdir():
+            zip_file.write(file, file.name)
+
+
+def _median_seconds(func, repeat):
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        gdf = func()
+        seconds.append(time.perf_counter() - start)
+    return statistics.median(seconds), gdf
+
+
+@click.command()
+@click.option('--input', 'input_path', type=str, help="計測に使う小地域のshpまたはzip（未指定なら生成データ）")
+@click.option('--rows', default=50000, show_default=True, type=int, help="生成データのポリゴン数")
+@click.option('--cities', default="101", show_default=True, type=str,
+              help="行の絞り込みで読み込む市区町村コード（3桁）のカンマ区切り文字列")
+@click.option('--repeat', default=3, show_default=True, type=int, help="方式ごとの実行回数（中央値を表示）")
+def main(input_path, rows, cities, repeat):
+    """読み込み方式・絞り込み条件ごとの読み込み時間（中央値）と読み込んだ行数・カラム数を表示する"""
+    columns = [column for column in BOUNDARY_COLUMNS if column != "geometry"]
+    filters = {"CITY": cities.split(",")}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(input_path) if input_path else Path(tmp_dir) / "A002005212015DDSWC13.zip"
+        if not input_path:
+            write_synthetic_shp_zip(path, rows)
+        print(f"{path}: {path.stat().st_size / 1024 ** 2:.1f}MB  default engine={default_read_engine()}")
+        read_path = ("zip://" if path.suffix == ".zip" else "") + str(path.resolve())
+
+        targets = [("gpd.read_file (current)", lambda: gpd.read_file(read_path))]
+        for engine in ("geopandas", "pyogrio"):
+            targets += [
+                (f"{engine} columns", lambda e=engine: ShapeToGeoPandas(str(path), columns, engine=e).gdf),
+                (f"{engine} columns+cities",
+                 lambda e=engine: ShapeToGeoPandas(str(path), columns, filters=filters, engine=e).gdf),
+            ]
+        for label, func in targets:
+            seconds, gdf = _median_seconds(func, repeat)
+            print(f"{label:<28} {seconds:8.3f}s  rows={len(gdf):<8} columns={len(gdf.columns)}")
+
+
+if __name__ == '__main__':
+    main()
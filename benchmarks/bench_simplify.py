@@ -0,0 +1,91 @@
+"""境界データの簡略化の頂点数・ファイルサイズ・処理時間を許容距離（ズームレベル）ごとに計測するベンチマーク
+
+共有辺を保つ簡略化と、ポリゴンごとの簡略化（隣接ポリゴンとの間に隙間・重なりが生じる）を比較する。
+
+usage:
+    pipenv run python -m benchmarks.bench_simplify --grid 300 --areas 150 --zooms 6,8,10,12
+    pipenv run python -m benchmarks.bench_simplify --input ./created/boundary.geojson
+"""
+import tempfile
+import time
+from pathlib import Path
+
+import click
+import geopandas as gpd
+from shapely.ops import unary_union
+
+from benchmarks.bench_dissolve import synthetic_small_area_cells
+from e_stat.lib import GdfDissolve
+from e_stat.utils import build_shared_arcs, count_vertices, output_file_from_df, simplify_shared_arcs, \
+    zoom_to_tolerance
+
+
+def synthetic_small_area_gdf(grid, areas, seed=0):
+    """小地域（町丁目）を模した格子を、市区町村を模した領域ごとにdissolveしたgdfを生成する
+
+    Args:
+        grid (int): 1辺の格子数
+        areas (int): 市区町村数
+        seed (int): 乱数のシード
+
+    Returns:
+        gpd.GeoDataFrame: 階段状の境界を持つ市区町村単位のgdf
+
+    """
+    geo_d = GdfDissolve(synthetic_small_area_cells(grid, areas, seed), ["AREA_CODE", "geometry"])
+    geo_d.dissolve_poly("AREA_CODE")
+    return geo_d.new_gdf
+
+
+def _coverage_errors(geometries, original_area):
+    """簡略化後の隙間・重なりの面積を返す
+
+    Returns:
+        tuple: (元の全体面積との差, ポリゴン同士の重なりの面積)
+
+    """
+    union_area = unary_union(list(geometries)).area
+    return abs(original_area - union_area), sum(g.area for g in geometries) - union_area
+
+
+def _file_size_kb(gdf, tmp_dir, file_stem):
+    path = output_file_from_df(gdf, tmp_dir, file_stem, "geojson")
+    return Path(path).stat().st_size / 1024
+
+
+@click.command()
+@click.option('--input', 'input_path', type=str, help="計測に使う境界データのファイル（未指定なら生成データ）")
+@click.option('--grid', default=200, show_default=True, type=int, help="生成データの1辺の格子数")
+@click.option('--areas', default=100, show_default=True, type=int, help="生成データの市区町村数")
+@click.option('--zooms', default="6,8,10,12", show_default=True, type=str, help="ズームレベルのカンマ区切り文字列")
+def main(input_path, grid, areas, zooms):
+    """ズームレベルごとの頂点数・geojsonのファイルサイズ・処理時間・全体面積の差・重なりの面積を表示する"""
+    gdf = gpd.read_file(input_path) if input_path else synthetic_small_area_gdf(grid, areas)
+    geometries = gdf.geometry.reset_index(drop=True)
+    original_area = unary_union(list(geometries)).area
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        print(f"original       polygons={len(gdf)} vertices={sum(map(count_vertices, geometries))} "
+              f"geojson={_file_size_kb(gdf, tmp_dir, 'original'):.1f}KB")
+        start = time.perf_counter()
+        arcs = build_shared_arcs(list(geometries))
+        print(f"build arcs     arcs={len(arcs)} {time.perf_counter() - start:.3f}s")
+
+        for zoom in (int(z) for z in zooms.split(",")):
+            tolerance = zoom_to_tolerance(zoom)
+            methods = [("shared arcs", lambda: simplify_shared_arcs(geometries, arcs, tolerance)),
+                       ("per polygon", lambda: [g.simplify(tolerance, preserve_topology=True) for g in geometries])]
+            for label, simplify in methods:
+                start = time.perf_counter()
+                simplified = simplify()
+                seconds = time.perf_counter() - start
+                area_diff, overlap = _coverage_errors(simplified, original_area)
+                size_kb = _file_size_kb(gdf.set_geometry(gpd.GeoSeries(simplified, index=gdf.index, crs=gdf.crs)),
+                                        tmp_dir, f"z{zoom}")
+                print(f"z{zoom:<3} {label:<12} tolerance={tolerance:.6f} "
+                      f"vertices={sum(map(count_vertices, simplified)):<8} geojson={size_kb:9.1f}KB "
+                      f"{seconds:7.3f}s  area_diff={area_diff:.2e} overlap={overlap:.2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""CLIの起動時間とアセット読み込み時間を計測するベンチマーク
+
+usage:
+    pipenv run python -m benchmarks.bench_startup --repeat 5
+    pipenv run python -m benchmarks.bench_startup --importtime
+"""
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import click
+
+from e_stat.__main__ import main as e_stat_main
+from e_stat.utils import ASSET_BUNDLE_FILE_NAME, DEFAULT_ASSET_DIR
+
+# 都道府県コード・標準地域コードの索引を読み込むスクリプト（build-assetsの実行前後で比較する）
+LOAD_ASSETS_SCRIPT = """
+from e_stat.lib import PrefCode, get_area_index
+PrefCode().code_to_name(1)
+get_area_index().search("さっぽろ")
+"""
+
+
+def _run_seconds(args, repeat):
+    """サブプロセスでコマンドを実行し、所要時間(秒)のリストを返す
+
+    Args:
+        args (list): pythonに渡す引数
+        repeat (int): 実行回数
+
+    Returns:
+        list: 所要時間のリスト
+
+    """
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], check=True, stdout=subprocess.DEVNULL)
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def _print_importtime(top):
+    """python -X importtimeの結果から累積時間の大きいモジュールを表示する
+
+    Args:
+        top (int): 表示するモジュール数
+
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-m", "e_stat", "--help"],
+                            check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.rstrip()))
+    for cumulative, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative / 1000:10.1f}ms {name}")
+
+
+@click.command()
+@click.option('--repeat', default=5, show_default=True, type=int, help="1コマンドあたりの実行回数")
+@click.option('--importtime', is_flag=True, help="`python -m e_stat --help`のimport時間の内訳を表示")
+@click.option('--top', default=15, show_default=True, type=int, help="--importtimeで表示するモジュール数")
+def main(repeat, importtime, top):
+    """`python -m e_stat --help`と各サブコマンドの--helpの起動時間（最小・中央値）を表示する"""
+    if importtime:
+        _print_importtime(top)
+        return
+
+    targets = [("--help", ["-m", "e_stat", "--help"])]
+    targets += [(f"{name} --help", ["-m", "e_stat", name, "--help"]) for name in sorted(e_stat_main.commands)]
+    bundled = (Path(DEFAULT_ASSET_DIR) / ASSET_BUNDLE_FILE_NAME).is_file()
+    targets.append((f"load assets (bundle={bundled})", ["-c", LOAD_ASSETS_SCRIPT]))
+    for label, args in targets:
+        seconds = _run_seconds(args, repeat)
+        print(f"{label:<28} min={min(seconds) * 1000:8.1f}ms  median={statistics.median(seconds) * 1000:8.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""出力形式ごとの書き出し・読み込み時間を計測するベンチマーク
+
+usage:
+    pipenv run python -m benchmarks.bench_writers --rows 2000 --vertices 200
+    pipenv run python -m benchmarks.bench_writers --input ./created/boundary.geojson
+"""
+import math
+import tempfile
+import time
+from pathlib import Path
+
+import click
+import geopandas as gpd
+import pandas as pd
+from shapely.geometry import Polygon
+
+from e_stat.utils import output_file_from_df, writer_formats
+
+# 出力形式ごとの読み込み関数
+READERS = {
+    "csv": lambda path: pd.read_csv(path, dtype=str),
+    "geojson": gpd.read_file,
+    "parquet": gpd.read_parquet,
+    "geoparquet": gpd.read_parquet,
+    "feather": gpd.read_feather,
+    "fgb": gpd.read_file,
+}
+
+
+def synthetic_boundary_gdf(rows, vertices):
+    """市区町村境界を模したGeoDataFrameを生成する
+
+    Args:
+        rows (int): ポリゴン数
+        vertices (int): 1ポリゴンあたりの頂点数
+
+    Returns:
+        gpd.GeoDataFrame: 生成したgdf
+
+    """
+    side = math.ceil(math.sqrt(rows))
+    geometries = []
+    for i in range(rows):
+        cx, cy = 130 + (i % side) * 0.1, 30 + (i // side) * 0.1
+        geometries.append(Polygon([
+            (cx + 0.05 * math.cos(2 * math.pi * v / vertices),
+             cy + 0.05 * math.sin(2 * math.pi * v / vertices)) for v in range(vertices)]))
+    return gpd.GeoDataFrame({
+        "AREA_CODE": [str(1000 + i).zfill(5) for i in range(rows)],
+        "PREF": ["01"] * rows,
+        "CITY_NAME": [f"市区町村{i}" for i in range(rows)],
+    }, geometry=geometries, crs="EPSG:4612")
+
+
+@click.command()
+@click.option('--input', 'input_path', type=str, help="計測に使う境界データのファイル（未指定なら生成データ）")
+@click.option('--rows', default=2000, show_default=True, type=int, help="生成データのポリゴン数")
+@click.option('--vertices', default=200, show_default=True, type=int, help="生成データの1ポリゴンあたりの頂点数")
+def main(input_path, rows, vertices):
+    """出力形式ごとの書き出し・読み込み時間とファイルサイズを表示する"""
+    gdf = gpd.read_file(input_path) if input_path else synthetic_boundary_gdf(rows, vertices)
+    print(f"rows={len(gdf)}")
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for fmt in writer_formats(geometry=True):
+            start = time.perf_counter()
+            output_path = output_file_from_df(gdf, tmp_dir, f"bench_{fmt}", fmt)
+            write_sec = time.perf_counter() - start
+
+            start = time.perf_counter()
+            READERS[fmt](str(output_path))
+            read_sec = time.perf_counter() - start
+            results.append({
+                "format": fmt,
+                "write_sec": round(write_sec, 3),
+                "read_sec": round(read_sec, 3),
+                "size_mb": round(Path(output_path).stat().st_size / 1024 ** 2, 2)})
+    print(pd.DataFrame(results).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
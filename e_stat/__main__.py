@@ -1,16 +1,130 @@
+import asyncio
+import functools
+import time
 from pathlib import Path
 
 import click
 
-from .env_settings import app_id
-from .lib import AreaCode, GdfDissolve, MergeBoundaryStats, PrefCode, ShapeToGeoPandas, StatsData, StatsIds, \
-    StatsMetaData
-from .utils import df_to_geojson, geojson_str_to_obj, output_csv_from_df, write_geojson
+from .env_settings import api_base_url, app_id, cache_dir, http_max_retries, http_timeout, statmap_base_url
+from .lib import BOUNDARY_LEVELS, DEFAULT_CATALOG_PATH, READ_ENGINES, VALIDATION_MODES, AreaCode, BoundaryBatch, \
+    MergeBoundaryStats, PrefCode, StatsCatalog, StatsData, StatsDataBatch, StatsIds, StatsMetaData, \
+    convert_boundary_levels, read_stats_data_jobs, read_stats_table_ids, shp_to_boundary_gdf
+from .utils import DEFAULT_ASSET_DIR, DISSOLVE_ENGINES, build_asset_bundle, configure_http_client, \
+    configure_instrumentation, configure_response_cache, output_file_from_df, print_stage_summary, span, \
+    write_trace_report, writer_formats
 
 
 @click.group()
-def main():
+@click.option('--profile', 'profile_path', type=str,
+              help="stageごとの所要時間・行数・転送量・メモリをChrome trace形式のjsonとして書き出すパス文字列を入力")
+@click.option('--cprofile', is_flag=True,
+              help="--profileと併せて指定すると、libのクラスの主要なメソッドをcProfileで計測し.profを書き出す")
+@click.option('--tracemalloc', 'trace_memory', is_flag=True,
+              help="--profileと併せて指定すると、stageごとのpythonのメモリ確保のピークをtracemallocで計測する")
+@click.pass_context
+def main(ctx, profile_path, cprofile, trace_memory):
     """e-statのAPIを簡単に利用するためのCLIツール"""
+    configure_http_client(
+        api_base_url=api_base_url,
+        statmap_base_url=statmap_base_url,
+        timeout=float(http_timeout) if http_timeout else None,
+        max_retries=int(http_max_retries) if http_max_retries else None)
+    configure_response_cache(cache_dir=cache_dir)
+    if profile_path:
+        _start_profile(ctx, profile_path, cprofile, trace_memory)
+
+
+def _start_profile(ctx, profile_path, cprofile, trace_memory):
+    """計測を有効にし、コマンドの終了時にレポートを書き出すように登録する
+
+    Args:
+        ctx (click.Context): グループのコンテキスト
+        profile_path (str): Chrome trace形式のjsonを書き出すパス文字列
+        cprofile (bool): TrueならcProfileでも計測する
+        trace_memory (bool): Trueならtracemallocでも計測する
+
+    Notes:
+        コマンドがsys.exitで終了した場合もレポートを書き出す
+
+    """
+    configure_instrumentation(enabled=True, cprofile=cprofile, tracemalloc=trace_memory)
+    command_span = span(f"command.{ctx.invoked_subcommand}")
+    command_span.__enter__()
+
+    def _write_report():
+        command_span.__exit__(None, None, None)
+        print_stage_summary()
+        print(f"計測結果を{write_trace_report(profile_path)}に書き出しました")
+
+    ctx.call_on_close(_write_report)
+
+
+def cache_options(func):
+    """APIレスポンスキャッシュの--no-cache/--refreshオプションをコマンドに追加するデコレータ"""
+    @click.option('--no-cache', 'no_cache', is_flag=True,
+                  help="APIレスポンスのキャッシュを使用・保存しない")
+    @click.option('--refresh', is_flag=True,
+                  help="キャッシュを参照せずにAPIから再取得し、キャッシュを更新する")
+    @functools.wraps(func)
+    def wrapper(*args, no_cache, refresh, **kwargs):
+        configure_response_cache(enabled=not no_cache, refresh=refresh)
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def validation_options(func):
+    """取得条件をリクエスト前に検証する--validate/--catalog_pathオプションをコマンドに追加するデコレータ
+
+    Notes:
+        コマンドにはvalidation（検証の方法）とcatalog（StatsCatalog、検証しない場合はNone）を渡す
+
+    """
+    @click.option('--validate', 'validation', type=click.Choice(VALIDATION_MODES),
+                  help="カタログの分類事項で地域・項目・年度をリクエスト前に検証する"
+                       "（prune：存在しないコードを除いて取得、strict：存在しないコードがあれば取得せずに終了）")
+    @click.option('--catalog_path', default=DEFAULT_CATALOG_PATH, show_default=True,
+                  type=str, help="分類事項を格納したカタログ（SQLite）のパス文字列を入力")
+    @functools.wraps(func)
+    def wrapper(*args, validation, catalog_path, **kwargs):
+        catalog = StatsCatalog(app_id, catalog_path) if validation else None
+        return func(*args, validation=validation, catalog=catalog, **kwargs)
+    return wrapper
+
+
+def format_option(geometry=False):
+    """書き出すファイルの形式を指定する-f/--formatオプションを返す
+
+    Args:
+        geometry (bool): Trueならジオメトリを持つデータ用（geojson等も選択可・--precisionも追加）
+
+    Returns:
+        function: click.optionのデコレータ
+
+    """
+    default = ("geojson", "csv") if geometry else ("csv",)
+    format_decorator = click.option('-f', '--format', 'formats', multiple=True, default=default,
+                                    show_default=True, type=click.Choice(writer_formats(geometry)),
+                                    help="書き出すファイルの形式を入力（複数指定可）")
+    if not geometry:
+        return format_decorator
+    precision_decorator = click.option('--precision', default=None, type=int,
+                                       help="geojsonの座標の小数点以下の桁数を入力（未指定なら丸めない）")
+    return lambda func: format_decorator(precision_decorator(func))
+
+
+def _write_outputs(df, output_dir, file_stem, formats, precision=None):
+    """データフレームを指定した全ての形式で書き出す
+
+    Args:
+        df (pd.DataFrame): 書き出し対象のデータフレーム（GeoDataFrameも可）
+        output_dir (str): 書き出し先ディレクトリのパス文字列
+        file_stem (str): 書き出すファイルの拡張子を除いた名称
+        formats (tuple): 出力形式名のタプル
+        precision (int): geojsonの座標の小数点以下の桁数
+
+    """
+    for fmt in formats:
+        output_file_from_df(df, output_dir, file_stem, fmt, precision=precision)
 
 
 def _download_shp_file(pref_name, download_dir):
@@ -34,48 +148,80 @@ def _download_shp_file(pref_name, download_dir):
     return download_path
 
 
-def _shp_to_boundary_gdf(shp_file_path):
+def _shp_to_boundary_gdf(shp_file_path, output_dir="./created/", formats=("geojson", "csv"), precision=None,
+                         simplify_zooms=(), dissolve_engine="geopandas", dissolve_workers=1):
     """.shpかshpが格納された.zipを指定してgdfを作成する
 
     Args:
         shp_file_path (Path): 変換対象のshpファイルを格納するディレクトリのパス文字列
+        output_dir (str): 境界データの書き出し先ディレクトリのパス文字列
+        formats (tuple): 出力形式名のタプル
+        precision (int): geojsonの座標の小数点以下の桁数
+        simplify_zooms (tuple): 簡略化したデータも書き出すズームレベルのタプル
+        dissolve_engine (str): 市区町村単位に結合する方式
+        dissolve_workers (int): dissolve_engine=coverageで結合を行うプロセス数
 
     Returns:
         gpd.GeoDataFrame: shpを変換したGeoDataFrame
 
     """
-    s2g = ShapeToGeoPandas(str(shp_file_path.resolve()))
-    gdf = s2g.gdf
-
-    necessary_columns = [
-        "KEY_CODE",
-        "PREF",
-        "CITY",
-        "PREF_NAME",
-        "CITY_NAME",
-        "geometry"]
-    geo_d = GdfDissolve(gdf, necessary_columns)
-    geo_d.join_columns("AREA_CODE", "PREF", "CITY")
-    geo_d.dissolve_poly("AREA_CODE")
-    boundary_gdf = geo_d.new_gdf
-
-    geojson_obj = geojson_str_to_obj(df_to_geojson(boundary_gdf))
-    write_geojson(geojson_obj, "./created/", "boundary.geojson")
-
-    output_csv_from_df(boundary_gdf, "./created/", "boundary.csv")
-    return boundary_gdf
+    return shp_to_boundary_gdf(shp_file_path, output_dir, "boundary", formats, precision, simplify_zooms,
+                               dissolve_engine, dissolve_workers)
 
 
 @main.command()
-@click.option('-p', '--pref_name', required=True,
-              type=str, help="取得するshpファイルの都道府県コードを入力")
+@click.option('-p', '--pref_name',
+              type=str, help="取得するshpファイルの都道府県名を入力")
 @click.option('-d', '--download_dir', required=True,
               type=str, help="ダウンロードするshpファイルを格納するディレクトリのパス文字列を入力")
-def boundary(pref_name, download_dir):
+@click.option('-o', '--output_dir', default="./created/", show_default=True,
+              type=str, help="境界データを書き出すディレクトリのパス文字列を入力")
+@click.option('--all', 'all_prefs', is_flag=True,
+              help="全都道府県の境界データを並行して取得")
+@click.option('--prefs', type=str,
+              help="取得する都道府県名をカンマ区切り文字列で入力(例:北海道,青森県)")
+@click.option('--merge', is_flag=True,
+              help="--all/--prefsで取得した境界データを結合した全国データ（boundary.*）も書き出す")
+@click.option('--download_workers', default=4, show_default=True,
+              type=int, help="同時にダウンロードするスレッド数")
+@click.option('--convert_workers', default=None,
+              type=int, help="変換を行うプロセス数（未指定ならCPU数）")
+@click.option('--simplify_zooms', type=str,
+              help="隣接境界を保って簡略化したデータ（boundary_z{ズームレベル}.*）も書き出すズームレベルをカンマ区切りで入力(例:6,8,10)")
+@click.option('--dissolve_engine', default="geopandas", show_default=True, type=click.Choice(DISSOLVE_ENGINES),
+              help="市区町村単位に結合する方式（coverage：ポリゴン同士が重ならない前提で共有辺を打ち消して高速に結合）")
+@click.option('--dissolve_workers', default=1, show_default=True,
+              type=int, help="--dissolve_engine coverageで結合を行うプロセス数（-p/--pref_name指定時）")
+@click.option('--levels', type=str,
+              help="市区町村単位に加えて書き出す階層をカンマ区切りで入力(例:designated_city,pref)。"
+                   "boundary_designated_city.*（政令市の区を結合）、boundary_pref.*（都道府県）を書き出す")
+@click.option('--read_engine', type=click.Choice(READ_ENGINES),
+              help="shpの読み込み方式（未指定ならpyogrioがインストールされていればpyogrio）")
+@click.option('--cities', type=str,
+              help="-p/--pref_nameの都道府県のうち読み込む市区町村コード（3桁）をカンマ区切りで入力(例:101,102)")
+@format_option(geometry=True)
+def boundary(pref_name, download_dir, output_dir, all_prefs, prefs, merge, download_workers, convert_workers,
+             simplify_zooms, dissolve_engine, dissolve_workers, levels, read_engine, cities, formats, precision):
     """境界データを取得"""
+    simplify_zooms = tuple(int(zoom) for zoom in simplify_zooms.split(",")) if simplify_zooms else ()
+    levels = tuple(levels.split(",")) if levels else ()
+    unknown_levels = set(levels) - set(BOUNDARY_LEVELS)
+    if unknown_levels:
+        raise click.BadParameter(f"{','.join(sorted(unknown_levels))}（指定可能：{','.join(BOUNDARY_LEVELS)}）",
+                                 param_hint="--levels")
+    if all_prefs or prefs:
+        pref_names = None if all_prefs else prefs.split(",")
+        batch = BoundaryBatch(pref_names, download_dir, output_dir, download_workers, convert_workers, formats,
+                              precision, simplify_zooms, dissolve_engine, levels, read_engine)
+        return batch.run(merge)
+
+    if pref_name is None:
+        raise click.UsageError("-p/--pref_name、--all、--prefsのいずれかを指定してください。")
     download_path = _download_shp_file(pref_name, download_dir)
-    boundary_gdf = _shp_to_boundary_gdf(download_path)
-    return boundary_gdf
+    boundary_gdfs = convert_boundary_levels(download_path, output_dir, "boundary", formats, precision, simplify_zooms,
+                                            dissolve_engine, dissolve_workers, levels, read_engine,
+                                            cities.split(",") if cities else None)
+    return boundary_gdfs["municipality"]
 
 
 @main.command()
@@ -83,27 +229,105 @@ def boundary(pref_name, download_dir):
               type=str, help="取得したい統計表ID一覧の政府統計コードを入力")
 @click.option('-o', '--output_dir', required=True,
               type=str, help="ダウンロードしたcsvを格納するディレクトリのパス文字列を入力")
-def ids(gov_stats_code, output_dir):
+@click.option('--catalog', is_flag=True,
+              help="APIにリクエストせず、catalog-syncで同期したローカルのカタログから取得する")
+@click.option('--catalog_path', default=DEFAULT_CATALOG_PATH, show_default=True,
+              type=str, help="カタログ（SQLite）のパス文字列を入力")
+@format_option()
+@cache_options
+def ids(gov_stats_code, output_dir, catalog, catalog_path, formats):
     """統計表ID一覧を取得"""
-    si = StatsIds(app_id, gov_stats_code)
-    si_df = si.stats_table_ids_df
-    si.stats_table_ids_to_csv(output_dir, "stats_ids.csv")
+    if catalog:
+        si_df = StatsCatalog(app_id, catalog_path).stats_table_ids_df(gov_stats_code)
+    else:
+        si = StatsIds(app_id, gov_stats_code)
+        si_df = si.stats_table_ids_df
+    _write_outputs(si_df, output_dir, "stats_ids", formats)
     return si_df
 
 
+@main.command()
+@click.option("-g", "--gov_stats_codes", type=str,
+              help="同期する政府統計コードをカンマ区切り文字列で入力（未指定なら政府統計コード一覧の全て）")
+@click.option('--concurrency', default=8, show_default=True,
+              type=int, help="同時に実行するリクエスト数の上限")
+@click.option('--full', is_flag=True,
+              help="前回の同期日に関わらず全件を取得し直す（e-Stat側で削除された統計表も反映する）")
+@click.option('--catalog_path', default=DEFAULT_CATALOG_PATH, show_default=True,
+              type=str, help="カタログ（SQLite）のパス文字列を入力")
+@cache_options
+def catalog_sync(gov_stats_codes, concurrency, full, catalog_path):
+    """全政府統計の統計表情報をローカルのカタログに同期する"""
+    catalog = StatsCatalog(app_id, catalog_path)
+    return catalog.sync(gov_stats_codes.split(",") if gov_stats_codes else None, concurrency, full)
+
+
 @main.command()
 @click.option("-st", "--stats_table_id", required=True,
               type=str, help="取得したい統計表メタデータの統計表IDを入力")
 @click.option('-o', '--output_dir', required=True,
               type=str, help="ダウンロードしたcsvを格納するディレクトリのパス文字列を入力")
-def meta(stats_table_id, output_dir):
+@click.option('--catalog', 'use_catalog', is_flag=True,
+              help="カタログを使用する（格納済みならAPIにリクエストせずに取得し、未格納なら取得してカタログに格納する）")
+@click.option('--catalog_path', default=DEFAULT_CATALOG_PATH, show_default=True,
+              type=str, help="--catalogで使用するカタログ（SQLite）のパス文字列を入力")
+@format_option()
+@cache_options
+def meta(stats_table_id, output_dir, use_catalog, catalog_path, formats):
     """統計表メタデータを取得"""
-    smt = StatsMetaData(app_id, stats_table_id)
+    if use_catalog:
+        smt = StatsMetaData(app_id, stats_table_id, catalog=StatsCatalog(app_id, catalog_path))
+    else:
+        smt = StatsMetaData(app_id, stats_table_id)
     smt_df = smt.stats_meta_data_df
-    smt.to_csv(output_dir, "meta_data.csv")
+    _write_outputs(smt_df, output_dir, "meta_data", formats)
     return smt_df
 
 
+@main.command("meta-prefetch")
+@click.option("-st", "--stats_table_ids", type=str, help="取得する統計表IDをカンマ区切り文字列で入力")
+@click.option("-i", "--input_file", type=str,
+              help="統計表IDの一覧ファイル（stats_table_id・TABLE_INFカラムを含むcsvか、1行に1つの統計表IDのテキスト）")
+@click.option('--concurrency', default=8, show_default=True,
+              type=int, help="同時に実行するリクエスト数の上限")
+@click.option('--full', is_flag=True, help="カタログに格納済みの統計表もAPIから取得し直す（キャッシュを参照しない）")
+@click.option('--catalog_path', default=DEFAULT_CATALOG_PATH, show_default=True,
+              type=str, help="カタログ（SQLite）のパス文字列を入力")
+@cache_options
+def meta_prefetch(stats_table_ids, input_file, concurrency, full, catalog_path):
+    """複数の統計表メタデータを並行して取得し、ローカルのカタログに格納する"""
+    table_ids = stats_table_ids.split(",") if stats_table_ids else []
+    if input_file:
+        table_ids += read_stats_table_ids(input_file)
+    if not table_ids:
+        raise click.UsageError("-st/--stats_table_idsか-i/--input_fileを指定してください。")
+    return StatsCatalog(app_id, catalog_path).prefetch_meta(table_ids, concurrency, full)
+
+
+@main.command()
+@click.option("-q", "--query", required=True, type=str,
+              help="統計表題・政府統計名・分類事項の名称の検索語を入力（空白区切りで複数指定するとAND検索）")
+@click.option('--limit', default=20, show_default=True, type=int, help="表示する統計表の最大件数")
+@click.option('-o', '--output_dir', type=str, help="検索結果を書き出すディレクトリのパス文字列を入力（未指定なら表示のみ）")
+@click.option('--catalog_path', default=DEFAULT_CATALOG_PATH, show_default=True,
+              type=str, help="カタログ（SQLite）のパス文字列を入力")
+@format_option()
+def search(query, limit, output_dir, catalog_path, formats):
+    """ローカルのカタログから統計表IDと分類コードを検索する"""
+    start = time.perf_counter()
+    result_df = StatsCatalog(app_id, catalog_path).search(query, limit)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    for row in result_df.itertuples(index=False):
+        print(f"{row.TABLE_INF}  {row.STAT_NAME or ''}  {row.TITLE or ''}")
+        for matched_class in row.MATCHED_CLASSES:
+            print(f"    {matched_class}")
+    print(f"{len(result_df)}件（{elapsed_ms:.1f}ms）")
+    if output_dir:
+        result_df = result_df.assign(MATCHED_CLASSES=result_df["MATCHED_CLASSES"].str.join(","))
+        _write_outputs(result_df, output_dir, "search", formats)
+    return result_df
+
+
 @main.command()
 @click.option('-a', '--areas', required=True, type=str,
               help="取得する統計データの標準地域コードをカンマ区切り文字列で入力(例:01101,01103,01105)")
@@ -115,7 +339,17 @@ def meta(stats_table_id, output_dir):
               type=str, help="取得したい統計データの統計表IDを入力")
 @click.option('-o', '--output_dir', required=True,
               type=str, help="ダウンロードしたcsvを格納するディレクトリのパス文字列を入力")
-def stats(areas, class_codes, years, stats_table_id, output_dir):
+@click.option('--max_workers', default=1, show_default=True,
+              type=int, help="上限を超えて分割したリクエストを並行して取得するスレッド数")
+@click.option('--typed', is_flag=True,
+              help="valueを数値（特殊記号はvalue_markerに記録）、コード等をカテゴリにしてメモリ使用量を抑える")
+@click.option('--wide', is_flag=True,
+              help="地域を行、項目・年度を列とする横持ちのファイル（stats_wide.*）も書き出す")
+@validation_options
+@format_option()
+@cache_options
+def stats(areas, class_codes, years, stats_table_id, output_dir, max_workers, typed, wide, validation, catalog,
+          formats):
     """統計データを取得"""
     sd = StatsData(
         app_id,
@@ -123,27 +357,72 @@ def stats(areas, class_codes, years, stats_table_id, output_dir):
         output_dir,
         areas.split(","),
         class_codes.split(","),
-        years.split(","))
+        years.split(","),
+        max_workers=max_workers,
+        typed=typed,
+        validation=validation,
+        catalog=catalog)
     stats_df = sd.stats_df
-    sd.to_csv(output_dir, "stats.csv")
+    _write_outputs(stats_df, output_dir, "stats", formats)
+    if wide:
+        _write_outputs(sd.pivot(sparse=False).to_frame().reset_index(), output_dir, "stats_wide", formats)
     return stats_df
 
 
+@main.command()
+@click.option('-j', '--jobs_file', required=True, type=str,
+              help="統計データ取得ジョブ(stats_table_id, areas, class_codes, years)を記述した.csv/.json/.jsonlのパス文字列を入力")
+@click.option('-o', '--output_dir', required=True,
+              type=str, help="ダウンロードしたcsvを格納するディレクトリのパス文字列を入力")
+@click.option('--concurrency', default=8, show_default=True,
+              type=int, help="同時に実行するリクエスト数の上限")
+@click.option('--rate_limit', default=5.0, show_default=True,
+              type=float, help="1ホストあたりの秒間リクエスト数の上限（0で無制限）")
+@click.option('--stream', is_flag=True,
+              help="結合せずにジョブごとのファイル（stats_<ジョブ番号>.*）を完了順に書き出す")
+@click.option('--typed', is_flag=True,
+              help="valueを数値（特殊記号はvalue_markerに記録）、コード等をカテゴリにしてメモリ使用量を抑える")
+@validation_options
+@format_option()
+@cache_options
+def stats_batch(jobs_file, output_dir, concurrency, rate_limit, stream, typed, validation, catalog, formats):
+    """複数の統計データを並行して取得"""
+    jobs = read_stats_data_jobs(jobs_file)
+    batch = StatsDataBatch(app_id, jobs, concurrency, rate_limit, typed, validation, catalog)
+    if not stream:
+        stats_df = batch.fetch()
+        _write_outputs(stats_df, output_dir, "stats", formats)
+        return stats_df
+
+    async def _write_each_result():
+        async for index, _, df in batch.iter_results():
+            _write_outputs(df, output_dir, f"stats_{index}", formats)
+
+    asyncio.run(_write_each_result())
+
+
 @main.command()
 @click.option('-p', '--pref_name', required=True,
               type=str, help="取得するshpファイルの都道府県名を入力")
 @click.option('-d', '--download_dir', required=True,
               type=str, help="ダウンロードするshpファイルを格納するディレクトリのパス文字列を入力")
 @click.option('-a', '--area', required=True, type=str,
-              help="取得する統計データの標準地域コードを入力")
+              help="取得する統計データの標準地域コードを入力（カンマ区切りで複数指定可）")
 @click.option('-c', '--class_code', required=True, type=str,
-              help="取得する統計データの項目を入力")
+              help="取得する統計データの項目を入力（カンマ区切りで複数指定可）")
 @click.option('-y', '--year', required=True,
-              type=str, help="取得する統計データの年度を入力")
+              type=str, help="取得する統計データの年度を入力（カンマ区切りで複数指定可）")
 @click.option("-st", "--stats_table_id", required=True,
               type=str, help="取得したい統計データの統計表IDを入力")
 @click.option('-o', '--output_dir', required=True,
               type=str, help="ダウンロードしたcsvを格納するディレクトリのパス文字列を入力")
+@click.option('--typed', is_flag=True,
+              help="valueを数値（特殊記号はvalue_markerに記録）、コード等をカテゴリにしてメモリ使用量を抑える")
+@click.option('--wide', is_flag=True,
+              help="項目・年度ごとの値を列に展開し、1地域1行で書き出す")
+@validation_options
+@format_option(geometry=True)
+@cache_options
 def merge_boundary(
         pref_name,
         download_dir,
@@ -151,24 +430,39 @@ def merge_boundary(
         class_code,
         year,
         stats_table_id,
-        output_dir):
+        output_dir,
+        typed,
+        wide,
+        validation,
+        catalog,
+        formats,
+        precision):
     """統計データと境界データを取得してマージする"""
     download_path = _download_shp_file(pref_name, download_dir)
 
-    boundary_gdf = _shp_to_boundary_gdf(download_path)
+    boundary_gdf = _shp_to_boundary_gdf(download_path, output_dir, formats, precision)
 
     mbs = MergeBoundaryStats(app_id,
                              stats_table_id,
                              boundary_gdf,
-                             area,
-                             class_code,
-                             year)
+                             area.split(","),
+                             class_code.split(","),
+                             year.split(","),
+                             typed,
+                             wide,
+                             validation,
+                             catalog)
     merge_boundary_df = mbs.merged_df
 
-    geojson_obj = geojson_str_to_obj(df_to_geojson(merge_boundary_df))
-    write_geojson(geojson_obj, "./created/", "merge_boundary.geojson")
+    _write_outputs(merge_boundary_df, output_dir, "merge_boundary", formats, precision)
+
 
-    output_csv_from_df(merge_boundary_df, output_dir, "merge_boundary.csv")
+@main.command()
+@click.option('-d', '--asset_dir', default=DEFAULT_ASSET_DIR, show_default=True,
+              type=str, help="標準地域コード等のアセットを格納したディレクトリのパス文字列を入力")
+def build_assets(asset_dir):
+    """アセットを起動の速いバイナリ形式（assets.bin）にまとめる"""
+    return build_asset_bundle(asset_dir)
 
 
 if __name__ == '__main__':
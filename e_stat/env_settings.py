@@ -9,3 +9,12 @@ dotenv_path = Path(__file__) / ".env"
 load_dotenv(dotenv_path)
 
 app_id = os.environ.get("app_id")
+
+# 以下は任意設定（未設定ならhttp_clientのデフォルト値を使用）
+# ローカルの代替サーバー等に向ける場合はapi_base_urlを指定する
+api_base_url = os.environ.get("api_base_url")
+statmap_base_url = os.environ.get("statmap_base_url")
+http_timeout = os.environ.get("http_timeout")
+http_max_retries = os.environ.get("http_max_retries")
+# APIレスポンスのキャッシュを格納するディレクトリ
+cache_dir = os.environ.get("cache_dir")
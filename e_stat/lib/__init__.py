@@ -1,8 +1,14 @@
 from .area_code import AreaCode
+from .area_index import AreaIndex, get_area_index
+from .boundary_batch import BoundaryBatch, convert_boundary_levels, shp_to_boundary_gdf
+from .boundary_levels import BOUNDARY_LEVELS, derive_boundary_levels
 from .gdf_dissolve import GdfDissolve
 from .merge_boundary_stats import MergeBoundaryStats
 from .pref_code import PrefCode
-from .shp_to_geopandas import ShapeToGeoPandas
+from .shp_to_geopandas import READ_ENGINES, ShapeToGeoPandas
+from .stats_catalog import DEFAULT_CATALOG_PATH, StatsCatalog, read_stats_table_ids
 from .stats_data import StatsData
+from .stats_data_batch import StatsDataBatch, StatsDataJob, read_stats_data_jobs
 from .stats_ids import StatsIds
 from .stats_meta_data import StatsMetaData
+from .stats_query_validator import VALIDATION_MODES, StatsQueryValidator, ValidatedQuery
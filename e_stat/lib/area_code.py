@@ -1,11 +1,9 @@
-import os
-import re
-import sys
 from pathlib import Path
 
-import pandas as pd
-import requests
-from tqdm import tqdm
+from ..utils import download_file, file_name_from_response, lazy_import, statmap_url
+from .area_index import get_area_index
+
+pd = lazy_import("pandas")
 
 
 class AreaCode:
@@ -23,9 +21,17 @@ class AreaCode:
             encoding (str): csv読み込み時のエンコーディング
             dtype (dict): カラムのdtype
 
+        Notes:
+            dtypeが"str"ならcsvはプロセス内で1度だけ読み込み、索引と共有する
+
         """
         self.path = Path(path)
-        self.df = self._read_csv(self.path, encoding, dtype)
+        if dtype == "str":
+            self.index = get_area_index(area_code_csv_path=self.path, encoding=encoding)
+            self.df = self.index.area_df
+        else:
+            self.index = None
+            self.df = self._read_csv(self.path, encoding, dtype)
         # download_polygon_of_shpが実行されるまでNone
         self.download_file_path = None
 
@@ -98,8 +104,74 @@ class AreaCode:
             pd.DataFrame: 対象の行のみ抽出したDataFrame
 
         """
+        if self.index is not None and column_name == "標準地域コード":
+            # 標準地域コードは索引から行番号を引く
+            if self.index.has_area(search_word):
+                return self._get_one_row(self.index.area_position(search_word))
         return self.df[self.df[column_name].str.contains(search_word)]
 
+    def code_to_name(self, area_code):
+        """標準地域コードを名称（政令市の区は「札幌市中央区」の形式）に変換する
+
+        Args:
+            area_code (str): 標準地域コード
+
+        Returns:
+            str: 名称
+
+        """
+        return self._area_index().area_code_to_name(area_code)
+
+    def name_to_codes(self, name):
+        """名称（完全一致）から標準地域コードを取得する
+
+        Args:
+            name (str): 市区町村名または「札幌市中央区」形式の名称
+
+        Returns:
+            list: 標準地域コードのリスト
+
+        """
+        return self._area_index().area_name_to_codes(name)
+
+    def search(self, word, pref_code=None):
+        """名称・ふりがなの前方一致で検索する（カタカナ・ひらがな、全角・半角を区別しない）
+
+        Args:
+            word (str): 検索ワード
+            pref_code (Union[int, str]): 指定した場合は都道府県で絞り込む
+
+        Returns:
+            pd.DataFrame: 対象の行のみ抽出したDataFrame
+
+        """
+        index = self._area_index()
+        positions = [index.area_position(code) for code in index.search(word, pref_code)]
+        return self.df.iloc[sorted(positions)]
+
+    def children(self, code):
+        """下位の標準地域コードを返す
+
+        Args:
+            code (Union[int, str]): 都道府県コードまたは政令市の標準地域コード
+
+        Returns:
+            list: 都道府県なら政令市・市区町村、政令市なら区の標準地域コードのリスト
+
+        """
+        return self._area_index().children(code)
+
+    def _area_index(self):
+        """索引を返す（dtype指定でcsvを読み込んだ場合もここで1度だけ生成する）
+
+        Returns:
+            AreaIndex: 索引
+
+        """
+        if self.index is None:
+            self.index = get_area_index(area_code_csv_path=self.path)
+        return self.index
+
     def _check_suffix(self, file_path, suffix):
         """ファイルの拡張子が指定のものかどうかチェック
 
@@ -140,13 +212,7 @@ class AreaCode:
             str: ファイル名を返す
 
         """
-        disposition = response.headers["Content-Disposition"]
-        try:
-            file_name = re.findall(r"filename.+''(.+)", disposition)[0]
-        except IndexError:
-            print("ファイル名が取得できませんでした")
-            file_name = os.path.basename(url)
-        return file_name
+        return file_name_from_response(url, response)
 
     def _file_download(self, url, dir_path, overwrite=True):
         """URLと保存先ディレクトリを指定してファイルをダウンロード
@@ -160,40 +226,25 @@ class AreaCode:
             Path: ダウンロードファイルのパスオブジェクト
 
         Notes:
-            すでにファイルが存在していて、overwrite=Falseなら何もせず
-            ファイルパスを返す
-
-        """
-        res = requests.get(url, stream=True)
-
-        parent_dir = self._make_download_path(dir_path)
-        file_name = self._get_file_name_from_response(url, res)
-        download_path = parent_dir / file_name
-
-        if download_path.exists() and not overwrite:
-            print("ファイルがすでに存在し、overwrite=Falseなのでダウンロードを中止します。")
-            return download_path
-
-        # content-lengthは必ず存在するわけでは無いためチェック
-        try:
-            file_size = int(res.headers['content-length'])
-        except KeyError:
-            file_size = None
-        progress_bar = tqdm(total=file_size, unit="B", unit_scale=True)
-
-        if res.status_code == 200:
-            print(f"{url=}, {res.status_code=}")
-            print(f"{file_name}のダウンロードを開始します")
-            with download_path.open('wb') as file:
-                for chunk in res.iter_content(chunk_size=1024):
-                    file.write(chunk)
-                    progress_bar.update(len(chunk))
-                progress_bar.close()
-            return download_path
-        else:
-            print(f"{url=}, {res.status_code=}")
-            print("正常にリクエストできませんでした。システムを終了します。")
-            sys.exit(1)
+            すでにファイルが存在していて、overwrite=Falseならサーバーにアクセスせず
+            ファイルパスを返す。中断したダウンロードは続きから再開する
+
+        """
+        return download_file(url, dir_path, overwrite)
+
+    def polygon_of_shp_url(self, area_code):
+        """指定された標準地域コードのshpを格納したzipファイルのダウンロードURLを返す
+
+        Args:
+            area_code (str): ダウンロード対象の標準地域コード
+
+        Returns:
+            str: ダウンロードURL
+
+        """
+        base_url = f"{statmap_url('data')}?"
+        query_params = f"dlserveyId=A002005212015&code={area_code}&coordSys=1&format=shape&downloadType=5"
+        return base_url + query_params
 
     def download_polygon_of_shp(self, area_code, dir_path, overwrite=True):
         """指定された標準地域コードのshpを格納したzipファイルをダウンロード
@@ -208,9 +259,6 @@ class AreaCode:
             self.download_file_pathにファイルパスを保存する
 
         """
-        area_code_to_int = area_code
-        base_url = f"https://www.e-stat.go.jp/gis/statmap-search/data?"
-        query_params = f"dlserveyId=A002005212015&code={area_code_to_int}&coordSys=1&format=shape&downloadType=5"
-        request_url = base_url + query_params
+        request_url = self.polygon_of_shp_url(area_code)
         self.download_file_path = self._file_download(
             request_url, dir_path, overwrite)
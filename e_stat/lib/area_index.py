@@ -0,0 +1,329 @@
+import functools
+import unicodedata
+from bisect import bisect_left
+from pathlib import Path
+
+from ..utils import asset_columns_to_df, read_asset_columns, read_asset_json
+
+DEFAULT_AREA_CODE_CSV_PATH = "./e_stat/assets/standard_area_codes.csv"
+DEFAULT_PREF_CODE_JSON_PATH = "./e_stat/assets/pref_code.json"
+
+# 標準地域コードcsvのカラム名
+AREA_CODE_COLUMN = "標準地域コード"
+PREF_COLUMN = "都道府県"
+GROUP_COLUMN = "政令市･郡･支庁･振興局等"
+GROUP_KANA_COLUMN = "政令市･郡･支庁･振興局等（ふりがな）"
+CITY_COLUMN = "市区町村"
+CITY_KANA_COLUMN = "市区町村（ふりがな）"
+
+
+def normalize_search_text(text):
+    """検索用に文字列を正規化する（全角半角・カタカナひらがな・大文字小文字を区別しない）
+
+    Args:
+        text (str): 正規化する文字列
+
+    Returns:
+        str: 正規化した文字列
+
+    """
+    normalized = unicodedata.normalize("NFKC", text).strip().lower()
+    # カタカナ（ァ〜ヶ）をひらがなに変換
+    return "".join(chr(ord(c) - 0x60) if "ァ" <= c <= "ヶ" else c for c in normalized)
+
+
+class AreaIndex:
+    """都道府県コード・標準地域コードの索引クラス"""
+
+    def __init__(self, pref_records, area_columns):
+        """イニシャライザ
+
+        Args:
+            pref_records (list): prefCode, prefNameを持つ辞書のリスト
+            area_columns (dict): 標準地域コードcsvのカラム名をキー、値(str、欠損値はNone)のリストを値とする辞書
+
+        """
+        self._area_columns = area_columns
+        self._area_df = None
+
+        # 都道府県コード（int）⇔都道府県名
+        self._pref_code_to_name = {int(r["prefCode"]): r["prefName"] for r in pref_records}
+        self._pref_name_to_code = {name: code for code, name in self._pref_code_to_name.items()}
+
+        # 標準地域コード→レコード、行番号
+        self._areas = {}
+        self._area_positions = {}
+        # 名称→標準地域コードのリスト
+        self._name_to_codes = {}
+        # 階層（都道府県コード→市区町村、政令市→区）
+        self._children = {str(code).zfill(2): [] for code in self._pref_code_to_name}
+        self._parents = {}
+        # 前方一致検索用の(正規化したキー, 標準地域コード)のソート済みリスト
+        search_keys = set()
+
+        # 欠損値は空文字として扱う
+        records = [{column: value or "" for column, value in zip(area_columns, values)}
+                   for values in zip(*area_columns.values())]
+        designated_cities = {(r[PREF_COLUMN], r[GROUP_COLUMN]): r[AREA_CODE_COLUMN]
+                             for r in records if not r[CITY_COLUMN] and r[GROUP_COLUMN]}
+        for position, r in enumerate(records):
+            code = r[AREA_CODE_COLUMN]
+            designated_city_code = designated_cities.get((r[PREF_COLUMN], r[GROUP_COLUMN]))
+            if not r[CITY_COLUMN]:
+                # 政令市の行（市区町村が空）
+                name, kana, full_name, full_kana = r[GROUP_COLUMN], r[GROUP_KANA_COLUMN], r[GROUP_COLUMN], ""
+                level, parent = "designated_city", code[:2]
+            elif designated_city_code is not None:
+                # 政令市の区
+                name, kana = r[CITY_COLUMN], r[CITY_KANA_COLUMN]
+                full_name, full_kana = r[GROUP_COLUMN] + name, r[GROUP_KANA_COLUMN] + kana
+                level, parent = "ward", designated_city_code
+            else:
+                name, kana, full_name, full_kana = r[CITY_COLUMN], r[CITY_KANA_COLUMN], r[CITY_COLUMN], ""
+                level, parent = "municipality", code[:2]
+
+            self._areas[code] = {
+                "code": code,
+                "pref_name": r[PREF_COLUMN],
+                "name": name,
+                "kana": kana,
+                "full_name": full_name,
+                "level": level}
+            self._area_positions[code] = position
+            self._parents[code] = parent
+            self._children.setdefault(parent, []).append(code)
+            for key in {name, full_name}:
+                self._name_to_codes.setdefault(key, []).append(code)
+            for key in (name, kana, full_name, full_kana):
+                if key:
+                    search_keys.add((normalize_search_text(key), code))
+        self._search_keys = sorted(search_keys)
+
+    @property
+    def area_df(self):
+        """標準地域コードのデータフレーム（初めて参照した時に生成する）"""
+        if self._area_df is None:
+            self._area_df = asset_columns_to_df(self._area_columns)
+        return self._area_df
+
+    """都道府県"""
+
+    def pref_code_to_name(self, pref_code):
+        """都道府県コードを都道府県名に変換する
+
+        Args:
+            pref_code (Union[int, str]): 都道府県コード
+
+        Returns:
+            str: 都道府県名
+
+        Raises:
+            KeyError: 都道府県コードが存在しない場合
+
+        """
+        return self._pref_code_to_name[int(pref_code)]
+
+    def pref_name_to_code(self, pref_name):
+        """都道府県名を都道府県コードに変換する
+
+        Args:
+            pref_name (str): 都道府県名
+
+        Returns:
+            int: 都道府県コード
+
+        Raises:
+            KeyError: 都道府県名が存在しない場合
+
+        """
+        return self._pref_name_to_code[pref_name]
+
+    def pref_codes(self):
+        """全都道府県の都道府県コードを返す
+
+        Returns:
+            list: 都道府県コード（int）のリスト
+
+        """
+        return list(self._pref_code_to_name)
+
+    """標準地域コード"""
+
+    def has_area(self, area_code):
+        """標準地域コードが存在するかチェック
+
+        Args:
+            area_code (str): 標準地域コード
+
+        Returns:
+            bool: 存在すればTrue
+
+        """
+        return area_code in self._areas
+
+    def area(self, area_code):
+        """標準地域コードのレコードを返す
+
+        Args:
+            area_code (str): 標準地域コード
+
+        Returns:
+            dict: code, pref_name, name, kana, full_name, levelを持つ辞書
+
+        Raises:
+            KeyError: 標準地域コードが存在しない場合
+
+        """
+        return self._areas[area_code]
+
+    def area_position(self, area_code):
+        """標準地域コードのcsv上の行番号を返す
+
+        Args:
+            area_code (str): 標準地域コード
+
+        Returns:
+            int: 0始まりの行番号
+
+        """
+        return self._area_positions[area_code]
+
+    def area_code_to_name(self, area_code):
+        """標準地域コードを名称（政令市の区は「札幌市中央区」の形式）に変換する
+
+        Args:
+            area_code (str): 標準地域コード
+
+        Returns:
+            str: 名称
+
+        """
+        return self._areas[area_code]["full_name"]
+
+    def area_name_to_codes(self, name):
+        """名称（完全一致）から標準地域コードを取得する
+
+        Args:
+            name (str): 市区町村名または「札幌市中央区」形式の名称
+
+        Returns:
+            list: 標準地域コードのリスト（同名の区等があるため複数の場合がある）
+
+        """
+        return list(self._name_to_codes.get(name, []))
+
+    def search(self, word, pref_code=None):
+        """名称・ふりがなの前方一致で標準地域コードを検索する（カタカナ・ひらがな、全角・半角を区別しない）
+
+        Args:
+            word (str): 検索ワード
+            pref_code (Union[int, str]): 指定した場合は都道府県で絞り込む
+
+        Returns:
+            list: 標準地域コードのリスト（コード順）
+
+        """
+        key = normalize_search_text(word)
+        codes = set()
+        for i in range(bisect_left(self._search_keys, (key, "")), len(self._search_keys)):
+            search_key, code = self._search_keys[i]
+            if not search_key.startswith(key):
+                break
+            codes.add(code)
+        if pref_code is not None:
+            codes = {code for code in codes if code[:2] == str(pref_code).zfill(2)}
+        return sorted(codes)
+
+    """階層"""
+
+    def parent(self, area_code):
+        """上位の地域コードを返す
+
+        Args:
+            area_code (str): 標準地域コード
+
+        Returns:
+            str: 政令市の区なら政令市の標準地域コード、それ以外は2桁の都道府県コード
+
+        """
+        return self._parents[area_code]
+
+    def children(self, code):
+        """下位の地域コードを返す
+
+        Args:
+            code (Union[int, str]): 都道府県コードまたは政令市の標準地域コード
+
+        Returns:
+            list: 都道府県なら政令市・市区町村、政令市なら区の標準地域コードのリスト
+
+        """
+        code = str(code)
+        if len(code) <= 2:
+            code = code.zfill(2)
+        return list(self._children.get(code, []))
+
+    def municipalities(self, pref_code):
+        """都道府県の政令市・市区町村の標準地域コードを返す
+
+        Args:
+            pref_code (Union[int, str]): 都道府県コード
+
+        Returns:
+            list: 標準地域コードのリスト
+
+        """
+        return self.children(str(int(pref_code)).zfill(2))
+
+    def wards(self, city_code):
+        """政令市の区の標準地域コードを返す
+
+        Args:
+            city_code (str): 政令市の標準地域コード
+
+        Returns:
+            list: 区の標準地域コードのリスト
+
+        """
+        return self.children(city_code)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_area_index(area_code_csv_path, pref_code_json_path, encoding):
+    """索引を生成する（引数ごとにプロセス内で1度だけ実行される）
+
+    Args:
+        area_code_csv_path (str): 標準地域コードが格納されたcsvの絶対パス文字列
+        pref_code_json_path (str): 都道府県コードが格納されたjsonの絶対パス文字列
+        encoding (str): csv読み込み時のエンコーディング
+
+    Returns:
+        AreaIndex: 索引
+
+    Notes:
+        build-assetsでバンドルを作成済みなら、csv・jsonを解析せずにバンドルから読み込む
+
+    """
+    area_columns = read_asset_columns(area_code_csv_path, encoding)
+    return AreaIndex(read_asset_json(pref_code_json_path), area_columns)
+
+
+def get_area_index(
+        area_code_csv_path=DEFAULT_AREA_CODE_CSV_PATH,
+        pref_code_json_path=DEFAULT_PREF_CODE_JSON_PATH,
+        encoding="shift-jis"):
+    """索引を返す（同じファイルに対してはプロセス内で1度だけ生成し、以降は同じ索引を返す）
+
+    Args:
+        area_code_csv_path (str): 標準地域コードが格納されたcsvのパス文字列
+        pref_code_json_path (str): 都道府県コードが格納されたjsonのパス文字列
+        encoding (str): csv読み込み時のエンコーディング
+
+    Returns:
+        AreaIndex: 索引
+
+    """
+    return _build_area_index(
+        str(Path(area_code_csv_path).resolve()),
+        str(Path(pref_code_json_path).resolve()),
+        encoding)
@@ -0,0 +1,338 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from ..utils import download_file, instrumented, lazy_import, output_file_from_df, zoom_to_tolerance
+from .area_code import AreaCode
+from .boundary_levels import derive_boundary_levels, level_file_stem
+from .gdf_dissolve import GdfDissolve
+from .pref_code import PrefCode
+from .shp_to_geopandas import ShapeToGeoPandas
+
+pd = lazy_import("pandas")
+
+# 境界データのデフォルトの出力形式
+DEFAULT_BOUNDARY_FORMATS = ("geojson", "csv")
+# 境界データとして残すカラム
+BOUNDARY_COLUMNS = [
+    "KEY_CODE",
+    "PREF",
+    "CITY",
+    "PREF_NAME",
+    "CITY_NAME",
+    "geometry"]
+
+
+def shp_to_boundary_gdf(
+        shp_file_path,
+        output_dir="./created/",
+        file_stem="boundary",
+        formats=DEFAULT_BOUNDARY_FORMATS,
+        precision=None,
+        simplify_zooms=(),
+        dissolve_engine="geopandas",
+        dissolve_workers=1,
+        levels=(),
+        read_engine=None,
+        cities=None):
+    """.shpかshpが格納された.zipを指定して市区町村単位の境界データを作成し、指定形式で書き出す
+
+    Args:
+        shp_file_path (Path): 変換対象のshpファイル（またはzipファイル）のパス
+        output_dir (str): 書き出し先ディレクトリのパス文字列
+        file_stem (str): 書き出すファイルの拡張子を除いた名称
+        formats (tuple): 出力形式名のタプル
+        precision (int): geojsonの座標の小数点以下の桁数（Noneなら丸めない）
+        simplify_zooms (tuple): 簡略化したデータも書き出すズームレベルのタプル
+        dissolve_engine (str): 市区町村単位に結合する方式（geopandasまたはcoverage）
+        dissolve_workers (int): dissolve_engine=coverageで結合を行うプロセス数
+        levels (tuple): 市区町村単位に加えて作成する階層（designated_city、pref）のタプル
+        read_engine (str): shpの読み込み方式（geopandasまたはpyogrio。Noneならpyogrioがあればpyogrio）
+        cities (list): 読み込む市区町村コード（CITY、3桁）のリスト（Noneなら全市区町村）
+
+    Returns:
+        gpd.GeoDataFrame: shpを変換したGeoDataFrame（市区町村単位）
+
+    """
+    return convert_boundary_levels(shp_file_path, output_dir, file_stem, formats, precision, simplify_zooms,
+                                   dissolve_engine, dissolve_workers, levels, read_engine, cities)["municipality"]
+
+
+def convert_boundary_levels(
+        shp_file_path,
+        output_dir="./created/",
+        file_stem="boundary",
+        formats=DEFAULT_BOUNDARY_FORMATS,
+        precision=None,
+        simplify_zooms=(),
+        dissolve_engine="geopandas",
+        dissolve_workers=1,
+        levels=(),
+        read_engine=None,
+        cities=None):
+    """.shpかshpが格納された.zipを指定して市区町村と上位の階層の境界データを作成し、指定形式で書き出す
+
+    Args:
+        shp_file_path (Path): 変換対象のshpファイル（またはzipファイル）のパス
+        output_dir (str): 書き出し先ディレクトリのパス文字列
+        file_stem (str): 書き出すファイルの拡張子を除いた名称（上位の階層は`{file_stem}_{階層}`）
+        formats (tuple): 出力形式名のタプル
+        precision (int): geojsonの座標の小数点以下の桁数（Noneなら丸めない）
+        simplify_zooms (tuple): 簡略化したデータも書き出すズームレベルのタプル
+        dissolve_engine (str): 結合する方式（geopandasまたはcoverage）
+        dissolve_workers (int): dissolve_engine=coverageで市区町村単位に結合を行うプロセス数
+        levels (tuple): 市区町村単位に加えて作成する階層（designated_city、pref）のタプル
+        read_engine (str): shpの読み込み方式（geopandasまたはpyogrio。Noneならpyogrioがあればpyogrio）
+        cities (list): 読み込む市区町村コード（CITY、3桁）のリスト（Noneなら全市区町村）
+
+    Returns:
+        dict: 階層をキー、境界データを値とする辞書
+
+    Notes:
+        小地域の境界の結合は市区町村単位の1回のみで、上位の階層は市区町村単位の結果から作成する。
+        shpからは境界データとして残すカラムのみを読み込む
+
+    """
+    s2g = ShapeToGeoPandas(str(Path(shp_file_path).resolve()),
+                           columns=[column for column in BOUNDARY_COLUMNS if column != "geometry"],
+                           filters={"CITY": list(cities)} if cities else None,
+                           engine=read_engine)
+    gdf = s2g.gdf
+
+    geo_d = GdfDissolve(gdf, BOUNDARY_COLUMNS)
+    geo_d.join_columns("AREA_CODE", "PREF", "CITY")
+    geo_d.dissolve_poly("AREA_CODE", dissolve_engine, dissolve_workers)
+
+    gdfs = derive_boundary_levels(geo_d.new_gdf, ("municipality",) + tuple(levels), dissolve_engine)
+    for level, boundary_gdf in gdfs.items():
+        write_boundaries(boundary_gdf, output_dir, level_file_stem(file_stem, level), formats, precision,
+                         simplify_zooms)
+    return gdfs
+
+
+def write_boundaries(boundary_gdf, output_dir, file_stem, formats, precision=None, simplify_zooms=()):
+    """境界データと、ズームレベルごとに簡略化した境界データを書き出す
+
+    Args:
+        boundary_gdf (gpd.GeoDataFrame): 境界データ
+        output_dir (str): 書き出し先ディレクトリのパス文字列
+        file_stem (str): 書き出すファイルの拡張子を除いた名称
+        formats (tuple): 出力形式名のタプル
+        precision (int): geojsonの座標の小数点以下の桁数（Noneなら丸めない）
+        simplify_zooms (tuple): 簡略化したデータも書き出すズームレベルのタプル
+
+    """
+    for fmt in formats:
+        output_file_from_df(boundary_gdf, output_dir, file_stem, fmt, precision=precision)
+    write_simplified_boundaries(boundary_gdf, output_dir, file_stem, simplify_zooms, formats, precision)
+
+
+def write_simplified_boundaries(boundary_gdf, output_dir, file_stem, zooms, formats, precision=None):
+    """境界データをズームレベルごとに簡略化し、`{file_stem}_z{ズームレベル}`として書き出す
+
+    Args:
+        boundary_gdf (gpd.GeoDataFrame): dissolve済みの境界データ
+        output_dir (str): 書き出し先ディレクトリのパス文字列
+        file_stem (str): 書き出すファイルの拡張子を除いた名称
+        zooms (tuple): ズームレベルのタプル
+        formats (tuple): 出力形式名のタプル
+        precision (int): geojsonの座標の小数点以下の桁数（Noneなら丸めない）
+
+    Notes:
+        許容距離はズームレベルの1ピクセルあたりの経度幅とする（zoom_to_tolerance）
+
+    """
+    if not zooms:
+        return
+    tolerances = {zoom: zoom_to_tolerance(zoom) for zoom in zooms}
+    geo_d = GdfDissolve(boundary_gdf, list(boundary_gdf.columns))
+    simplified_gdfs = geo_d.simplify_poly(list(tolerances.values()))
+    for zoom, tolerance in tolerances.items():
+        for fmt in formats:
+            output_file_from_df(simplified_gdfs[tolerance], output_dir, f"{file_stem}_z{zoom}", fmt,
+                                precision=precision)
+
+
+def _convert_pref_boundary(shp_file_path, output_dir, file_stem, formats, precision, simplify_zooms, dissolve_engine,
+                           levels, read_engine, return_gdf):
+    """プロセスプール内で1都道府県分の境界データを変換する
+
+    Args:
+        shp_file_path (Path): 変換対象のzipファイルのパス
+        output_dir (str): 書き出し先ディレクトリのパス文字列
+        file_stem (str): 書き出すファイルの拡張子を除いた名称
+        formats (tuple): 出力形式名のタプル
+        precision (int): geojsonの座標の小数点以下の桁数
+        simplify_zooms (tuple): 簡略化したデータも書き出すズームレベルのタプル
+        dissolve_engine (str): 結合する方式
+        levels (tuple): 市区町村単位に加えて作成する階層のタプル
+        read_engine (str): shpの読み込み方式
+        return_gdf (bool): Trueなら変換したgdfを返す（全国データへのマージ用）
+
+    Returns:
+        Union[dict, None]: 階層をキー、変換したgdfを値とする辞書
+
+    """
+    gdfs = convert_boundary_levels(shp_file_path, output_dir, file_stem, formats, precision, simplify_zooms,
+                                   dissolve_engine, 1, levels, read_engine)
+    return gdfs if return_gdf else None
+
+
+class BoundaryBatch:
+    """複数都道府県の境界データを並行してダウンロード・変換するクラス"""
+
+    def __init__(
+            self,
+            pref_names,
+            download_dir,
+            output_dir="./created/",
+            download_workers=4,
+            convert_workers=None,
+            formats=DEFAULT_BOUNDARY_FORMATS,
+            precision=None,
+            simplify_zooms=(),
+            dissolve_engine="geopandas",
+            levels=(),
+            read_engine=None):
+        """イニシャライザ
+
+        Args:
+            pref_names (list): 都道府県名のリスト（Noneなら全都道府県）
+            download_dir (str): ダウンロードするshpファイルを格納するディレクトリのパス文字列
+            output_dir (str): 変換したファイルの書き出し先ディレクトリのパス文字列
+            download_workers (int): 同時にダウンロードするスレッド数
+            convert_workers (int): 変換を行うプロセス数（NoneならCPU数）
+            formats (tuple): 出力形式名のタプル
+            precision (int): geojsonの座標の小数点以下の桁数（Noneなら丸めない）
+            simplify_zooms (tuple): 簡略化したデータも書き出すズームレベルのタプル
+            dissolve_engine (str): 結合する方式（geopandasまたはcoverage）
+            levels (tuple): 市区町村単位に加えて作成する階層（designated_city、pref）のタプル
+            read_engine (str): shpの読み込み方式（geopandasまたはpyogrio。Noneならpyogrioがあればpyogrio）
+
+        Notes:
+            都道府県単位で既にプロセスプールを使用するため、都道府県内の結合は1プロセスで行う
+
+        """
+        pref = PrefCode()
+        if pref_names is None:
+            pref_codes = pref.pref_codes()
+        else:
+            pref_codes = [pref.name_to_code(name) for name in pref_names]
+        self.pref_codes = [str(code).zfill(2) for code in pref_codes]
+        self.pref_names = {str(code).zfill(2): pref.code_to_name(code) for code in pref_codes}
+
+        self.download_dir = str(Path(download_dir).resolve())
+        self.output_dir = output_dir
+        self.download_workers = download_workers
+        self.convert_workers = convert_workers
+        self.formats = formats
+        self.precision = precision
+        self.simplify_zooms = simplify_zooms
+        self.dissolve_engine = dissolve_engine
+        self.levels = levels
+        self.read_engine = read_engine
+
+        # 都道府県コードごとのダウンロードファイルのパスと失敗内容
+        self.download_paths = {}
+        self.failures = {}
+
+    def _label(self, pref_code):
+        """進捗表示用の都道府県ラベルを返す
+
+        Args:
+            pref_code (str): 2桁の都道府県コード
+
+        Returns:
+            str: ラベル文字列
+
+        """
+        return f"[{pref_code} {self.pref_names[pref_code]}]"
+
+    @instrumented("boundary_batch.download")
+    def download(self):
+        """未取得の都道府県のshpを並行してダウンロードする
+
+        Returns:
+            dict: 都道府県コードをキー、ダウンロードファイルのパスを値とする辞書
+
+        """
+        area_code = AreaCode()
+        urls = {code: area_code.polygon_of_shp_url(code) for code in self.pref_codes}
+        with ThreadPoolExecutor(max_workers=self.download_workers) as executor:
+            futures = {executor.submit(download_file, url, self.download_dir, False): code
+                       for code, url in urls.items()}
+            for future in as_completed(futures):
+                code = futures[future]
+                try:
+                    self.download_paths[code] = future.result()
+                    print(f"{self._label(code)}ダウンロード完了：{self.download_paths[code]}")
+                except (Exception, SystemExit) as e:
+                    # download_fileはsys.exitで異常終了するため、SystemExitも都道府県単位の失敗として扱う
+                    self.failures[code] = f"ダウンロード失敗：{e!r}"
+                    print(f"{self._label(code)}{self.failures[code]}")
+        return self.download_paths
+
+    @instrumented("boundary_batch.convert")
+    def convert(self, merge=False):
+        """ダウンロードしたshpを都道府県ごとにプロセスプールで変換する
+
+        Args:
+            merge (bool): Trueなら全都道府県を結合した全国データも書き出す
+
+        Returns:
+            Union[gpd.GeoDataFrame, None]: merge=Trueなら全国の境界データ（市区町村単位）
+
+        Notes:
+            上位の階層を作成した場合は、全国データも階層ごとに書き出す
+
+        """
+        gdfs = {}
+        with ProcessPoolExecutor(max_workers=self.convert_workers) as executor:
+            futures = {executor.submit(_convert_pref_boundary,
+                                       path,
+                                       self.output_dir,
+                                       f"boundary_{code}",
+                                       self.formats,
+                                       self.precision,
+                                       self.simplify_zooms,
+                                       self.dissolve_engine,
+                                       self.levels,
+                                       self.read_engine,
+                                       merge): code
+                       for code, path in self.download_paths.items()}
+            for future in as_completed(futures):
+                code = futures[future]
+                try:
+                    gdfs[code] = future.result()
+                    print(f"{self._label(code)}変換完了")
+                except (Exception, SystemExit) as e:
+                    self.failures[code] = f"変換失敗：{e!r}"
+                    print(f"{self._label(code)}{self.failures[code]}")
+
+        if not merge or not gdfs:
+            return None
+        print("全国の境界データを結合します。")
+        national_gdfs = {}
+        for level in gdfs[min(gdfs)]:
+            national_gdfs[level] = pd.concat([gdfs[code][level] for code in sorted(gdfs)], ignore_index=True)
+            # 都道府県境も共有辺として簡略化するため、全国データは結合後に簡略化する
+            write_boundaries(national_gdfs[level], self.output_dir, level_file_stem("boundary", level), self.formats,
+                             self.precision, self.simplify_zooms)
+        return national_gdfs["municipality"]
+
+    def run(self, merge=False):
+        """ダウンロードと変換を実行し、失敗した都道府県を報告する
+
+        Args:
+            merge (bool): Trueなら全都道府県を結合した全国データも書き出す
+
+        Returns:
+            Union[gpd.GeoDataFrame, None]: merge=Trueなら全国の境界データ
+
+        """
+        self.download()
+        national_gdf = self.convert(merge)
+        succeeded = len(self.pref_codes) - len(self.failures)
+        print(f"{succeeded}/{len(self.pref_codes)}都道府県の境界データを作成しました。")
+        for code in sorted(self.failures):
+            print(f"{self._label(code)}{self.failures[code]}")
+        return national_gdf
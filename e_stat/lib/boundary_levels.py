@@ -0,0 +1,105 @@
+from ..utils import lazy_import
+from .area_index import get_area_index
+from .gdf_dissolve import GdfDissolve
+
+pd = lazy_import("pandas")
+
+# 境界データの階層（市区町村 → 政令市（区を結合） → 都道府県）
+BOUNDARY_LEVELS = ("municipality", "designated_city", "pref")
+# 市区町村より上位の階層で残すカラム
+LEVEL_COLUMNS = {
+    "designated_city": ["AREA_CODE", "PREF", "CITY", "PREF_NAME", "CITY_NAME", "geometry"],
+    "pref": ["AREA_CODE", "PREF", "PREF_NAME", "geometry"],
+}
+
+
+def _designated_city_gdf(municipality_gdf, dissolve_engine, area_index):
+    """市区町村単位の境界データから、政令市の区を政令市に結合した境界データを作成する
+
+    Args:
+        municipality_gdf (gpd.GeoDataFrame): 市区町村単位の境界データ
+        dissolve_engine (str): 結合する方式（geopandasまたはcoverage）
+        area_index (AreaIndex): 標準地域コードの索引
+
+    Returns:
+        gpd.GeoDataFrame: 政令市単位の境界データ
+
+    Notes:
+        結合するのは政令市の区のみで、それ以外の市区町村はそのまま残す
+
+    """
+    gdf = municipality_gdf[LEVEL_COLUMNS["designated_city"]].copy()
+    designated_city_codes = {
+        code: area_index.parent(code) for code in gdf["AREA_CODE"].unique()
+        if area_index.has_area(code) and area_index.area(code)["level"] == "ward"}
+    is_ward = gdf["AREA_CODE"].isin(designated_city_codes)
+    if not is_ward.any():
+        return gdf.reset_index(drop=True)
+
+    wards = gdf[is_ward].copy()
+    wards["AREA_CODE"] = wards["AREA_CODE"].map(designated_city_codes)
+    wards["CITY"] = wards["AREA_CODE"].str[2:]
+    wards["CITY_NAME"] = wards["AREA_CODE"].map(area_index.area_code_to_name)
+    geo_d = GdfDissolve(wards, LEVEL_COLUMNS["designated_city"])
+    geo_d.dissolve_poly("AREA_CODE", dissolve_engine)
+
+    designated_city_gdf = pd.concat([gdf[~is_ward], geo_d.new_gdf[LEVEL_COLUMNS["designated_city"]]])
+    return designated_city_gdf.sort_values("AREA_CODE").reset_index(drop=True)
+
+
+def _pref_gdf(gdf, dissolve_engine):
+    """市区町村（または政令市）単位の境界データを都道府県単位に結合する
+
+    Args:
+        gdf (gpd.GeoDataFrame): 市区町村（または政令市）単位の境界データ
+        dissolve_engine (str): 結合する方式（geopandasまたはcoverage）
+
+    Returns:
+        gpd.GeoDataFrame: 都道府県単位の境界データ（AREA_CODEは都道府県の標準地域コード（例：01000））
+
+    """
+    gdf = gdf[LEVEL_COLUMNS["pref"]].copy()
+    gdf["AREA_CODE"] = gdf["PREF"] + "000"
+    geo_d = GdfDissolve(gdf, LEVEL_COLUMNS["pref"])
+    geo_d.dissolve_poly("AREA_CODE", dissolve_engine)
+    return geo_d.new_gdf[LEVEL_COLUMNS["pref"]]
+
+
+def level_file_stem(file_stem, level):
+    """階層ごとの書き出すファイルの拡張子を除いた名称を返す
+
+    Args:
+        file_stem (str): 市区町村単位の境界データのファイル名（拡張子を除く）
+        level (str): 階層
+
+    Returns:
+        str: 市区町村ならfile_stem、それ以外は`{file_stem}_{階層}`
+
+    """
+    return file_stem if level == "municipality" else f"{file_stem}_{level}"
+
+
+def derive_boundary_levels(municipality_gdf, levels, dissolve_engine="geopandas", area_index=None):
+    """市区町村単位の境界データから上位の階層の境界データを順に作成する
+
+    Args:
+        municipality_gdf (gpd.GeoDataFrame): 市区町村単位にdissolveした境界データ
+        levels (tuple): 作成する階層（BOUNDARY_LEVELSの値）のタプル
+        dissolve_engine (str): 結合する方式（geopandasまたはcoverage）
+        area_index (AreaIndex): 標準地域コードの索引（Noneならデフォルトのアセットから読み込む）
+
+    Returns:
+        dict: 階層をキー、境界データを値とする辞書
+
+    Notes:
+        小地域の境界から結合し直さず、市区町村 → 政令市 → 都道府県の順に作成済みの1つ下の階層の結果を結合する
+
+    """
+    gdfs = {"municipality": municipality_gdf}
+    if "designated_city" in levels:
+        if area_index is None:
+            area_index = get_area_index()
+        gdfs["designated_city"] = _designated_city_gdf(municipality_gdf, dissolve_engine, area_index)
+    if "pref" in levels:
+        gdfs["pref"] = _pref_gdf(gdfs.get("designated_city", municipality_gdf), dissolve_engine)
+    return {level: gdfs[level] for level in BOUNDARY_LEVELS if level in levels}
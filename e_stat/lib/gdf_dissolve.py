@@ -1,4 +1,6 @@
-import geopandas as gpd
+from ..utils import coverage_dissolve, lazy_import, simplify_coverage, span
+
+gpd = lazy_import("geopandas")
 
 
 class GdfDissolve:
@@ -37,14 +39,45 @@ class GdfDissolve:
         self.new_gdf[new_column_name] = self.new_gdf[org_column] + \
             self.new_gdf[add_column]
 
-    def dissolve_poly(self, column):
+    def dissolve_poly(self, column, engine="geopandas", workers=1):
         """指定カラム名のフィールド値が同じの場合にジオメトリを結合
 
         Args:
             column (str): キーとなるカラムの名称
+            engine (str): geopandas（GeoDataFrame.dissolve）またはcoverage（重なりの無いポリゴン群として結合）
+            workers (int): engine=coverageで結合を行うプロセス数
+
+        Notes:
+            coverageは小地域の境界のようにポリゴン同士が重ならない前提で、共有辺を打ち消して結合するため高速
 
         """
         print(f"gdfを指定キー({column})で結合します。")
+        with span("dissolve", profile=True, engine=engine, rows=len(self.new_gdf)) as s:
+            if engine == "coverage":
+                dissolved = coverage_dissolve(self.new_gdf, column, workers)
+            else:
+                dissolved = self.new_gdf.dissolve(by=column)
+            s.set(groups=len(dissolved))
         # dissolveで結合したキーはインデックスになってしまうのでreset_index()でカラムに変換
-        self.new_gdf: gpd.GeoDataFrame = self.new_gdf.dissolve(
-            by=column).reset_index()
+        self.new_gdf: gpd.GeoDataFrame = dissolved.reset_index()
+
+    def simplify_poly(self, tolerances):
+        """隣接するポリゴンとの共有辺を保ったまま、許容距離ごとにジオメトリを簡略化する
+
+        Args:
+            tolerances (list): 許容距離（gdfの座標系の単位）のリスト
+
+        Returns:
+            dict: 許容距離をキー、簡略化したgdfを値とする辞書
+
+        Notes:
+            ポリゴンごとに簡略化すると隣接するポリゴンとの間に隙間・重なりが生じるため、
+            共有辺を1本のアークとして簡略化してからポリゴンを再構成する
+
+        """
+        print(f"gdfのジオメトリを簡略化します。許容距離={list(tolerances)}")
+        with span("simplify", profile=True, rows=len(self.new_gdf), tolerances=len(tolerances)):
+            simplified = simplify_coverage(self.new_gdf.geometry, tolerances)
+        return {tolerance: self.new_gdf.set_geometry(
+            gpd.GeoSeries(geometries, index=self.new_gdf.index, crs=self.new_gdf.crs))
+            for tolerance, geometries in simplified.items()}
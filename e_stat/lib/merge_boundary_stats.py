@@ -1,7 +1,8 @@
-import geopandas as gpd
-import pandas as pd
+from ..utils import VALUE_COLUMN, lazy_import, pivot_stats_df, span
+from .stats_data import StatsData
 
-from ..utils import csv_string_to_df, get_api_response
+gpd = lazy_import("geopandas")
+pd = lazy_import("pandas")
 
 
 class MergeBoundaryStats:
@@ -14,17 +15,29 @@ class MergeBoundaryStats:
             boundary_gdf,
             area,
             class_code,
-            year):
+            year,
+            typed=False,
+            wide=False,
+            validation=None,
+            catalog=None):
         """イニシャライザ
 
         Args:
             app_id (str): e-statAPIのAPIkey
             stats_table_id (str): 取得したい統計情報の統計表ID
             boundary_gdf (gpd.GeoDataFrame): 境界データのgdf
-            stats_df (pd.DataFrame): 統計データのdf
-            area (str): 標準地域コード
-            class_code (str): 統計表メタデータのクラスコード
-            year (str): データを取得したい年度
+            area (Union[str, list]): 標準地域コード（リストなら複数の地域）
+            class_code (Union[str, list]): 統計表メタデータのクラスコード（リストなら複数の項目）
+            year (Union[str, list]): データを取得したい年度（リストなら複数の年度）
+            typed (bool): Trueならvalueを数値（特殊記号はvalue_markerに記録）、コード等をカテゴリにする
+            wide (bool): Trueなら項目・年度ごとの値を列に展開し、1地域1行のgdfにする
+            validation (str): リクエスト前の取得条件の検証（None：検証しない、prune：存在しないコードを除く、
+                strict：存在しないコードがあれば終了する）
+            catalog (StatsCatalog): 検証に使う分類事項を格納したカタログ（Noneならデフォルトのパスのカタログ）
+
+        Notes:
+            複数の地域・項目・年度はStatsDataでまとめて取得し（URLの長さ・件数の上限で分割）、
+            境界データとの結合は1回で行う
 
         """
         self.app_id = app_id
@@ -32,38 +45,77 @@ class MergeBoundaryStats:
         self.stats_table_id = stats_table_id
         self.boundary_gdf = boundary_gdf
 
-        self.area = area
-        self.class_code = class_code
-        self.year = year + "100000"
-
-        self.detail_url = "http://api.e-stat.go.jp/rest/3.0/app/getSimpleStatsData" \
-                          f"?appId={self.app_id}" \
-                          f"&cdArea={self.area}" \
-                          f"&cdCat01={self.class_code}" \
-                          f"&cdTime={self.year}" \
-                          f"&statsDataId={self.stats_table_id}" \
-                          f"&lang=J&metaGetFlg=N&cntGetFlg=N&explanationGetFlg=N&annotationGetFlg=N&sectionHeaderFlg=2"
-        self.stats_df = self._extraction_only_year(self._create_stats_df())
-        self.merged_df = self._merge_df()
-
-    def _create_stats_df(self):
-        """統計表をAPIから取得して、データフレームとして返す
+        self.areas = _as_list(area)
+        self.class_codes = _as_list(class_code)
+        self.years = [str(y) + "100000" for y in _as_list(year)]
+        self.typed = typed
+        self.wide = wide
 
-        Returns:
-            pd.DataFrame: 統計表のデータフレーム
-
-        """
-        print(f"統計表を取得します。URL={self.detail_url}")
-        res = get_api_response(self.detail_url)
-        row_text = res.text
-        return csv_string_to_df(row_text)
+        self.stats_data = StatsData(
+            self.app_id, self.stats_table_id, None,
+            self.areas, self.class_codes, _as_list(year), typed=self.typed,
+            validation=validation, catalog=catalog)
+        self.detail_url = self.stats_data.detail_url
+        self.stats_df = self._extraction_only_year(self.stats_data.stats_df)
+        with span("merge", profile=True, wide=self.wide) as s:
+            self.merged_df = self._join_wide_df() if self.wide else self._merge_df()
+            s.set(rows=len(self.merged_df))
 
     def _extraction_only_year(self, df):
-        return df[df["time_code"].str.startswith(str(self.year))]
+        if not len(df.columns):
+            return df
+        return df[df["time_code"].isin(self.years)]
 
     def _merge_df(self):
+        if not len(self.stats_df.columns):
+            return self.boundary_gdf.iloc[0:0]
         return pd.merge(
             self.boundary_gdf,
             self.stats_df,
             left_on='AREA_CODE',
             right_on='area_code')
+
+    def _pivot_wide_df(self):
+        """統計データを地域コードを行、項目・年度を列とする横持ちのdfに変換する
+
+        Returns:
+            pd.DataFrame: area_codeをインデックスとし、`{項目コード}_{年度}`を列名としたdf
+
+        Notes:
+            表章項目が複数ある統計表では列名を`{表章項目コード}_{項目コード}_{年度}`とする（pivot_stats_dfの自動の列）
+
+        """
+        wide_df = pivot_stats_df(self.stats_df, sparse=False).to_frame()
+        wide_df.index = wide_df.index.astype(str)
+        # 行列はfloat64で保持するため、型付きの値（Int64等）は元の型に戻す
+        value_dtype = self.stats_df[VALUE_COLUMN].dtype if VALUE_COLUMN in self.stats_df.columns else None
+        if value_dtype is not None and pd.api.types.is_numeric_dtype(value_dtype):
+            wide_df = wide_df.astype(value_dtype)
+        return wide_df
+
+    def _join_wide_df(self):
+        """横持ちにした統計データを境界データに1回の結合でマージする
+
+        Returns:
+            gpd.GeoDataFrame: 境界データに項目・年度ごとの値の列を追加したgdf
+
+        """
+        if not len(self.stats_df.columns) or self.stats_df.empty:
+            return self.boundary_gdf.iloc[0:0]
+        return self.boundary_gdf.join(self._pivot_wide_df(), on="AREA_CODE", how="inner")
+
+
+def _as_list(value):
+    """文字列またはリストの引数をリストに揃える
+
+    Args:
+        value (Union[str, list]): 文字列またはリスト
+
+    Returns:
+        list: リスト
+
+    """
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
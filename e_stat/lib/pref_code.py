@@ -1,7 +1,7 @@
-import json
 import sys
 from pathlib import Path
-import pandas as pd
+
+from .area_index import get_area_index
 
 
 class PrefCode:
@@ -10,38 +10,12 @@ class PrefCode:
     def __init__(self):
         """イニシャライザ
 
-        """
-        self.__pref_code_json_path = Path("./e_stat/assets/pref_code.json")
-        self.__pref_code_df = self._pref_json_to_df()
-
-    def _read_json(self):
-        """jsonを読み込んで辞書に変換する
-
-        Returns:
-            Union[dict, list]: jsonを変換した辞書またはリスト
-
-        """
-        json_path = self.__pref_code_json_path
-        with json_path.open() as file:
-            return json.load(file)
-
-    def _dict_in_list_to_df(self, dicts):
-        """フラットな同じキーを持つ辞書のリストをdfに変換
-
-        Args:
-            dicts (list): 辞書のリスト
-
-        Returns:
-            pd.DataFrame: 変換されたdf
+        Notes:
+            jsonはプロセス内で1度だけ読み込み、索引（辞書）で変換する
 
         """
-        return pd.DataFrame(dicts)
-
-    def _pref_json_to_df(self):
-        if isinstance(self._read_json(), list):
-            return self._dict_in_list_to_df(self._read_json())
-        print(f"{self.__pref_code_json_path}はdfに変換できません。システムを終了します。")
-        sys.exit(1)
+        self.__pref_code_json_path = Path("./e_stat/assets/pref_code.json")
+        self.__index = get_area_index(pref_code_json_path=self.__pref_code_json_path)
 
     def code_to_name(self, pref_code):
         """都道府県コードを都道府県名に変換する
@@ -53,12 +27,10 @@ class PrefCode:
             str: 都道府県名
 
         """
-        df = self.__pref_code_df
         try:
-            pref_name = list(df[df["prefCode"] == pref_code]["prefName"])[0]
-            return pref_name
-        except BaseException:
-            print(f"{df}からデータを抽出できません。システムを終了します。")
+            return self.__index.pref_code_to_name(pref_code)
+        except (KeyError, ValueError):
+            print(f"{self.__pref_code_json_path}から都道府県コード{pref_code}を抽出できません。システムを終了します。")
             sys.exit(1)
 
     def name_to_code(self, pref_name):
@@ -71,10 +43,17 @@ class PrefCode:
             int: 都道府県コード
 
         """
-        df = self.__pref_code_df
         try:
-            pref_code = list(df[df["prefName"] == pref_name]["prefCode"])[0]
-            return pref_code
-        except BaseException:
-            print(f"{df}からデータを抽出できません。システムを終了します。")
+            return self.__index.pref_name_to_code(pref_name)
+        except KeyError:
+            print(f"{self.__pref_code_json_path}から都道府県名{pref_name}を抽出できません。システムを終了します。")
             sys.exit(1)
+
+    def pref_codes(self):
+        """全都道府県の都道府県コードを返す
+
+        Returns:
+            list: 都道府県コード（int）のリスト
+
+        """
+        return self.__index.pref_codes()
@@ -1,20 +1,74 @@
+import importlib.util
 import sys
 from pathlib import Path
 
-import geopandas as gpd
+from ..utils import lazy_import, span
+
+gpd = lazy_import("geopandas")
+pyogrio = lazy_import("pyogrio")
+
+# shpの読み込み方式（geopandas：gpd.read_file、pyogrio：GDALからカラムごとの配列としてまとめて読み込む）
+READ_ENGINES = ("geopandas", "pyogrio")
+
+
+def default_read_engine():
+    """pyogrioがインストールされていればpyogrio、なければgeopandasを返す
+
+    Returns:
+        str: 読み込み方式
+
+    """
+    return "pyogrio" if importlib.util.find_spec("pyogrio") is not None else "geopandas"
+
+
+def _where_clause(filters):
+    """カラムの値の条件をOGR SQLのWHERE句に変換する
+
+    Args:
+        filters (dict): カラム名をキー、残す値のリストを値とする辞書
+
+    Returns:
+        str: WHERE句（例："CITY" IN ('101','102')）
+
+    """
+    clauses = []
+    for column, values in filters.items():
+        quoted = ",".join("'" + str(value).replace("'", "''") + "'" for value in values)
+        clauses.append(f'"{column}" IN ({quoted})')
+    return " AND ".join(clauses)
 
 
 class ShapeToGeoPandas:
     """シェープファイルをGeoDataframeに変換して指定形式で吐き出すクラス"""
 
-    def __init__(self, shp_path):
+    def __init__(self, shp_path, columns=None, bbox=None, mask=None, filters=None, engine=None):
         """イニシャライザ
 
         Args:
             shp_path (str): .shpが格納されているzipのパス文字列（.shpファイルの直接参照も可）
+            columns (list): 読み込む属性のカラム名のリスト（Noneなら全カラム。ジオメトリは常に読み込む）
+            bbox (tuple): 読み込む範囲(minx, miny, maxx, maxy)（shpの座標系）
+            mask (shapely.geometry.base.BaseGeometry): 読み込む範囲のジオメトリ（bboxとは同時に指定しない）
+            filters (dict): カラム名をキー、残す値のリストを値とする辞書（例：{"CITY": ["101", "102"]}）
+            engine (str): 読み込み方式（geopandasまたはpyogrio。Noneならpyogrioがあればpyogrio）
+
+        Notes:
+            pyogrioではカラム・範囲・行の条件をGDALに渡し、不要なデータを読み込まない。
+            geopandas（gpd.read_file）では範囲のみ読み込み時に絞り込み、カラム・行は読み込み後に絞り込む
 
         """
         self.shp_path = shp_path
+        self.columns = columns
+        self.bbox = bbox
+        self.mask = mask
+        self.filters = filters
+        self.engine = engine or default_read_engine()
+        if self.engine not in READ_ENGINES:
+            print(f"読み込み方式は{','.join(READ_ENGINES)}のいずれかを指定してください。システムを終了します。")
+            sys.exit(1)
+        if self.engine == "pyogrio" and importlib.util.find_spec("pyogrio") is None:
+            print("pyogrioで読み込むにはpyogrioをインストールしてください。システムを終了します。")
+            sys.exit(1)
         self.gdf = self._file_to_gdf(shp_path)
 
     def _suffix_check(self, path, target_suffix):
@@ -71,7 +125,7 @@ class ShapeToGeoPandas:
 
         """
         path_str = str(Path(path).resolve())
-        return gpd.read_file(path_str)
+        return self._read_file(path_str)
 
     def _zip_to_gdf(self, path):
         """zipファイルをGeoDataframeに変換する
@@ -84,7 +138,35 @@ class ShapeToGeoPandas:
 
         """
         path_str = str(Path(path).resolve())
-        return gpd.read_file("zip://" + path_str)
+        return self._read_file("zip://" + path_str)
+
+    def _read_file(self, path_str):
+        """指定の方式でカラム・範囲・行を絞り込んで読み込む
+
+        Args:
+            path_str (str): shpファイルのパス文字列（zipの場合はzip://で始まるパス文字列）
+
+        Returns:
+            gpd.GeoDataFrame: 読み込んだgdf
+
+        """
+        with span("shp.read", profile=True, engine=self.engine) as s:
+            if self.engine == "pyogrio":
+                gdf = pyogrio.read_dataframe(
+                    path_str,
+                    columns=self.columns,
+                    bbox=self.bbox,
+                    mask=self.mask,
+                    where=_where_clause(self.filters) if self.filters else None)
+            else:
+                gdf = gpd.read_file(path_str, bbox=self.bbox, mask=self.mask)
+                if self.filters:
+                    for column, values in self.filters.items():
+                        gdf = gdf[gdf[column].isin(values)]
+                if self.columns is not None:
+                    gdf = gdf[list(self.columns) + [gdf.geometry.name]]
+            s.set(rows=len(gdf), columns=len(gdf.columns))
+        return gdf
 
     def _file_to_gdf(self, path):
         """.shp及び.shpが格納されたzipファイルを読み込みGeoDataFrameを返す
@@ -0,0 +1,635 @@
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+
+from ..utils import api_endpoint_url, instrumented, iter_csv_chunks, lazy_import, open_api_response, read_asset_df, \
+    read_until_section, section_header_value, span
+from .stats_search import SEARCH_KINDS, create_search_tables, delete_documents, index_documents, \
+    search_documents
+
+pd = lazy_import("pandas")
+
+# 統計表情報のカタログ（SQLite）のデフォルトのパス
+DEFAULT_CATALOG_PATH = "./e_stat/.cache/stats_catalog.sqlite3"
+# カタログに格納する統計表情報のカラム（getSimpleStatsListのSTAT_INFセクションのカラム）
+CATALOG_COLUMNS = [
+    "TABLE_INF", "STAT_CODE", "STAT_NAME", "GOV_ORG_CODE", "GOV_ORG_NAME", "TABULATION_CATEGORY",
+    "TABULATION_SUB_CATEGORY1", "TABULATION_SUB_CATEGORY2", "TABULATION_SUB_CATEGORY3", "TABULATION_SUB_CATEGORY4",
+    "TABULATION_SUB_CATEGORY5", "NO", "TITLE", "TABLE_CATEGORY", "TABLE_SUB_CATEGORY1", "TABLE_SUB_CATEGORY2",
+    "TABLE_SUB_CATEGORY3", "CYCLE", "SURVEY_DATE", "OPEN_DATE", "SMALL_AREA", "COLLECT_AREA",
+    "OVERALL_TOTAL_NUMBER", "UPDATED_DATE", "MAIN_CATEGORY_CODE", "MAIN_CATEGORY", "SUB_CATEGORY_CODE",
+    "SUB_CATEGORY"]
+# カタログに格納する分類事項のカラム（getSimpleMetaInfoのCLASS_INFセクションのカラム）
+CLASS_INF_COLUMNS = [
+    "CLASS_OBJ_ID", "CLASS_OBJ_NAME", "CLASS_CODE", "CLASS_NAME", "CLASS_LEVEL", "CLASS_UNIT", "CLASS_PARENT_CODE"]
+GOV_STATS_CODES_TSV = "./e_stat/assets/government_statistics_codes.tsv"
+
+
+def read_gov_stats_codes():
+    """政府統計コード一覧のtsvから全ての政府統計コードを返す
+
+    Returns:
+        list: 政府統計コードのリスト
+
+    """
+    df = read_asset_df(str(Path(GOV_STATS_CODES_TSV).resolve()), "shift-jis", sep="\t")
+    return df["政府統計コード"].dropna().tolist()
+
+
+def read_stats_table_ids(path):
+    """統計表IDの一覧ファイルを読み込む
+
+    Args:
+        path (str): .csv（stats_table_idまたはTABLE_INFカラム）または1行に1つの統計表IDを書いたテキストファイルのパス文字列
+
+    Returns:
+        list: 統計表IDのリスト（重複を除き、ファイルの順）
+
+    Notes:
+        csvはstats-batchのジョブ定義ファイルやidsコマンドの出力をそのまま指定できる
+
+    """
+    file_path = Path(path)
+    if file_path.suffix == ".csv":
+        df = pd.read_csv(str(file_path.resolve()), encoding="utf-8", dtype=str)
+        column = next((c for c in ("stats_table_id", "TABLE_INF") if c in df.columns), None)
+        if column is None:
+            print("csvにはstats_table_idまたはTABLE_INFカラムを含めてください。システムを終了します。")
+            sys.exit(1)
+        table_ids = df[column].dropna().str.strip().tolist()
+    else:
+        with file_path.open(encoding="utf-8") as file:
+            table_ids = [line.strip() for line in file if line.strip()]
+    return list(dict.fromkeys(table_ids))
+
+
+def fetch_stats_list(url, refresh=False):
+    """統計表情報取得APIのNEXT_KEYをたどり、全ページの統計表情報を取得する
+
+    Args:
+        url (str): 統計表情報取得API（getSimpleStatsList）のURL（startPositionを含まないもの）
+        refresh (bool): Trueならレスポンスキャッシュを参照せずにリクエストする
+
+    Returns:
+        tuple: (統計表情報のデータフレーム, エラーメッセージ（正常ならNone）)
+
+    Notes:
+        該当データが無い（STATUS=1）場合は空のデータフレームを返す。
+        複数の政府統計コードをまとめて取得するため、エラーでも異常終了せずエラーメッセージを返す
+
+    """
+    dfs = []
+    page_url = url
+    while True:
+        with open_api_response(page_url, refresh=refresh) as stream:
+            header_text, found = read_until_section(stream, "STAT_INF")
+            if not found:
+                status = section_header_value(header_text, "STATUS")
+                if status == "1":
+                    break
+                return pd.DataFrame(), f"STATUS={status}, ERROR_MSG={section_header_value(header_text, 'ERROR_MSG')}"
+            next_key = section_header_value(header_text, "NEXT_KEY")
+            dfs.extend(iter_csv_chunks(stream))
+        if next_key is None:
+            break
+        page_url = f"{url}&startPosition={next_key}"
+    if not dfs:
+        return pd.DataFrame(columns=CATALOG_COLUMNS), None
+    return pd.concat(dfs, ignore_index=True), None
+
+
+def fetch_meta_info(url, refresh=False):
+    """メタ情報取得APIから分類事項（CLASS_INF）を取得する
+
+    Args:
+        url (str): メタ情報取得API（getSimpleMetaInfo）のURL
+        refresh (bool): Trueならレスポンスキャッシュを参照せずにリクエストする
+
+    Returns:
+        tuple: (分類事項のデータフレーム, エラーメッセージ（正常ならNone）)
+
+    Notes:
+        複数の統計表をまとめて取得するため、エラーでも異常終了せずエラーメッセージを返す
+
+    """
+    with open_api_response(url, refresh=refresh) as stream:
+        header_text, found = read_until_section(stream, "CLASS_INF")
+        if not found:
+            return pd.DataFrame(), f"STATUS={section_header_value(header_text, 'STATUS')}, " \
+                                   f"ERROR_MSG={section_header_value(header_text, 'ERROR_MSG')}"
+        dfs = list(iter_csv_chunks(stream))
+    if not dfs:
+        return pd.DataFrame(columns=CLASS_INF_COLUMNS), None
+    return pd.concat(dfs, ignore_index=True), None
+
+
+def _df_rows(df, columns):
+    """データフレームをSQLiteに挿入する値のタプルのリストに変換する
+
+    Args:
+        df (pd.DataFrame): データフレーム
+        columns (list): 取り出すカラム（存在しないカラムはNone）
+
+    Returns:
+        list: 欠損値をNoneにした値のタプルのリスト
+
+    """
+    values = df.reindex(columns=columns).astype(object)
+    return list(values.where(values.notna(), None).itertuples(index=False, name=None))
+
+
+class StatsCatalog:
+    """全政府統計の統計表情報をローカルのSQLiteに同期して検索するためのクラス"""
+
+    def __init__(self, app_id, catalog_path=DEFAULT_CATALOG_PATH):
+        """イニシャライザ
+
+        Args:
+            app_id (str): e-statAPIのAPIkey
+            catalog_path (str): カタログ（SQLite）のパス文字列
+
+        """
+        self.app_id = app_id
+        self.catalog_path = Path(catalog_path)
+        self.catalog_path.parent.mkdir(parents=True, exist_ok=True)
+        # 読み込んだ分類事項の行（統計表IDをキー）。同じ統計表の2回目以降の参照はSQLiteを読まない
+        self._class_inf_rows_cache = {}
+        self._create_tables()
+
+    @contextmanager
+    def _connect(self):
+        """カタログへの接続を返すコンテキストマネージャ（正常終了ならコミットし、最後に接続を閉じる）
+
+        Yields:
+            sqlite3.Connection: 接続オブジェクト
+
+        """
+        conn = sqlite3.connect(str(self.catalog_path))
+        # WALモードではコミットごとのfsyncを省いても破損しない（電源断で直前のコミットが失われるのみ）
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _create_tables(self):
+        """統計表情報・分類事項・同期状態・メタ情報の取得状態・検索索引のテーブルとインデックスを作成する"""
+        columns = ", ".join(f"{column} TEXT" for column in CATALOG_COLUMNS[1:])
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"CREATE TABLE IF NOT EXISTS stats_tables (TABLE_INF TEXT PRIMARY KEY, {columns})")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_stats_tables_stat_code ON stats_tables (STAT_CODE)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_stats_tables_updated_date ON stats_tables (UPDATED_DATE)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_stats_tables_collect_area ON stats_tables (COLLECT_AREA)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sync_state "
+                "(STAT_CODE TEXT PRIMARY KEY, SYNCED_DATE TEXT, TABLE_COUNT INTEGER, ERROR_MSG TEXT)")
+            class_columns = ", ".join(f"{column} TEXT" for column in CLASS_INF_COLUMNS)
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS class_inf (TABLE_INF TEXT, {class_columns}, "
+                f"PRIMARY KEY (TABLE_INF, CLASS_OBJ_ID, CLASS_CODE))")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta_state "
+                "(TABLE_INF TEXT PRIMARY KEY, FETCHED_DATE TEXT, CLASS_COUNT INTEGER, ERROR_MSG TEXT)")
+            create_search_tables(conn)
+
+    def stats_list_url(self, gov_stats_code, updated_since=None, today=None):
+        """政府統計コードの統計表情報取得APIのURLを生成する
+
+        Args:
+            gov_stats_code (str): 政府統計コード
+            updated_since (str): 指定した日付(yyyymmdd)以降に更新された統計表のみ取得する（Noneなら全件）
+            today (str): 更新日付の範囲の終わりの日付(yyyymmdd)
+
+        Returns:
+            str: URL
+
+        """
+        url = f"{api_endpoint_url('getSimpleStatsList')}" \
+              f"?appId={self.app_id}&lang=J&statsCode={gov_stats_code}&searchKind=1&explanationGetFlg=N"
+        if updated_since:
+            url += f"&updatedDate={updated_since}-{today or date.today().strftime('%Y%m%d')}"
+        return url
+
+    def synced_dates(self):
+        """政府統計コードごとの最後に同期した日付を返す
+
+        Returns:
+            dict: 政府統計コードをキー、同期した日付(yyyymmdd)を値とする辞書（エラーになったコードは含まない）
+
+        """
+        with self._connect() as conn:
+            rows = conn.execute("SELECT STAT_CODE, SYNCED_DATE FROM sync_state WHERE ERROR_MSG IS NULL").fetchall()
+        return dict(rows)
+
+    @instrumented("stats_catalog.sync")
+    def sync(self, gov_stats_codes=None, concurrency=8, full=False):
+        """政府統計コードごとの統計表情報をAPIから取得してカタログに格納する
+
+        Args:
+            gov_stats_codes (list): 同期する政府統計コードのリスト（Noneなら政府統計コード一覧の全て）
+            concurrency (int): 同時に実行するリクエスト数の上限
+            full (bool): Trueなら前回の同期日に関わらず全件を取得し直す
+
+        Returns:
+            dict: 同期したコード数・追加/更新した統計表数・エラーになったコードの辞書
+
+        Notes:
+            前回同期したコードは更新日付（updatedDate）で前回の同期日以降に更新された統計表のみ取得して追加・更新する。
+            差分の同期ではe-Stat側で削除された統計表は消えないため、full=Trueで全件取得するとそのコードの統計表を入れ替える。
+            カタログ自体が統計表情報のキャッシュのため、レスポンスキャッシュは参照せずに常にリクエストする
+
+        """
+        codes = list(gov_stats_codes) if gov_stats_codes else read_gov_stats_codes()
+        synced_dates = {} if full else self.synced_dates()
+        today = date.today().strftime("%Y%m%d")
+        result = {"codes": len(codes), "tables": 0, "errors": {}}
+        print(f"{len(codes)}件の政府統計コードの統計表情報を同期します（同時実行数={concurrency}）。")
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor, self._connect() as conn:
+            futures = {
+                executor.submit(
+                    fetch_stats_list, self.stats_list_url(code, synced_dates.get(code), today), refresh=True): code
+                for code in codes}
+            # SQLiteへの書き込みは取得を待つスレッドでまとめて行う
+            for future in as_completed(futures):
+                code = futures[future]
+                try:
+                    df, error_message = future.result()
+                except OSError as e:
+                    df, error_message = None, str(e)
+                if error_message is not None:
+                    print(f"政府統計コード{code}の統計表情報を取得できませんでした。{error_message}")
+                    result["errors"][code] = error_message
+                    conn.execute("INSERT OR REPLACE INTO sync_state VALUES (?, NULL, NULL, ?)", (code, error_message))
+                    continue
+                with span("catalog.write", stats_code=code, rows=len(df)):
+                    result["tables"] += self._write_tables(conn, code, df, replace=code not in synced_dates)
+                conn.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, NULL)",
+                             (code, today, self._table_count(conn, code)))
+                conn.commit()
+        print(f"{result['tables']}件の統計表情報を追加・更新しました（エラー：{len(result['errors'])}件）。")
+        return result
+
+    def _write_tables(self, conn, gov_stats_code, df, replace):
+        """統計表情報をカタログに書き込む
+
+        Args:
+            conn (sqlite3.Connection): 接続オブジェクト
+            gov_stats_code (str): 政府統計コード
+            df (pd.DataFrame): 統計表情報のデータフレーム
+            replace (bool): Trueならそのコードの統計表を全て入れ替える（dfに無い統計表は削除する）
+
+        Returns:
+            int: 書き込んだ統計表数
+
+        """
+        if replace:
+            # 取得した統計表に含まれない（e-Stat側で削除された）統計表は分類事項・メタ情報の取得状態・検索索引からも削除する
+            table_ids = set() if df.empty else set(df["TABLE_INF"])
+            stored_ids = [row[0] for row in conn.execute(
+                "SELECT TABLE_INF FROM stats_tables WHERE STAT_CODE = ?", (gov_stats_code,))]
+            self._delete_tables(conn, [table_id for table_id in stored_ids if table_id not in table_ids])
+        if df.empty:
+            return 0
+        rows = _df_rows(df, CATALOG_COLUMNS)
+        placeholders = ", ".join("?" * len(CATALOG_COLUMNS))
+        conn.executemany(f"INSERT OR REPLACE INTO stats_tables VALUES ({placeholders})", rows)
+        self._index_tables(conn, rows)
+        return len(rows)
+
+    def _delete_tables(self, conn, table_ids):
+        """統計表とその分類事項・メタ情報の取得状態・検索索引の文書をカタログから削除する
+
+        Args:
+            conn (sqlite3.Connection): 接続オブジェクト
+            table_ids (list): 削除する統計表IDのリスト
+
+        """
+        for kind in SEARCH_KINDS:
+            delete_documents(conn, table_ids, kind)
+        for table in ("class_inf", "meta_state", "stats_tables"):
+            conn.executemany(f"DELETE FROM {table} WHERE TABLE_INF = ?", ((table_id,) for table_id in table_ids))
+        for table_id in table_ids:
+            self._class_inf_rows_cache.pop(table_id, None)
+
+    def _index_tables(self, conn, rows):
+        """統計表題・政府統計名を検索索引に追加する（同じ統計表IDの文書は入れ替える）
+
+        Args:
+            conn (sqlite3.Connection): 接続オブジェクト
+            rows (list): CATALOG_COLUMNSの順の値のタプルのリスト
+
+        """
+        table_index, stat_name_index, title_index = (CATALOG_COLUMNS.index(column)
+                                                     for column in ("TABLE_INF", "STAT_NAME", "TITLE"))
+        delete_documents(conn, [row[table_index] for row in rows], "table")
+        # 統計表題と政府統計名にまたがるn-gramができないよう、区切り文字を挟む
+        index_documents(conn, ((row[table_index], "table", None, None,
+                                f"{row[stat_name_index] or ''}|{row[title_index] or ''}") for row in rows))
+
+    def store_class_inf(self, stats_table_id, df):
+        """統計表の分類事項（メタ情報のCLASS_INF）をカタログに格納し、名称を検索索引に追加する
+
+        Args:
+            stats_table_id (str): 統計表ID
+            df (pd.DataFrame): 分類事項のデータフレーム（StatsMetaData.stats_meta_data_df）
+
+        Returns:
+            int: 格納した分類事項数
+
+        """
+        with self._connect() as conn:
+            return self._write_class_inf(conn, stats_table_id, df)
+
+    def _write_class_inf(self, conn, stats_table_id, df):
+        """分類事項をカタログに書き込み、取得状態を記録する
+
+        Args:
+            conn (sqlite3.Connection): 接続オブジェクト
+            stats_table_id (str): 統計表ID
+            df (pd.DataFrame): 分類事項のデータフレーム
+
+        Returns:
+            int: 書き込んだ分類事項数
+
+        """
+        rows = [(stats_table_id, *row) for row in _df_rows(df, CLASS_INF_COLUMNS)]
+        conn.execute("DELETE FROM class_inf WHERE TABLE_INF = ?", (stats_table_id,))
+        conn.executemany(
+            f"INSERT OR REPLACE INTO class_inf VALUES ({', '.join('?' * (len(CLASS_INF_COLUMNS) + 1))})", rows)
+        delete_documents(conn, [stats_table_id], "class")
+        index_documents(conn, ((stats_table_id, "class", row[1], row[3], row[4]) for row in rows))
+        conn.execute("INSERT OR REPLACE INTO meta_state VALUES (?, ?, ?, NULL)",
+                     (stats_table_id, date.today().strftime("%Y%m%d"), len(rows)))
+        self._class_inf_rows_cache.pop(stats_table_id, None)
+        return len(rows)
+
+    def meta_info_url(self, stats_table_id):
+        """統計表のメタ情報取得APIのURLを生成する（StatsMetaDataと同じURL）
+
+        Args:
+            stats_table_id (str): 統計表ID
+
+        Returns:
+            str: URL
+
+        """
+        return f"{api_endpoint_url('getSimpleMetaInfo')}" \
+               f"?appId={self.app_id}&lang=J&statsDataId={stats_table_id}&explanationGetFlg=N"
+
+    def stored_meta_ids(self):
+        """分類事項を格納済みの統計表IDを返す
+
+        Returns:
+            set: 統計表IDの集合（取得がエラーになった統計表は含まない）
+
+        """
+        with self._connect() as conn:
+            return {row[0] for row in conn.execute("SELECT TABLE_INF FROM meta_state WHERE ERROR_MSG IS NULL")}
+
+    @instrumented("stats_catalog.prefetch_meta")
+    def prefetch_meta(self, stats_table_ids, concurrency=8, full=False):
+        """複数の統計表のメタ情報をAPIから並行して取得し、分類事項をカタログに格納する
+
+        Args:
+            stats_table_ids (list): 統計表IDのリスト
+            concurrency (int): 同時に実行するリクエスト数の上限
+            full (bool): Trueなら格納済みの統計表もレスポンスキャッシュを参照せずに取得し直す
+
+        Returns:
+            dict: 取得した統計表数・格納済みで取得しなかった統計表数・エラーになった統計表の辞書
+
+        Notes:
+            格納した分類事項はclass_inf_df・class_codesやStatsMetaData(catalog=...)からAPIにリクエストせずに参照できる
+
+        """
+        table_ids = list(dict.fromkeys(str(table_id) for table_id in stats_table_ids))
+        stored = set() if full else self.stored_meta_ids()
+        targets = [table_id for table_id in table_ids if table_id not in stored]
+        result = {"fetched": 0, "stored": len(table_ids) - len(targets), "errors": {}}
+        print(f"{len(targets)}件の統計表のメタ情報を取得します（格納済み：{result['stored']}件、同時実行数={concurrency}）。")
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor, self._connect() as conn:
+            futures = {executor.submit(fetch_meta_info, self.meta_info_url(table_id), refresh=full): table_id
+                       for table_id in targets}
+            # SQLiteへの書き込みは取得を待つスレッドでまとめて行う
+            for future in as_completed(futures):
+                table_id = futures[future]
+                try:
+                    df, error_message = future.result()
+                except OSError as e:
+                    df, error_message = None, str(e)
+                if error_message is not None:
+                    print(f"統計表ID{table_id}のメタ情報を取得できませんでした。{error_message}")
+                    result["errors"][table_id] = error_message
+                    conn.execute("INSERT OR REPLACE INTO meta_state VALUES (?, NULL, NULL, ?)",
+                                 (table_id, error_message))
+                    continue
+                with span("catalog.write_meta", stats_table_id=table_id, rows=len(df)):
+                    self._write_class_inf(conn, table_id, df)
+                result["fetched"] += 1
+                conn.commit()
+        print(f"{result['fetched']}件の統計表の分類事項を格納しました（エラー：{len(result['errors'])}件）。")
+        return result
+
+    def _class_inf_rows(self, stats_table_id):
+        """格納済みの統計表の分類事項の行を返す（1度読み込んだ統計表はメモリに保持する）
+
+        Args:
+            stats_table_id (str): 統計表ID
+
+        Returns:
+            list: CLASS_INF_COLUMNSの順の値のタプルのリスト（未格納ならNone）
+
+        """
+        if stats_table_id not in self._class_inf_rows_cache:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    f"SELECT {', '.join(CLASS_INF_COLUMNS)} FROM class_inf WHERE TABLE_INF = ? ORDER BY rowid",
+                    (stats_table_id,)).fetchall()
+                if not rows and conn.execute("SELECT 1 FROM meta_state WHERE TABLE_INF = ? AND ERROR_MSG IS NULL",
+                                             (stats_table_id,)).fetchone() is None:
+                    return None
+            self._class_inf_rows_cache[stats_table_id] = rows
+        return self._class_inf_rows_cache[stats_table_id]
+
+    def class_inf_df(self, stats_table_id):
+        """格納済みの統計表の分類事項を返す
+
+        Args:
+            stats_table_id (str): 統計表ID
+
+        Returns:
+            pd.DataFrame: StatsMetaData.stats_meta_data_dfと同じカラムのデータフレーム（未格納ならNone）
+
+        """
+        rows = self._class_inf_rows(stats_table_id)
+        if rows is None:
+            return None
+        return pd.DataFrame(rows, columns=CLASS_INF_COLUMNS)
+
+    def class_codes_by_object(self, stats_table_id):
+        """格納済みの統計表の分類事項IDごとの分類コードを返す
+
+        Args:
+            stats_table_id (str): 統計表ID
+
+        Returns:
+            dict: 分類事項IDをキー、分類コードのリスト（メタ情報の順）を値とする辞書（統計表が未格納ならNone）
+
+        Notes:
+            データフレームを作らずに読み込んだ行から取り出すため、多数の統計表を参照しても速い
+
+        """
+        rows = self._class_inf_rows(stats_table_id)
+        if rows is None:
+            return None
+        obj_index, code_index = CLASS_INF_COLUMNS.index("CLASS_OBJ_ID"), CLASS_INF_COLUMNS.index("CLASS_CODE")
+        codes = {}
+        for row in rows:
+            codes.setdefault(row[obj_index], []).append(row[code_index])
+        return codes
+
+    def class_codes(self, stats_table_id, class_obj_id):
+        """格納済みの統計表の分類事項IDの分類コードを返す
+
+        Args:
+            stats_table_id (str): 統計表ID
+            class_obj_id (str): 分類事項ID（例: area、time、tab、cat01）
+
+        Returns:
+            list: 分類コードのリスト（メタ情報の順。統計表が未格納ならNone、分類事項IDが無ければ空のリスト）
+
+        Notes:
+            地域はclass_obj_id="area"（標準地域コード）、時間軸は"time"（例: 2010000000）で取得する
+
+        """
+        codes = self.class_codes_by_object(stats_table_id)
+        if codes is None:
+            return None
+        return codes.get(class_obj_id, [])
+
+    def rebuild_search_index(self):
+        """格納済みの統計表情報・分類事項から検索索引を作り直す
+
+        Returns:
+            int: 索引に追加した文書数
+
+        """
+        with self._connect() as conn:
+            conn.execute("DELETE FROM search_grams")
+            conn.execute("DELETE FROM search_docs")
+            count = index_documents(conn, conn.execute(
+                "SELECT TABLE_INF, 'table', NULL, NULL, COALESCE(STAT_NAME, '') || '|' || COALESCE(TITLE, '') "
+                "FROM stats_tables").fetchall())
+            count += index_documents(conn, conn.execute(
+                "SELECT TABLE_INF, 'class', CLASS_OBJ_ID, CLASS_CODE, CLASS_NAME FROM class_inf").fetchall())
+        return count
+
+    def search(self, query, limit=20):
+        """統計表題・政府統計名・分類事項の名称をn-gramの索引で検索する
+
+        Args:
+            query (str): 検索語（空白区切りで複数指定するとAND検索）
+            limit (int): 返す統計表の最大件数
+
+        Returns:
+            pd.DataFrame: TABLE_INF, STAT_NAME, TITLE, MATCHED_CLASSES, SCOREのデータフレーム
+
+        Notes:
+            索引が無いカタログ（検索機能の追加前に同期したもの）は初回の検索時に索引を作成する
+
+        """
+        with self._connect() as conn:
+            indexed = conn.execute("SELECT 1 FROM search_docs LIMIT 1").fetchone()
+            stored = conn.execute("SELECT 1 FROM stats_tables LIMIT 1").fetchone() or \
+                conn.execute("SELECT 1 FROM class_inf LIMIT 1").fetchone()
+        if stored and not indexed:
+            print("検索索引を作成します。")
+            self.rebuild_search_index()
+        with self._connect() as conn:
+            return search_documents(conn, query, limit)
+
+    def _table_count(self, conn, gov_stats_code):
+        return conn.execute(
+            "SELECT COUNT(*) FROM stats_tables WHERE STAT_CODE = ?", (gov_stats_code,)).fetchone()[0]
+
+    def find_tables(self, gov_stats_code=None, title=None, collect_area=None, updated_since=None, limit=None):
+        """カタログから条件に一致する統計表情報を検索する
+
+        Args:
+            gov_stats_code (str): 政府統計コード
+            title (str): 統計表題（TITLE）・政府統計名（STAT_NAME）に含まれる文字列
+            collect_area (str): 集計地域区分（例: 市区町村、都道府県）
+            updated_since (str): 指定した日付(yyyy-mm-dd)以降に更新された統計表
+            limit (int): 最大件数
+
+        Returns:
+            pd.DataFrame: 統計表情報のデータフレーム
+
+        """
+        conditions, params = [], []
+        if gov_stats_code:
+            conditions.append("STAT_CODE = ?")
+            params.append(gov_stats_code)
+        if title:
+            conditions.append("(TITLE LIKE ? OR STAT_NAME LIKE ?)")
+            params += [f"%{title}%"] * 2
+        if collect_area:
+            conditions.append("COLLECT_AREA = ?")
+            params.append(collect_area)
+        if updated_since:
+            conditions.append("UPDATED_DATE >= ?")
+            params.append(updated_since)
+        query = "SELECT * FROM stats_tables"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY TABLE_INF"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        with self._connect() as conn:
+            return pd.read_sql_query(query, conn, params=params)
+
+    def stats_table_ids_df(self, gov_stats_code):
+        """StatsIds.stats_table_ids_dfと同じ形式で政府統計コードの統計表ID一覧を返す
+
+        Args:
+            gov_stats_code (str): 政府統計コード
+
+        Returns:
+            pd.DataFrame: 統計表情報一覧のデータフレーム
+
+        Notes:
+            カタログに未同期のコードは異常終了する
+
+        """
+        if gov_stats_code not in self.synced_dates():
+            print(f"政府統計コード{gov_stats_code}はカタログに同期されていません。"
+                  f"catalog-syncコマンドを実行してください。システムを終了します。")
+            sys.exit(1)
+        return self.find_tables(gov_stats_code=gov_stats_code)
+
+    def meta_state_df(self):
+        """統計表ごとのメタ情報の取得状態を返す
+
+        Returns:
+            pd.DataFrame: TABLE_INF, FETCHED_DATE, CLASS_COUNT, ERROR_MSGのデータフレーム
+
+        """
+        with self._connect() as conn:
+            return pd.read_sql_query("SELECT * FROM meta_state ORDER BY TABLE_INF", conn)
+
+    def sync_state_df(self):
+        """政府統計コードごとの同期状態を返す
+
+        Returns:
+            pd.DataFrame: STAT_CODE, SYNCED_DATE, TABLE_COUNT, ERROR_MSGのデータフレーム
+
+        """
+        with self._connect() as conn:
+            return pd.read_sql_query("SELECT * FROM sync_state ORDER BY STAT_CODE", conn)
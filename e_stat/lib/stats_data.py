@@ -1,6 +1,10 @@
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
-from ..utils import csv_string_to_df, df_to_flatten_d_list, extraction_df, get_api_response, output_csv_from_df
+from ..utils import DEFAULT_MAX_ROWS, DEFAULT_MAX_URL_LENGTH, build_stats_data_url, concat_stats_dfs, \
+    df_to_flatten_d_list, extraction_df, fetch_all_stats_data_pages, instrumented, iter_stats_data_pages, \
+    output_csv_from_df, pivot_stats_df, plan_stats_data_chunks
+from .stats_query_validator import StatsQueryValidator
 
 
 class StatsData:
@@ -13,7 +17,14 @@ class StatsData:
             output_dir,
             areas,
             class_codes,
-            years):
+            years,
+            max_url_length=DEFAULT_MAX_URL_LENGTH,
+            max_rows=DEFAULT_MAX_ROWS,
+            max_workers=1,
+            fetch=True,
+            typed=False,
+            validation=None,
+            catalog=None):
         """イニシャライザ
 
         Args:
@@ -23,6 +34,20 @@ class StatsData:
             areas (list): 標準地域コードのリスト
             class_codes (list): 統計表メタデータのクラスコードのリスト（取得したい詳細項目）
             years (list): データを取得したい年度のリスト
+            max_url_length (int): 1リクエストのURLの長さの上限
+            max_rows (int): 1リクエストのデータ件数の上限
+            max_workers (int): 分割したリクエストを並行して取得するスレッド数
+            fetch (bool): Falseなら初期化時に取得しない（iter_pagesでページごとに取得する場合）
+            typed (bool): Trueならvalueを数値（特殊記号はvalue_markerに記録）、コード等をカテゴリにする
+            validation (str): リクエスト前の取得条件の検証（None：検証しない、prune：存在しないコードを除く、
+                strict：存在しないコードがあれば終了する）
+            catalog (StatsCatalog): 検証に使う分類事項を格納したカタログ（Noneならデフォルトのパスのカタログ）
+
+        Notes:
+            URLの長さかデータ件数が上限を超える場合はリクエストを分割して取得し、1つのdfに結合する。
+            10万件を超える統計表はNEXT_KEYをたどって全ページを取得する。
+            検証する場合は分類事項から見積もった1組み合わせあたりのデータ件数で分割し、
+            有効なコードが残らない条件があればリクエストせずに空のdfを返す
 
         """
         # api_key
@@ -32,31 +57,94 @@ class StatsData:
         self.stats_table_id = stats_table_id
         self.output_dir = output_dir
 
+        # カタログの分類事項（CLASS_INF）で取得条件を検証する
+        self.validated_query = None
+        rows_per_combination = 1
+        if validation:
+            self.validated_query = StatsQueryValidator(app_id, stats_table_id, catalog).validate(
+                areas, class_codes, years, validation)
+            areas, class_codes, years = \
+                self.validated_query.areas, self.validated_query.class_codes, self.validated_query.years
+            rows_per_combination = self.validated_query.rows_per_combination
+
         self.areas = ",".join(areas)
         self.class_codes = ",".join(class_codes)
         self.years = ",".join([str(y) + "100000" for y in years])
 
-        self.detail_url = "http://api.e-stat.go.jp/rest/3.0/app/getSimpleStatsData" \
-            f"?appId={self.app_id}" \
-            f"&cdArea={self.areas}" \
-            f"&cdCat01={self.class_codes}" \
-            f"&cdTime={self.years}" \
-            f"&statsDataId={self.stats_table_id}" \
-            f"&lang=J&metaGetFlg=N&cntGetFlg=N&explanationGetFlg=N&annotationGetFlg=N&sectionHeaderFlg=2"
+        self.detail_url = build_stats_data_url(
+            self.app_id, self.stats_table_id, areas, class_codes, years)
+
+        # URLの長さとデータ件数の上限に収まるように分割したリクエストのURL
+        self.max_workers = max_workers
+        self.typed = typed
+        self.chunk_urls = [
+            build_stats_data_url(self.app_id, self.stats_table_id, *chunk)
+            for chunk in plan_stats_data_chunks(
+                self.app_id, self.stats_table_id, areas, class_codes, years,
+                max_url_length=max_url_length, max_rows=max_rows, rows_per_combination=rows_per_combination)]
+        if self.validated_query is not None and not self.validated_query.estimated_rows:
+            self.chunk_urls = []
+
+        # fetch=Falseの場合はiter_pagesを実行するまでNone
+        self.stats_df = self._create_stats_df() if fetch else None
+
+    def _fetch_stats_df(self, url):
+        """統計表をAPIから全ページ取得して、データフレームとして返す
+
+        Args:
+            url (str): 統計データ取得APIのURL
+
+        Returns:
+            pd.DataFrame: 統計表のデータフレーム
+
+        """
+        return fetch_all_stats_data_pages(url, typed=self.typed)
+
+    def iter_pages(self):
+        """統計表をチャンク（最大5万件）ごとに取得して返すジェネレータ
+
+        Yields:
+            pd.DataFrame: 1チャンク分の統計表のデータフレーム
 
-        self.stats_df = self._create_stats_df()
+        Notes:
+            分割したリクエストも順に取得するので、全件を一度にメモリに載せずに処理できる
 
+        """
+        for url in self.chunk_urls:
+            yield from iter_stats_data_pages(url, typed=self.typed)
+
+    @instrumented("stats_data.fetch")
     def _create_stats_df(self):
-        """統計表をAPIから取得して、データフレームとして返す
+        """分割したリクエストごとに統計表を取得して、1つのデータフレームとして返す
 
         Returns:
             pd.DataFrame: 統計表のデータフレーム
 
         """
-        print(f"統計表を取得します。URL={self.detail_url}")
-        res = get_api_response(self.detail_url)
-        row_text = res.text
-        return csv_string_to_df(row_text)
+        if not self.chunk_urls:
+            print("取得条件に有効なコードが無いため、リクエストしません。")
+            return concat_stats_dfs([])
+        if len(self.chunk_urls) == 1:
+            return self._fetch_stats_df(self.chunk_urls[0])
+
+        print(f"リクエストを{len(self.chunk_urls)}件に分割して取得します。")
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            dfs = list(executor.map(self._fetch_stats_df, self.chunk_urls))
+        return concat_stats_dfs(dfs)
+
+    def pivot(self, index="area_code", columns=None, sparse=None):
+        """統計データを地域×(項目, 年度)の行列に変換する
+
+        Args:
+            index (str): 行にするカラム
+            columns (list): 列にするカラム（Noneならcat01_code, time_codeと値が2種類以上ある`*_code`カラム）
+            sparse (bool): Trueなら疎行列、Falseなら密行列で保持する（Noneなら値のある割合で決める）
+
+        Returns:
+            StatsMatrix: to_numpy・to_frame・to_parquetで書き出せる行列
+
+        """
+        return pivot_stats_df(self.stats_df, index, columns, sparse=sparse)
 
     def to_dict(
             self,
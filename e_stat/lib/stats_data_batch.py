@@ -0,0 +1,311 @@
+import asyncio
+import json
+import sys
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlparse
+
+from ..utils import build_stats_data_url, concat_stats_dfs, fetch_all_stats_data_pages, instrumented, lazy_import, \
+    plan_stats_data_chunks
+from .stats_catalog import StatsCatalog
+from .stats_query_validator import StatsQueryValidator
+
+pd = lazy_import("pandas")
+
+# 統計データ取得ジョブ（StatsDataの引数に対応する）
+StatsDataJob = namedtuple(
+    "StatsDataJob", [
+        "stats_table_id", "areas", "class_codes", "years"])
+
+
+def _split_codes(value):
+    """カンマ区切り文字列またはリストをコードのリストに変換する
+
+    Args:
+        value (Union[str, list]): カンマ区切り文字列またはリスト
+
+    Returns:
+        list: コードのリスト
+
+    Notes:
+        csvの空欄（dtype=strでもNaNになる）やNoneは空のリストとして扱う
+
+    """
+    if isinstance(value, str):
+        return [v.strip() for v in value.split(",") if v.strip()]
+    if isinstance(value, (list, tuple)):
+        return [str(v) for v in value]
+    if value is None or pd.isna(value):
+        return []
+    return [str(value)]
+
+
+def read_stats_data_jobs(path):
+    """ジョブ定義ファイルを読み込みStatsDataJobのリストを返す
+
+    Args:
+        path (str): .csvまたは.json/.jsonlのジョブ定義ファイルのパス文字列
+
+    Returns:
+        list: StatsDataJobのリスト
+
+    Notes:
+        各ジョブはstats_table_id, areas, class_codes, yearsを持つ。
+        areas, class_codes, yearsはカンマ区切り文字列かリストで指定する
+
+    """
+    file_path = Path(path)
+    if file_path.suffix == ".csv":
+        records = pd.read_csv(
+            str(file_path.resolve()), encoding="utf-8", dtype=str).to_dict("records")
+    elif file_path.suffix == ".json":
+        with file_path.open(encoding="utf-8") as file:
+            records = json.load(file)
+    elif file_path.suffix == ".jsonl":
+        with file_path.open(encoding="utf-8") as file:
+            records = [json.loads(line) for line in file if line.strip()]
+    else:
+        print("ジョブ定義ファイルは.csv, .json, .jsonlのみ対応しています。システムを終了します。")
+        sys.exit(1)
+
+    try:
+        return [StatsDataJob(str(r["stats_table_id"]),
+                             _split_codes(r["areas"]),
+                             _split_codes(r["class_codes"]),
+                             _split_codes(r["years"])) for r in records]
+    except KeyError:
+        print("ジョブにはstats_table_id, areas, class_codes, yearsを指定してください。システムを終了します。")
+        sys.exit(1)
+
+
+class HostRateLimiter:
+    """ホストごとにリクエストの送信間隔を制限するクラス"""
+
+    def __init__(self, requests_per_second):
+        """イニシャライザ
+
+        Args:
+            requests_per_second (float): 1ホストあたりの秒間リクエスト数の上限（0以下なら無制限）
+
+        """
+        self.interval = 1 / requests_per_second if requests_per_second > 0 else 0
+        self._locks = {}
+        self._next_times = {}
+
+    async def wait(self, url):
+        """URLのホストに対して送信可能になるまで待機する
+
+        Args:
+            url (str): リクエスト先のURL
+
+        """
+        if not self.interval:
+            return
+        host = urlparse(url).netloc
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            next_time = self._next_times.get(host, now)
+            if next_time > now:
+                await asyncio.sleep(next_time - now)
+            self._next_times[host] = max(now, next_time) + self.interval
+
+
+class StatsDataBatch:
+    """複数の統計データ取得ジョブを並行して実行するクラス"""
+
+    def __init__(
+            self,
+            app_id,
+            jobs,
+            max_concurrency=8,
+            requests_per_second=5.0,
+            typed=False,
+            validation=None,
+            catalog=None):
+        """イニシャライザ
+
+        Args:
+            app_id (str): e-statAPIのAPIkey
+            jobs (list): StatsDataJobのリスト
+            max_concurrency (int): 同時に実行するリクエスト数の上限
+            requests_per_second (float): 1ホストあたりの秒間リクエスト数の上限
+            typed (bool): Trueならvalueを数値（特殊記号はvalue_markerに記録）、コード等をカテゴリにする
+            validation (str): リクエスト前の取得条件の検証（None：検証しない、prune：存在しないコードを除く、
+                strict：存在しないコードがあれば終了する）
+            catalog (StatsCatalog): 検証に使う分類事項を格納したカタログ（Noneならデフォルトのパスのカタログ）
+
+        """
+        self.app_id = app_id
+        self.jobs = list(jobs)
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+        self.typed = typed
+        self.validation = validation
+        self.catalog = catalog
+        # ジョブ番号ごとの1組み合わせあたりのデータ件数の見積もり（検証しない場合は空）
+        self._rows_per_combination = {}
+        # メタ情報を取得できず、検証できないため実行しないジョブ番号
+        self._skipped_jobs = set()
+        self._validated = False
+
+    def validate_jobs(self):
+        """全ジョブの取得条件をリクエスト前に検証し、存在しないコードを除いたジョブに置き換える
+
+        Returns:
+            list: 検証したStatsDataJobのリスト
+
+        Notes:
+            カタログに未格納の統計表のメタ情報はまとめて並行して取得する。
+            メタ情報を取得できない統計表のジョブは、validation="prune"なら実行せず、
+            validation="strict"なら統計データを1件もリクエストせずに終了する（1ジョブのエラーで他のジョブを止めないよう、
+            メタ情報はprefetch_metaの結果のみを使い、バッチの中でStatsMetaDataから取得し直さない）。
+            validation="strict"ならいずれかのジョブに存在しないコードがあれば、統計データを1件もリクエストせずに終了する
+
+        """
+        if not self.validation or self._validated:
+            return self.jobs
+        catalog = self.catalog if self.catalog is not None else StatsCatalog(self.app_id)
+        errors = catalog.prefetch_meta([job.stats_table_id for job in self.jobs], self.max_concurrency)["errors"]
+        failed = {job.stats_table_id: errors.get(job.stats_table_id, "分類事項が格納されていません")
+                  for job in self.jobs
+                  if job.stats_table_id in errors or catalog.class_codes_by_object(job.stats_table_id) is None}
+        if failed:
+            detail = "、".join(f"{table_id}（{error}）" for table_id, error in failed.items())
+            if self.validation == "strict":
+                print(f"メタ情報を取得できない統計表があります：{detail}。システムを終了します。")
+                sys.exit(1)
+            print(f"メタ情報を取得できない統計表のジョブを除外します：{detail}。")
+
+        validated_jobs = []
+        for index, job in enumerate(self.jobs):
+            if job.stats_table_id in failed:
+                self._skipped_jobs.add(index)
+                validated_jobs.append(job)
+                continue
+            query = StatsQueryValidator(self.app_id, job.stats_table_id, catalog).validate(
+                job.areas, job.class_codes, job.years, self.validation)
+            self._rows_per_combination[index] = query.rows_per_combination if query.estimated_rows else 0
+            validated_jobs.append(job._replace(areas=query.areas, class_codes=query.class_codes, years=query.years))
+        self.jobs = validated_jobs
+        self._validated = True
+        return self.jobs
+
+    def _job_urls(self, index, job):
+        """ジョブの統計データ取得URLを生成する
+
+        Args:
+            index (int): ジョブの番号
+            job (StatsDataJob): 統計データ取得ジョブ
+
+        Returns:
+            list: 統計データ取得APIのURLのリスト（上限を超える条件は分割される。有効なコードが無ければ空）
+
+        """
+        rows_per_combination = self._rows_per_combination.get(index, 1)
+        if not rows_per_combination:
+            return []
+        return [build_stats_data_url(self.app_id, job.stats_table_id, *chunk)
+                for chunk in plan_stats_data_chunks(
+                    self.app_id, job.stats_table_id, job.areas, job.class_codes, job.years,
+                    rows_per_combination=rows_per_combination)]
+
+    def _fetch_df(self, url):
+        """統計表をAPIから全ページ取得して、データフレームとして返す（スレッド内で実行）
+
+        Args:
+            url (str): 統計データ取得APIのURL
+
+        Returns:
+            pd.DataFrame: 統計表のデータフレーム
+
+        Notes:
+            StatsData._fetch_stats_dfと同じ処理なので、逐次取得と同じ結果になる
+
+        """
+        return fetch_all_stats_data_pages(url, typed=self.typed)
+
+    async def _fetch_chunk(self, url, semaphore, executor):
+        """1リクエストを同時実行数とレート制限の範囲内で実行する
+
+        Args:
+            url (str): 統計データ取得APIのURL
+            semaphore (asyncio.Semaphore): 同時実行数を制限するセマフォ
+            executor (ThreadPoolExecutor): リクエストを実行するスレッドプール
+
+        Returns:
+            pd.DataFrame: 統計表のデータフレーム
+
+        """
+        async with semaphore:
+            await self.rate_limiter.wait(url)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, self._fetch_df, url)
+
+    async def _run_job(self, index, job, semaphore, executor):
+        """1ジョブの分割したリクエストを並行して実行し、結合する
+
+        Args:
+            index (int): ジョブの番号
+            job (StatsDataJob): 統計データ取得ジョブ
+            semaphore (asyncio.Semaphore): 同時実行数を制限するセマフォ
+            executor (ThreadPoolExecutor): リクエストを実行するスレッドプール
+
+        Returns:
+            tuple: (ジョブの番号, ジョブ, 統計表のデータフレーム)
+
+        """
+        dfs = await asyncio.gather(
+            *[self._fetch_chunk(url, semaphore, executor) for url in self._job_urls(index, job)])
+        df = concat_stats_dfs(dfs)
+        return index, job, df
+
+    async def iter_results(self):
+        """完了した順にジョブの結果を返す非同期ジェネレータ
+
+        Yields:
+            tuple: (ジョブの番号, ジョブ, 統計表のデータフレーム)
+
+        Notes:
+            検証でメタ情報を取得できなかったジョブは実行せず、結果も返さない（ジョブの番号はジョブ定義の順のまま）
+
+        """
+        self.validate_jobs()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            tasks = [asyncio.ensure_future(self._run_job(i, job, semaphore, executor))
+                     for i, job in enumerate(self.jobs) if i not in self._skipped_jobs]
+            try:
+                for task in asyncio.as_completed(tasks):
+                    yield await task
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    async def run(self):
+        """全ジョブを実行し、ジョブ順に結合したデータフレームを返す
+
+        Returns:
+            pd.DataFrame: 全ジョブの統計表を結合したデータフレーム（stats_table_idカラム付き）
+
+        """
+        results = [result async for result in self.iter_results()]
+        results.sort(key=lambda result: result[0])
+        dfs = [df.assign(stats_table_id=job.stats_table_id)
+               for _, job, df in results]
+        df = concat_stats_dfs(dfs)
+        if self.typed and "stats_table_id" in df.columns:
+            df["stats_table_id"] = df["stats_table_id"].astype("category")
+        return df
+
+    @instrumented("stats_data_batch.fetch")
+    def fetch(self):
+        """同期的に全ジョブを実行して結合したデータフレームを返す
+
+        Returns:
+            pd.DataFrame: 全ジョブの統計表を結合したデータフレーム
+
+        """
+        return asyncio.run(self.run())
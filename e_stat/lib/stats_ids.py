@@ -1,10 +1,8 @@
 import sys
 from pathlib import Path
 
-import pandas as pd
-
-from ..utils import csv_file_to_df, csv_string_to_df, df_to_flatten_d_list, extraction_df, get_api_response, \
-    output_csv_from_df, stats_res_formatter, validation_stats_url
+from ..utils import api_endpoint_url, df_to_flatten_d_list, extraction_df, instrumented, output_csv_from_df, \
+    read_asset_df, read_section_csv, validation_stats_url
 
 
 class StatsIds:
@@ -31,21 +29,19 @@ class StatsIds:
         # 取得する政府統計コード
         self.gov_stats_code = gov_stats_code
 
-        # 政府統計コード一覧
+        # 政府統計コード一覧（初めて参照した時に読み込む）
         self.__gov_stats_codes_csv_path = "./e_stat/assets/government_statistics_codes.tsv"
-        self.gov_stats_codes_df: pd.DataFrame = self._read_gov_stats_codes_tsv(
-            self.__gov_stats_codes_csv_path, "shift-jis")
+        self.__gov_stats_codes_df = None
         self.__necessary_columns = necessary_columns
-        self.gov_stats_codes_dict = self._gov_stats_codes_to_dict()
+        self.__gov_stats_codes_dict = None
 
         # 統計表ID一覧
         # デフォルトでGISで扱いやすい社会・人口統計体系（00200502）のデータフレームを生成する
-        self.__stats_table_ids_url = f"http://api.e-stat.go.jp/rest/3.0/app/getSimpleStatsList" \
+        self.__stats_table_ids_url = f"{api_endpoint_url('getSimpleStatsList')}" \
                                      f"?appId={self.app_id}&lang=J&statsCode={self.gov_stats_code}" \
                                      f"&searchKind=1&explanationGetFlg=N"
         self.__default_stats_table_ids_csv = "./e_stat/assets/default_stats_table_ids.csv"
-        self.default_stats_table_ids_df = csv_file_to_df(
-            self.__default_stats_table_ids_csv)
+        self.__default_stats_table_ids_df = None
 
         self.stats_table_ids_df = self._create_stats_table_ids_df()
 
@@ -62,6 +58,28 @@ class StatsIds:
         else:
             print("stats_urlにはe-statのURLを入力してください。")
 
+    @property
+    def gov_stats_codes_df(self):
+        """政府統計コード一覧のデータフレーム（初めて参照した時に読み込む）"""
+        if self.__gov_stats_codes_df is None:
+            self.__gov_stats_codes_df = self._read_gov_stats_codes_tsv(
+                self.__gov_stats_codes_csv_path, "shift-jis")
+        return self.__gov_stats_codes_df
+
+    @property
+    def gov_stats_codes_dict(self):
+        """政府統計コードの名称とコードの辞書のリスト（初めて参照した時に生成する）"""
+        if self.__gov_stats_codes_dict is None:
+            self.__gov_stats_codes_dict = self._gov_stats_codes_to_dict()
+        return self.__gov_stats_codes_dict
+
+    @property
+    def default_stats_table_ids_df(self):
+        """デフォルトの統計表ID一覧のデータフレーム（初めて参照した時に読み込む）"""
+        if self.__default_stats_table_ids_df is None:
+            self.__default_stats_table_ids_df = read_asset_df(self.__default_stats_table_ids_csv)
+        return self.__default_stats_table_ids_df
+
     """政府統計コード"""
 
     def _read_gov_stats_codes_tsv(self, path, encoding):
@@ -73,10 +91,13 @@ class StatsIds:
         Returns:
             pd.DataFrame: pandasのデータフレーム
 
+        Notes:
+            build-assetsでバンドルを作成済みならバンドルから読み込む
+
         """
         file_path = Path(path)
         resolve_path_str = str(file_path.resolve())
-        return pd.read_table(resolve_path_str, encoding=encoding, dtype=str)
+        return read_asset_df(resolve_path_str, encoding, sep="\t")
 
     def _gov_stats_codes_to_dict(self):
         """政府統計コードの名称とコードを辞書のリストで取得する
@@ -95,6 +116,7 @@ class StatsIds:
 
     """統計表ID一覧"""
 
+    @instrumented("stats_ids.fetch")
     def _create_stats_table_ids_df(self):
         """統計表ID一覧をAPIから取得して、データフレームとして返す
 
@@ -102,10 +124,8 @@ class StatsIds:
             pd.DataFrame: 統計表情報一覧のデータフレーム
 
         """
-        res = get_api_response(self.__stats_table_ids_url)
-        row_text = res.text
-        csv_str = self._stats_table_ids_res_formatting(row_text)
-        df = csv_string_to_df(csv_str)
+        # レスポンスを受信しながら"STAT_INF"セクションのcsvを解析する
+        df = read_section_csv(self.__stats_table_ids_url, "STAT_INF")
         self.stats_table_ids_df = df
         return df
 
@@ -163,16 +183,3 @@ class StatsIds:
 
         """
         return self.default_stats_table_ids_df if self.stats_table_ids_df is None else self.stats_table_ids_df
-
-    def _stats_table_ids_res_formatting(self, text):
-        """統計表ID一覧取得APIのcsv風のレスポンスの先頭を削除してcsv形式の文字列を返す
-
-        Args:
-            text (str): 統計表ID一覧取得APIのcsv風のレスポンス
-
-        Returns:
-            str: 統計表ID一覧取得APIのcsv部分のみを抽出した文字列
-
-        """
-        pettern_row_text = r'.*"STAT_INF"\n(.*)'
-        return stats_res_formatter(text, pettern_row_text)
@@ -1,18 +1,23 @@
 import sys
 
-from ..utils import csv_string_to_df, df_to_flatten_d_list, extraction_df, get_api_response, output_csv_from_df, \
-    stats_res_formatter
+from ..utils import api_endpoint_url, df_to_flatten_d_list, extraction_df, instrumented, output_csv_from_df, \
+    read_section_csv
 
 
 class StatsMetaData:
     """統計表情報の詳細情報（メタデータ）を取り扱うクラス"""
 
-    def __init__(self, app_id, stats_table_id):
+    def __init__(self, app_id, stats_table_id, catalog=None):
         """イニシャライザ
 
         Args:
             app_id (str): e-statAPIのAPIkey
             stats_table_id (str): 取得したい統計情報の統計表ID
+            catalog (StatsCatalog): 分類事項を格納するカタログ（Noneなら常にAPIから取得する）
+
+        Notes:
+            catalogを指定すると、格納済み（meta-prefetch等で取得済み）の統計表はAPIにリクエストせずにカタログから読み込み、
+            未格納の統計表はAPIから取得してカタログに格納する
 
         """
         # api_key
@@ -20,11 +25,13 @@ class StatsMetaData:
 
         # 統計情報
         self.stats_data_id = stats_table_id
-        self.default_url = f"http://api.e-stat.go.jp/rest/3.0/app/getSimpleMetaInfo" \
+        self.catalog = catalog
+        self.default_url = f"{api_endpoint_url('getSimpleMetaInfo')}" \
                            f"?appId={self.app_id}" \
                            f"&lang=J&statsDataId={self.stats_data_id}&explanationGetFlg=N"
         self.stats_meta_data_df = self._create_stats_meta_data_df()
 
+    @instrumented("stats_meta_data.fetch")
     def _create_stats_meta_data_df(self):
         """統計表ID一覧をAPIから取得して、データフレームとして返す
 
@@ -32,26 +39,18 @@ class StatsMetaData:
             pd.DataFrame: 統計表情報一覧のデータフレーム
 
         """
-        res = get_api_response(self.default_url)
-        row_text = res.text
-        csv_str = self._stats_meta_data_res_formatting(row_text)
-        df = csv_string_to_df(csv_str)
+        if self.catalog is not None:
+            df = self.catalog.class_inf_df(self.stats_data_id)
+            if df is not None:
+                self.stats_meta_data_df = df
+                return df
+        # レスポンスを受信しながら"CLASS_INF"セクションのcsvを解析する
+        df = read_section_csv(self.default_url, "CLASS_INF")
+        if self.catalog is not None:
+            self.catalog.store_class_inf(self.stats_data_id, df)
         self.stats_meta_data_df = df
         return df
 
-    def _stats_meta_data_res_formatting(self, text):
-        """統計表ID一覧取得APIのcsv風のレスポンスの先頭を削除してcsv形式の文字列を返す
-
-        Args:
-            text (str): 統計表ID一覧取得APIのcsv風のレスポンス
-
-        Returns:
-            str: 統計表ID一覧取得APIのcsv部分のみを抽出した文字列
-
-        """
-        pattern_row_text = r'.*"CLASS_INF"\n(.*)'
-        return stats_res_formatter(text, pattern_row_text)
-
     def to_dict(
             self,
             columns=[
@@ -0,0 +1,107 @@
+import sys
+from collections import namedtuple
+
+from .stats_catalog import StatsCatalog
+from .stats_meta_data import StatsMetaData
+
+# 検証の方法（prune：存在しないコードを除いて取得する、strict：存在しないコードがあればリクエストせずに終了する）
+VALIDATION_MODES = ("prune", "strict")
+# 統計データ取得APIの絞り込み条件と分類事項IDの対応（cdArea, cdCat01, cdTime）
+_DIMENSION_CLASS_OBJ_IDS = {"areas": "area", "class_codes": "cat01", "years": "time"}
+_DIMENSION_NAMES = {"areas": "地域", "class_codes": "項目", "years": "年度"}
+
+# 検証結果（areas, class_codes, yearsは存在するコードのみ。invalidは条件ごとの存在しないコードの辞書）
+ValidatedQuery = namedtuple(
+    "ValidatedQuery", [
+        "areas", "class_codes", "years", "invalid", "rows_per_combination", "estimated_rows"])
+
+
+def _time_code(year):
+    """年度を統計データ取得APIの時間軸コードに変換する（build_stats_data_urlと同じ規則）"""
+    return f"{year}100000"
+
+
+class StatsQueryValidator:
+    """カタログに格納した統計表の分類事項（CLASS_INF）で、統計データの取得条件をリクエスト前に検証するクラス"""
+
+    def __init__(self, app_id, stats_table_id, catalog=None):
+        """イニシャライザ
+
+        Args:
+            app_id (str): e-statAPIのAPIkey
+            stats_table_id (str): 統計表ID
+            catalog (StatsCatalog): 分類事項を格納したカタログ（Noneならデフォルトのパスのカタログ）
+
+        Notes:
+            カタログに未格納の統計表はメタ情報をAPIから1回だけ取得してカタログに格納する
+
+        """
+        self.app_id = app_id
+        self.stats_table_id = stats_table_id
+        self.catalog = catalog if catalog is not None else StatsCatalog(app_id)
+        if self.catalog.class_codes_by_object(stats_table_id) is None:
+            StatsMetaData(app_id, stats_table_id, catalog=self.catalog)
+        self.class_codes_by_object = self.catalog.class_codes_by_object(stats_table_id) or {}
+
+    def rows_per_combination(self):
+        """地域・項目・年度の1組み合わせあたりのデータ件数の見積もりを返す
+
+        Returns:
+            int: 取得条件で絞り込まない分類事項（表章項目・cat02等）のコード数の積
+
+        """
+        rows = 1
+        for class_obj_id, codes in self.class_codes_by_object.items():
+            if class_obj_id not in _DIMENSION_CLASS_OBJ_IDS.values():
+                rows *= max(1, len(codes))
+        return rows
+
+    def validate(self, areas, class_codes, years, mode="prune"):
+        """取得条件の標準地域コード・項目コード・年度を統計表の分類事項と照合する
+
+        Args:
+            areas (list): 標準地域コードのリスト
+            class_codes (list): 統計表メタデータのクラスコードのリスト
+            years (list): データを取得したい年度のリスト
+            mode (str): VALIDATION_MODESの値
+
+        Returns:
+            ValidatedQuery: 存在するコードのみの取得条件と見積もりのデータ件数
+
+        Notes:
+            統計表に分類事項（例: 地域の無い統計表のarea）が無い条件は照合しない。
+            見積もりのデータ件数は全ての組み合わせに値がある場合の上限で、空の条件は統計表の全コードとして数える。
+            mode="strict"で存在しないコードがある場合は、リクエストせずにシステムを終了する
+
+        """
+        requested = {"areas": [str(a) for a in areas], "class_codes": [str(c) for c in class_codes],
+                     "years": [str(y) for y in years]}
+        valid, invalid = {}, {}
+        for dimension, codes in requested.items():
+            known = self.class_codes_by_object.get(_DIMENSION_CLASS_OBJ_IDS[dimension])
+            if known is None:
+                valid[dimension] = codes
+                continue
+            known = set(known)
+            to_code = _time_code if dimension == "years" else str
+            valid[dimension] = [code for code in codes if to_code(code) in known]
+            if len(valid[dimension]) < len(codes):
+                invalid[dimension] = [code for code in codes if to_code(code) not in known]
+
+        if invalid:
+            detail = "、".join(
+                f"{_DIMENSION_NAMES[dimension]}={','.join(codes)}" for dimension, codes in invalid.items())
+            if mode == "strict":
+                print(f"統計表{self.stats_table_id}に存在しないコードが指定されています（{detail}）。システムを終了します。")
+                sys.exit(1)
+            print(f"統計表{self.stats_table_id}に存在しないコードを除外します（{detail}）。")
+
+        rows_per_combination = self.rows_per_combination()
+        estimated_rows = rows_per_combination
+        for dimension, codes in valid.items():
+            if requested[dimension]:
+                estimated_rows *= len(codes)
+            else:
+                estimated_rows *= max(1, len(self.class_codes_by_object.get(_DIMENSION_CLASS_OBJ_IDS[dimension], [])))
+        return ValidatedQuery(valid["areas"], valid["class_codes"], valid["years"], invalid,
+                              rows_per_combination, estimated_rows)
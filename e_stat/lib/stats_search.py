@@ -0,0 +1,155 @@
+from ..utils import NGRAM_SIZE, lazy_import, normalize_text, text_ngrams
+
+pd = lazy_import("pandas")
+
+# 検索対象の種類（table：統計表題・政府統計名、class：分類事項の名称）
+SEARCH_KINDS = ("table", "class")
+
+
+def create_search_tables(conn):
+    """n-gramの転置索引のテーブルを作成する
+
+    Args:
+        conn (sqlite3.Connection): カタログへの接続
+
+    Notes:
+        search_docsに検索対象の文書（統計表題・分類事項の名称）を、search_gramsにn-gramごとの文書IDを格納する
+
+    """
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS search_docs (doc_id INTEGER PRIMARY KEY, TABLE_INF TEXT, KIND TEXT, "
+        "CLASS_OBJ_ID TEXT, CLASS_CODE TEXT, TEXT TEXT, NORMALIZED TEXT)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_search_docs_table ON search_docs (TABLE_INF, KIND)")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS search_grams (gram TEXT, doc_id INTEGER, PRIMARY KEY (gram, doc_id)) "
+        "WITHOUT ROWID")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_search_grams_doc ON search_grams (doc_id)")
+
+
+def delete_documents(conn, table_ids, kind):
+    """統計表の文書を索引から削除する
+
+    Args:
+        conn (sqlite3.Connection): カタログへの接続
+        table_ids (list): 統計表IDのリスト
+        kind (str): 検索対象の種類（SEARCH_KINDSの値）
+
+    """
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS target_tables (TABLE_INF TEXT PRIMARY KEY)")
+    conn.execute("DELETE FROM target_tables")
+    conn.executemany("INSERT OR IGNORE INTO target_tables VALUES (?)", ((table_id,) for table_id in table_ids))
+    doc_ids = "SELECT doc_id FROM search_docs WHERE KIND = ? AND TABLE_INF IN (SELECT TABLE_INF FROM target_tables)"
+    conn.execute(f"DELETE FROM search_grams WHERE doc_id IN ({doc_ids})", (kind,))
+    conn.execute(f"DELETE FROM search_docs WHERE doc_id IN ({doc_ids})", (kind,))
+
+
+def index_documents(conn, documents):
+    """文書をn-gramに分割して索引に追加する
+
+    Args:
+        conn (sqlite3.Connection): カタログへの接続
+        documents (iterable): (統計表ID, 種類, 分類事項ID, 分類コード, 文字列)のタプル
+
+    Returns:
+        int: 追加した文書数
+
+    """
+    docs = []
+    for table_id, kind, class_obj_id, class_code, text in documents:
+        normalized = normalize_text(text)
+        if normalized:
+            docs.append((table_id, kind, class_obj_id, class_code, text, normalized))
+    if not docs:
+        return 0
+    # 文書IDを先に割り当て、文書とn-gramをそれぞれまとめて挿入する
+    first_id = conn.execute("SELECT COALESCE(MAX(doc_id), 0) + 1 FROM search_docs").fetchone()[0]
+    conn.executemany(
+        "INSERT INTO search_docs (doc_id, TABLE_INF, KIND, CLASS_OBJ_ID, CLASS_CODE, TEXT, NORMALIZED) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)", ((first_id + i, *doc) for i, doc in enumerate(docs)))
+    conn.executemany("INSERT OR IGNORE INTO search_grams VALUES (?, ?)",
+                     ((gram, first_id + i) for i, doc in enumerate(docs) for gram in text_ngrams(doc[-1])))
+    return len(docs)
+
+
+def _rarest_gram(conn, term, cap=10000):
+    """検索語のn-gramのうち、含む文書が最も少ないものを返す
+
+    Args:
+        conn (sqlite3.Connection): カタログへの接続
+        term (str): 正規化した検索語（n文字以上）
+        cap (int): 文書数を数える上限（頻出するn-gramを全件数えないため）
+
+    Returns:
+        str: n-gram
+
+    """
+    return min(sorted(text_ngrams(term)), key=lambda gram: conn.execute(
+        "SELECT COUNT(*) FROM (SELECT 1 FROM search_grams WHERE gram = ? LIMIT ?)", (gram, cap)).fetchone()[0])
+
+
+def _term_hits_query(conn, index, term):
+    """検索語を含む文書を返すSELECT文とパラメータを返す
+
+    Args:
+        conn (sqlite3.Connection): カタログへの接続
+        index (int): 検索語の番号
+        term (str): 正規化した検索語
+
+    Returns:
+        tuple: (SELECT文, パラメータのリスト)
+
+    Notes:
+        含む文書が最も少ないn-gramで候補を絞り込み、実際に検索語を含むかをinstrで確認する。
+        n文字未満の検索語は索引を使わずに全文書を走査する
+
+    """
+    select = f"SELECT {index} AS term, d.TABLE_INF, d.KIND FROM search_docs d"
+    if len(term) < NGRAM_SIZE:
+        return f"{select} WHERE instr(d.NORMALIZED, ?) > 0", [term]
+    return (f"{select} WHERE d.doc_id IN (SELECT doc_id FROM search_grams WHERE gram = ?) "
+            f"AND instr(d.NORMALIZED, ?) > 0", [_rarest_gram(conn, term), term])
+
+
+def search_documents(conn, query, limit=20):
+    """検索語（空白区切りで複数指定するとAND検索）に一致する統計表と分類事項を検索する
+
+    Args:
+        conn (sqlite3.Connection): カタログへの接続
+        query (str): 検索語
+        limit (int): 返す統計表の最大件数
+
+    Returns:
+        pd.DataFrame: TABLE_INF, STAT_NAME, TITLE, MATCHED_CLASSES（一致した分類事項の`{分類事項ID}:{分類コード} {名称}`の
+            リスト）, SCOREのデータフレーム（SCOREの降順）
+
+    Notes:
+        各検索語が統計表題・政府統計名またはいずれかの分類事項の名称に含まれる統計表を返す。
+        統計表題に一致した検索語が多いほどSCOREが高い。集計と並べ替えはSQLiteで行い、上位の統計表のみ分類事項を取得する
+
+    """
+    terms = list(dict.fromkeys(normalize_text(term) for term in query.split()))
+    terms = [term for term in terms if term]
+    columns = ["TABLE_INF", "STAT_NAME", "TITLE", "MATCHED_CLASSES", "SCORE"]
+    if not terms:
+        return pd.DataFrame(columns=columns)
+
+    queries, params = zip(*(_term_hits_query(conn, i, term) for i, term in enumerate(terms)))
+    ranked = conn.execute(
+        f"SELECT h.TABLE_INF, t.STAT_NAME, t.TITLE, "
+        f"COUNT(DISTINCT CASE WHEN h.KIND = 'table' THEN h.term END) * 2 + MAX(h.KIND = 'class') AS score "
+        f"FROM ({' UNION ALL '.join(queries)}) h LEFT JOIN stats_tables t ON h.TABLE_INF = t.TABLE_INF "
+        f"GROUP BY h.TABLE_INF HAVING COUNT(DISTINCT h.term) = ? ORDER BY score DESC, h.TABLE_INF LIMIT ?",
+        [*(p for term_params in params for p in term_params), len(terms), limit]).fetchall()
+
+    matched_classes = {}
+    if ranked:
+        table_placeholders = ", ".join("?" * len(ranked))
+        term_conditions = " OR ".join(["instr(NORMALIZED, ?) > 0"] * len(terms))
+        for table_id, class_obj_id, class_code, text in conn.execute(
+                f"SELECT TABLE_INF, CLASS_OBJ_ID, CLASS_CODE, TEXT FROM search_docs "
+                f"WHERE TABLE_INF IN ({table_placeholders}) AND KIND = 'class' AND ({term_conditions}) "
+                f"ORDER BY doc_id", [row[0] for row in ranked] + terms):
+            matched_classes.setdefault(table_id, []).append(f"{class_obj_id}:{class_code} {text}")
+    rows = [[table_id, stat_name, title, matched_classes.get(table_id, []), score]
+            for table_id, stat_name, title, score in ranked]
+    return pd.DataFrame(rows, columns=columns)
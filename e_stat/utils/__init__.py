@@ -1,3 +1,18 @@
+from .asset_bundle import *
+from .coverage_dissolve import *
+from .csv_stream import *
 from .df_utils import *
 from .e_stat_utils import *
+from .file_download import *
 from .gdf_geojson import *
+from .http_client import *
+from .instrumentation import *
+from .lazy_import import *
+from .query_planner import *
+from .response_cache import *
+from .stats_pages import *
+from .stats_pivot import *
+from .stats_schema import *
+from .text_ngram import *
+from .topology_simplify import *
+from .writers import *
@@ -0,0 +1,357 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+
+from .lazy_import import lazy_import
+
+pd = lazy_import("pandas")
+
+# アセットバンドルのファイル名（アセットと同じディレクトリに置く）
+ASSET_BUNDLE_FILE_NAME = "assets.bin"
+# バンドルの形式のバージョン（形式を変更したら上げる。異なるバンドルは使わずに元ファイルを読み込む）
+ASSET_BUNDLE_VERSION = 1
+ASSET_BUNDLE_MAGIC = b"ESTATAB\x00"
+DEFAULT_ASSET_DIR = "./e_stat/assets"
+# バンドルするアセット：ファイル名をキー、(形式, エンコーディング)を値とする辞書
+BUNDLED_ASSETS = {
+    "standard_area_codes.csv": ("csv", "shift-jis"),
+    "government_statistics_codes.tsv": ("tsv", "shift-jis"),
+    "default_stats_table_ids.csv": ("csv", "utf-8"),
+    "pref_code.json": ("json", "utf-8"),
+}
+
+# ヘッダー：マジックナンバー、バージョン、目録(json)のバイト数
+_HEADER = struct.Struct("<8sII")
+# 列の値の区切り文字（アセットの値には含まれない）
+_VALUE_SEPARATOR = "\x00"
+
+# バンドルのパスをキー、開いたAssetBundleを値とする辞書
+_opened_bundles = {}
+_opened_bundles_lock = threading.Lock()
+
+
+def _source_stat(path):
+    """アセットの元ファイルのサイズと更新日時を返す
+
+    Args:
+        path (Path): 元ファイルのパス
+
+    Returns:
+        list: [サイズ, 更新日時(ns)]
+
+    """
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _source_sha256(path):
+    """アセットの元ファイルのsha256を返す
+
+    Args:
+        path (Path): 元ファイルのパス
+
+    Returns:
+        str: sha256の16進文字列
+
+    """
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _read_source_columns(path, kind, encoding):
+    """表形式のアセットの元ファイルをpandasで読み込み、カラムごとの値のリストに変換する
+
+    Args:
+        path (Path): 元ファイルのパス
+        kind (str): csvまたはtsv
+        encoding (str): 元ファイルのエンコーディング
+
+    Returns:
+        dict: カラム名をキー、値(str、欠損値はNone)のリストを値とする辞書
+
+    """
+    sep = "\t" if kind == "tsv" else ","
+    df = pd.read_csv(str(path.resolve()), sep=sep, encoding=encoding, dtype=str)
+    return {column: [None if pd.isna(value) else value for value in df[column]] for column in df.columns}
+
+
+def _encode_column(values):
+    """カラムの値を欠損値のマスクとNUL区切りのutf-8に変換する
+
+    Args:
+        values (list): 値(str、欠損値はNone)のリスト
+
+    Returns:
+        tuple: (欠損値マスク, 値のバイト列)
+
+    """
+    if any(value is not None and _VALUE_SEPARATOR in value for value in values):
+        raise ValueError("アセットの値にNUL文字が含まれています。")
+    null_mask = bytes(1 if value is None else 0 for value in values)
+    data = _VALUE_SEPARATOR.join("" if value is None else value for value in values).encode("utf-8")
+    return null_mask, data
+
+
+def build_asset_bundle(asset_dir=DEFAULT_ASSET_DIR):
+    """アセット（標準地域コード・政府統計コード等）をメモリマップ可能なバイナリ形式にまとめる
+
+    Args:
+        asset_dir (str): アセットを格納したディレクトリのパス文字列
+
+    Returns:
+        Path: 書き出したバンドルのパス
+
+    Notes:
+        形式：ヘッダー(マジックナンバー・バージョン・目録のバイト数)、目録(json)、データ部。
+        目録には元ファイルのサイズ・更新日時・sha256と、データ部の各カラムの位置を記録する。
+        表形式のアセットはカラムごとに欠損値マスクとNUL区切りのutf-8で格納し、読み込み時は必要なカラムのみ復元する
+
+    """
+    asset_path = Path(asset_dir)
+    entries = {}
+    chunks = []
+    offset = 0
+    for file_name, (kind, encoding) in BUNDLED_ASSETS.items():
+        source_path = asset_path / file_name
+        if not source_path.is_file():
+            continue
+        entry = {
+            "kind": kind,
+            "stat": _source_stat(source_path),
+            "sha256": _source_sha256(source_path),
+        }
+        if kind == "json":
+            data = json.dumps(json.loads(source_path.read_text(encoding=encoding)),
+                              ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            entry["data"] = [offset, len(data)]
+            chunks.append(data)
+            offset += len(data)
+        else:
+            columns = _read_source_columns(source_path, kind, encoding)
+            entry["rows"] = len(next(iter(columns.values()), []))
+            entry["columns"] = []
+            for column, values in columns.items():
+                null_mask, data = _encode_column(values)
+                entry["columns"].append([column, offset, len(null_mask), len(data)])
+                chunks.extend((null_mask, data))
+                offset += len(null_mask) + len(data)
+        entries[file_name] = entry
+
+    directory = json.dumps(entries, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    bundle_path = asset_path / ASSET_BUNDLE_FILE_NAME
+    tmp_path = bundle_path.with_suffix(".tmp")
+    with tmp_path.open("wb") as file:
+        file.write(_HEADER.pack(ASSET_BUNDLE_MAGIC, ASSET_BUNDLE_VERSION, len(directory)))
+        file.write(directory)
+        for chunk in chunks:
+            file.write(chunk)
+    os.replace(tmp_path, bundle_path)
+    with _opened_bundles_lock:
+        _opened_bundles.pop(str(bundle_path.resolve()), None)
+    print(f"{bundle_path.resolve()}を書き出しました。")
+    return bundle_path
+
+
+class AssetBundle:
+    """build_asset_bundleで作成したバンドルをメモリマップして読み込むクラス"""
+
+    def __init__(self, path):
+        """イニシャライザ
+
+        Args:
+            path (Path): バンドルのパス
+
+        Raises:
+            ValueError: バンドルの形式・バージョンが異なる場合
+
+        """
+        self.path = Path(path)
+        with self.path.open("rb") as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, directory_size = _HEADER.unpack_from(self._buffer, 0)
+        if magic != ASSET_BUNDLE_MAGIC or version != ASSET_BUNDLE_VERSION:
+            self._buffer.close()
+            raise ValueError(f"{self.path}は対応していない形式のバンドルです。")
+        self._data_offset = _HEADER.size + directory_size
+        self.entries = json.loads(self._buffer[_HEADER.size:self._data_offset].decode("utf-8"))
+
+    def _slice(self, offset, size):
+        """データ部の指定範囲のバイト列を返す
+
+        Args:
+            offset (int): データ部の先頭からの位置
+            size (int): バイト数
+
+        Returns:
+            bytes: バイト列
+
+        """
+        start = self._data_offset + offset
+        return self._buffer[start:start + size]
+
+    def is_fresh(self, source_path):
+        """バンドル内のアセットが元ファイルと一致するかチェック
+
+        Args:
+            source_path (Path): 元ファイルのパス
+
+        Returns:
+            bool: バンドルに含まれていて、元ファイルが更新されていなければTrue
+
+        Notes:
+            サイズ・更新日時が一致しなければ（git checkout等）sha256で比較する
+
+        """
+        entry = self.entries.get(source_path.name)
+        if entry is None:
+            return False
+        if not source_path.is_file():
+            return True
+        if _source_stat(source_path) == entry["stat"]:
+            return True
+        return _source_sha256(source_path) == entry["sha256"]
+
+    def read_json(self, file_name):
+        """jsonのアセットを読み込む
+
+        Args:
+            file_name (str): アセットのファイル名
+
+        Returns:
+            object: jsonを変換したオブジェクト
+
+        """
+        offset, size = self.entries[file_name]["data"]
+        return json.loads(self._slice(offset, size).decode("utf-8"))
+
+    def read_columns(self, file_name, columns=None):
+        """表形式のアセットをカラムごとに読み込む
+
+        Args:
+            file_name (str): アセットのファイル名
+            columns (list): 読み込むカラム名（Noneなら全カラム）
+
+        Returns:
+            dict: カラム名をキー、値(str、欠損値はNone)のリストを値とする辞書
+
+        """
+        entry = self.entries[file_name]
+        result = {}
+        for column, offset, mask_size, data_size in entry["columns"]:
+            if columns is not None and column not in columns:
+                continue
+            null_mask = self._slice(offset, mask_size)
+            values = self._slice(offset + mask_size, data_size).decode("utf-8").split(_VALUE_SEPARATOR)
+            if entry["rows"] == 0:
+                values = []
+            result[column] = [None if is_null else value for is_null, value in zip(null_mask, values)]
+        return result
+
+
+def _open_bundle(asset_dir):
+    """アセットディレクトリのバンドルを開く（プロセス内で1度だけ開く）
+
+    Args:
+        asset_dir (Path): アセットを格納したディレクトリ
+
+    Returns:
+        Union[AssetBundle, None]: バンドルが無い・形式が異なる場合はNone
+
+    """
+    bundle_path = str((asset_dir / ASSET_BUNDLE_FILE_NAME).resolve())
+    with _opened_bundles_lock:
+        if bundle_path not in _opened_bundles:
+            try:
+                _opened_bundles[bundle_path] = AssetBundle(bundle_path)
+            except (OSError, ValueError, struct.error):
+                _opened_bundles[bundle_path] = None
+        return _opened_bundles[bundle_path]
+
+
+def _fresh_bundle(source_path):
+    """元ファイルに対応する最新のバンドルを返す
+
+    Args:
+        source_path (Path): 元ファイルのパス
+
+    Returns:
+        Union[AssetBundle, None]: 使用できるバンドルが無ければNone
+
+    """
+    bundle = _open_bundle(source_path.parent)
+    if bundle is None or not bundle.is_fresh(source_path):
+        return None
+    return bundle
+
+
+def read_asset_columns(path, encoding="utf-8", sep=",", columns=None):
+    """表形式のアセットを読み込む（バンドルがあればバンドルから、なければ元ファイルから）
+
+    Args:
+        path (str): 元ファイル（csv/tsv）のパス文字列
+        encoding (str): 元ファイルのエンコーディング
+        sep (str): 元ファイルの区切り文字
+        columns (list): 読み込むカラム名（Noneなら全カラム）
+
+    Returns:
+        dict: カラム名をキー、値(str、欠損値はNone)のリストを値とする辞書
+
+    """
+    source_path = Path(path)
+    bundle = _fresh_bundle(source_path)
+    if bundle is not None:
+        return bundle.read_columns(source_path.name, columns)
+    source_columns = _read_source_columns(source_path, "tsv" if sep == "\t" else "csv", encoding)
+    if columns is None:
+        return source_columns
+    return {column: values for column, values in source_columns.items() if column in columns}
+
+
+def read_asset_df(path, encoding="utf-8", sep=","):
+    """表形式のアセットをデータフレームとして読み込む（pd.read_csv(path, dtype=str)と同じ結果を返す）
+
+    Args:
+        path (str): 元ファイル（csv/tsv）のパス文字列
+        encoding (str): 元ファイルのエンコーディング
+        sep (str): 元ファイルの区切り文字
+
+    Returns:
+        pd.DataFrame: アセットのデータフレーム
+
+    """
+    return asset_columns_to_df(read_asset_columns(path, encoding, sep))
+
+
+def asset_columns_to_df(columns):
+    """read_asset_columnsの結果をデータフレームに変換する
+
+    Args:
+        columns (dict): カラム名をキー、値のリストを値とする辞書
+
+    Returns:
+        pd.DataFrame: 欠損値をNaNとしたデータフレーム
+
+    """
+    return pd.DataFrame(columns, dtype=object).fillna(value=float("nan"))
+
+
+def read_asset_json(path, encoding="utf-8"):
+    """jsonのアセットを読み込む（バンドルがあればバンドルから、なければ元ファイルから）
+
+    Args:
+        path (str): 元ファイルのパス文字列
+        encoding (str): 元ファイルのエンコーディング
+
+    Returns:
+        object: jsonを変換したオブジェクト
+
+    """
+    source_path = Path(path)
+    bundle = _fresh_bundle(source_path)
+    if bundle is not None:
+        return bundle.read_json(source_path.name)
+    with source_path.open(encoding=encoding) as file:
+        return json.load(file)
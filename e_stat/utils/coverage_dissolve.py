@@ -0,0 +1,162 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from .lazy_import import lazy_import
+
+gpd = lazy_import("geopandas")
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+shapely = lazy_import("shapely")
+shapely_ops = lazy_import("shapely.ops")
+shapely_wkb = lazy_import("shapely.wkb")
+
+# dissolveの方式（geopandas：GeoDataFrame.dissolve、coverage：重なりの無いポリゴン群として結合）
+DISSOLVE_ENGINES = ("geopandas", "coverage")
+
+
+def group_positions(keys):
+    """キーの値ごとに行位置をまとめる
+
+    Args:
+        keys (pd.Series): グループのキーのSeries
+
+    Returns:
+        tuple: (昇順に並べたキーのリスト, キーごとの行位置の配列のリスト)
+
+    Notes:
+        1度の安定ソートとキーの境目の検出でグループを作るため、キーごとに全行を走査しない。
+        欠損値のキーはGeoDataFrame.dissolveと同様に除く
+
+    """
+    positions = np.flatnonzero(keys.notna().values)
+    if not len(positions):
+        return [], []
+    values = np.asarray(keys.values[positions], dtype=object)
+    order = np.argsort(values, kind="stable")
+    sorted_values = values[order]
+    sorted_positions = positions[order]
+    starts = np.flatnonzero(sorted_values[1:] != sorted_values[:-1]) + 1
+    return list(sorted_values[np.r_[0, starts]]), np.split(sorted_positions, starts)
+
+
+def coverage_union(geometries):
+    """重なりの無いポリゴン群（小地域の境界等）を1つのジオメトリに結合する
+
+    Args:
+        geometries (list): ポリゴンのリスト
+
+    Returns:
+        shapely.geometry.base.BaseGeometry: 結合したジオメトリ
+
+    Notes:
+        shapely2系ではcoverage_union_all（共有辺を打ち消すだけで交差判定を行わない）を使用し、
+        結果が不正なジオメトリになった場合（ポリゴン同士が重なっていた等）はunary_unionで結合し直す。
+        shapely1系ではunary_unionで結合する
+
+    """
+    if hasattr(shapely, "coverage_union_all"):
+        merged = shapely.coverage_union_all(geometries)
+        if merged.is_valid:
+            return merged
+    return shapely_ops.unary_union(list(geometries))
+
+
+def _to_wkb(geometries):
+    """ジオメトリのリストをWKBのリストに変換する（プロセス間の受け渡し用）
+
+    Args:
+        geometries (list): ジオメトリのリスト
+
+    Returns:
+        list: WKB(bytes)のリスト
+
+    Notes:
+        shapelyのジオメトリをそのままpickleするよりWKBの方が数倍速い
+
+    """
+    if hasattr(shapely, "to_wkb"):
+        return list(shapely.to_wkb(np.asarray(geometries, dtype=object)))
+    return [geometry.wkb for geometry in geometries]
+
+
+def _from_wkb(wkbs):
+    """WKBのリストをジオメトリのリストに変換する
+
+    Args:
+        wkbs (list): WKB(bytes)のリスト
+
+    Returns:
+        list: ジオメトリのリスト
+
+    """
+    if hasattr(shapely, "from_wkb"):
+        return list(shapely.from_wkb(np.asarray(wkbs, dtype=object)))
+    return [shapely_wkb.loads(wkb) for wkb in wkbs]
+
+
+def _coverage_union_wkb_groups(groups):
+    """プロセスプール内で複数グループのジオメトリを結合する
+
+    Args:
+        groups (list): グループごとのポリゴンのWKBのリストのリスト
+
+    Returns:
+        list: グループごとの結合したジオメトリのWKBのリスト
+
+    """
+    return _to_wkb([coverage_union(_from_wkb(wkbs)) for wkbs in groups])
+
+
+def _split_balanced(groups, parts):
+    """グループのリストをポリゴン数が均等になるように分割する
+
+    Args:
+        groups (list): (グループの位置, ポリゴンのリスト)のリスト
+        parts (int): 分割数
+
+    Returns:
+        list: 分割したグループのリストのリスト
+
+    """
+    batches = [[] for _ in range(parts)]
+    sizes = [0] * parts
+    for group in sorted(groups, key=lambda g: len(g[1]), reverse=True):
+        smallest = sizes.index(min(sizes))
+        batches[smallest].append(group)
+        sizes[smallest] += len(group[1])
+    return [batch for batch in batches if batch]
+
+
+def coverage_dissolve(gdf, column, workers=1):
+    """重なりの無いポリゴン群のgdfを指定カラムの値ごとに結合する
+
+    Args:
+        gdf (gpd.GeoDataFrame): 小地域の境界等、ポリゴン同士が重ならないgdf
+        column (str): キーとなるカラムの名称
+        workers (int): 結合を行うプロセス数（1ならプロセスプールを使用しない）
+
+    Returns:
+        gpd.GeoDataFrame: GeoDataFrame.dissolve(by=column)と同じ形（キーがインデックス、ジオメトリが先頭カラム、
+            その他のカラムはグループ内の最初の値）のgdf
+
+    """
+    keys, positions = group_positions(gdf[column])
+    geometry_values = np.asarray(gdf.geometry.values)
+    groups = [geometry_values[group] for group in positions]
+
+    if workers > 1 and len(groups) > 1:
+        batches = _split_balanced(list(enumerate(groups)), workers)
+        merged = [None] * len(groups)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_coverage_union_wkb_groups,
+                                   [[_to_wkb(geometries) for _, geometries in batch] for batch in batches])
+            for batch, batch_merged in zip(batches, results):
+                for (index, _), geometry in zip(batch, _from_wkb(batch_merged)):
+                    merged[index] = geometry
+    else:
+        merged = [coverage_union(geometries) for geometries in groups]
+
+    geometry_name = gdf.geometry.name
+    index = pd.Index(keys, name=column)
+    data = gdf.drop(columns=geometry_name).groupby(column).first()
+    dissolved = gpd.GeoDataFrame({geometry_name: merged}, index=index, geometry=geometry_name, crs=gdf.crs)
+    return dissolved.join(data)
@@ -0,0 +1,100 @@
+import sys
+
+from .df_utils import open_api_response
+from .instrumentation import span
+from .lazy_import import lazy_import
+from .response_cache import normalize_request_url
+
+pd = lazy_import("pandas")
+
+# 1チャンクあたりの行数
+CSV_CHUNK_ROWS = 50000
+
+
+def read_until_section(stream, section_name):
+    """e-statAPIのcsv風のレスポンスを、指定セクションの見出し行まで読み進める
+
+    Args:
+        stream (io.TextIOBase): レスポンスのテキストストリーム
+        section_name (str): セクション名（例: VALUE, STAT_INF, CLASS_INF）
+
+    Returns:
+        tuple: (見出し行より前のセクションヘッダ部分の文字列, 見出し行が見つかればTrue)
+
+    Notes:
+        見出し行が見つかった場合、streamは見出し行の直後（csvのヘッダ行）まで読み進めた状態になる
+
+    """
+    section_line = f'"{section_name}"'
+    header_lines = []
+    for line in iter(stream.readline, ""):
+        if line.rstrip("\r\n") == section_line:
+            return "".join(header_lines), True
+        header_lines.append(line)
+    return "".join(header_lines), False
+
+
+def iter_csv_chunks(stream, chunk_rows=CSV_CHUNK_ROWS):
+    """テキストストリームのcsvを指定行数ずつデータフレームに変換するジェネレータ
+
+    Args:
+        stream (io.TextIOBase): csvのヘッダ行の位置まで読み進めたテキストストリーム
+        chunk_rows (int): 1チャンクあたりの行数
+
+    Yields:
+        pd.DataFrame: 全カラムをstrとしたデータフレーム
+
+    Notes:
+        ストリームから逐次読み込むため、メモリ使用量は1チャンク分に抑えられる
+
+    """
+    try:
+        reader = pd.read_csv(stream, dtype=str, chunksize=chunk_rows)
+    except pd.errors.EmptyDataError:
+        return
+    try:
+        yield from reader
+    finally:
+        reader.close()
+
+
+def iter_section_csv_chunks(url, section_name, chunk_rows=CSV_CHUNK_ROWS):
+    """e-statAPIのcsv風のレスポンスから指定セクションのcsvを逐次データフレームに変換するジェネレータ
+
+    Args:
+        url (str): e-statAPIのURL
+        section_name (str): セクション名（例: STAT_INF, CLASS_INF）
+        chunk_rows (int): 1チャンクあたりの行数
+
+    Yields:
+        pd.DataFrame: 全カラムをstrとしたデータフレーム
+
+    """
+    with span(f"api.{section_name}", url=normalize_request_url(url)) as s, open_api_response(url) as stream:
+        _, found = read_until_section(stream, section_name)
+        if not found:
+            print("レスポンスの文字列を整形できません。システムを終了します。")
+            sys.exit(1)
+        for df in iter_csv_chunks(stream, chunk_rows):
+            s.add(rows=len(df))
+            yield df
+
+
+def read_section_csv(url, section_name, chunk_rows=CSV_CHUNK_ROWS):
+    """e-statAPIのcsv風のレスポンスから指定セクションのcsvをデータフレームとして読み込む
+
+    Args:
+        url (str): e-statAPIのURL
+        section_name (str): セクション名（例: STAT_INF, CLASS_INF）
+        chunk_rows (int): 1チャンクあたりの行数
+
+    Returns:
+        pd.DataFrame: 全カラムをstrとしたデータフレーム
+
+    """
+    chunks = list(iter_section_csv_chunks(url, section_name, chunk_rows))
+    if not chunks:
+        return pd.DataFrame()
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks, ignore_index=True)
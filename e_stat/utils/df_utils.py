@@ -1,21 +1,90 @@
 import io
 from pathlib import Path
 
-import pandas as pd
-import requests
+from .http_client import http_get
+from .instrumentation import current_span
+from .lazy_import import lazy_import
+from .response_cache import ResponseCacheWriter, open_cached_response_body
 
+pd = lazy_import("pandas")
 
-def get_api_response(url):
-    """URLを指定してレスポンスオブジェクトを返す
+# レスポンスボディを逐次読み込む単位（バイト）
+RESPONSE_CHUNK_SIZE = 1024 * 1024
+
+
+class _ChunkReader(io.RawIOBase):
+    """バイト列のイテレータを読み込み可能なファイルオブジェクトとして扱うクラス"""
+
+    def __init__(self, chunks, on_close=None):
+        """イニシャライザ
+
+        Args:
+            chunks (iterator): バイト列のイテレータ
+            on_close (function): close時に呼び出す関数
+
+        """
+        super().__init__()
+        self._chunks = chunks
+        self._on_close = on_close
+        self._buffer = memoryview(b"")
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while not self._buffer:
+            try:
+                self._buffer = memoryview(next(self._chunks))
+            except StopIteration:
+                return 0
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def close(self):
+        if not self.closed and self._on_close is not None:
+            self._on_close()
+        super().close()
+
+
+def open_api_response(url, chunk_size=RESPONSE_CHUNK_SIZE, refresh=False):
+    """URLを指定してレスポンスボディを逐次読み込むテキストストリームを返す
 
     Args:
         url (str): URL
+        chunk_size (int): レスポンスボディを読み込む単位（バイト）
+        refresh (bool): Trueならキャッシュを参照せずにリクエストし、キャッシュを更新する
 
     Returns:
-        Response: レスポンスオブジェクト
+        io.TextIOWrapper: レスポンスボディのテキストストリーム（改行は変換しない）
+
+    Notes:
+        レスポンス全体をメモリに載せずに読み込む。キャッシュがあればキャッシュのファイルを読み込み、
+        なければ受信しながらキャッシュに書き込む（最後まで読み込んだ場合のみ保存される）
 
     """
-    return requests.get(url)
+    cached = None if refresh else open_cached_response_body(url)
+    if cached is not None:
+        file, encoding = cached
+        return io.TextIOWrapper(file, encoding=encoding or "utf-8", newline="")
+
+    res = http_get(url, stream=True)
+    writer = ResponseCacheWriter(url, res)
+
+    def _chunks():
+        for chunk in res.iter_content(chunk_size=chunk_size):
+            writer.write(chunk)
+            current_span().add(bytes=len(chunk))
+            yield chunk
+        writer.commit()
+
+    def _close():
+        writer.discard()
+        res.close()
+
+    reader = io.BufferedReader(_ChunkReader(_chunks(), _close), buffer_size=chunk_size)
+    return io.TextIOWrapper(reader, encoding=res.encoding or "utf-8", newline="")
 
 
 def extraction_df(df, columns):
@@ -71,10 +140,7 @@ def csv_string_to_df(csv_str):
         pd.DataFrame: csv形式の文字列オブジェクトを変換したdf
 
     """
-    return pd.read_csv(
-        io.StringIO(csv_str),
-        encoding="shift-jis",
-        dtype=str)
+    return pd.read_csv(io.StringIO(csv_str), dtype=str)
 
 
 def output_csv_from_df(df, path, file_name):
@@ -1,8 +1,12 @@
+import csv
 import re
 import sys
 from urllib.parse import urlparse
 
-import requests
+from .http_client import api_endpoint_url, http_head
+from .lazy_import import lazy_import
+
+requests = lazy_import("requests")
 
 
 def stats_res_formatter(text, pattern_row_text):
@@ -39,10 +43,99 @@ def validation_stats_url(url):
         return False
     if not len(urlparse(url).scheme) > 0:
         return False
-    if not urlparse(url).netloc == "api.e-stat.go.jp":
+    # api_base_urlでローカルの代替サーバーを指定している場合はそのホストも許可する
+    allowed_netlocs = {"api.e-stat.go.jp", urlparse(api_endpoint_url("")).netloc}
+    if urlparse(url).netloc not in allowed_netlocs:
         return False
     try:
-        requests.head(url)
+        http_head(url)
     except requests.exceptions.MissingSchema:
         return False
     return True
+
+
+def build_stats_data_url(app_id, stats_table_id, areas, class_codes, years):
+    """統計データ取得API（getSimpleStatsData）のURLを生成する
+
+    Args:
+        app_id (str): e-statAPIのAPIkey
+        stats_table_id (str): 取得したい統計情報の統計表ID
+        areas (list): 標準地域コードのリスト
+        class_codes (list): 統計表メタデータのクラスコードのリスト
+        years (list): データを取得したい年度のリスト
+
+    Returns:
+        str: 統計データ取得APIのURL
+
+    Notes:
+        ページングのためにNEXT_KEYを読めるよう、セクションヘッダ付き（sectionHeaderFlg=1）で取得する
+
+    """
+    joined_areas = ",".join(areas)
+    joined_class_codes = ",".join(class_codes)
+    joined_years = ",".join([str(y) + "100000" for y in years])
+    return f"{api_endpoint_url('getSimpleStatsData')}" \
+        f"?appId={app_id}" \
+        f"&cdArea={joined_areas}" \
+        f"&cdCat01={joined_class_codes}" \
+        f"&cdTime={joined_years}" \
+        f"&statsDataId={stats_table_id}" \
+        f"&lang=J&metaGetFlg=N&cntGetFlg=N&explanationGetFlg=N&annotationGetFlg=N&sectionHeaderFlg=1"
+
+
+def section_header_value(header_text, column_name):
+    """セクションヘッダ部分から指定カラムの値を取得する
+
+    Args:
+        header_text (str): "VALUE"セクションより前のレスポンス文字列
+        column_name (str): 取得したいカラム名（例: NEXT_KEY, STATUS）
+
+    Returns:
+        Union[str, None]: カラムの値。存在しなければNone
+
+    """
+    rows = list(csv.reader(header_text.splitlines()))
+    for row, next_row in zip(rows, rows[1:]):
+        if column_name in row:
+            index = row.index(column_name)
+            return next_row[index] if index < len(next_row) and next_row[index] else None
+    return None
+
+
+def check_stats_data_status(header_text):
+    """"VALUE"セクションが無い統計データ取得APIのレスポンスのSTATUSを確認する
+
+    Args:
+        header_text (str): レスポンスのセクションヘッダ部分の文字列
+
+    Notes:
+        該当データが無い（STATUS=1）場合は何もせず、それ以外のエラーは異常終了する
+
+    """
+    status = section_header_value(header_text, "STATUS")
+    if status == "1":
+        return
+    error_message = section_header_value(header_text, "ERROR_MSG")
+    print(f"統計データを取得できませんでした。STATUS={status}, ERROR_MSG={error_message}。システムを終了します。")
+    sys.exit(1)
+
+
+def split_stats_data_response(text):
+    """統計データ取得APIのセクションヘッダ付きレスポンスをcsv部分とNEXT_KEYに分割する
+
+    Args:
+        text (str): 統計データ取得APIのcsv風のレスポンス
+
+    Returns:
+        tuple: ("VALUE"セクションのcsv形式の文字列, NEXT_KEY（最終ページならNone）)
+
+    Notes:
+        該当データが無い（STATUS=1）場合は空文字列を返す
+
+    """
+    match = re.search(r'^"VALUE"\r?\n', text, re.M)
+    if match is None:
+        check_stats_data_status(text)
+        return "", None
+    header_text = text[:match.start()]
+    return text[match.end():], section_header_value(header_text, "NEXT_KEY")
@@ -0,0 +1,325 @@
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+from .http_client import http_get, http_head
+from .instrumentation import span
+from .lazy_import import lazy_import
+
+tqdm = lazy_import("tqdm")
+
+# ダウンロード時の書き込み単位（バイト）
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# ダウンロード状態（ファイル名・ETag・Last-Modified・サイズ・チェックサム）を格納するディレクトリ名
+DOWNLOAD_STATE_DIR = ".download_state"
+
+
+def file_name_from_response(url, response):
+    """responseのContent-Dispositionからファイル名を取得、できなければURLの末尾をファイル名として返す
+
+    Args:
+        url (str): リクエストのURL
+        response (Response): responseオブジェクト
+
+    Returns:
+        str: ファイル名を返す
+
+    """
+    disposition = response.headers.get("Content-Disposition", "")
+    try:
+        file_name = re.findall(r"filename.+''(.+)", disposition)[0]
+    except IndexError:
+        print("ファイル名が取得できませんでした")
+        file_name = os.path.basename(url)
+    return file_name
+
+
+def file_sha256(path, chunk_size=DOWNLOAD_CHUNK_SIZE):
+    """ファイルのsha256を計算する
+
+    Args:
+        path (Path): ファイルのパス
+        chunk_size (int): 読み込み単位（バイト）
+
+    Returns:
+        str: sha256の16進文字列
+
+    """
+    digest = hashlib.sha256()
+    with path.open("rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _state_path(parent_dir, url):
+    """URLに対応するダウンロード状態ファイルのパスを返す
+
+    Args:
+        parent_dir (Path): ダウンロード先ディレクトリ
+        url (str): ダウンロードリンク
+
+    Returns:
+        Path: ダウンロード状態ファイルのパス
+
+    """
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return parent_dir / DOWNLOAD_STATE_DIR / f"{key}.json"
+
+
+def _read_state(state_path):
+    """ダウンロード状態を読み込む
+
+    Args:
+        state_path (Path): ダウンロード状態ファイルのパス
+
+    Returns:
+        dict: ダウンロード状態（存在しなければ空の辞書）
+
+    """
+    try:
+        with state_path.open(encoding="utf-8") as file:
+            return json.load(file)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _write_state(state_path, state):
+    """ダウンロード状態を一時ファイル経由で書き込む
+
+    Args:
+        state_path (Path): ダウンロード状態ファイルのパス
+        state (dict): ダウンロード状態
+
+    """
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = state_path.with_suffix(".tmp")
+    with tmp_path.open("w", encoding="utf-8") as file:
+        json.dump(state, file, ensure_ascii=False)
+    os.replace(tmp_path, state_path)
+
+
+def _is_valid_local_copy(download_path, state):
+    """ローカルのファイルが前回ダウンロードしたものと一致するかチェック
+
+    Args:
+        download_path (Path): ダウンロードファイルのパス
+        state (dict): ダウンロード状態
+
+    Returns:
+        bool: ファイルが存在しサイズが一致すればTrue
+
+    Notes:
+        実行のたびにファイル全体のチェックサムを計算しないよう、ダウンロード完了時に記録したサイズと比較する。
+        サーバー側の更新はETag/Last-Modifiedによる条件付きリクエストで確認する
+
+    """
+    return "size" in state and download_path.is_file() and download_path.stat().st_size == state["size"]
+
+
+def _validator_headers(state):
+    """ETag・Last-Modifiedから条件付きリクエスト用の値を返す
+
+    Args:
+        state (dict): ダウンロード状態
+
+    Returns:
+        str: If-RangeやIf-None-Matchに使う値（なければNone）
+
+    """
+    return state.get("etag") or state.get("last_modified")
+
+
+def _head_download_path(url, parent_dir):
+    """HEADリクエストのContent-Dispositionからダウンロードファイルのパスを取得する
+
+    Args:
+        url (str): ダウンロードリンク
+        parent_dir (Path): ダウンロード先ディレクトリ
+
+    Returns:
+        Union[Path, None]: ダウンロードファイルのパス。HEADリクエストに失敗した場合はNone
+
+    """
+    res = http_head(url, allow_redirects=True)
+    if res.status_code != 200:
+        return None
+    return parent_dir / file_name_from_response(url, res)
+
+
+def _unsatisfiable_range_total(response):
+    """416レスポンスのContent-Range（bytes */全体のサイズ）からファイル全体のサイズを取得する
+
+    Args:
+        response (Response): responseオブジェクト
+
+    Returns:
+        Union[int, None]: ファイル全体のサイズ。取得できなければNone
+
+    """
+    match = re.fullmatch(r"bytes \*/(\d+)", response.headers.get("Content-Range", ""))
+    return int(match.group(1)) if match else None
+
+
+def _finish_download(part_path, download_path, state_path, state, sha256, expected_sha256):
+    """.partファイルのチェックサムを確認して置き換え、ダウンロード状態を記録する
+
+    Args:
+        part_path (Path): .partファイルのパス
+        download_path (Path): ダウンロードファイルのパス
+        state_path (Path): ダウンロード状態ファイルのパス
+        state (dict): ファイル名・ETag・Last-Modifiedのダウンロード状態
+        sha256 (str): .partファイルのsha256
+        expected_sha256 (str): 期待するsha256（Noneなら確認しない）
+
+    Returns:
+        Path: ダウンロードファイルのパスオブジェクト
+
+    """
+    if expected_sha256 is not None and sha256 != expected_sha256:
+        part_path.unlink()
+        print("ダウンロードしたファイルのチェックサムが一致しません。システムを終了します。")
+        sys.exit(1)
+
+    size = part_path.stat().st_size
+    os.replace(part_path, download_path)
+    _write_state(state_path, {**state, "size": size, "sha256": sha256})
+    return download_path
+
+
+def download_file(
+        url,
+        dir_path,
+        overwrite=True,
+        chunk_size=DOWNLOAD_CHUNK_SIZE,
+        expected_sha256=None):
+    """URLと保存先ディレクトリを指定してファイルをダウンロード
+
+    Args:
+        url (str): ダウンロードリンク
+        dir_path (str): 保存するディレクトリのパス文字列
+        overwrite (bool): ファイル上書きオプション。Trueなら上書き（サーバー側が更新されていなければ再取得しない）
+        chunk_size (int): 書き込み単位（バイト）
+        expected_sha256 (str): 期待するsha256。指定した場合は一致しなければ異常終了
+
+    Returns:
+        Path: ダウンロードファイルのパスオブジェクト
+
+    Notes:
+        - overwrite=Falseなら、前回のダウンロード状態（無ければHEADリクエストのファイル名）から
+          ローカルのファイルを確認し、存在すればGETリクエストをせずにファイルパスを返す
+        - overwrite=TrueならETag/Last-Modifiedで条件付きリクエストを行い、更新がなければ再取得しない
+        - 中断した.partファイルがあればRangeリクエストで続きから取得する（取得済みなら416を完了として扱う）
+        - .partファイルに書き込み、完了後に置き換えるので途中で中断しても壊れたファイルは残らない
+
+    """
+    parent_dir = Path(dir_path)
+    parent_dir.mkdir(parents=True, exist_ok=True)
+    state_path = _state_path(parent_dir, url)
+    state = _read_state(state_path)
+
+    download_path = parent_dir / state["file_name"] if "file_name" in state else None
+    if download_path is None and not overwrite:
+        download_path = _head_download_path(url, parent_dir)
+        if download_path is not None and download_path.exists():
+            print("ファイルがすでに存在し、overwrite=Falseなのでダウンロードを中止します。")
+            return download_path
+    if download_path is not None and _is_valid_local_copy(download_path, state):
+        if not overwrite:
+            print("ファイルがすでに存在し、overwrite=Falseなのでダウンロードを中止します。")
+            return download_path
+    else:
+        # ローカルのファイルが無い・壊れている場合は条件付きリクエストにしない
+        state.pop("size", None)
+
+    headers = {}
+    validator = _validator_headers(state)
+    part_path = download_path.with_name(download_path.name + ".part") if download_path else None
+    resume_from = part_path.stat().st_size if part_path is not None and part_path.is_file() else 0
+    if resume_from and validator:
+        headers["Range"] = f"bytes={resume_from}-"
+        headers["If-Range"] = validator
+    elif "size" in state:
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            headers["If-Modified-Since"] = state["last_modified"]
+
+    res = http_get(url, stream=True, headers=headers)
+    print(f"{url=}, {res.status_code=}")
+
+    if res.status_code == 304:
+        print("サーバー上のファイルが更新されていないため、ダウンロードを中止します。")
+        res.close()
+        return download_path
+
+    if res.status_code == 416 and resume_from:
+        res.close()
+        if _unsatisfiable_range_total(res) == resume_from:
+            print(f"{download_path.name}は取得済みのため、ダウンロードを完了します。")
+            return _finish_download(
+                part_path, download_path, state_path,
+                {"file_name": download_path.name, "etag": state.get("etag"),
+                 "last_modified": state.get("last_modified")},
+                file_sha256(part_path, chunk_size), expected_sha256)
+        # .partファイルがサーバー上のファイルより大きい場合は削除し、再実行時は最初から取得する
+        part_path.unlink()
+        print("中断したダウンロードを再開できませんでした。再実行すると最初から取得します。システムを終了します。")
+        sys.exit(1)
+
+    if res.status_code not in (200, 206):
+        print("正常にリクエストできませんでした。システムを終了します。")
+        sys.exit(1)
+
+    if download_path is None:
+        # HEADリクエストに対応していない場合は、GETのレスポンスのファイル名で既存のファイルを確認する
+        download_path = parent_dir / file_name_from_response(url, res)
+        part_path = download_path.with_name(download_path.name + ".part")
+        if download_path.exists() and not overwrite:
+            print("ファイルがすでに存在し、overwrite=Falseなのでダウンロードを中止します。")
+            res.close()
+            return download_path
+    if res.status_code == 200:
+        # Rangeが無視された（またはファイルが更新された）場合は最初から取得する
+        resume_from = 0
+
+    state = {
+        "file_name": download_path.name,
+        "etag": res.headers.get("ETag"),
+        "last_modified": res.headers.get("Last-Modified"),
+    }
+    _write_state(state_path, state)
+
+    # content-lengthは必ず存在するわけでは無いためチェック
+    try:
+        file_size = int(res.headers['content-length']) + resume_from
+    except KeyError:
+        file_size = None
+    progress_bar = tqdm.tqdm(total=file_size, initial=resume_from, unit="B", unit_scale=True)
+
+    digest = hashlib.sha256()
+    if resume_from:
+        print(f"{download_path.name}のダウンロードを{resume_from}バイト目から再開します")
+        with part_path.open("rb") as file:
+            for chunk in iter(lambda: file.read(chunk_size), b""):
+                digest.update(chunk)
+    else:
+        print(f"{download_path.name}のダウンロードを開始します")
+
+    with span("download", file_name=download_path.name, resume_from=resume_from) as s, \
+            part_path.open("ab" if resume_from else "wb", buffering=chunk_size) as file:
+        for chunk in res.iter_content(chunk_size=chunk_size):
+            file.write(chunk)
+            digest.update(chunk)
+            progress_bar.update(len(chunk))
+            s.add(bytes=len(chunk))
+    progress_bar.close()
+
+    if file_size is not None and part_path.stat().st_size != file_size:
+        print("ダウンロードしたファイルのサイズが一致しません。再実行すると続きから取得します。システムを終了します。")
+        sys.exit(1)
+    return _finish_download(
+        part_path, download_path, state_path, state, digest.hexdigest(), expected_sha256)
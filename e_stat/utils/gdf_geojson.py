@@ -1,49 +1,87 @@
+import json
 from pathlib import Path
 
-import geojson
-import geopandas as gpd
 
-
-def df_to_geojson(gdf):
-    """gdfから指定されたディレクトリに指定名でGeoJSONを作成する
+def _round_coordinates(coordinates, precision):
+    """座標の入れ子リストの各値を指定桁数で丸める
 
     Args:
-        gdf (gpd.GeoDataFrame): 書き出し元のgdf
+        coordinates (Union[tuple, list, float]): GeoJSONのcoordinates
+        precision (int): 小数点以下の桁数
 
     Returns:
-        str: geojson形式の文字列
+        Union[list, float]: 丸めたcoordinates
 
     """
-    print("gdfをgeojsonに変換します。")
-    return gdf.to_json()
+    if isinstance(coordinates, (tuple, list)):
+        return [_round_coordinates(c, precision) for c in coordinates]
+    return round(coordinates, precision)
+
+
+def _round_geometry(geometry, precision):
+    """GeoJSONのgeometryの座標を指定桁数で丸める
+
+    Args:
+        geometry (dict): GeoJSONのgeometry
+        precision (int): 小数点以下の桁数
 
+    Returns:
+        dict: 座標を丸めたgeometry
 
-def geojson_str_to_obj(geojson_str):
     """
+    if geometry is None:
+        return None
+    if geometry["type"] == "GeometryCollection":
+        return {"type": "GeometryCollection",
+                "geometries": [_round_geometry(g, precision) for g in geometry["geometries"]]}
+    return {"type": geometry["type"],
+            "coordinates": _round_coordinates(geometry["coordinates"], precision)}
+
+
+def _json_default(value):
+    """json.dumpsで変換できない値（numpyのスカラー等）を変換する
 
     Args:
-        geojson_str (str): geojson形式の文字列
+        value (object): 変換対象の値
 
     Returns:
-        geojson.feature.FeatureCollection: geojsonオブジェクト
+        object: jsonに変換可能な値
 
     """
-    return geojson.loads(geojson_str)
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
 
 
-def write_geojson(geojson_obj, output_dir, file_name):
-    """geojsonオブジェクトをファイル出力する
+def write_geojson_stream(gdf, output_dir, file_name, precision=None, indent=None):
+    """gdfを1地物ずつGeoJSONとしてファイル出力する
 
     Args:
-        geojson_obj (geojson): GeoJSONオブジェクト
+        gdf (gpd.GeoDataFrame): 書き出し元のgdf
         output_dir (str): 書き出し先ディレクトリのパス文字列
         file_name (str): 作成するファイルの名称
+        precision (int): 座標の小数点以下の桁数（Noneなら丸めない）
+        indent (int): 各地物のインデント幅（Noneなら改行・空白なしのコンパクトな出力）
+
+    Notes:
+        gdf.to_json()のようにFeatureCollection全体を文字列・オブジェクトとして作らないので、
+        メモリ使用量は1地物分に抑えられる
 
     """
-    output_dit_obj = Path(output_dir)
-    data_path = output_dit_obj / file_name
-    if not output_dit_obj.exists():
-        output_dit_obj.mkdir(parents=True, exist_ok=True)
-    with data_path.open("w") as file:
-        geojson.dump(geojson_obj, file, indent=2, ensure_ascii=False)
-        print(f"{data_path.resolve()}を書き出しました。")
+    output_dir_obj = Path(output_dir)
+    data_path = output_dir_obj / file_name
+    if not output_dir_obj.exists():
+        output_dir_obj.mkdir(parents=True, exist_ok=True)
+
+    separators = (",", ":") if indent is None else (",", ": ")
+    with data_path.open("w", encoding="utf-8") as file:
+        file.write('{"type":"FeatureCollection","features":[')
+        for i, feature in enumerate(gdf.iterfeatures(na="null")):
+            if precision is not None:
+                feature["geometry"] = _round_geometry(feature["geometry"], precision)
+            file.write("," if i else "")
+            file.write("\n")
+            file.write(json.dumps(feature, ensure_ascii=False, indent=indent,
+                                  separators=separators, default=_json_default))
+        file.write("\n]}\n")
+    print(f"{data_path.resolve()}を書き出しました。")
@@ -0,0 +1,175 @@
+import threading
+
+from .instrumentation import span
+from .lazy_import import lazy_import
+from .response_cache import normalize_request_url
+
+requests = lazy_import("requests")
+urllib3 = lazy_import("urllib3")
+
+DEFAULT_API_BASE_URL = "http://api.e-stat.go.jp/rest/3.0/app"
+# 地図で見る統計（統計GIS）の境界データのダウンロードのベースURL
+DEFAULT_STATMAP_BASE_URL = "https://www.e-stat.go.jp/gis/statmap-search"
+
+# 全リクエストで共有するHTTPクライアントの設定
+_http_client_config = {
+    "api_base_url": DEFAULT_API_BASE_URL,
+    "statmap_base_url": DEFAULT_STATMAP_BASE_URL,
+    # (接続タイムアウト, 読み込みタイムアウト)の秒数
+    "timeout": (10, 120),
+    "max_retries": 5,
+    "backoff_factor": 0.5,
+    "status_forcelist": (429, 500, 502, 503, 504),
+    "pool_connections": 10,
+    "pool_maxsize": 32,
+}
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def configure_http_client(**kwargs):
+    """共有HTTPクライアントの設定を変更する
+
+    Args:
+        **kwargs: 変更する設定値（api_base_url, statmap_base_url, timeout, max_retries, backoff_factor,
+            status_forcelist, pool_connections, pool_maxsize）
+
+    Notes:
+        設定を変更すると既存のセッションは閉じられ、次回のリクエスト時に再生成される
+
+    """
+    global _http_session
+    unknown_keys = set(kwargs) - set(_http_client_config)
+    if unknown_keys:
+        raise KeyError(f"不明な設定です: {sorted(unknown_keys)}")
+    with _http_session_lock:
+        _http_client_config.update(
+            {k: v for k, v in kwargs.items() if v is not None})
+        if _http_session is not None:
+            _http_session.close()
+            _http_session = None
+
+
+def http_client_config():
+    """共有HTTPクライアントの現在の設定を返す
+
+    Returns:
+        dict: 設定値の辞書（コピー）
+
+    """
+    return dict(_http_client_config)
+
+
+def _create_http_session():
+    """コネクションプールとリトライを設定したセッションを生成する
+
+    Returns:
+        requests.Session: セッションオブジェクト
+
+    """
+    retry = urllib3.util.Retry(
+        total=_http_client_config["max_retries"],
+        backoff_factor=_http_client_config["backoff_factor"],
+        status_forcelist=_http_client_config["status_forcelist"],
+        respect_retry_after_header=True,
+        # リトライしきった場合は例外ではなく最後のレスポンスを返す
+        raise_on_status=False)
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=_http_client_config["pool_connections"],
+        pool_maxsize=_http_client_config["pool_maxsize"],
+        max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_http_session():
+    """プロセス内で共有するセッションを返す（初回呼び出し時に生成）
+
+    Returns:
+        requests.Session: セッションオブジェクト
+
+    """
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                _http_session = _create_http_session()
+    return _http_session
+
+
+def close_http_session():
+    """共有セッションを閉じてコネクションプールを解放する"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is not None:
+            _http_session.close()
+            _http_session = None
+
+
+def http_get(url, **kwargs):
+    """共有セッションでGETリクエストを送信する
+
+    Args:
+        url (str): URL
+        **kwargs: requests.Session.getに渡す引数
+
+    Returns:
+        Response: レスポンスオブジェクト
+
+    """
+    kwargs.setdefault("timeout", _http_client_config["timeout"])
+    # トレースを共有できるよう、appIdを除いたURLを記録する
+    with span("http.get", url=normalize_request_url(url)) as s:
+        res = get_http_session().get(url, **kwargs)
+        # stream=Trueの場合はヘッダを受信するまでの時間（ボディの転送量は読み込む側で計測する）
+        s.set(status=res.status_code, bytes=None if kwargs.get("stream") else len(res.content))
+    return res
+
+
+def http_head(url, **kwargs):
+    """共有セッションでHEADリクエストを送信する
+
+    Args:
+        url (str): URL
+        **kwargs: requests.Session.headに渡す引数
+
+    Returns:
+        Response: レスポンスオブジェクト
+
+    """
+    kwargs.setdefault("timeout", _http_client_config["timeout"])
+    return get_http_session().head(url, **kwargs)
+
+
+def api_endpoint_url(endpoint):
+    """e-statAPIのエンドポイント名からURLを生成する
+
+    Args:
+        endpoint (str): エンドポイント名（例: getSimpleStatsData）
+
+    Returns:
+        str: エンドポイントのURL
+
+    Notes:
+        api_base_urlを変更するとローカルの代替サーバーに向けることができる
+
+    """
+    return f"{_http_client_config['api_base_url'].rstrip('/')}/{endpoint}"
+
+
+def statmap_url(path):
+    """地図で見る統計（統計GIS）のパスからURLを生成する
+
+    Args:
+        path (str): パス（例: data）
+
+    Returns:
+        str: URL
+
+    Notes:
+        statmap_base_urlを変更するとローカルの代替サーバーに向けることができる
+
+    """
+    return f"{_http_client_config['statmap_base_url'].rstrip('/')}/{path}"
@@ -0,0 +1,320 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+from .lazy_import import lazy_import
+
+cProfile = lazy_import("cProfile")
+pstats = lazy_import("pstats")
+resource = lazy_import("resource")
+tracemalloc = lazy_import("tracemalloc")
+
+# 計測の設定（enabled=Falseならspanは何もしない）
+_instrumentation_config = {
+    "enabled": False,
+    # Trueならinstrumentedを付けたlibのクラスのメソッドをcProfileで計測する
+    "cprofile": False,
+    # Trueならtracemallocでstageごとのpythonのメモリ確保のピークを計測する
+    "tracemalloc": False,
+}
+_spans = []
+_spans_lock = threading.Lock()
+_local = threading.local()
+_profiles = {}
+# 計測開始時刻（Chrome traceのtsの基準）
+_origin = time.perf_counter()
+
+
+def configure_instrumentation(**kwargs):
+    """計測の設定を変更する
+
+    Args:
+        **kwargs: 変更する設定値（enabled, cprofile, tracemalloc）
+
+    Notes:
+        設定を変更すると記録済みのspanは消去される
+
+    """
+    global _origin
+    unknown_keys = set(kwargs) - set(_instrumentation_config)
+    if unknown_keys:
+        raise KeyError(f"不明な設定です: {sorted(unknown_keys)}")
+    with _spans_lock:
+        _instrumentation_config.update(
+            {k: v for k, v in kwargs.items() if v is not None})
+        _spans.clear()
+        _profiles.clear()
+        _origin = time.perf_counter()
+    if _instrumentation_config["enabled"] and _instrumentation_config["tracemalloc"]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+
+def instrumentation_config():
+    """計測の現在の設定を返す
+
+    Returns:
+        dict: 設定値の辞書（コピー）
+
+    """
+    return dict(_instrumentation_config)
+
+
+def _rss_mb():
+    """(現在のRSS, プロセス開始からのピークRSS)をMBで返す（取得できなければ0）"""
+    try:
+        # ru_maxrssはmacOSではバイト、Linuxではキロバイト単位
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 ** 2 if sys.platform == "darwin" else 1024)
+    except ImportError:
+        return 0.0, 0.0
+    try:
+        with open("/proc/self/statm") as f:
+            current = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError):
+        current = peak
+    return current, peak
+
+
+class _NullSpan:
+    """計測が無効な時のspan（何もしない）"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def set(self, **attrs):
+        """何もしない"""
+
+    def add(self, **counts):
+        """何もしない"""
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """処理の1区間（stage）の所要時間・行数・転送量・メモリを記録する"""
+
+    def __init__(self, name, attrs, profile=False):
+        """イニシャライザ
+
+        Args:
+            name (str): stageの名称（例: shp.read, dissolve, http.get）
+            attrs (dict): 記録する属性（rows, bytes等）
+            profile (bool): TrueならcProfileで計測する（cprofileが有効な場合）
+
+        """
+        self.name = name
+        self.attrs = dict(attrs)
+        self.profile = profile
+        self._profiler = None
+        self._child_traced_peak = 0
+
+    def set(self, **attrs):
+        """属性を設定する（例: span.set(rows=len(df))）"""
+        self.attrs.update(attrs)
+
+    def add(self, **counts):
+        """数値の属性に加算する（例: span.add(bytes=len(chunk))）"""
+        for key, value in counts.items():
+            self.attrs[key] = self.attrs.get(key, 0) + value
+
+    def __enter__(self):
+        stack = _local.__dict__.setdefault("stack", [])
+        if _instrumentation_config["tracemalloc"] and tracemalloc.is_tracing():
+            # 親のstageのピークを退避してからピークをリセットする
+            if stack:
+                stack[-1]._child_traced_peak = max(stack[-1]._child_traced_peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        if self.profile and _instrumentation_config["cprofile"] and \
+                not any(span._profiler is not None for span in stack):
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._rss_start = _rss_mb()
+        stack.append(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end = time.perf_counter()
+        stack = getattr(_local, "stack", [])
+        # 途中で破棄されたジェネレータ内のspanは後から閉じられるため、末尾とは限らない
+        if self in stack:
+            stack.remove(self)
+        if self._profiler is not None:
+            self._profiler.disable()
+            with _spans_lock:
+                if self.name in _profiles:
+                    _profiles[self.name].add(self._profiler)
+                else:
+                    _profiles[self.name] = pstats.Stats(self._profiler)
+        rss, peak_rss = _rss_mb()
+        record = {
+            "name": self.name,
+            "start": self._start - _origin,
+            "seconds": end - self._start,
+            "thread": threading.get_ident(),
+            "depth": len(stack),
+            "rss_mb": round(rss, 1),
+            "peak_rss_mb": round(peak_rss, 1),
+            # このstageでプロセスのピークRSSが増えた量
+            "peak_rss_growth_mb": round(peak_rss - self._rss_start[1], 1),
+            "error": exc_type.__name__ if exc_type else None,
+            **self.attrs}
+        if _instrumentation_config["tracemalloc"] and tracemalloc.is_tracing():
+            traced_peak = max(self._child_traced_peak, tracemalloc.get_traced_memory()[1])
+            record["traced_peak_mb"] = round(traced_peak / 1024 ** 2, 1)
+            if stack:
+                stack[-1]._child_traced_peak = max(stack[-1]._child_traced_peak, traced_peak)
+        with _spans_lock:
+            _spans.append(record)
+        return False
+
+
+def span(name, profile=False, **attrs):
+    """処理の区間を計測するコンテキストマネージャを返す
+
+    Args:
+        name (str): stageの名称
+        profile (bool): TrueならcProfileで計測する（cprofileが有効な場合）
+        **attrs: 記録する属性（rows, bytes等）
+
+    Returns:
+        Span: 計測が無効なら何もしないspan
+
+    Notes:
+        with span("shp.read") as s: ... s.set(rows=len(gdf)) のように使う
+
+    """
+    if not _instrumentation_config["enabled"]:
+        return _NULL_SPAN
+    return Span(name, attrs, profile)
+
+
+def current_span():
+    """実行中のスレッドで最も内側のspanを返す
+
+    Returns:
+        Span: 計測が無効またはspanの外なら何もしないspan
+
+    Notes:
+        転送量を数える関数等、spanを受け取らない下位の処理から属性を加算する場合に使う
+
+    """
+    stack = getattr(_local, "stack", None)
+    if not _instrumentation_config["enabled"] or not stack:
+        return _NULL_SPAN
+    return stack[-1]
+
+
+def instrumented(name=None):
+    """関数・メソッドの呼び出しをspanとして計測するデコレータ
+
+    Args:
+        name (str): stageの名称（Noneなら`{クラス名}.{メソッド名}`）
+
+    Returns:
+        function: デコレータ
+
+    Notes:
+        libのクラスの主要なメソッドに付け、cprofileが有効ならcProfileでも計測する
+
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _instrumentation_config["enabled"]:
+                return func(*args, **kwargs)
+            with Span(span_name, {}, profile=True):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def recorded_spans():
+    """記録済みのspanを返す
+
+    Returns:
+        list: spanの辞書のリスト（終了順）
+
+    """
+    with _spans_lock:
+        return list(_spans)
+
+
+def stage_summary():
+    """stageごとに所要時間・行数・転送量・メモリを集計する
+
+    Returns:
+        list: stageごとの集計の辞書のリスト（合計所要時間の降順）
+
+    """
+    summary = {}
+    for record in recorded_spans():
+        stage = summary.setdefault(record["name"], {
+            "name": record["name"], "count": 0, "seconds": 0.0, "rows": 0, "bytes": 0, "peak_rss_mb": 0.0,
+            "peak_rss_growth_mb": 0.0})
+        stage["count"] += 1
+        stage["seconds"] += record["seconds"]
+        stage["rows"] += record.get("rows") or 0
+        stage["bytes"] += record.get("bytes") or 0
+        stage["peak_rss_mb"] = max(stage["peak_rss_mb"], record["peak_rss_mb"])
+        stage["peak_rss_growth_mb"] += record["peak_rss_growth_mb"]
+        if "traced_peak_mb" in record:
+            stage["traced_peak_mb"] = max(stage.get("traced_peak_mb", 0.0), record["traced_peak_mb"])
+    return sorted(summary.values(), key=lambda stage: stage["seconds"], reverse=True)
+
+
+def print_stage_summary():
+    """stageごとの集計を表形式で出力する"""
+    for stage in stage_summary():
+        traced = f" traced_peak={stage['traced_peak_mb']:.1f}MB" if "traced_peak_mb" in stage else ""
+        print(f"{stage['name']:<32} {stage['seconds']:9.3f}s  count={stage['count']:<5} "
+              f"rows={stage['rows']:<9} bytes={stage['bytes']:<11} "
+              f"peak_rss={stage['peak_rss_mb']:.1f}MB(+{stage['peak_rss_growth_mb']:.1f}MB){traced}")
+
+
+def write_trace_report(path):
+    """記録済みのspanをChrome trace形式（chrome://tracing・Perfettoで表示可能）のjsonとして書き出す
+
+    Args:
+        path (str): 書き出すjsonのパス
+
+    Returns:
+        Path: 書き出したjsonのパス
+
+    Notes:
+        stageごとの集計はotherData.stagesに含める。cprofileが有効なら、
+        メソッドごとのcProfileの統計を`{jsonのファイル名}.{stage名}.prof`として同じディレクトリに書き出す
+
+    """
+    report_path = Path(path)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    pid = os.getpid()
+    events = []
+    for record in recorded_spans():
+        args = {k: v for k, v in record.items() if k not in ("name", "start", "seconds", "thread", "depth")}
+        events.append({
+            "name": record["name"], "cat": record["name"].split(".")[0], "ph": "X", "pid": pid,
+            "tid": record["thread"], "ts": round(record["start"] * 1e6, 1), "dur": round(record["seconds"] * 1e6, 1),
+            "args": args})
+        events.append({
+            "name": "rss_mb", "ph": "C", "pid": pid, "ts": round((record["start"] + record["seconds"]) * 1e6, 1),
+            "args": {"rss_mb": record["rss_mb"]}})
+    report = {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"stages": stage_summary()}}
+    with report_path.open("w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False)
+
+    with _spans_lock:
+        profiles = dict(_profiles)
+    for name, stats in profiles.items():
+        stats.dump_stats(str(report_path.with_name(f"{report_path.stem}.{name}.prof")))
+    return report_path
@@ -0,0 +1,57 @@
+import importlib
+import sys
+import threading
+import types
+
+
+class LazyModule(types.ModuleType):
+    """属性に初めてアクセスした時にimportするモジュールの代理オブジェクト"""
+
+    def __init__(self, name):
+        """イニシャライザ
+
+        Args:
+            name (str): 遅延importするモジュール名
+
+        """
+        super().__init__(name)
+        self._lazy_lock = threading.Lock()
+
+    def _load(self):
+        """モジュールをimportして属性をコピーする（複数スレッドから呼ばれても1度だけ実行される）
+
+        Returns:
+            module: importしたモジュール
+
+        """
+        with self._lazy_lock:
+            module = importlib.import_module(self.__name__)
+            # 以降の属性アクセスで__getattr__を経由しないようにコピーする
+            self.__dict__.update(
+                {key: value for key, value in module.__dict__.items() if key != "__name__"})
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name):
+    """importに時間がかかるモジュールを、属性へ初めてアクセスするまでimportしない
+
+    Args:
+        name (str): モジュール名（例: "geopandas"）
+
+    Returns:
+        module: import済みならモジュール、未importならLazyModule
+
+    Notes:
+        `--help`やAPIのみを使うコマンドでgeopandas等の読み込みを省き、起動を速くするために使う。
+        `gpd = lazy_import("geopandas")`のように書けば、以降は通常のモジュールと同じように扱える
+
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
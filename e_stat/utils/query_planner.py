@@ -0,0 +1,90 @@
+from .e_stat_utils import build_stats_data_url
+
+# URLの長さの上限（サーバー側の制限より余裕をもたせた値）
+DEFAULT_MAX_URL_LENGTH = 4000
+# APIが1リクエストで返すデータ件数の上限
+DEFAULT_MAX_ROWS = 100000
+
+
+def estimate_stats_rows(areas, class_codes, years, rows_per_combination=1):
+    """地域・項目・年度の組み合わせからレスポンスのデータ件数を見積もる
+
+    Args:
+        areas (list): 標準地域コードのリスト
+        class_codes (list): 統計表メタデータのクラスコードのリスト
+        years (list): データを取得したい年度のリスト
+        rows_per_combination (int): 1組み合わせあたりのデータ件数（表章項目等の数）
+
+    Returns:
+        int: 見積もりのデータ件数
+
+    """
+    return len(areas) * len(class_codes) * len(years) * rows_per_combination
+
+
+def _split_half(codes):
+    """リストを前後半に分割する
+
+    Args:
+        codes (list): 分割するリスト
+
+    Returns:
+        tuple: (前半のリスト, 後半のリスト)
+
+    """
+    middle = len(codes) // 2
+    return codes[:middle], codes[middle:]
+
+
+def plan_stats_data_chunks(
+        app_id,
+        stats_table_id,
+        areas,
+        class_codes,
+        years,
+        max_url_length=DEFAULT_MAX_URL_LENGTH,
+        max_rows=DEFAULT_MAX_ROWS,
+        rows_per_combination=1):
+    """URLの長さとデータ件数の上限に収まるように統計データの取得条件を分割する
+
+    Args:
+        app_id (str): e-statAPIのAPIkey
+        stats_table_id (str): 取得したい統計情報の統計表ID
+        areas (list): 標準地域コードのリスト
+        class_codes (list): 統計表メタデータのクラスコードのリスト
+        years (list): データを取得したい年度のリスト
+        max_url_length (int): URLの長さの上限
+        max_rows (int): 1リクエストあたりのデータ件数の上限
+        rows_per_combination (int): 1組み合わせあたりのデータ件数の見積もり
+
+    Returns:
+        list: (areas, class_codes, years)のタプルのリスト（元の並び順を保つ）
+
+    Notes:
+        条件を満たさない間、要素数の最も多い条件を半分に分割し続ける。
+        1要素まで分割しても上限を超える場合はそのまま返す
+
+    """
+    areas, class_codes, years = list(areas), list(class_codes), list(years)
+
+    url_length = len(build_stats_data_url(
+        app_id, stats_table_id, areas, class_codes, years))
+    rows = estimate_stats_rows(areas, class_codes, years, rows_per_combination)
+    if url_length <= max_url_length and rows <= max_rows:
+        return [(areas, class_codes, years)]
+
+    dimensions = [areas, class_codes, years]
+    largest = max(range(len(dimensions)), key=lambda i: len(dimensions[i]))
+    if len(dimensions[largest]) <= 1:
+        return [(areas, class_codes, years)]
+
+    chunks = []
+    for half in _split_half(dimensions[largest]):
+        split_dimensions = list(dimensions)
+        split_dimensions[largest] = half
+        chunks.extend(plan_stats_data_chunks(
+            app_id, stats_table_id, *split_dimensions,
+            max_url_length=max_url_length,
+            max_rows=max_rows,
+            rows_per_combination=rows_per_combination))
+    return chunks
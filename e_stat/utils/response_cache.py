@@ -0,0 +1,339 @@
+import csv
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+# レスポンスキャッシュの設定
+_response_cache_config = {
+    "enabled": True,
+    # Trueならキャッシュを参照せずに再取得し、キャッシュを更新する
+    "refresh": False,
+    "cache_dir": "./e_stat/.cache/responses",
+    # キャッシュの有効期間（秒）
+    "ttl": 7 * 24 * 60 * 60,
+    # キャッシュの合計サイズの上限（バイト）。超えた場合は最終参照が古いものから削除する
+    "max_bytes": 1024 ** 3,
+}
+# 正規化したURLに含めないクエリパラメータ（キャッシュのメタデータに記録しない認証情報）
+_IGNORED_PARAMS = {"appId"}
+# キャッシュに保存するe-statAPIのSTATUS（0：正常終了、1：該当データ無し）
+CACHEABLE_API_STATUSES = ("0", "1")
+# STATUSを読み取るために参照するレスポンスの先頭のバイト数（RESULTセクションは先頭の3行）
+_STATUS_HEAD_BYTES = 4096
+
+_cache_lock = threading.Lock()
+_cache_total_bytes = None
+
+
+def configure_response_cache(**kwargs):
+    """レスポンスキャッシュの設定を変更する
+
+    Args:
+        **kwargs: 変更する設定値（enabled, refresh, cache_dir, ttl, max_bytes）
+
+    """
+    global _cache_total_bytes
+    unknown_keys = set(kwargs) - set(_response_cache_config)
+    if unknown_keys:
+        raise KeyError(f"不明な設定です: {sorted(unknown_keys)}")
+    with _cache_lock:
+        _response_cache_config.update(
+            {k: v for k, v in kwargs.items() if v is not None})
+        _cache_total_bytes = None
+
+
+def response_cache_config():
+    """レスポンスキャッシュの現在の設定を返す
+
+    Returns:
+        dict: 設定値の辞書（コピー）
+
+    """
+    return dict(_response_cache_config)
+
+
+def normalize_request_url(url):
+    """キャッシュキー用にURLを正規化する
+
+    Args:
+        url (str): リクエストのURL
+
+    Returns:
+        str: appIdを除き、クエリパラメータをキー順に並べ替えたURL
+
+    """
+    parsed = urlparse(url)
+    params = sorted((k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+                    if k not in _IGNORED_PARAMS)
+    return parsed._replace(query=urlencode(params)).geturl()
+
+
+def response_cache_key(url):
+    """正規化したURLとappIdのハッシュからキャッシュキー（sha256）を生成する
+
+    Args:
+        url (str): リクエストのURL
+
+    Returns:
+        str: キャッシュキー
+
+    Notes:
+        appIdごとにキーを分けるため、別のappIdで取得したレスポンスを返さない（appId自体はキャッシュに記録しない）
+
+    """
+    app_ids = [v for k, v in parse_qsl(urlparse(url).query, keep_blank_values=True) if k == "appId"]
+    app_id_digest = hashlib.sha256(",".join(app_ids).encode("utf-8")).hexdigest()
+    return hashlib.sha256(f"{app_id_digest}\n{normalize_request_url(url)}".encode("utf-8")).hexdigest()
+
+
+def api_response_status(head_text):
+    """e-statAPIのcsv風のレスポンスの先頭からRESULTセクションのSTATUSを取得する
+
+    Args:
+        head_text (str): レスポンスの先頭部分の文字列
+
+    Returns:
+        Union[str, None]: STATUSの値。RESULTセクションが無ければNone
+
+    """
+    rows = list(csv.reader(head_text.lstrip("\ufeff").splitlines()[:3]))
+    if len(rows) < 3 or rows[0] != ["RESULT"] or "STATUS" not in rows[1]:
+        return None
+    index = rows[1].index("STATUS")
+    return rows[2][index] if index < len(rows[2]) else None
+
+
+def _cache_paths(key):
+    """キャッシュキーに対応するメタデータとボディのパスを返す
+
+    Args:
+        key (str): キャッシュキー
+
+    Returns:
+        tuple: (メタデータのPath, ボディのPath)
+
+    """
+    cache_dir = Path(_response_cache_config["cache_dir"])
+    return cache_dir / f"{key}.json", cache_dir / f"{key}.body"
+
+
+def _entry_size(meta_path):
+    """キャッシュエントリのバイト数を返す
+
+    Args:
+        meta_path (Path): メタデータのパス
+
+    Returns:
+        int: メタデータとボディの合計バイト数（存在しなければ0）
+
+    """
+    size = 0
+    for path in (meta_path, meta_path.with_suffix(".body")):
+        try:
+            size += path.stat().st_size
+        except FileNotFoundError:
+            pass
+    return size
+
+
+def _remove_entry(meta_path):
+    """キャッシュエントリを削除する
+
+    Args:
+        meta_path (Path): メタデータのパス
+
+    Returns:
+        int: 削除したバイト数
+
+    """
+    removed = 0
+    for path in (meta_path, meta_path.with_suffix(".body")):
+        try:
+            removed += path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def _valid_cache_entry(url):
+    """有効期限内のキャッシュのメタデータとパスを返す
+
+    Args:
+        url (str): リクエストのURL
+
+    Returns:
+        tuple: (メタデータ, メタデータのパス, ボディのパス)。なければNone
+
+    """
+    if not _response_cache_config["enabled"] or _response_cache_config["refresh"]:
+        return None
+    meta_path, body_path = _cache_paths(response_cache_key(url))
+    try:
+        with meta_path.open(encoding="utf-8") as file:
+            meta = json.load(file)
+    except (FileNotFoundError, ValueError):
+        return None
+    if time.time() - meta["created_at"] > _response_cache_config["ttl"]:
+        _remove_entry(meta_path)
+        return None
+    return meta, meta_path, body_path
+
+
+def open_cached_response_body(url, chunk_size=1024 * 1024):
+    """有効期限内のキャッシュがあれば、ボディをメモリに読み込まずにファイルとして開く
+
+    Args:
+        url (str): リクエストのURL
+        chunk_size (int): チェックサム計算時の読み込み単位（バイト）
+
+    Returns:
+        tuple: (ボディのバイナリファイルオブジェクト, エンコーディング)。なければNone
+
+    """
+    entry = _valid_cache_entry(url)
+    if entry is None:
+        return None
+    meta, meta_path, body_path = entry
+    digest = hashlib.sha256()
+    try:
+        file = body_path.open("rb")
+    except FileNotFoundError:
+        return None
+    for chunk in iter(lambda: file.read(chunk_size), b""):
+        digest.update(chunk)
+    if digest.hexdigest() != meta["sha256"]:
+        file.close()
+        _remove_entry(meta_path)
+        return None
+    file.seek(0)
+    os.utime(meta_path)
+    return file, meta["encoding"]
+
+
+def _evict_if_needed(cache_dir, added_bytes):
+    """キャッシュの合計サイズが上限を超えたら最終参照が古いものから削除する
+
+    Args:
+        cache_dir (Path): キャッシュディレクトリ
+        added_bytes (int): 今回増加したバイト数（上書きしたエントリの分は差し引く）
+
+    """
+    global _cache_total_bytes
+    with _cache_lock:
+        if _cache_total_bytes is None:
+            _cache_total_bytes = sum(
+                entry.stat().st_size for entry in os.scandir(cache_dir) if entry.is_file())
+        else:
+            _cache_total_bytes += added_bytes
+        if _cache_total_bytes <= _response_cache_config["max_bytes"]:
+            return
+        meta_paths = sorted(cache_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for meta_path in meta_paths:
+            if _cache_total_bytes <= _response_cache_config["max_bytes"]:
+                break
+            _cache_total_bytes -= _remove_entry(meta_path)
+
+
+class ResponseCacheWriter:
+    """レスポンスボディを受け取りながら逐次キャッシュに書き込むクラス"""
+
+    def __init__(self, url, res):
+        """イニシャライザ
+
+        Args:
+            url (str): リクエストのURL
+            res (requests.Response): レスポンスオブジェクト
+
+        Notes:
+            キャッシュが無効、またはレスポンスが正常終了していなければ何も書き込まない。
+            e-statAPIはエラーもステータスコード200で返すため、RESULTセクションのSTATUSが
+            CACHEABLE_API_STATUSESでないレスポンスはcommit時に破棄する
+
+        """
+        self.url = url
+        self.res = res
+        self.enabled = _response_cache_config["enabled"] and res.status_code == 200
+        if not self.enabled:
+            return
+        self._meta_path, self._body_path = _cache_paths(response_cache_key(url))
+        self._meta_path.parent.mkdir(parents=True, exist_ok=True)
+        # 他のプロセス・スレッドが読みかけのファイルを壊さないよう一時ファイルに書き込んでから置き換える
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        self._body_tmp = self._body_path.with_name(self._body_path.name + suffix)
+        self._meta_tmp = self._meta_path.with_name(self._meta_path.name + suffix)
+        self._file = self._body_tmp.open("wb")
+        self._digest = hashlib.sha256()
+        self._size = 0
+        # STATUSの判定に使うボディの先頭
+        self._head = b""
+
+    def write(self, chunk):
+        """ボディの一部を書き込む
+
+        Args:
+            chunk (bytes): ボディの一部
+
+        """
+        if not self.enabled:
+            return
+        self._file.write(chunk)
+        self._digest.update(chunk)
+        self._size += len(chunk)
+        if len(self._head) < _STATUS_HEAD_BYTES:
+            self._head += chunk[:_STATUS_HEAD_BYTES - len(self._head)]
+
+    def commit(self):
+        """書き込んだボディとメタデータをキャッシュとして保存する
+
+        Notes:
+            RESULTセクションのSTATUSが正常終了・該当データ無しでなければ保存せずに破棄する
+
+        """
+        if not self.enabled:
+            return
+        head_text = self._head.decode(self.res.encoding or "utf-8", errors="ignore")
+        if api_response_status(head_text) not in CACHEABLE_API_STATUSES:
+            self.discard()
+            return
+        self.enabled = False
+        self._file.close()
+        meta = {
+            "url": normalize_request_url(self.url),
+            "created_at": time.time(),
+            "status_code": self.res.status_code,
+            "encoding": self.res.encoding,
+            "headers": {k: v for k, v in self.res.headers.items() if k.lower() == "content-type"},
+            "sha256": self._digest.hexdigest(),
+        }
+        with self._meta_tmp.open("w", encoding="utf-8") as file:
+            json.dump(meta, file, ensure_ascii=False)
+        replaced_bytes = _entry_size(self._meta_path)
+        os.replace(self._body_tmp, self._body_path)
+        os.replace(self._meta_tmp, self._meta_path)
+
+        _evict_if_needed(self._meta_path.parent, self._size + self._meta_path.stat().st_size - replaced_bytes)
+
+    def discard(self):
+        """ボディを最後まで受け取れなかった場合に一時ファイルを削除する"""
+        if not self.enabled:
+            return
+        self.enabled = False
+        self._file.close()
+        self._body_tmp.unlink()
+
+
+def clear_response_cache():
+    """キャッシュを全て削除する"""
+    global _cache_total_bytes
+    cache_dir = Path(_response_cache_config["cache_dir"])
+    if not cache_dir.exists():
+        return
+    with _cache_lock:
+        for meta_path in cache_dir.glob("*.json"):
+            _remove_entry(meta_path)
+        _cache_total_bytes = None
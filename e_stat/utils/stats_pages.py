@@ -0,0 +1,59 @@
+from .csv_stream import CSV_CHUNK_ROWS, iter_csv_chunks, read_until_section
+from .df_utils import open_api_response
+from .e_stat_utils import check_stats_data_status, section_header_value
+from .instrumentation import span
+from .lazy_import import lazy_import
+from .response_cache import normalize_request_url
+from .stats_schema import apply_stats_schema, concat_stats_dfs
+
+pd = lazy_import("pandas")
+
+
+def iter_stats_data_pages(url, chunk_rows=CSV_CHUNK_ROWS, typed=False):
+    """統計データ取得APIのNEXT_KEYをたどり、チャンクごとのデータフレームを返すジェネレータ
+
+    Args:
+        url (str): 統計データ取得APIのURL（startPositionを含まないもの）
+        chunk_rows (int): 1チャンクあたりの行数
+        typed (bool): Trueならチャンクごとにapply_stats_schemaで型付きのデータフレームに変換する
+
+    Yields:
+        pd.DataFrame: 最大chunk_rows件分の統計表のデータフレーム
+
+    Notes:
+        レスポンスを受信しながらcsvを解析して返すので、巨大な統計表も1チャンク分のメモリで処理できる。
+        該当データが無い（STATUS=1）場合は空のデータフレームを1つ返す
+
+    """
+    page_url = url
+    while True:
+        print(f"統計表を取得します。URL={page_url}")
+        with span("api.stats_data_page", url=normalize_request_url(page_url)) as s, \
+                open_api_response(page_url) as stream:
+            header_text, found = read_until_section(stream, "VALUE")
+            if not found:
+                check_stats_data_status(header_text)
+                yield pd.DataFrame()
+                return
+            # NEXT_KEYはセクションヘッダにあるため、データ行を読み込む前に取得できる
+            next_key = section_header_value(header_text, "NEXT_KEY")
+            for df in iter_csv_chunks(stream, chunk_rows):
+                s.add(rows=len(df))
+                yield apply_stats_schema(df) if typed else df
+        if next_key is None:
+            return
+        page_url = f"{url}&startPosition={next_key}"
+
+
+def fetch_all_stats_data_pages(url, typed=False):
+    """統計データ取得APIの全ページを取得して1つのデータフレームに結合する
+
+    Args:
+        url (str): 統計データ取得APIのURL（startPositionを含まないもの）
+        typed (bool): Trueなら型付きのデータフレーム（valueは数値、コード等はカテゴリ）を返す
+
+    Returns:
+        pd.DataFrame: 全ページを結合した統計表のデータフレーム
+
+    """
+    return concat_stats_dfs(list(iter_stats_data_pages(url, typed=typed)))
@@ -0,0 +1,262 @@
+import sys
+from pathlib import Path
+
+from .instrumentation import span
+from .lazy_import import lazy_import
+from .stats_schema import VALUE_COLUMN
+from .writers import require_pyarrow
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+pa = lazy_import("pyarrow")
+pq = lazy_import("pyarrow.parquet")
+
+# 横持ちにする時に常に列にするカラム（項目・時間軸）
+DEFAULT_PIVOT_COLUMNS = ("cat01_code", "time_code")
+# 値のある組み合わせの割合がこれ未満なら疎行列（値のある要素のみ）で保持する
+SPARSE_DENSITY_THRESHOLD = 0.3
+
+
+def _factorize(series):
+    """カラムを整数のコードと、コードに対応するラベルに変換する
+
+    Args:
+        series (pd.Series): カテゴリまたは文字列のカラム
+
+    Returns:
+        tuple: (コードのndarray（欠損値は-1）, ラベルのndarray（昇順）)
+
+    Notes:
+        カテゴリのカラムはカテゴリのコードをそのまま使うため、文字列を比較せずに変換できる
+
+    """
+    codes, uniques = pd.factorize(series, sort=True)
+    return codes, np.asarray(uniques, dtype=object)
+
+
+def _pivot_columns(df, index, columns):
+    """横持ちで列にするカラムを決める
+
+    Args:
+        df (pd.DataFrame): 統計データのdf
+        index (str): 行にするカラム
+        columns (list): 列にするカラム（Noneなら自動）
+
+    Returns:
+        list: 列にするカラム名のリスト
+
+    Notes:
+        自動の場合はcat01_code, time_codeと、値が2種類以上ある他の`*_code`カラム（表章項目・cat02等）をdfの順で使う
+
+    """
+    if columns is not None:
+        return list(columns)
+    return [column for column in df.columns
+            if column.endswith("_code") and column != index
+            and (column in DEFAULT_PIVOT_COLUMNS or df[column].nunique() > 1)]
+
+
+def pivot_stats_df(df, index="area_code", columns=None, values=VALUE_COLUMN, sparse=None):
+    """縦持ち（地域×項目×時間軸ごとに1行）の統計データを、地域×(項目, 年度)の行列に変換する
+
+    Args:
+        df (pd.DataFrame): StatsData.stats_df等の統計データのdf
+        index (str): 行にするカラム
+        columns (list): 列にするカラム（Noneならcat01_code, time_codeと値が2種類以上ある`*_code`カラム）
+        values (str): 値のカラム
+        sparse (bool): Trueなら疎行列、Falseなら密行列で保持する（Noneなら値のある割合で決める）
+
+    Returns:
+        StatsMatrix: 統計データの行列
+
+    Notes:
+        コードを整数に変換し、numpyで値を1回だけ配置するため、dfをコピーせずに変換できる（typed=Trueのカテゴリなら更に速い）。
+        同じ行・列に複数の値がある場合は、区別するカラムをcolumnsに指定するよう表示して異常終了する
+
+    """
+    if not len(df.columns):
+        # 該当データが無い統計データ（カラムなし）は空の行列にする
+        names = list(columns or DEFAULT_PIVOT_COLUMNS)
+        empty = np.array([], dtype=np.int64)
+        return StatsMatrix(pd.Index([], name=index, dtype=object),
+                           pd.MultiIndex.from_arrays([[] for _ in names], names=names),
+                           empty, empty, np.array([], dtype="float64"), sparse)
+    pivot_columns = _pivot_columns(df, index, columns)
+    if not pivot_columns:
+        print("列にするカラムを1つ以上指定してください。システムを終了します。")
+        sys.exit(1)
+    with span("pivot", rows=len(df), columns=len(pivot_columns)) as s:
+        row_codes, row_labels = _factorize(df[index])
+        column_parts = [_factorize(df[column]) for column in pivot_columns]
+
+        # 列にするカラムのコードを1つの整数にまとめ、存在する組み合わせのみを列にする
+        combined = np.zeros(len(df), dtype=np.int64)
+        valid = row_codes >= 0
+        for codes, labels in column_parts:
+            combined = combined * len(labels) + codes
+            valid &= codes >= 0
+        column_codes, combinations = pd.factorize(combined[valid], sort=True)
+        label_indexes = np.unravel_index(combinations, [len(labels) for _, labels in column_parts])
+        column_labels = pd.MultiIndex.from_arrays(
+            [labels[indexes] for (_, labels), indexes in zip(column_parts, label_indexes)], names=pivot_columns)
+
+        raw = df[values]
+        if pd.api.types.is_numeric_dtype(raw.dtype):
+            value_array = raw.to_numpy(dtype="float64", na_value=np.nan)[valid]
+        else:
+            value_array = raw.to_numpy(dtype=object)[valid]
+
+        # 列ごとに連続するように（列, 行）の順に並べる
+        rows = row_codes[valid].astype(np.int64)
+        n_rows = len(row_labels)
+        order = np.argsort(column_codes * n_rows + rows, kind="stable")
+        rows, cols, value_array = rows[order], column_codes[order].astype(np.int64), value_array[order]
+        if len(rows) > 1 and ((np.diff(cols) == 0) & (np.diff(rows) == 0)).any():
+            print(f"同じ{index}・列に複数の値があります。区別するカラムをcolumnsに指定してください"
+                  f"（列：{','.join(pivot_columns)}）。システムを終了します。")
+            sys.exit(1)
+        # 秘匿等で値の無い要素は保持しない（列は残し、値の無い要素として扱う）
+        present = ~pd.isna(value_array)
+        if not present.all():
+            rows, cols, value_array = rows[present], cols[present], value_array[present]
+
+        matrix = StatsMatrix(pd.Index(row_labels, name=index), column_labels, rows, cols, value_array, sparse)
+        s.set(shape=list(matrix.shape), density=round(matrix.density, 4), sparse=matrix.sparse)
+    return matrix
+
+
+class StatsMatrix:
+    """地域×(項目, 年度)の統計データの行列（密行列または値のある要素のみの疎行列）"""
+
+    def __init__(self, row_labels, column_labels, rows, cols, values, sparse=None):
+        """イニシャライザ
+
+        Args:
+            row_labels (pd.Index): 行のラベル（地域コード等）
+            column_labels (pd.MultiIndex): 列のラベル（項目コード・時間軸コード等の組み合わせ）
+            rows (np.ndarray): 値のある要素の行番号
+            cols (np.ndarray): 値のある要素の列番号（列, 行の順に並べたもの）
+            values (np.ndarray): 値のある要素の値（float64またはobject）
+            sparse (bool): Trueなら疎行列で保持する（Noneなら値のある割合がSPARSE_DENSITY_THRESHOLD未満なら疎行列）
+
+        """
+        self.row_labels = row_labels
+        self.column_labels = column_labels
+        self.shape = (len(row_labels), len(column_labels))
+        self.nnz = len(values)
+        cells = self.shape[0] * self.shape[1]
+        self.density = self.nnz / cells if cells else 0.0
+        self.sparse = self.density < SPARSE_DENSITY_THRESHOLD if sparse is None else sparse
+        self.dtype = values.dtype
+        self._coo = (rows, cols, values)
+        # 密行列は疎行列のまま保持しない（値の配置は1回のみ）
+        self._dense = None if self.sparse else self._to_dense()
+        if not self.sparse:
+            self._coo = None
+
+    def _empty(self, shape):
+        """欠損値で埋めた配列を返す（数値はNaN、それ以外はNone）"""
+        if self.dtype == object:
+            return np.full(shape, None, dtype=object)
+        return np.full(shape, np.nan)
+
+    def _to_dense(self):
+        rows, cols, values = self._coo
+        dense = self._empty(self.shape)
+        dense[rows, cols] = values
+        return dense
+
+    def to_numpy(self):
+        """密行列のndarrayを返す
+
+        Returns:
+            np.ndarray: 行×列の配列（値の無い要素は数値ならNaN、それ以外はNone）
+
+        """
+        return self._dense if self._dense is not None else self._to_dense()
+
+    def to_coo(self):
+        """値のある要素の(行番号, 列番号, 値)を返す
+
+        Returns:
+            tuple: (行番号のndarray, 列番号のndarray, 値のndarray)
+
+        """
+        if self._coo is not None:
+            return self._coo
+        # 転置してから探すと列, 行の順になる
+        cols, rows = np.nonzero(~pd.isna(self._dense).T)
+        return rows, cols, self._dense[rows, cols]
+
+    def column_names(self):
+        """列のラベルを`_`で連結した列名を返す
+
+        Returns:
+            list: `{項目コード}_{年度}`（例: A1101_2015）の列名のリスト（time_codeは先頭4桁の年度にする）
+
+        """
+        if not len(self.column_labels):
+            return []
+        parts = [pd.Index(self.column_labels.get_level_values(level)).astype(str)
+                 for level in range(self.column_labels.nlevels)]
+        parts = [part.str[:4] if name == "time_code" else part
+                 for name, part in zip(self.column_labels.names, parts)]
+        names = parts[0]
+        for part in parts[1:]:
+            names = names + "_" + part
+        return list(names)
+
+    def _iter_columns(self):
+        """列ごとの値の配列を返すジェネレータ（疎行列でも1列分の配列のみ作成する）"""
+        if self._dense is not None:
+            for j in range(self.shape[1]):
+                yield self._dense[:, j]
+            return
+        rows, cols, values = self._coo
+        bounds = np.searchsorted(cols, np.arange(self.shape[1] + 1))
+        for j in range(self.shape[1]):
+            column = self._empty(self.shape[0])
+            column[rows[bounds[j]:bounds[j + 1]]] = values[bounds[j]:bounds[j + 1]]
+            yield column
+
+    def to_frame(self, sparse=None):
+        """行のラベルをインデックス、column_namesを列名としたdfを返す
+
+        Args:
+            sparse (bool): Trueなら列をpandasの疎配列（SparseDtype）にする（Noneなら行列の保持方法に合わせる）
+
+        Returns:
+            pd.DataFrame: 横持ちのdf
+
+        """
+        sparse = self.sparse if sparse is None else sparse
+        if not sparse and self._dense is not None:
+            return pd.DataFrame(self._dense, index=self.row_labels, columns=self.column_names())
+        return pd.DataFrame(
+            {name: pd.arrays.SparseArray(column) if sparse else column
+             for name, column in zip(self.column_names(), self._iter_columns())},
+            index=self.row_labels)
+
+    def to_parquet(self, path):
+        """dfを介さずに列ごとの配列からParquetを書き出す
+
+        Args:
+            path (str): 書き出すParquetのパス文字列
+
+        Returns:
+            Path: 書き出したファイルのパス
+
+        Notes:
+            行のラベルを1列目とし、値の無い要素はnullにする（Parquetはnullを列ごとのビットマップで持つため、疎でも小さい）
+
+        """
+        require_pyarrow("parquet")
+        output_path = Path(path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with span("write.matrix_parquet", rows=self.shape[0], columns=self.shape[1]):
+            arrays = [pa.array(self.row_labels.astype(str))]
+            arrays += [pa.array(column, from_pandas=True) for column in self._iter_columns()]
+            table = pa.Table.from_arrays(arrays, names=[self.row_labels.name or "index", *self.column_names()])
+            pq.write_table(table, str(output_path.resolve()))
+        print(f"{output_path}を書き出しました。")
+        return output_path
@@ -0,0 +1,92 @@
+from .lazy_import import lazy_import
+
+pd = lazy_import("pandas")
+
+# 統計データのvalueに出現する特殊記号（-：該当なし、…：不詳、***・x：秘匿等）
+STATS_VALUE_MARKERS = ("-", "…", "***", "x", "X")
+# 統計データの値のカラム名
+VALUE_COLUMN = "value"
+# 数値に変換できなかった値（特殊記号）を記録するカラム名
+VALUE_MARKER_COLUMN = "value_marker"
+
+
+def _typed_value(raw):
+    """valueカラムを数値と、数値に変換できなかった値の記号に分ける
+
+    Args:
+        raw (pd.Series): 文字列のvalueカラム
+
+    Returns:
+        tuple: (数値のSeries（整数のみならInt64、それ以外はfloat64）, 記号のカテゴリSeries)
+
+    """
+    numeric = pd.to_numeric(raw, errors="coerce")
+    dropped = raw.notna() & numeric.isna()
+    # 定義済みの記号以外で数値に変換できなかった値も記録する
+    unknown_markers = sorted(set(raw[dropped]) - set(STATS_VALUE_MARKERS))
+    marker = raw.where(dropped).astype(
+        pd.CategoricalDtype(categories=list(STATS_VALUE_MARKERS) + unknown_markers))
+
+    values = numeric.dropna()
+    if numeric.dtype.kind == "f" and (values == values.round()).all() and (values.abs() < 2 ** 53).all():
+        numeric = numeric.astype("Int64")
+    elif numeric.dtype.kind in "iu":
+        numeric = numeric.astype("Int64")
+    return numeric, marker
+
+
+def apply_stats_schema(df):
+    """文字列のみの統計データのdfを型付きのdfに変換する
+
+    Args:
+        df (pd.DataFrame): csv_string_to_df等で読み込んだ統計データのdf（全カラムstr）
+
+    Returns:
+        pd.DataFrame: valueを数値（Int64またはfloat64）、その直後にvalue_marker、それ以外のカラムをカテゴリにしたdf
+
+    Notes:
+        コード・名称・単位等は同じ値が繰り返し出現するため、カテゴリにすることでメモリ使用量が数分の一になる。
+        valueの特殊記号（"-"、"…"、"***"、"x"）は欠損値とし、value_markerに元の記号を残す
+
+    """
+    typed = {}
+    for column in df.columns:
+        if column == VALUE_COLUMN:
+            typed[VALUE_COLUMN], typed[VALUE_MARKER_COLUMN] = _typed_value(df[column])
+        else:
+            typed[column] = df[column].astype("category")
+    return pd.DataFrame(typed, index=df.index)
+
+
+def concat_stats_dfs(dfs):
+    """統計データのdfを結合する（型付きのdfはカテゴリと数値の型を揃えてから結合する）
+
+    Args:
+        dfs (list): 統計データのdfのリスト
+
+    Returns:
+        pd.DataFrame: 結合したdf
+
+    Notes:
+        カテゴリが異なるカラムをそのまま結合するとobjectに戻るため、カテゴリを和集合に揃える。
+        valueがInt64とfloat64で混在する場合はfloat64に揃える
+
+    """
+    # 該当データが無いページ（カラムなし）は除く
+    non_empty_dfs = [df for df in dfs if len(df.columns)]
+    if not non_empty_dfs:
+        return dfs[0] if dfs else pd.DataFrame()
+    if len(non_empty_dfs) == 1:
+        return non_empty_dfs[0]
+
+    aligned = {}
+    for column in non_empty_dfs[0].columns:
+        series_list = [df[column] for df in non_empty_dfs if column in df.columns]
+        if all(isinstance(s.dtype, pd.CategoricalDtype) for s in series_list):
+            categories = pd.api.types.union_categoricals(series_list, ignore_order=True).categories
+            aligned[column] = pd.CategoricalDtype(categories=categories)
+        elif column == VALUE_COLUMN and len({str(s.dtype) for s in series_list}) > 1:
+            aligned[column] = "float64"
+    if aligned:
+        non_empty_dfs = [df.astype({k: v for k, v in aligned.items() if k in df.columns}) for df in non_empty_dfs]
+    return pd.concat(non_empty_dfs, ignore_index=True)
@@ -0,0 +1,39 @@
+import unicodedata
+
+# 検索索引のn-gramの文字数（日本語は単語の区切りが無いため、形態素解析を使わず2文字ずつに分割する）
+NGRAM_SIZE = 2
+
+
+def normalize_text(text):
+    """検索用に文字列を正規化する
+
+    Args:
+        text (str): 文字列
+
+    Returns:
+        str: NFKC正規化（全角英数字・記号を半角に統一）して小文字にし、空白を除いた文字列
+
+    Notes:
+        e-Statの統計表題は「Ａ　人口・世帯」のように全角英数字・全角空白を含むため、
+        索引・検索語の両方を同じ規則で正規化する
+
+    """
+    if not isinstance(text, str):
+        return ""
+    return "".join(unicodedata.normalize("NFKC", text).lower().split())
+
+
+def text_ngrams(text, n=NGRAM_SIZE):
+    """正規化済みの文字列をn-gramの集合に分割する
+
+    Args:
+        text (str): normalize_textで正規化した文字列
+        n (int): n-gramの文字数
+
+    Returns:
+        set: n-gramの集合（n文字未満の文字列はそのまま1要素とする）
+
+    """
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
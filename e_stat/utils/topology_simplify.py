@@ -0,0 +1,164 @@
+from .lazy_import import lazy_import
+
+gpd = lazy_import("geopandas")
+shapely_geometry = lazy_import("shapely.geometry")
+shapely_ops = lazy_import("shapely.ops")
+
+# タイル1枚の幅(px)
+TILE_SIZE_PX = 256
+
+
+def zoom_to_tolerance(zoom):
+    """ズームレベルの1ピクセルあたりの経度幅（度）を簡略化の許容距離として返す
+
+    Args:
+        zoom (int): Webメルカトルのズームレベル
+
+    Returns:
+        float: 許容距離（度）
+
+    Notes:
+        境界データ（緯度経度）をそのズームレベルで表示したときに1ピクセル未満の頂点を間引く許容距離になる
+
+    """
+    return 360 / (TILE_SIZE_PX * 2 ** zoom)
+
+
+def count_vertices(geometry):
+    """ジオメトリの頂点数を返す
+
+    Args:
+        geometry (shapely.geometry.base.BaseGeometry): ジオメトリ
+
+    Returns:
+        int: 頂点数
+
+    """
+    if geometry is None or geometry.is_empty:
+        return 0
+    if hasattr(geometry, "geoms"):
+        return sum(count_vertices(part) for part in geometry.geoms)
+    if geometry.geom_type == "Polygon":
+        return len(geometry.exterior.coords) + sum(len(ring.coords) for ring in geometry.interiors)
+    return len(geometry.coords)
+
+
+def build_shared_arcs(geometries):
+    """ポリゴン群の境界線を、隣接するポリゴンと共有する辺（アーク）ごとに分割する
+
+    Args:
+        geometries (list): ポリゴン・マルチポリゴンのリスト
+
+    Returns:
+        list: アーク（LineString）のリスト
+
+    Notes:
+        隣接するポリゴンの共有辺は1本のアークにまとめられ、3つ以上のポリゴンが接する点（ノード）で分割される
+        （TopoJSONのアークと同じ考え方）
+
+    """
+    boundaries = [geometry.boundary for geometry in geometries if geometry is not None and not geometry.is_empty]
+    if not boundaries:
+        return []
+    noded = shapely_ops.unary_union(boundaries)
+    if noded.geom_type == "MultiLineString":
+        noded = shapely_ops.linemerge(noded)
+    return list(noded.geoms) if hasattr(noded, "geoms") else [noded]
+
+
+def _simplify_arc(arc, tolerance):
+    """アークを両端点を固定したまま簡略化する
+
+    Args:
+        arc (shapely.geometry.LineString): アーク
+        tolerance (float): 許容距離
+
+    Returns:
+        shapely.geometry.LineString: 簡略化したアーク
+
+    """
+    if arc.is_ring:
+        # 島などの閉じたアークはリングとして有効な形を保つ
+        ring = shapely_geometry.Polygon(arc).simplify(tolerance, preserve_topology=True).exterior
+        return ring if len(ring.coords) >= 4 else arc
+    return arc.simplify(tolerance, preserve_topology=True)
+
+
+def _assign_faces(faces, geometries):
+    """簡略化したアークから再構成した面を、元のポリゴンのインデックスに割り当てる
+
+    Args:
+        faces (list): polygonizeで作成した面のリスト
+        geometries (gpd.GeoSeries): 元のポリゴンのGeoSeries
+
+    Returns:
+        dict: 元のポリゴンの位置をキー、割り当てた面のリストを値とする辞書
+
+    Notes:
+        面の内部の点を含むポリゴンに割り当て、見つからない場合は重なる面積が最大のポリゴンに割り当てる。
+        元のポリゴン群と半分以上重ならない面（湖・海などの穴）は割り当てない
+
+    """
+    sindex = geometries.sindex
+    assigned = {}
+    for face in faces:
+        candidates = [int(i) for i in sindex.intersection(face.bounds)]
+        point = face.representative_point()
+        owners = [i for i in candidates if geometries.iloc[i].contains(point)]
+        if len(owners) != 1:
+            areas = {i: geometries.iloc[i].intersection(face).area for i in candidates}
+            owners = [max(areas, key=areas.get)] if sum(areas.values()) > face.area / 2 else []
+        if owners:
+            assigned.setdefault(owners[0], []).append(face)
+    return assigned
+
+
+def simplify_shared_arcs(geometries, arcs, tolerance):
+    """共有辺のアークを簡略化してポリゴン群を再構成する
+
+    Args:
+        geometries (gpd.GeoSeries): 元のポリゴンのGeoSeries
+        arcs (list): build_shared_arcsで作成したアークのリスト
+        tolerance (float): 許容距離（元のポリゴンの座標系の単位）
+
+    Returns:
+        list: 元のポリゴンと同じ順の簡略化したジオメトリのリスト
+
+    Notes:
+        アークを再構成できなかったポリゴン（許容距離に対して小さすぎる等）はポリゴン単体で簡略化する
+
+    """
+    simplified_arcs = [_simplify_arc(arc, tolerance) for arc in arcs]
+    if not simplified_arcs:
+        return list(geometries)
+    # 簡略化で交差したアークは交点で分割してから面を作る
+    faces = list(shapely_ops.polygonize(shapely_ops.unary_union(simplified_arcs)))
+    assigned = _assign_faces(faces, geometries)
+    simplified = []
+    for position, geometry in enumerate(geometries):
+        if position in assigned:
+            simplified.append(shapely_ops.unary_union(assigned[position]))
+        elif geometry is None or geometry.is_empty:
+            simplified.append(geometry)
+        else:
+            simplified.append(geometry.simplify(tolerance, preserve_topology=True))
+    return simplified
+
+
+def simplify_coverage(geometries, tolerances):
+    """隣接するポリゴン間に隙間・重なりが生じないように、複数の許容距離で簡略化する
+
+    Args:
+        geometries (gpd.GeoSeries): ポリゴンのGeoSeries
+        tolerances (list): 許容距離のリスト
+
+    Returns:
+        dict: 許容距離をキー、簡略化したジオメトリのリストを値とする辞書
+
+    Notes:
+        共有辺のアークへの分割は1度だけ行い、許容距離ごとにアークの簡略化と面の再構成を行う
+
+    """
+    geometries = gpd.GeoSeries(list(geometries))
+    arcs = build_shared_arcs(list(geometries))
+    return {tolerance: simplify_shared_arcs(geometries, arcs, tolerance) for tolerance in tolerances}
@@ -0,0 +1,193 @@
+import sys
+from pathlib import Path
+
+from .df_utils import output_csv_from_df
+from .gdf_geojson import write_geojson_stream
+from .instrumentation import span
+
+# 出力形式名をキー、(拡張子, 書き出し関数, ジオメトリ必須か)を値とする辞書
+_WRITERS = {}
+
+
+def register_writer(fmt, suffix, geometry_required=False):
+    """書き出し関数を出力形式として登録するデコレータ
+
+    Args:
+        fmt (str): 出力形式名（--formatで指定する値）
+        suffix (str): 書き出すファイルの拡張子
+        geometry_required (bool): TrueならGeoDataFrameのみ書き出せる
+
+    Returns:
+        function: デコレータ
+
+    Notes:
+        書き出し関数はwriter(df, output_path, **options)の形式で定義する。
+        optionsはoutput_file_from_dfに渡されたキーワード引数で、使わないものは無視する
+
+    """
+    def decorator(func):
+        _WRITERS[fmt] = (suffix, func, geometry_required)
+        return func
+    return decorator
+
+
+def writer_formats(geometry=False):
+    """登録済みの出力形式名を返す
+
+    Args:
+        geometry (bool): Trueならジオメトリ必須の形式も含める
+
+    Returns:
+        list: 出力形式名のリスト
+
+    """
+    return [fmt for fmt, (_, _, geometry_required) in _WRITERS.items()
+            if geometry or not geometry_required]
+
+
+def _is_geo_df(df):
+    """データフレームがジオメトリを持つかチェック
+
+    Args:
+        df (pd.DataFrame): チェック対象のデータフレーム
+
+    Returns:
+        bool: GeoDataFrameならTrue
+
+    """
+    return hasattr(df, "geometry") and "geometry" in df.columns
+
+
+def require_pyarrow(fmt):
+    """pyarrowが利用可能かチェックし、なければ異常終了
+
+    Args:
+        fmt (str): 出力形式名
+
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        print(f"{fmt}形式で書き出すにはpyarrowをインストールしてください。システムを終了します。")
+        sys.exit(1)
+
+
+def output_file_from_df(df, path, file_stem, fmt="csv", **options):
+    """データフレームを指定した出力形式で書き出す
+
+    Args:
+        df (pd.DataFrame): 書き出し対象のデータフレーム（GeoDataFrameも可）
+        path (str): アウトプットするディレクトリのパス文字列
+        file_stem (str): 書き出すファイルの拡張子を除いた名称
+        fmt (str): 出力形式名（csv, geojson, parquet, geoparquet, feather, fgb）
+        **options: 書き出し関数に渡すオプション（geojsonのprecision, indent等）
+
+    Returns:
+        Path: 書き出したファイルのパス
+
+    """
+    if fmt not in _WRITERS:
+        print(f"{fmt}は対応していない出力形式です（対応形式：{list(_WRITERS)}）。システムを終了します。")
+        sys.exit(1)
+    suffix, writer, geometry_required = _WRITERS[fmt]
+    if geometry_required and not _is_geo_df(df):
+        print(f"{fmt}形式はジオメトリを持つデータのみ書き出せます。システムを終了します。")
+        sys.exit(1)
+
+    dir_path = Path(path)
+    if not dir_path.exists():
+        dir_path.mkdir(parents=True, exist_ok=True)
+    output_path = dir_path / f"{file_stem}{suffix}"
+    with span(f"write.{fmt}", rows=len(df)) as s:
+        writer(df, output_path, **options)
+        # 書き出し関数がファイルを作らない場合（ディレクトリへの書き出し等）はサイズを記録しない
+        s.set(bytes=output_path.stat().st_size if output_path.is_file() else None)
+    return output_path
+
+
+@register_writer("csv", ".csv")
+def _write_csv(df, output_path, **options):
+    """csvを書き出す
+
+    Args:
+        df (pd.DataFrame): 書き出し対象のデータフレーム
+        output_path (Path): 書き出すファイルのパス
+
+    """
+    output_csv_from_df(df, str(output_path.parent), output_path.name)
+
+
+@register_writer("geojson", ".geojson", geometry_required=True)
+def _write_geojson(df, output_path, precision=None, indent=None, **options):
+    """geojsonを書き出す
+
+    Args:
+        df (gpd.GeoDataFrame): 書き出し対象のGeoDataFrame
+        output_path (Path): 書き出すファイルのパス
+        precision (int): 座標の小数点以下の桁数（Noneなら丸めない）
+        indent (int): インデント幅（Noneなら改行・空白なしで書き出す）
+
+    """
+    write_geojson_stream(df, str(output_path.parent), output_path.name, precision, indent)
+
+
+@register_writer("parquet", ".parquet")
+def _write_parquet(df, output_path, **options):
+    """parquetを書き出す
+
+    Args:
+        df (pd.DataFrame): 書き出し対象のデータフレーム
+        output_path (Path): 書き出すファイルのパス
+
+    Notes:
+        GeoDataFrameの場合はジオメトリを保持したGeoParquetとして書き出される
+
+    """
+    require_pyarrow("parquet")
+    df.to_parquet(str(output_path.resolve()), index=False)
+    print(f"{output_path.resolve()}を書き出しました。")
+
+
+@register_writer("geoparquet", ".geo.parquet", geometry_required=True)
+def _write_geoparquet(df, output_path, **options):
+    """GeoParquetを書き出す
+
+    Args:
+        df (gpd.GeoDataFrame): 書き出し対象のGeoDataFrame
+        output_path (Path): 書き出すファイルのパス
+
+    Notes:
+        parquetと同時に指定しても上書きしないよう、拡張子は.geo.parquetとする
+
+    """
+    _write_parquet(df, output_path)
+
+
+@register_writer("feather", ".feather")
+def _write_feather(df, output_path, **options):
+    """featherを書き出す
+
+    Args:
+        df (pd.DataFrame): 書き出し対象のデータフレーム
+        output_path (Path): 書き出すファイルのパス
+
+    Notes:
+        featherはデフォルトのRangeIndex以外を保存できないためインデックスをリセットする
+
+    """
+    require_pyarrow("feather")
+    df.reset_index(drop=True).to_feather(str(output_path.resolve()))
+    print(f"{output_path.resolve()}を書き出しました。")
+
+
+@register_writer("fgb", ".fgb", geometry_required=True)
+def _write_flatgeobuf(df, output_path, **options):
+    """FlatGeobufを書き出す
+
+    Args:
+        df (gpd.GeoDataFrame): 書き出し対象のGeoDataFrame
+        output_path (Path): 書き出すファイルのパス
+
+    """
+    df.to_file(str(output_path.resolve()), driver="FlatGeobuf")
+    print(f"{output_path.resolve()}を書き出しました。")
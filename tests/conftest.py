@@ -0,0 +1,53 @@
+import pytest
+
+from e_stat.utils import configure_http_client, configure_response_cache, http_client_config, \
+    response_cache_config
+from tests.fake_api_server import FakeEStatServer
+
+# テストで使うappId（代替サーバーはapp_idを指定した場合のみ照合する）
+APP_ID = "test-app-id"
+
+
+@pytest.fixture
+def response_cache_dir(tmp_path):
+    """レスポンスキャッシュを一時ディレクトリに向け、テスト後に設定を元に戻す"""
+    original = response_cache_config()
+    cache_dir = tmp_path / "responses"
+    configure_response_cache(enabled=True, refresh=False, cache_dir=str(cache_dir))
+    yield cache_dir
+    configure_response_cache(**original)
+
+
+@pytest.fixture
+def server_factory(response_cache_dir):
+    """代替サーバーを起動し、HTTPクライアントをそのサーバーに向ける関数を返す
+
+    Notes:
+        リトライの待機を省くためbackoff_factorを0にする。テスト後にサーバーを停止し、設定を元に戻す
+
+    """
+    original = http_client_config()
+    servers = []
+
+    def _start(**kwargs):
+        server = FakeEStatServer(**kwargs).start()
+        servers.append(server)
+        configure_http_client(api_base_url=server.base_url, statmap_base_url=server.statmap_base_url,
+                              backoff_factor=0)
+        return server
+
+    yield _start
+    for server in servers:
+        server.stop()
+    configure_http_client(**original)
+
+
+@pytest.fixture
+def fake_server(server_factory):
+    """既定の設定の代替サーバー"""
+    return server_factory()
+
+
+def endpoint_requests(server, endpoint):
+    """代替サーバーが受けたエンドポイントごとのリクエストのパスを返す"""
+    return [path for path in server.request_log if path.split("?")[0].endswith(f"/{endpoint}")]
@@ -0,0 +1,625 @@
+import csv
+import hashlib
+import io
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import product
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import geopandas as gpd
+from shapely import geometry
+
+from e_stat.utils import http_get
+
+STATS_DATA_COLUMNS = [
+    "tab_code",
+    "表章項目",
+    "cat01_code",
+    "項目",
+    "area_code",
+    "地域",
+    "time_code",
+    "調査年",
+    "unit",
+    "value",
+    "annotation"]
+STATS_LIST_COLUMNS = [
+    "TABLE_INF", "STAT_CODE", "STAT_NAME", "GOV_ORG_CODE", "GOV_ORG_NAME", "TABULATION_CATEGORY",
+    "TABULATION_SUB_CATEGORY1", "TABULATION_SUB_CATEGORY2", "TABULATION_SUB_CATEGORY3", "TABULATION_SUB_CATEGORY4",
+    "TABULATION_SUB_CATEGORY5", "NO", "TITLE", "TABLE_CATEGORY", "TABLE_SUB_CATEGORY1", "TABLE_SUB_CATEGORY2",
+    "TABLE_SUB_CATEGORY3", "CYCLE", "SURVEY_DATE", "OPEN_DATE", "SMALL_AREA", "COLLECT_AREA",
+    "OVERALL_TOTAL_NUMBER", "UPDATED_DATE", "MAIN_CATEGORY_CODE", "MAIN_CATEGORY", "SUB_CATEGORY_CODE",
+    "SUB_CATEGORY"]
+META_INFO_COLUMNS = [
+    "CLASS_OBJ_ID", "CLASS_OBJ_NAME", "CLASS_CODE", "CLASS_NAME", "CLASS_LEVEL", "CLASS_UNIT", "CLASS_PARENT_CODE"]
+# 代替サーバーが応答するe-statAPIのエンドポイント
+API_ENDPOINTS = ("getSimpleStatsList", "getSimpleMetaInfo", "getSimpleStatsData")
+# 録画したレスポンスを再生するエンドポイントと録画ファイルの拡張子（dataは統計GISの境界データのダウンロード）
+RECORDED_ENDPOINTS = {
+    "getSimpleStatsList": ".csv",
+    "getSimpleMetaInfo": ".csv",
+    "getSimpleStatsData": ".csv",
+    "data": ".zip",
+}
+# appIdが不正な場合のe-statAPIのSTATUSとエラーメッセージ
+INVALID_APP_ID_ERROR = ("100", "認証に失敗しました。アプリケーションIDが正しく設定されているか確認してください。")
+# 存在しない統計表IDを指定した場合のe-statAPIのSTATUSとエラーメッセージ
+INVALID_STATS_ID_ERROR = ("100", "指定された統計表IDは存在しません。")
+
+
+def _csv_line(values):
+    """値のリストをダブルクォートで囲んだcsvの1行に変換する
+
+    Args:
+        values (list): 値のリスト
+
+    Returns:
+        str: csvの1行の文字列（改行付き）
+
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer, quoting=csv.QUOTE_ALL, lineterminator="\n").writerow(values)
+    return buffer.getvalue()
+
+
+def _section_header(params, *parameter_keys):
+    """RESULT・PARAMETERセクションの行を生成する
+
+    Args:
+        params (dict): クエリパラメータ
+        *parameter_keys (str): PARAMETERセクションに含めるパラメータ名
+
+    Returns:
+        list: csvの行の文字列のリスト
+
+    """
+    return [
+        _csv_line(["RESULT"]),
+        _csv_line(["STATUS", "ERROR_MSG", "DATE"]),
+        _csv_line(["0", "正常に終了しました。", "2020-12-01T00:00:00.000+09:00"]),
+        _csv_line(["PARAMETER"]),
+        _csv_line(["LANG", *(re.sub(r"(?<!^)(?=[A-Z])", "_", key).upper() for key in parameter_keys)]),
+        _csv_line(["J", *(params.get(key, "") for key in parameter_keys)])]
+
+
+def _error_response(status, error_message):
+    """エラー時のe-statAPIのレスポンス（ステータスコードは200で、RESULTセクションのみ）を生成する
+
+    Args:
+        status (str): STATUS（例: 100）
+        error_message (str): ERROR_MSG
+
+    Returns:
+        str: レスポンスボディ
+
+    """
+    return "".join([
+        _csv_line(["RESULT"]),
+        _csv_line(["STATUS", "ERROR_MSG", "DATE"]),
+        _csv_line([status, error_message, "2020-12-01T00:00:00.000+09:00"])])
+
+
+def recording_file_name(endpoint, params):
+    """リクエストに対応する録画ファイルの名称を返す
+
+    Args:
+        endpoint (str): エンドポイント（URLのパスの末尾）
+        params (dict): クエリパラメータ
+
+    Returns:
+        str: `{endpoint}-{パラメータのハッシュ}{拡張子}`
+
+    Notes:
+        appIdは録画した環境ごとに異なるためハッシュに含めない
+
+    """
+    query = "&".join(f"{k}={v}" for k, v in sorted(params.items()) if k != "appId")
+    digest = hashlib.sha1(query.encode("utf-8")).hexdigest()[:12]
+    return f"{endpoint}-{digest}{RECORDED_ENDPOINTS.get(endpoint, '.csv')}"
+
+
+def record_api_response(url, recordings_dir):
+    """実際のAPIのレスポンスを代替サーバーで再生できる録画ファイルとして保存する
+
+    Args:
+        url (str): リクエストするURL
+        recordings_dir (str): 録画ファイルを保存するディレクトリ
+
+    Returns:
+        Path: 録画ファイルのパス
+
+    """
+    parsed = urlparse(url)
+    params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+    res = http_get(url)
+    res.raise_for_status()
+    path = Path(recordings_dir) / recording_file_name(parsed.path.rstrip("/").split("/")[-1], params)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(res.content)
+    return path
+
+
+class _FakeEStatRequestHandler(BaseHTTPRequestHandler):
+    """e-statAPIの代替サーバーのリクエストハンドラ"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        """アクセスログを出力しない"""
+
+    def _send_body(self, status, body, headers, content_length):
+        """レスポンスを返す
+
+        Args:
+            status (int): ステータスコード
+            body (bytes): レスポンスボディ（HEADリクエストの場合は空）
+            headers (dict): レスポンスヘッダ
+            content_length (int): Content-Length
+
+        """
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(content_length))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        """エンドポイントごとにレスポンスを返す"""
+        fake_api = self.server.fake_api
+        start = time.perf_counter()
+        with fake_api.in_flight():
+            status, body, headers = fake_api.response(self.path, self.headers)
+        # クライアントがレスポンスを受け取った時点で記録が揃っているよう、送信前に記録する
+        fake_api.record_metrics(
+            self.command, self.path, self.headers, status, len(body), time.perf_counter() - start,
+            self.client_address)
+        try:
+            self._send_body(status, b"" if self.command == "HEAD" else body, headers, len(body))
+        except (BrokenPipeError, ConnectionResetError):
+            # タイムアウトしたクライアントが先に切断した場合
+            pass
+
+    do_HEAD = do_GET
+
+
+class _FakeEStatHTTPServer(ThreadingHTTPServer):
+    """クライアントの切断をエラーとして出力しないHTTPサーバー"""
+
+    def handle_error(self, request, client_address):
+        """キープアライブ中の接続がクライアントから切断された場合は何もしない"""
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+
+class FakeEStatServer:
+    """テスト・ベンチマーク用のe-statAPIのローカル代替サーバー"""
+
+    def __init__(
+            self,
+            total_rows=None,
+            page_size=100000,
+            shapefile_polygons=400,
+            stats_list_rows=100,
+            meta_class_rows=50,
+            latency=0.0,
+            error_status=503,
+            error_rate=0.0,
+            fail_first=0,
+            files=None,
+            app_id=None,
+            invalid_stats_ids=(),
+            seed=0,
+            recordings_dir=None,
+            host="127.0.0.1",
+            port=0):
+        """イニシャライザ
+
+        Args:
+            total_rows (int): 統計データの総件数（Noneならリクエストした地域・項目・年度の組み合わせ数）
+            page_size (int): 1レスポンスあたりの件数の上限（実APIは10万件）
+            shapefile_polygons (int): 境界データのshp（zip）の小地域のポリゴン数
+            stats_list_rows (int): 統計表情報の件数
+            meta_class_rows (int): メタ情報の分類事項ごとの件数
+            latency (float): 1リクエストごとに待機する秒数
+            error_status (int): エラーとして返すステータスコード
+            error_rate (float): エラーを返すリクエストの割合（0〜1）
+            fail_first (int): 最初のリクエストから指定した件数はerror_statusを返す（リトライの確認用）
+            files (dict): 境界データのダウンロードで返すファイルの内容（都道府県コードごと。無ければshpのzipを生成する）
+            app_id (str): 受け付けるappId（指定するとそれ以外のappIdにはSTATUS=100のエラーを返す）
+            invalid_stats_ids (list): メタ情報・統計データの取得でSTATUS=100のエラーを返す統計表ID
+            seed (int): エラーを返すリクエストを決める乱数のシード
+            recordings_dir (str): 録画したレスポンスのディレクトリ（録画があるリクエストは録画を返す）
+            host (str): 待ち受けるホスト
+            port (int): 待ち受けるポート（0なら空いているポートを使用）
+
+        """
+        self.total_rows = total_rows
+        self.page_size = page_size
+        self.shapefile_polygons = shapefile_polygons
+        self.stats_list_rows = stats_list_rows
+        self.meta_class_rows = meta_class_rows
+        self.latency = latency
+        self.error_status = error_status
+        self.error_rate = error_rate
+        self.fail_first = fail_first
+        self.files = dict(files or {})
+        self.app_id = app_id
+        self.invalid_stats_ids = set(invalid_stats_ids)
+        self.recordings_dir = Path(recordings_dir) if recordings_dir else None
+        self.request_log = []
+        self.request_headers = []
+        self.request_durations = []
+        self.client_addresses = set()
+        self.request_times = []
+        self.max_in_flight = 0
+        self.bytes_sent = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._shapefiles = {}
+        self._httpd = _FakeEStatHTTPServer((host, port), _FakeEStatRequestHandler)
+        self._httpd.fake_api = self
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """configure_http_client(api_base_url=...)に渡すベースURL"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/rest/3.0/app"
+
+    @property
+    def statmap_base_url(self):
+        """統計GISの境界データのダウンロードのベースURL"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/gis/statmap-search"
+
+    def start(self):
+        """別スレッドでサーバーを起動する
+
+        Returns:
+            FakeEStatServer: 自身
+
+        """
+        # 停止を待つ時間を短くするため、停止要求を確認する間隔を短くする
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """サーバーを停止する"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def reset_metrics(self):
+        """リクエストの記録を消去する"""
+        with self._lock:
+            self.request_log = []
+            self.request_headers = []
+            self.request_durations = []
+            self.client_addresses = set()
+            self.request_times = []
+            self.max_in_flight = 0
+            self.bytes_sent = 0
+
+    @contextmanager
+    def in_flight(self):
+        """リクエストの受信時刻と同時に処理しているリクエスト数の最大値を記録する"""
+        with self._lock:
+            self.request_times.append(time.monotonic())
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def record_metrics(self, method, path, headers, status, size, seconds, client_address):
+        """リクエストの記録を追加する
+
+        Args:
+            method (str): リクエストのメソッド
+            path (str): リクエストのパス
+            headers (dict): リクエストヘッダ
+            status (int): ステータスコード
+            size (int): レスポンスボディのバイト数
+            seconds (float): レスポンスを生成するまでの秒数（待機時間を含む）
+            client_address (tuple): クライアントの(ホスト, ポート)。コネクションごとに異なる
+
+        """
+        with self._lock:
+            self.request_log.append(path)
+            self.request_headers.append((method, path, dict(headers)))
+            self.request_durations.append((urlparse(path).path.split("/")[-1], status, seconds))
+            self.client_addresses.add(client_address)
+            self.bytes_sent += size
+
+    def _inject_error(self):
+        """最初のfail_first件とerror_rateの割合でTrueを返す"""
+        with self._lock:
+            if self.fail_first > 0:
+                self.fail_first -= 1
+                return True
+            if self.error_rate <= 0:
+                return False
+            return self._random.random() < self.error_rate
+
+    def _recorded_response(self, endpoint, params):
+        """録画したレスポンスを返す
+
+        Args:
+            endpoint (str): エンドポイント
+            params (dict): クエリパラメータ
+
+        Returns:
+            bytes: 録画したレスポンスボディ（無ければNone）
+
+        Notes:
+            パラメータごとの録画が無ければ`{endpoint}{拡張子}`の録画を全パラメータ共通で返す
+
+        """
+        if self.recordings_dir is None or endpoint not in RECORDED_ENDPOINTS:
+            return None
+        for file_name in (recording_file_name(endpoint, params), endpoint + RECORDED_ENDPOINTS[endpoint]):
+            path = self.recordings_dir / file_name
+            if path.is_file():
+                return path.read_bytes()
+        return None
+
+    def response(self, path, headers=None):
+        """リクエストのパスからレスポンスを生成する
+
+        Args:
+            path (str): クエリ文字列を含むリクエストのパス
+            headers (dict): リクエストヘッダ
+
+        Returns:
+            tuple: (ステータスコード, レスポンスボディ(bytes), レスポンスヘッダの辞書)
+
+        """
+        parsed = urlparse(path)
+        params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        endpoint = parsed.path.rstrip("/").split("/")[-1]
+        if self.latency:
+            time.sleep(self.latency)
+        if self._inject_error():
+            return self.error_status, b"injected error", {"Content-Type": "text/plain"}
+
+        csv_type = {"Content-Type": "text/csv; charset=UTF-8"}
+        # e-statAPIはエラーもステータスコード200で返し、RESULTセクションのSTATUSでエラーを示す
+        if endpoint in API_ENDPOINTS:
+            if self.app_id is not None and params.get("appId") != self.app_id:
+                return 200, _error_response(*INVALID_APP_ID_ERROR).encode("utf-8"), csv_type
+            if params.get("statsDataId") in self.invalid_stats_ids:
+                return 200, _error_response(*INVALID_STATS_ID_ERROR).encode("utf-8"), csv_type
+        body = self._recorded_response(endpoint, params)
+        if body is not None and endpoint != "data":
+            return 200, body, csv_type
+        if endpoint == "getSimpleStatsList":
+            return 200, self.stats_list_response(params).encode("utf-8"), csv_type
+        if endpoint == "getSimpleMetaInfo":
+            return 200, self.meta_info_response(params).encode("utf-8"), csv_type
+        if endpoint == "getSimpleStatsData":
+            return 200, self.stats_data_response(params).encode("utf-8"), csv_type
+        if endpoint == "data" and parsed.path.startswith("/gis/statmap-search"):
+            code = params.get("code", "00")
+            return self._file_response(
+                body if body is not None else self.file_body(code), f"A002005212015DDSWC{code}.zip", headers or {})
+        return 404, b"not found", {"Content-Type": "text/plain"}
+
+    def file_body(self, code):
+        """境界データのダウンロードで返すファイルの内容
+
+        Args:
+            code (str): 都道府県コード（2桁）
+
+        Returns:
+            bytes: filesに指定した内容（無ければ小地域のshpのzip）
+
+        """
+        return self.files.get(code) or self.shapefile_response(code)
+
+    def shapefile_response(self, code):
+        """統計GISの境界データのダウンロードを模した小地域のshpのzipを生成する
+
+        Args:
+            code (str): 都道府県コード（2桁）
+
+        Returns:
+            bytes: zipファイルの内容
+
+        Notes:
+            小地域は格子状のポリゴンで、10ポリゴンごとに市区町村を分ける。生成したzipは都道府県コードごとに使い回す
+
+        """
+        with self._lock:
+            if code in self._shapefiles:
+                return self._shapefiles[code]
+        side = max(1, int(self.shapefile_polygons ** 0.5))
+        records = []
+        for i in range(self.shapefile_polygons):
+            x, y = 139 + (i % side) * 0.01, 35 + (i // side) * 0.01
+            city = f"{101 + i // 10:03d}"
+            records.append({
+                "KEY_CODE": f"{code}{city}{i:06d}", "PREF": code, "CITY": city,
+                "PREF_NAME": f"都道府県{code}", "CITY_NAME": f"市区町村{city}", "S_NAME": f"町丁{i}",
+                "geometry": geometry.box(x, y, x + 0.01, y + 0.01)})
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            shp_dir = Path(tmp_dir)
+            gpd.GeoDataFrame(records, crs="EPSG:4612").to_file(str(shp_dir / f"h27ka{code}.shp"))
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, "w") as zip_file:
+                for file in sorted(shp_dir.iterdir()):
+                    zip_file.write(file, file.name)
+        with self._lock:
+            self._shapefiles[code] = buffer.getvalue()
+        return self._shapefiles[code]
+
+    def _file_response(self, body, file_name, headers):
+        """ETagによる条件付きリクエスト・Rangeリクエストに対応したファイルのレスポンスを生成する
+
+        Args:
+            body (bytes): ファイルの内容
+            file_name (str): Content-Dispositionのファイル名
+            headers (dict): リクエストヘッダ
+
+        Returns:
+            tuple: (ステータスコード, レスポンスボディ(bytes), レスポンスヘッダの辞書)
+
+        """
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        response_headers = {
+            "Content-Type": "application/zip",
+            "Content-Disposition": f"attachment; filename*=UTF-8''{file_name}",
+            "ETag": etag,
+            "Accept-Ranges": "bytes"}
+        if headers.get("If-None-Match") == etag:
+            return 304, b"", response_headers
+        range_header = headers.get("Range", "")
+        if range_header.startswith("bytes=") and headers.get("If-Range", etag) == etag:
+            start = int(range_header[len("bytes="):].split("-")[0])
+            if start >= len(body):
+                return 416, b"", {**response_headers, "Content-Range": f"bytes */{len(body)}"}
+            response_headers["Content-Range"] = f"bytes {start}-{len(body) - 1}/{len(body)}"
+            return 206, body[start:], response_headers
+        return 200, body, response_headers
+
+    def _stats_data_row(self, index, combinations):
+        """統計データのindex番目の行を生成する
+
+        Args:
+            index (int): 0始まりの行番号
+            combinations (list): (項目, 地域, 時間軸)コードの組み合わせのリスト
+
+        Returns:
+            list: 1行分の値のリスト
+
+        """
+        cat01_code, area_code, time_code = combinations[index % len(combinations)]
+        tab_code = str(index // len(combinations)).zfill(3)
+        return [tab_code, f"表章項目{tab_code}",
+                cat01_code, f"項目{cat01_code}",
+                area_code, f"地域{area_code}",
+                time_code, f"{time_code[:4]}年度",
+                "人", str(index), ""]
+
+    def stats_list_response(self, params):
+        """getSimpleStatsListのセクションヘッダ付きcsvレスポンスを生成する
+
+        Args:
+            params (dict): クエリパラメータ
+
+        Returns:
+            str: レスポンスボディ
+
+        """
+        stats_code = params.get("statsCode", "00200502")
+        lines = _section_header(params, "statsCode")
+        # 統計表の更新日付は全て2020-03-06とし、updatedDate（yyyymmdd-yyyymmdd）の範囲外なら該当データ無しを返す
+        updated_from, _, updated_to = params.get("updatedDate", "").partition("-")
+        if not (updated_from or "0") <= "20200306" <= (updated_to or "99999999"):
+            lines[2] = _csv_line(["1", "正常に終了しましたが、該当データはありませんでした。", "2020-12-01T00:00:00.000+09:00"])
+            return "".join(lines)
+        lines += [
+            _csv_line(["RESULT_INF"]),
+            _csv_line(["NUMBER", "FROM_NUMBER", "TO_NUMBER"]),
+            _csv_line([str(self.stats_list_rows), "1", str(self.stats_list_rows)]),
+            _csv_line(["STAT_INF"]),
+            _csv_line(STATS_LIST_COLUMNS)]
+        for i in range(self.stats_list_rows):
+            # 政府統計コードごとに異なる統計表IDにする（実際の統計表IDは10桁）
+            table_id = f"{stats_code}{i + 1:05d}"
+            row = dict.fromkeys(STATS_LIST_COLUMNS, "")
+            row.update({
+                "TABLE_INF": table_id, "STAT_CODE": stats_code, "STAT_NAME": f"統計{stats_code}",
+                "GOV_ORG_CODE": "00200", "GOV_ORG_NAME": "総務省", "TABULATION_CATEGORY": "市区町村データ",
+                "NO": table_id, "TITLE": f"統計表{table_id}", "CYCLE": "年度次", "SURVEY_DATE": "0",
+                "OPEN_DATE": "2020-03-06", "SMALL_AREA": "0", "COLLECT_AREA": "市区町村",
+                "OVERALL_TOTAL_NUMBER": "100000", "UPDATED_DATE": "2020-03-06",
+                "MAIN_CATEGORY_CODE": "99", "MAIN_CATEGORY": "その他", "SUB_CATEGORY_CODE": "99",
+                "SUB_CATEGORY": "その他"})
+            lines.append(_csv_line(row.values()))
+        return "".join(lines)
+
+    def meta_info_response(self, params):
+        """getSimpleMetaInfoのセクションヘッダ付きcsvレスポンスを生成する
+
+        Args:
+            params (dict): クエリパラメータ
+
+        Returns:
+            str: レスポンスボディ
+
+        Notes:
+            分類事項は表章項目(tab)・項目(cat01)・地域(area)・時間軸(time)で、それぞれmeta_class_rows件とする
+
+        """
+        lines = _section_header(params, "statsDataId")
+        lines += [_csv_line(["CLASS_INF"]), _csv_line(META_INFO_COLUMNS)]
+        class_objects = [
+            ("tab", "表章項目", lambda i: f"{i:03d}"),
+            ("cat01", "項目", lambda i: f"A{1101 + i}"),
+            ("area", "地域", lambda i: f"01{100 + i:03d}"),
+            ("time", "調査年", lambda i: f"{2000 + i}100000")]
+        for class_obj_id, class_obj_name, code in class_objects:
+            for i in range(self.meta_class_rows):
+                lines.append(_csv_line([
+                    class_obj_id, class_obj_name, code(i), f"{class_obj_name}{code(i)}", "1", "人", ""]))
+        return "".join(lines)
+
+    def stats_data_response(self, params):
+        """getSimpleStatsDataのセクションヘッダ付きcsvレスポンスを生成する
+
+        Args:
+            params (dict): クエリパラメータ
+
+        Returns:
+            str: レスポンスボディ
+
+        Notes:
+            sectionHeaderFlg=2の場合は、実APIと同じくVALUEセクションのヘッダと行のみを返す。
+            総件数が0件の場合は、実APIと同じくVALUEセクションの無い該当データ無し（STATUS=1）のレスポンスを返す
+
+        """
+        combinations = list(product(
+            params.get("cdCat01", "A1101").split(","),
+            params.get("cdArea", "00000").split(","),
+            params.get("cdTime", "2000100000").split(",")))
+        total = len(combinations) if self.total_rows is None else self.total_rows
+        start = int(params.get("startPosition", 1))
+        stop = min(total, start - 1 + self.page_size)
+        next_key = str(stop + 1) if stop < total else ""
+        rows = [_csv_line(self._stats_data_row(i, combinations)) for i in range(start - 1, stop)]
+        if params.get("sectionHeaderFlg") == "2":
+            return "".join([_csv_line(STATS_DATA_COLUMNS), *rows])
+
+        lines = _section_header({**params, "startPosition": str(start)}, "statsDataId", "startPosition")
+        if total == 0:
+            lines[2] = _csv_line(["1", "正常に終了しましたが、該当データはありませんでした。", "2020-12-01T00:00:00.000+09:00"])
+            return "".join(lines)
+        lines += [
+            _csv_line(["RESULT_INF"]),
+            _csv_line(["TOTAL_NUMBER", "FROM_NUMBER", "TO_NUMBER", "NEXT_KEY"]),
+            _csv_line([str(total), str(start), str(stop), next_key]),
+            _csv_line(["VALUE"]),
+            _csv_line(STATS_DATA_COLUMNS)]
+        return "".join(lines + rows)
@@ -0,0 +1,90 @@
+import pytest
+
+from e_stat.lib import AreaCode, PrefCode
+from e_stat.lib.area_index import get_area_index, normalize_search_text
+
+
+@pytest.fixture(scope="module")
+def index():
+    return get_area_index()
+
+
+def test_get_area_index_is_cached(index):
+    """同じファイルに対しては同じ索引を返す"""
+    assert get_area_index() is index
+    assert AreaCode().index is index
+
+
+def test_pref_code_and_name(index):
+    """都道府県コード⇔都道府県名を変換できる"""
+    assert index.pref_code_to_name(1) == "北海道"
+    assert index.pref_code_to_name("13") == "東京都"
+    assert index.pref_name_to_code("沖縄県") == 47
+    assert index.pref_codes() == list(range(1, 48))
+
+
+def test_pref_code_unknown_exits():
+    """存在しない都道府県は異常終了する"""
+    with pytest.raises(SystemExit):
+        PrefCode().code_to_name(99)
+    with pytest.raises(SystemExit):
+        PrefCode().name_to_code("札幌県")
+
+
+def test_area_levels(index):
+    """政令市・区・市区町村を判別し、区は政令市名を付けた名称になる"""
+    assert index.area("01100")["level"] == "designated_city"
+    assert index.area("01101")["level"] == "ward"
+    assert index.area("01202")["level"] == "municipality"
+    assert index.area("07301")["level"] == "municipality"
+    assert index.area_code_to_name("01101") == "札幌市中央区"
+    assert index.area_code_to_name("07301") == "桑折町"
+
+
+def test_area_name_to_codes(index):
+    """同名の市区町村は全ての標準地域コードを返す"""
+    assert index.area_name_to_codes("府中市") == ["13206", "34208"]
+    assert index.area_name_to_codes("札幌市中央区") == ["01101"]
+    assert index.area_name_to_codes("存在しない市") == []
+
+
+@pytest.mark.parametrize("word", ["さっぽろ", "サッポロ", "ｻｯﾎﾟﾛ", "札幌"])
+def test_search_is_kana_and_width_insensitive(index, word):
+    """ひらがな・カタカナ・半角カナ・漢字のいずれでも前方一致で検索できる"""
+    codes = index.search(word)
+    assert "01100" in codes
+    assert "01101" in codes
+
+
+def test_search_pref_filter(index):
+    """都道府県で絞り込める"""
+    assert index.search("だて") == ["01233", "07213"]
+    assert index.search("だて", pref_code=7) == ["07213"]
+    assert index.search("存在しない") == []
+
+
+def test_children_and_parent(index):
+    """都道府県→政令市・市区町村、政令市→区の階層をたどれる"""
+    hokkaido = index.children(1)
+    assert "01100" in hokkaido
+    assert "01202" in hokkaido
+    assert "01101" not in hokkaido
+    assert index.municipalities("01") == hokkaido
+    assert index.wards("01100") == [f"011{i:02d}" for i in range(1, 11)]
+    assert index.children("01202") == []
+    assert index.parent("01101") == "01100"
+    assert index.parent("01100") == "01"
+
+
+def test_area_code_search_rows():
+    """AreaCodeの検索は索引の結果をcsvの行として返す"""
+    area_code = AreaCode()
+    assert list(area_code.search("ふちゅう")["標準地域コード"]) == ["13206", "34208", "34302"]
+    assert list(area_code._text_search("標準地域コード", "01101")["市区町村"]) == ["中央区"]
+    assert area_code.code_to_name("01101") == "札幌市中央区"
+    assert area_code.children("01100")[0] == "01101"
+
+
+def test_normalize_search_text():
+    """全角英数・カタカナ・大文字を正規化する"""
+    assert normalize_search_text(" ＡＢＣカナ ") == "abcかな"
@@ -0,0 +1,61 @@
+import shutil
+
+import pandas as pd
+import pytest
+
+from e_stat.utils import asset_bundle, build_asset_bundle, read_asset_columns, read_asset_df, read_asset_json
+from e_stat.utils.asset_bundle import ASSET_BUNDLE_FILE_NAME, BUNDLED_ASSETS, DEFAULT_ASSET_DIR
+
+
+@pytest.fixture
+def asset_dir(tmp_path):
+    """アセットをコピーしてバンドルを作成したディレクトリ"""
+    for file_name in BUNDLED_ASSETS:
+        shutil.copy2(f"{DEFAULT_ASSET_DIR}/{file_name}", tmp_path / file_name)
+    build_asset_bundle(str(tmp_path))
+    return tmp_path
+
+
+def _read_source_df(path, encoding, sep=","):
+    return pd.read_csv(path, encoding=encoding, sep=sep, dtype=str)
+
+
+@pytest.mark.parametrize("file_name", ["standard_area_codes.csv", "government_statistics_codes.tsv",
+                                       "default_stats_table_ids.csv"])
+def test_bundle_matches_source(asset_dir, file_name):
+    """バンドルから読み込んだ表はpd.read_csv(dtype=str)と同じになる"""
+    kind, encoding = BUNDLED_ASSETS[file_name]
+    sep = "\t" if kind == "tsv" else ","
+    path = asset_dir / file_name
+
+    assert asset_bundle._fresh_bundle(path) is not None
+    pd.testing.assert_frame_equal(read_asset_df(str(path), encoding, sep), _read_source_df(path, encoding, sep),
+                                  check_dtype=False)
+
+
+def test_bundle_json_and_columns(asset_dir):
+    """jsonと指定したカラムのみを読み込める"""
+    assert read_asset_json(str(asset_dir / "pref_code.json"))[0] == {"prefCode": 1, "prefName": "北海道"}
+
+    columns = read_asset_columns(str(asset_dir / "standard_area_codes.csv"), "shift-jis", columns=["標準地域コード"])
+    assert list(columns) == ["標準地域コード"]
+    assert columns["標準地域コード"][:2] == ["01100", "01101"]
+
+
+def test_stale_bundle_falls_back_to_source(asset_dir):
+    """元ファイルが更新されたらバンドルを使わず元ファイルから読み込む"""
+    path = asset_dir / "default_stats_table_ids.csv"
+    with path.open("a", encoding="utf-8") as file:
+        file.write(",".join(["0000000000"] * len(_read_source_df(path, "utf-8").columns)) + "\n")
+
+    assert asset_bundle._fresh_bundle(path) is None
+    assert read_asset_df(str(path))["TABLE_INF"].iloc[-1] == "0000000000"
+
+
+def test_unsupported_bundle_falls_back_to_source(tmp_path):
+    """形式の異なるバンドルは使わずに元ファイルから読み込む"""
+    shutil.copy2(f"{DEFAULT_ASSET_DIR}/pref_code.json", tmp_path / "pref_code.json")
+    (tmp_path / ASSET_BUNDLE_FILE_NAME).write_bytes(b"NOTABUNDLE" + b"\x00" * 16)
+
+    assert asset_bundle._fresh_bundle(tmp_path / "pref_code.json") is None
+    assert len(read_asset_json(str(tmp_path / "pref_code.json"))) == 47
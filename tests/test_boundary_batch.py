@@ -0,0 +1,44 @@
+import geopandas as gpd
+import pytest
+
+from e_stat.lib import AreaCode, BoundaryBatch
+
+
+@pytest.fixture
+def batch_server(server_factory, monkeypatch):
+    """都道府県コード02のダウンロードは404、03は壊れたzipを返す代替サーバー"""
+    server = server_factory(shapefile_polygons=20, files={"03": b"not a zip file"})
+
+    def polygon_of_shp_url(self, area_code):
+        endpoint = "missing" if area_code == "02" else "data"
+        return f"{server.statmap_base_url}/{endpoint}?code={area_code}"
+
+    monkeypatch.setattr(AreaCode, "polygon_of_shp_url", polygon_of_shp_url)
+    return server
+
+
+def test_failures_are_isolated_per_prefecture(batch_server, tmp_path):
+    """ダウンロード・変換に失敗した都道府県があっても、他の都道府県は変換する"""
+    output_dir = tmp_path / "created"
+    batch = BoundaryBatch(
+        ["北海道", "青森県", "岩手県"], str(tmp_path / "download"), str(output_dir), convert_workers=2)
+    national_gdf = batch.run(merge=True)
+
+    assert sorted(batch.failures) == ["02", "03"]
+    assert batch.failures["02"].startswith("ダウンロード失敗")
+    assert batch.failures["03"].startswith("変換失敗")
+    assert (output_dir / "boundary_01.geojson").is_file()
+    assert not (output_dir / "boundary_03.geojson").exists()
+    # 全国データには変換に成功した都道府県のみ含む
+    assert set(national_gdf["PREF"]) == {"01"}
+    assert len(gpd.read_file(str(output_dir / "boundary.geojson"))) == len(national_gdf) == 2
+
+
+def test_existing_download_is_reused(batch_server, tmp_path):
+    """ダウンロード済みの都道府県は再取得しない"""
+    batch = BoundaryBatch(["北海道"], str(tmp_path / "download"), str(tmp_path / "created"))
+    batch.download()
+    batch_server.reset_metrics()
+    BoundaryBatch(["北海道"], str(tmp_path / "download"), str(tmp_path / "created")).download()
+
+    assert not batch_server.request_log
@@ -0,0 +1,67 @@
+import geopandas as gpd
+import pytest
+from shapely.geometry import box
+
+from e_stat.lib import BOUNDARY_LEVELS, convert_boundary_levels, derive_boundary_levels
+from e_stat.lib.boundary_levels import level_file_stem
+
+
+@pytest.fixture
+def municipality_gdf():
+    """札幌市の区2つ、函館市、青森市の市区町村単位の境界データ"""
+    rows = [("01", "101", "中央区"), ("01", "102", "北区"), ("01", "202", "函館市"), ("02", "201", "青森市")]
+    return gpd.GeoDataFrame(
+        [{"AREA_CODE": pref + city, "PREF": pref, "CITY": city, "PREF_NAME": f"都道府県{pref}",
+          "CITY_NAME": name, "geometry": box(i, 0, i + 1, 1)} for i, (pref, city, name) in enumerate(rows)],
+        crs="EPSG:4612")
+
+
+def test_designated_city_merges_wards(municipality_gdf):
+    """政令市の区のみを政令市に結合し、それ以外の市区町村はそのまま残す"""
+    gdfs = derive_boundary_levels(municipality_gdf, ("designated_city",))
+
+    designated_city_gdf = gdfs["designated_city"]
+    assert list(gdfs) == ["designated_city"]
+    assert list(designated_city_gdf["AREA_CODE"]) == ["01100", "01202", "02201"]
+    sapporo = designated_city_gdf.iloc[0]
+    assert (sapporo["CITY"], sapporo["CITY_NAME"]) == ("100", "札幌市")
+    assert sapporo.geometry.equals(box(0, 0, 2, 1))
+    assert designated_city_gdf.iloc[1].geometry.equals(box(2, 0, 3, 1))
+
+
+@pytest.mark.parametrize("engine", ["geopandas", "coverage"])
+def test_pref_from_designated_city(municipality_gdf, engine):
+    """都道府県単位は1つ下の階層から結合し、面積は市区町村単位と一致する"""
+    gdfs = derive_boundary_levels(municipality_gdf, ("pref", "designated_city", "municipality"), engine)
+
+    assert list(gdfs) == list(BOUNDARY_LEVELS)
+    pref_gdf = gdfs["pref"]
+    assert list(pref_gdf.columns) == ["AREA_CODE", "PREF", "PREF_NAME", "geometry"]
+    assert list(pref_gdf["AREA_CODE"]) == ["01000", "02000"]
+    assert sum(g.area for g in pref_gdf.geometry) == pytest.approx(sum(g.area for g in municipality_gdf.geometry))
+    assert pref_gdf.iloc[0].geometry.equals(box(0, 0, 3, 1))
+
+
+def test_level_file_stem():
+    """市区町村単位以外は階層名を付けたファイル名になる"""
+    assert level_file_stem("boundary", "municipality") == "boundary"
+    assert level_file_stem("boundary", "pref") == "boundary_pref"
+
+
+def test_convert_boundary_levels(server_factory, tmp_path):
+    """小地域のshpから全階層を作成し、階層ごとのファイルを書き出す"""
+    # 札幌市の4つの区（01101〜01104）の小地域
+    server = server_factory(shapefile_polygons=40)
+    zip_path = tmp_path / "h27ka01.zip"
+    zip_path.write_bytes(server.shapefile_response("01"))
+    output_dir = tmp_path / "created"
+
+    gdfs = convert_boundary_levels(zip_path, str(output_dir), formats=("geojson",),
+                                   levels=("designated_city", "pref"))
+
+    assert len(gdfs["municipality"]) == 4
+    assert list(gdfs["designated_city"]["AREA_CODE"]) == ["01100"]
+    assert list(gdfs["pref"]["AREA_CODE"]) == ["01000"]
+    for stem in ("boundary", "boundary_designated_city", "boundary_pref"):
+        assert (output_dir / f"{stem}.geojson").is_file()
+    assert len(gpd.read_file(str(output_dir / "boundary_designated_city.geojson"))) == 1
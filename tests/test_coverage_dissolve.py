@@ -0,0 +1,66 @@
+import geopandas as gpd
+import pandas as pd
+import pytest
+from shapely.geometry import box
+
+from e_stat.lib import GdfDissolve
+from e_stat.utils import coverage_dissolve, coverage_union, group_positions
+
+
+@pytest.fixture
+def cells_gdf():
+    """格子状の小地域を市区町村ごとにまとめる前のgdf（欠損値のキーを含む）"""
+    rows = []
+    for i in range(12):
+        for j in range(12):
+            area_code = None if (i, j) == (0, 0) else f"01{(i // 4) * 3 + j // 4:03d}"
+            rows.append({"AREA_CODE": area_code, "CITY_NAME": f"市{area_code}", "KEY_CODE": f"{i:02d}{j:02d}",
+                         "geometry": box(i, j, i + 1, j + 1)})
+    return gpd.GeoDataFrame(rows, crs="EPSG:4612")
+
+
+def _assert_same_dissolve(result, expected):
+    assert list(result.index) == list(expected.index)
+    assert list(result.columns) == list(expected.columns)
+    assert result.crs == expected.crs
+    pd.testing.assert_frame_equal(pd.DataFrame(result.drop(columns="geometry")),
+                                  pd.DataFrame(expected.drop(columns="geometry")))
+    for a, b in zip(result.geometry, expected.geometry):
+        assert a.symmetric_difference(b).area < 1e-9
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_coverage_dissolve_matches_geopandas(cells_gdf, workers):
+    """GeoDataFrame.dissolveと同じ形・ジオメトリになる（プロセスプールを使う場合も同じ）"""
+    result = coverage_dissolve(cells_gdf, "AREA_CODE", workers=workers)
+
+    expected = cells_gdf.dissolve(by="AREA_CODE")
+    _assert_same_dissolve(result, expected)
+    assert len(result) == 9
+    assert all(g.geom_type == "Polygon" for g in result.geometry)
+
+
+def test_gdf_dissolve_engine(cells_gdf):
+    """GdfDissolve.dissolve_polyはengineに関わらず同じ結果になる"""
+    by_geopandas = GdfDissolve(cells_gdf, ["AREA_CODE", "CITY_NAME", "geometry"])
+    by_geopandas.dissolve_poly("AREA_CODE")
+    by_coverage = GdfDissolve(cells_gdf, ["AREA_CODE", "CITY_NAME", "geometry"])
+    by_coverage.dissolve_poly("AREA_CODE", engine="coverage")
+
+    _assert_same_dissolve(by_coverage.new_gdf, by_geopandas.new_gdf)
+
+
+def test_group_positions():
+    """キーの昇順にグループを作り、欠損値のキーは除く"""
+    keys, positions = group_positions(pd.Series(["b", "a", None, "b", "a"]))
+
+    assert keys == ["a", "b"]
+    assert [list(p) for p in positions] == [[1, 4], [0, 3]]
+
+
+def test_coverage_union_falls_back_on_overlap():
+    """重なるポリゴンが含まれていてもunary_unionと同じ結果になる"""
+    merged = coverage_union([box(0, 0, 2, 1), box(1, 0, 3, 1)])
+
+    assert merged.is_valid
+    assert merged.area == pytest.approx(3)
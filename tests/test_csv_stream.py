@@ -0,0 +1,74 @@
+import io
+
+import pandas as pd
+import pytest
+
+from e_stat.utils import build_stats_data_url, csv_string_to_df, fetch_all_stats_data_pages, http_get, \
+    iter_csv_chunks, iter_stats_data_pages, read_section_csv, read_until_section, split_stats_data_response
+from tests.conftest import APP_ID
+
+AREAS = [f"01{i:03d}" for i in range(100, 125)]
+CLASS_CODES = ["A1101", "A1102", "A1301"]
+YEARS = [2000, 2005]
+
+
+def _url():
+    return build_stats_data_url(APP_ID, "0000020201", AREAS, CLASS_CODES, YEARS)
+
+
+def _read_with_regex(url):
+    """ストリーム化する前の方式（レスポンス全体を正規表現で分割してStringIOで読み込む）で全ページを取得する"""
+    pages = []
+    page_url = url
+    while True:
+        csv_str, next_key = split_stats_data_response(http_get(page_url).text)
+        pages.append(csv_string_to_df(csv_str))
+        if next_key is None:
+            return pd.concat(pages, ignore_index=True)
+        page_url = f"{url}&startPosition={next_key}"
+
+
+def test_stream_matches_regex_path(server_factory):
+    """ストリームから読み込んだ結果は従来の方式と一致する"""
+    server_factory(page_size=40)
+
+    expected = _read_with_regex(_url())
+    streamed = fetch_all_stats_data_pages(_url())
+
+    assert len(expected) == len(AREAS) * len(CLASS_CODES) * len(YEARS)
+    pd.testing.assert_frame_equal(streamed, expected)
+
+
+def test_stream_chunks(server_factory):
+    """ページをまたいで指定行数ずつのチャンクとして返す"""
+    server = server_factory(page_size=100)
+
+    chunks = list(iter_stats_data_pages(_url(), chunk_rows=30))
+
+    assert [len(chunk) for chunk in chunks] == [30, 30, 30, 10, 30, 20]
+    assert len(server.request_log) == 2
+
+
+def test_read_until_section():
+    """見出し行の直後まで読み進め、それより前のセクションヘッダを返す"""
+    stream = io.StringIO('"RESULT"\r\n"STATUS"\r\n"0"\r\n"VALUE"\r\n"a","b"\r\n"1","2"\r\n')
+
+    header_text, found = read_until_section(stream, "VALUE")
+
+    assert found
+    assert header_text == '"RESULT"\r\n"STATUS"\r\n"0"\r\n'
+    assert [list(chunk["a"]) for chunk in iter_csv_chunks(stream)] == [["1"]]
+
+
+def test_read_until_section_not_found():
+    """見出し行が無ければ全体をセクションヘッダとして返す"""
+    stream = io.StringIO('"RESULT"\n"STATUS"\n"1"\n')
+
+    assert read_until_section(stream, "VALUE") == ('"RESULT"\n"STATUS"\n"1"\n', False)
+    assert list(iter_csv_chunks(stream)) == []
+
+
+def test_read_section_csv_missing_section_exits(fake_server):
+    """指定セクションが無いレスポンスは異常終了する"""
+    with pytest.raises(SystemExit):
+        read_section_csv(_url(), "CLASS_INF")
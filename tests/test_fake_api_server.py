@@ -0,0 +1,86 @@
+import io
+
+import pandas as pd
+import pytest
+
+from e_stat.utils import api_endpoint_url, http_get
+from tests.conftest import APP_ID
+from tests.fake_api_server import recording_file_name
+
+
+def _get(endpoint, **params):
+    res = http_get(api_endpoint_url(endpoint), params={"appId": APP_ID, "lang": "J", **params})
+    res.raise_for_status()
+    return res.text
+
+
+def _section_df(text, section):
+    """指定したセクション以降のcsvをデータフレームに変換する"""
+    return pd.read_csv(io.StringIO(text.split(f'"{section}"\n', 1)[1]), dtype=str)
+
+
+def test_stats_list(server_factory):
+    """getSimpleStatsListは政府統計コードごとの統計表IDをstats_list_rows件返す"""
+    server_factory(stats_list_rows=3)
+
+    df = _section_df(_get("getSimpleStatsList", statsCode="00200502"), "STAT_INF")
+
+    assert list(df["TABLE_INF"]) == ["0020050200001", "0020050200002", "0020050200003"]
+    assert set(df["STAT_CODE"]) == {"00200502"}
+
+
+def test_stats_list_updated_date(fake_server):
+    """updatedDateの範囲外なら該当データ無し（STATUS=1）を返す"""
+    text = _get("getSimpleStatsList", statsCode="00200502", updatedDate="20210101-")
+
+    assert '"1","正常に終了しましたが、該当データはありませんでした。"' in text
+    assert '"STAT_INF"' not in text
+
+
+def test_meta_info(server_factory):
+    """getSimpleMetaInfoは分類事項ごとにmeta_class_rows件の分類を返す"""
+    server_factory(meta_class_rows=2)
+
+    df = _section_df(_get("getSimpleMetaInfo", statsDataId="0000020201"), "CLASS_INF")
+
+    assert list(df["CLASS_OBJ_ID"]) == ["tab", "tab", "cat01", "cat01", "area", "area", "time", "time"]
+    assert list(df[df["CLASS_OBJ_ID"] == "cat01"]["CLASS_CODE"]) == ["A1101", "A1102"]
+
+
+def test_error_rate_is_reproducible(server_factory):
+    """error_rateの割合でエラーを返し、同じseedなら同じリクエストでエラーになる"""
+    statuses = []
+    for _ in range(2):
+        server = server_factory(error_rate=0.5, seed=1)
+        statuses.append([server.response("/rest/3.0/app/getSimpleStatsList?statsCode=1")[0] for _ in range(20)])
+
+    assert statuses[0] == statuses[1]
+    assert 0 < statuses[0].count(503) < 20
+
+
+@pytest.mark.parametrize("params", [{"statsCode": "00200502"}, {"statsCode": "00200502", "appId": "other"}])
+def test_replay_recording(server_factory, tmp_path, params):
+    """録画があるリクエストはappIdに関わらず録画したレスポンスを返す"""
+    (tmp_path / recording_file_name("getSimpleStatsList", {"lang": "J", "statsCode": "00200502"})).write_text(
+        "recorded", encoding="utf-8")
+    server_factory(recordings_dir=str(tmp_path))
+
+    assert _get("getSimpleStatsList", **params) == "recorded"
+    assert _get("getSimpleStatsList", statsCode="00200503") != "recorded"
+
+
+def test_replay_default_recording(server_factory, tmp_path):
+    """パラメータごとの録画が無ければエンドポイント共通の録画を返す"""
+    (tmp_path / "getSimpleMetaInfo.csv").write_text("recorded", encoding="utf-8")
+    server_factory(recordings_dir=str(tmp_path))
+
+    assert _get("getSimpleMetaInfo", statsDataId="0000020201") == "recorded"
+
+
+def test_recording_file_name_ignores_app_id():
+    """録画ファイル名はappIdとパラメータの順序に依存しない"""
+    name = recording_file_name("getSimpleMetaInfo", {"statsDataId": "0000020201", "lang": "J", "appId": "a"})
+
+    assert name == recording_file_name("getSimpleMetaInfo", {"lang": "J", "statsDataId": "0000020201"})
+    assert name.startswith("getSimpleMetaInfo-") and name.endswith(".csv")
+    assert recording_file_name("data", {"code": "13"}).endswith(".zip")
@@ -0,0 +1,124 @@
+import hashlib
+import json
+
+import pytest
+
+from e_stat.utils import download_file
+from e_stat.utils import file_download
+
+FILE_NAME = "A002005212015DDSWC13.zip"
+
+
+@pytest.fixture
+def download_url(fake_server):
+    return f"{fake_server.statmap_base_url}/data?dlserveyId=A002005212015&code=13&coordSys=1&format=shape"
+
+
+def _state(dir_path):
+    return json.loads(next((dir_path / file_download.DOWNLOAD_STATE_DIR).glob("*.json")).read_text("utf-8"))
+
+
+def _requests(server):
+    return [(method, headers) for method, _, headers in server.request_headers]
+
+
+def test_download(fake_server, download_url, tmp_path):
+    """Content-Dispositionのファイル名で保存し、サイズ・ETag・チェックサムを記録する"""
+    body = fake_server.file_body("13")
+    path = download_file(download_url, str(tmp_path))
+
+    assert path == tmp_path / FILE_NAME
+    assert path.read_bytes() == body
+    assert not list(tmp_path.glob("*.part"))
+    state = _state(tmp_path)
+    assert state["size"] == len(body)
+    assert state["sha256"] == hashlib.sha256(body).hexdigest()
+    assert state["etag"]
+
+
+def test_not_modified(fake_server, download_url, tmp_path):
+    """サーバー上のファイルが更新されていなければ304で再取得しない"""
+    download_file(download_url, str(tmp_path))
+    path = download_file(download_url, str(tmp_path))
+
+    assert path.read_bytes() == fake_server.file_body("13")
+    statuses = [status for _, status, _ in fake_server.request_durations]
+    assert statuses == [200, 304]
+    assert _requests(fake_server)[1][1]["If-None-Match"] == _state(tmp_path)["etag"]
+
+
+def test_modified_on_server(fake_server, download_url, tmp_path):
+    """サーバー上のファイルが更新されていれば再取得する"""
+    download_file(download_url, str(tmp_path))
+    fake_server.files["13"] = b"updated"
+    path = download_file(download_url, str(tmp_path))
+
+    assert path.read_bytes() == b"updated"
+    assert [status for _, status, _ in fake_server.request_durations] == [200, 200]
+
+
+def test_resume(fake_server, download_url, tmp_path):
+    """中断した.partファイルはRangeリクエストで続きから取得する"""
+    body = fake_server.file_body("13")
+    download_file(download_url, str(tmp_path))
+    path = tmp_path / FILE_NAME
+    path.rename(tmp_path / (FILE_NAME + ".part"))
+    (tmp_path / (FILE_NAME + ".part")).write_bytes(body[:1000])
+    fake_server.reset_metrics()
+    download_file(download_url, str(tmp_path))
+
+    assert path.read_bytes() == body
+    assert [status for _, status, _ in fake_server.request_durations] == [206]
+    assert _requests(fake_server)[0][1]["Range"] == "bytes=1000-"
+    assert _state(tmp_path)["sha256"] == hashlib.sha256(body).hexdigest()
+
+
+def test_complete_part_is_finished_on_416(fake_server, download_url, tmp_path):
+    """取得済みの.partファイルに対する416はダウンロード完了として扱う"""
+    body = fake_server.file_body("13")
+    download_file(download_url, str(tmp_path))
+    (tmp_path / FILE_NAME).rename(tmp_path / (FILE_NAME + ".part"))
+    fake_server.reset_metrics()
+    path = download_file(download_url, str(tmp_path))
+
+    assert path.read_bytes() == body
+    assert [status for _, status, _ in fake_server.request_durations] == [416]
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_checksum_mismatch(fake_server, download_url, tmp_path):
+    """チェックサムが一致しなければ.partファイルを削除して異常終了する"""
+    with pytest.raises(SystemExit):
+        download_file(download_url, str(tmp_path), expected_sha256="0" * 64)
+
+    assert not (tmp_path / FILE_NAME).exists()
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_no_overwrite_skips_request(fake_server, download_url, tmp_path, monkeypatch):
+    """overwrite=Falseでダウンロード済みなら、チェックサムを計算せずリクエストもしない"""
+    download_file(download_url, str(tmp_path))
+    fake_server.reset_metrics()
+    monkeypatch.setattr(file_download, "file_sha256", lambda *args, **kwargs: pytest.fail("re-hashed"))
+    path = download_file(download_url, str(tmp_path), overwrite=False)
+
+    assert path == tmp_path / FILE_NAME
+    assert not fake_server.request_log
+
+
+def test_no_overwrite_without_state_sends_head(fake_server, download_url, tmp_path):
+    """ダウンロード状態が無くても、HEADリクエストのファイル名で既存のファイルを確認しGETしない"""
+    (tmp_path / FILE_NAME).write_bytes(b"existing")
+    path = download_file(download_url, str(tmp_path), overwrite=False)
+
+    assert path.read_bytes() == b"existing"
+    assert [method for method, _ in _requests(fake_server)] == ["HEAD"]
+
+
+def test_truncated_local_copy_is_downloaded_again(fake_server, download_url, tmp_path):
+    """ローカルのファイルのサイズが記録と異なれば、overwrite=Falseでも取得し直す"""
+    download_file(download_url, str(tmp_path))
+    (tmp_path / FILE_NAME).write_bytes(b"broken")
+    path = download_file(download_url, str(tmp_path), overwrite=False)
+
+    assert path.read_bytes() == fake_server.file_body("13")
@@ -0,0 +1,79 @@
+import json
+
+import geopandas as gpd
+import numpy as np
+import pytest
+from shapely.geometry import Point, box
+
+from e_stat.utils import write_geojson_stream
+
+
+@pytest.fixture
+def boundary_gdf():
+    return gpd.GeoDataFrame(
+        {"AREA_CODE": ["01100", "01101", "01102"],
+         "CITY_NAME": ["札幌市", "中央区", None],
+         "JINKO": [100, 200, np.nan]},
+        geometry=[box(0, 0, 1, 1), box(1, 0, 2, 1), Point(141.123456789, 43.987654321)], crs="EPSG:4612")
+
+
+def _load(path):
+    with path.open(encoding="utf-8") as file:
+        return json.load(file)
+
+
+def test_stream_is_valid_feature_collection(boundary_gdf, tmp_path):
+    """書き出したファイルがjsonとして読めるFeatureCollectionになる"""
+    write_geojson_stream(boundary_gdf, str(tmp_path), "boundary.geojson")
+
+    obj = _load(tmp_path / "boundary.geojson")
+    assert obj["type"] == "FeatureCollection"
+    assert [f["properties"]["AREA_CODE"] for f in obj["features"]] == ["01100", "01101", "01102"]
+    assert obj["features"][0]["properties"]["CITY_NAME"] == "札幌市"
+
+
+def test_stream_round_trip(boundary_gdf, tmp_path):
+    """geopandasで読み込むと元のgdfと同じ属性・ジオメトリになる"""
+    write_geojson_stream(boundary_gdf, str(tmp_path), "boundary.geojson")
+
+    read_gdf = gpd.read_file(tmp_path / "boundary.geojson")
+    assert list(read_gdf["AREA_CODE"]) == list(boundary_gdf["AREA_CODE"])
+    assert all(a.equals(b) for a, b in zip(read_gdf.geometry, boundary_gdf.geometry))
+
+
+def test_stream_nan_as_null(boundary_gdf, tmp_path):
+    """欠損値はnullとして書き出される"""
+    write_geojson_stream(boundary_gdf, str(tmp_path), "boundary.geojson")
+
+    properties = _load(tmp_path / "boundary.geojson")["features"][2]["properties"]
+    assert properties["CITY_NAME"] is None
+    assert properties["JINKO"] is None
+
+
+def test_stream_precision(boundary_gdf, tmp_path):
+    """precisionを指定すると座標が指定桁数で丸められる"""
+    write_geojson_stream(boundary_gdf, str(tmp_path), "boundary.geojson", precision=3)
+
+    geometry = _load(tmp_path / "boundary.geojson")["features"][2]["geometry"]
+    assert geometry == {"type": "Point", "coordinates": [141.123, 43.988]}
+
+
+def test_stream_compact_and_indent(boundary_gdf, tmp_path):
+    """デフォルトは空白なし、indentを指定すると整形して書き出す"""
+    write_geojson_stream(boundary_gdf, str(tmp_path), "compact.geojson")
+    write_geojson_stream(boundary_gdf, str(tmp_path), "indent.geojson", indent=2)
+
+    compact = (tmp_path / "compact.geojson").read_text(encoding="utf-8")
+    indented = (tmp_path / "indent.geojson").read_text(encoding="utf-8")
+    assert '": ' not in compact
+    assert '\n    "' in indented
+    assert _load(tmp_path / "compact.geojson") == _load(tmp_path / "indent.geojson")
+
+
+def test_stream_empty_gdf(tmp_path):
+    """地物がない場合も空のFeatureCollectionを書き出す"""
+    empty_gdf = gpd.GeoDataFrame({"AREA_CODE": []}, geometry=[], crs="EPSG:4612")
+
+    write_geojson_stream(empty_gdf, str(tmp_path / "out"), "empty.geojson")
+
+    assert _load(tmp_path / "out" / "empty.geojson") == {"type": "FeatureCollection", "features": []}
@@ -0,0 +1,87 @@
+import pytest
+import requests
+
+from e_stat.utils import api_endpoint_url, configure_http_client, get_http_session, http_get, statmap_url
+
+
+def _stats_data_url():
+    return f"{api_endpoint_url('getSimpleStatsData')}?statsDataId=0000020201"
+
+
+@pytest.mark.parametrize("error_status", [500, 503, 429])
+def test_retry_on_error_status(server_factory, error_status):
+    """5xx・429が返っても、リトライして正常なレスポンスを返す"""
+    server = server_factory(fail_first=2, error_status=error_status)
+    res = http_get(_stats_data_url())
+
+    assert res.status_code == 200
+    assert [status for _, status, _ in server.request_durations] == [error_status, error_status, 200]
+
+
+def test_give_up_after_max_retries(server_factory):
+    """リトライの上限に達したら、例外ではなく最後のレスポンスを返す"""
+    server = server_factory(fail_first=10)
+    configure_http_client(max_retries=2)
+    res = http_get(_stats_data_url())
+
+    assert res.status_code == 503
+    assert len(server.request_log) == 3
+
+
+def test_no_retry_on_client_error(fake_server):
+    """404はリトライしない"""
+    res = http_get(api_endpoint_url("unknown"))
+
+    assert res.status_code == 404
+    assert len(fake_server.request_log) == 1
+
+
+def test_timeout(server_factory):
+    """設定したタイムアウトを超えたら、リトライの後に例外を送出する"""
+    server_factory(latency=0.5)
+    configure_http_client(timeout=0.1, max_retries=1)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        http_get(_stats_data_url())
+
+
+def test_timeout_per_request(server_factory):
+    """リクエストごとに指定したタイムアウトが設定より優先される"""
+    server_factory(latency=0.2)
+    configure_http_client(timeout=0.05, max_retries=0)
+
+    assert http_get(_stats_data_url(), timeout=5).status_code == 200
+
+
+def test_connection_pool_reuse(fake_server):
+    """連続したリクエストは同じコネクションを使い回す"""
+    for _ in range(5):
+        http_get(_stats_data_url())
+
+    assert len(fake_server.request_log) == 5
+    assert len(fake_server.client_addresses) == 1
+
+
+def test_configure_recreates_session(fake_server):
+    """設定を変更するとセッションが作り直され、新しい設定が適用される"""
+    session = get_http_session()
+    assert get_http_session() is session
+
+    configure_http_client(max_retries=3)
+    assert get_http_session() is not session
+    assert get_http_session().get_adapter(fake_server.base_url).max_retries.total == 3
+
+
+def test_unknown_config_key():
+    """不明な設定はKeyErrorになる"""
+    with pytest.raises(KeyError):
+        configure_http_client(unknown=1)
+
+
+def test_statmap_url(fake_server):
+    """境界データのダウンロードURLはstatmap_base_urlの代替サーバーに向く"""
+    assert statmap_url("data") == f"{fake_server.statmap_base_url}/data"
+
+    res = http_get(f"{statmap_url('data')}?code=13")
+
+    assert res.status_code == 200
+    assert res.headers["Content-Type"] == "application/zip"
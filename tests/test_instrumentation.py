@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from e_stat.lib import StatsData, StatsMetaData
+from e_stat.utils import configure_instrumentation, current_span, instrumentation_config, instrumented, \
+    recorded_spans, span, stage_summary, write_trace_report
+from tests.conftest import APP_ID
+
+
+@pytest.fixture
+def instrumentation():
+    """計測を有効にし、テスト後に設定を元に戻す"""
+    original = instrumentation_config()
+    configure_instrumentation(enabled=True)
+    yield
+    configure_instrumentation(**original)
+
+
+def test_disabled_span_records_nothing():
+    """計測が無効ならspanは何も記録しない"""
+    configure_instrumentation(enabled=False)
+    with span("stage", rows=1) as s:
+        s.add(bytes=10)
+
+    assert current_span() is s
+    assert recorded_spans() == []
+
+
+def test_span_attributes(instrumentation):
+    """spanは入れ子の深さと、設定・加算した属性を記録する"""
+    with span("outer", rows=3) as outer:
+        with span("inner") as inner:
+            assert current_span() is inner
+            inner.add(bytes=10)
+            inner.add(bytes=5)
+        outer.set(rows=4)
+
+    inner_record, outer_record = recorded_spans()
+    assert (inner_record["name"], inner_record["depth"], inner_record["bytes"]) == ("inner", 1, 15)
+    assert (outer_record["name"], outer_record["depth"], outer_record["rows"]) == ("outer", 0, 4)
+    assert outer_record["seconds"] >= inner_record["seconds"]
+
+
+def test_span_records_error(instrumentation):
+    """例外で抜けたspanは例外の型を記録し、例外はそのまま送出する"""
+    with pytest.raises(ValueError):
+        with span("stage"):
+            raise ValueError
+
+    assert recorded_spans()[0]["error"] == "ValueError"
+
+
+def test_instrumented(instrumentation):
+    """instrumentedを付けた関数の呼び出しごとにspanを記録し、stageごとに集計する"""
+    @instrumented("stage.fetch")
+    def fetch(rows):
+        with span("stage.page", rows=rows):
+            return rows
+
+    assert fetch(2) + fetch(3) == 5
+
+    summary = {stage["name"]: stage for stage in stage_summary()}
+    assert summary["stage.fetch"]["count"] == 2
+    assert summary["stage.page"]["rows"] == 5
+
+
+def test_trace_report_excludes_app_id(fake_server, instrumentation, tmp_path):
+    """トレースのjsonにはAPIのリクエストのURLをappIdを除いて記録する"""
+    StatsMetaData(APP_ID, "0000020201")
+    StatsData(APP_ID, "0000020201", str(tmp_path), ["01100"], ["A1101"], ["2000"])
+
+    report_path = write_trace_report(str(tmp_path / "trace.json"))
+
+    text = report_path.read_text(encoding="utf-8")
+    assert APP_ID not in text
+    report = json.loads(text)
+    urls = [event["args"]["url"] for event in report["traceEvents"] if "url" in event.get("args", {})]
+    assert urls and all("statsDataId=0000020201" in url for url in urls)
+    stages = {stage["name"] for stage in report["otherData"]["stages"]}
+    assert {"stats_meta_data.fetch", "stats_data.fetch", "api.stats_data_page"} <= stages
@@ -0,0 +1,54 @@
+import subprocess
+import sys
+
+from e_stat.utils import lazy_import
+from e_stat.utils.lazy_import import LazyModule
+
+HEAVY_MODULES = ("geopandas", "pandas", "shapely", "tqdm", "requests")
+
+
+def _loaded_modules(code):
+    """別プロセスでコードを実行し、importされた重いモジュールを返す"""
+    script = f"import sys\n{code}\nprint('loaded:' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    loaded = result.stdout.rsplit("loaded:", 1)[1].strip()
+    return set(filter(None, loaded.split(",")))
+
+
+def test_cli_import_does_not_load_heavy_modules():
+    """CLIのimport時点ではgeopandas・pandas等を読み込まない"""
+    assert _loaded_modules("import e_stat.__main__") == set()
+
+
+def test_help_does_not_load_heavy_modules():
+    """--helpではgeopandas・pandas等を読み込まない"""
+    code = "from e_stat.__main__ import main\ntry:\n    main(['boundary', '--help'])\nexcept SystemExit:\n    pass"
+    assert _loaded_modules(code) == set()
+
+
+def test_pref_code_does_not_load_pandas():
+    """都道府県コードの変換ではpandasを読み込まない"""
+    code = "from e_stat.lib import PrefCode\nassert PrefCode().code_to_name(1) == '北海道'"
+    assert _loaded_modules(code) == set()
+
+
+def test_area_code_df_loads_pandas():
+    """AreaCode.dfを参照した時点でpandasを読み込む"""
+    code = "from e_stat.lib import AreaCode\nassert len(AreaCode().df) > 0"
+    assert "pandas" in _loaded_modules(code)
+
+
+def test_lazy_import_loads_on_attribute_access():
+    """未importのモジュールは属性に初めてアクセスした時にimportする"""
+    sys.modules.pop("colorsys", None)
+    module = lazy_import("colorsys")
+
+    assert isinstance(module, LazyModule)
+    assert "colorsys" not in sys.modules
+    assert module.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert "colorsys" in sys.modules
+
+
+def test_lazy_import_returns_loaded_module():
+    """import済みのモジュールはそのまま返す"""
+    assert lazy_import("json") is sys.modules["json"]
@@ -0,0 +1,83 @@
+import geopandas as gpd
+import pandas as pd
+import pytest
+from shapely.geometry import box
+
+from e_stat.lib import MergeBoundaryStats
+from e_stat.lib import merge_boundary_stats
+from tests.conftest import APP_ID
+
+AREAS = ["01100", "01101", "01102"]
+
+
+@pytest.fixture
+def boundary_gdf():
+    return gpd.GeoDataFrame(
+        {"AREA_CODE": AREAS + ["01103"], "CITY_NAME": ["札幌市", "中央区", "北区", "東区"]},
+        geometry=[box(i, 0, i + 1, 1) for i in range(4)], crs="EPSG:4612")
+
+
+def test_merge_long(fake_server, boundary_gdf):
+    """複数の地域・項目・年度をまとめて取得し、地域・項目・年度ごとに1行として結合する"""
+    mbs = MergeBoundaryStats(APP_ID, "0000020201", boundary_gdf, AREAS, ["A1101", "A1102"], ["2000", "2005"])
+
+    assert len(mbs.merged_df) == 3 * 2 * 2
+    assert set(mbs.merged_df["AREA_CODE"]) == set(AREAS)
+    assert (mbs.merged_df["AREA_CODE"] == mbs.merged_df["area_code"]).all()
+    assert len(fake_server.request_log) == 1
+
+
+def test_merge_wide(fake_server, boundary_gdf):
+    """wideなら項目・年度ごとの値を列に展開し、1地域1行の境界データにする"""
+    mbs = MergeBoundaryStats(APP_ID, "0000020201", boundary_gdf, AREAS, ["A1101", "A1102"], ["2000", "2005"],
+                             wide=True)
+    merged = mbs.merged_df
+
+    assert isinstance(merged, gpd.GeoDataFrame)
+    assert list(merged["AREA_CODE"]) == AREAS
+    value_columns = [c for c in merged.columns if c.startswith("A1")]
+    assert value_columns == ["A1101_2000", "A1101_2005", "A1102_2000", "A1102_2005"]
+    # 値は地域・項目・年度の組み合わせごとに対応する行の値になる
+    long_df = mbs.stats_df.set_index(["area_code", "cat01_code", "time_code"])["value"]
+    for area in AREAS:
+        row = merged[merged["AREA_CODE"] == area].iloc[0]
+        assert row["A1102_2005"] == long_df[(area, "A1102", "2005100000")]
+
+
+def test_merge_wide_typed(fake_server, boundary_gdf):
+    """typedとwideを組み合わせると数値の列になる"""
+    mbs = MergeBoundaryStats(APP_ID, "0000020201", boundary_gdf, AREAS, ["A1101"], ["2000"], typed=True, wide=True)
+
+    assert str(mbs.merged_df["A1101_2000"].dtype) == "Int64"
+    assert sorted(mbs.merged_df["A1101_2000"]) == [0, 1, 2]
+
+
+def test_merge_wide_no_data(server_factory, boundary_gdf):
+    """該当データが無ければ空の境界データを返す"""
+    server_factory(total_rows=0)
+    mbs = MergeBoundaryStats(APP_ID, "0000020201", boundary_gdf, AREAS, ["A1101"], ["2000"], wide=True)
+
+    assert mbs.merged_df.empty
+    assert list(mbs.merged_df.columns) == list(boundary_gdf.columns)
+
+
+def test_year_filter(monkeypatch, boundary_gdf):
+    """指定した年度以外の行は結合しない"""
+    stats_df = pd.DataFrame({
+        "cat01_code": ["A1101"] * 4,
+        "area_code": ["01100", "01101", "01100", "01101"],
+        "time_code": ["2000100000", "2000100000", "2005100000", "2005100000"],
+        "value": ["1", "2", "3", "4"]})
+
+    class _StatsData:
+        def __init__(self, *args, **kwargs):
+            self.detail_url = "url"
+            self.stats_df = stats_df
+
+    monkeypatch.setattr(merge_boundary_stats, "StatsData", _StatsData)
+
+    mbs = MergeBoundaryStats(APP_ID, "0000020201", boundary_gdf, AREAS, "A1101", "2005")
+    assert list(mbs.merged_df["value"]) == ["3", "4"]
+
+    wide = MergeBoundaryStats(APP_ID, "0000020201", boundary_gdf, AREAS, "A1101", "2005", wide=True)
+    assert [c for c in wide.merged_df.columns if c.startswith("A1")] == ["A1101_2005"]
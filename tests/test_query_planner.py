@@ -0,0 +1,63 @@
+from itertools import product
+
+from e_stat.lib import StatsData
+from e_stat.utils import build_stats_data_url, estimate_stats_rows, plan_stats_data_chunks
+
+AREAS = [f"{13101 + i}" for i in range(20)]
+CLASS_CODES = ["A1101", "A1102", "A1103"]
+YEARS = ["2000", "2005", "2010", "2015"]
+
+
+def _combinations(chunks):
+    """分割した取得条件の(地域, 項目, 年度)の組み合わせのリスト"""
+    return [combination for chunk in chunks for combination in product(*chunk)]
+
+
+def test_no_split_within_limits():
+    """上限に収まる場合は分割しない"""
+    chunks = plan_stats_data_chunks("app", "0000020201", AREAS, CLASS_CODES, YEARS)
+
+    assert chunks == [(AREAS, CLASS_CODES, YEARS)]
+
+
+def test_split_by_rows():
+    """データ件数の上限を超える場合は、全ての組み合わせを重複なく分割する"""
+    chunks = plan_stats_data_chunks("app", "0000020201", AREAS, CLASS_CODES, YEARS, max_rows=50)
+
+    assert len(chunks) > 1
+    assert all(estimate_stats_rows(*chunk) <= 50 for chunk in chunks)
+    assert sorted(_combinations(chunks)) == sorted(product(AREAS, CLASS_CODES, YEARS))
+    # 要素数の最も多い地域から分割し、元の並び順を保つ
+    assert chunks[0][0] == AREAS[:len(chunks[0][0])]
+
+
+def test_split_by_url_length():
+    """URLの長さの上限を超える場合は、全てのURLが上限に収まるように分割する"""
+    max_url_length = len(build_stats_data_url("app", "0000020201", AREAS, CLASS_CODES, YEARS)) - 50
+    chunks = plan_stats_data_chunks(
+        "app", "0000020201", AREAS, CLASS_CODES, YEARS, max_url_length=max_url_length)
+
+    assert len(chunks) == 2
+    assert chunks[0] == (AREAS[:10], CLASS_CODES, YEARS)
+    assert chunks[1] == (AREAS[10:], CLASS_CODES, YEARS)
+    assert all(len(build_stats_data_url("app", "0000020201", *chunk)) <= max_url_length for chunk in chunks)
+
+
+def test_single_combination_over_limit():
+    """1要素まで分割しても上限を超える場合は、それ以上分割しない"""
+    chunks = plan_stats_data_chunks("app", "0000020201", ["13101"], ["A1101"], ["2015"], max_rows=0)
+
+    assert chunks == [(["13101"], ["A1101"], ["2015"])]
+
+
+def test_stats_data_chunks_match_single_request(fake_server, tmp_path):
+    """分割して取得した統計表は、1リクエストで取得した統計表と同じ行を持つ"""
+    areas, class_codes, years = AREAS[:5], CLASS_CODES, YEARS[:2]
+    single = StatsData("app", "0000020201", str(tmp_path), areas, class_codes, years).stats_df
+    chunked = StatsData(
+        "app", "0000020201", str(tmp_path), areas, class_codes, years, max_rows=4, max_workers=3)
+
+    assert len(chunked.chunk_urls) > 1
+    assert len(fake_server.request_log) == 1 + len(chunked.chunk_urls)
+    columns = ["cat01_code", "area_code", "time_code"]
+    assert sorted(map(tuple, chunked.stats_df[columns].values)) == sorted(map(tuple, single[columns].values))
@@ -0,0 +1,171 @@
+import json
+import os
+import time
+
+import pytest
+
+from e_stat.utils import api_endpoint_url, api_response_status, build_stats_data_url, configure_response_cache, \
+    fetch_all_stats_data_pages, open_api_response, response_cache, response_cache_key
+from tests.conftest import APP_ID
+
+
+def _url(stats_table_id="0000020201", app_id=APP_ID, areas=("01100",)):
+    return build_stats_data_url(app_id, stats_table_id, list(areas), ["A1101"], [2000])
+
+
+def _read_response(url):
+    with open_api_response(url) as stream:
+        return stream.read()
+
+
+def _cache_dir_bytes(cache_dir):
+    return sum(path.stat().st_size for path in cache_dir.iterdir())
+
+
+def test_cache_hit(fake_server, response_cache_dir):
+    """同じURLの2回目はキャッシュから返し、APIにリクエストしない"""
+    first = _read_response(_url())
+    second = _read_response(_url())
+
+    assert first == second
+    assert len(fake_server.request_log) == 1
+    meta = [json.loads(path.read_text(encoding="utf-8")) for path in response_cache_dir.glob("*.json")]
+    assert len(meta) == 1
+    # appIdはキャッシュに記録しない
+    assert APP_ID not in json.dumps(meta, ensure_ascii=False)
+
+
+def test_cache_miss(fake_server):
+    """パラメータ・appIdが異なるURLはキャッシュを使わない"""
+    _read_response(_url())
+    _read_response(_url("0000020202"))
+    _read_response(_url(app_id="other-app-id"))
+
+    assert len(fake_server.request_log) == 3
+
+
+def test_cache_key_ignores_param_order():
+    """クエリパラメータの順序はキャッシュキーに影響しない"""
+    assert response_cache_key(f"{api_endpoint_url('a')}?appId=x&b=1&c=2") == \
+        response_cache_key(f"{api_endpoint_url('a')}?c=2&appId=x&b=1")
+
+
+def test_refresh(fake_server):
+    """refreshが有効ならキャッシュを参照せずに再取得し、キャッシュを更新する"""
+    _read_response(_url())
+    configure_response_cache(refresh=True)
+    _read_response(_url())
+    configure_response_cache(refresh=False)
+    _read_response(_url())
+
+    assert len(fake_server.request_log) == 2
+
+
+def test_refresh_per_request(fake_server):
+    """open_api_responseのrefreshを指定したリクエストのみキャッシュを参照せず、キャッシュを更新する"""
+    _read_response(_url())
+    with open_api_response(_url(), refresh=True) as stream:
+        stream.read()
+    _read_response(_url())
+
+    assert len(fake_server.request_log) == 2
+
+
+def test_cache_disabled(fake_server, response_cache_dir):
+    """キャッシュが無効なら毎回リクエストし、保存もしない"""
+    configure_response_cache(enabled=False)
+    _read_response(_url())
+    _read_response(_url())
+
+    assert len(fake_server.request_log) == 2
+    assert not response_cache_dir.exists()
+
+
+def test_ttl_expired(fake_server, response_cache_dir):
+    """有効期間を過ぎたキャッシュは使わない"""
+    _read_response(_url())
+    meta_path = next(response_cache_dir.glob("*.json"))
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    meta["created_at"] = time.time() - response_cache.response_cache_config()["ttl"] - 1
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+    _read_response(_url())
+
+    assert len(fake_server.request_log) == 2
+
+
+def test_lru_eviction(fake_server, response_cache_dir):
+    """合計サイズが上限を超えたら最終参照が古いものから削除する"""
+    _read_response(_url(areas=("01100",)))
+    entry_bytes = _cache_dir_bytes(response_cache_dir)
+    configure_response_cache(max_bytes=entry_bytes * 2 + entry_bytes // 2)
+    _read_response(_url(areas=("01101",)))
+    # 1件目の最終参照を2件目より新しくする
+    first_meta = next(p for p in response_cache_dir.glob("*.json") if "01100" in p.read_text(encoding="utf-8"))
+    os.utime(first_meta, (time.time() + 10, time.time() + 10))
+    _read_response(_url(areas=("01102",)))
+
+    cached = [path.read_text(encoding="utf-8") for path in response_cache_dir.glob("*.json")]
+    assert len(cached) == 2
+    assert not any("01101" in text for text in cached)
+
+
+def test_total_bytes_on_overwrite(fake_server, response_cache_dir):
+    """同じキーを上書きしても、キャッシュの合計サイズの集計がずれない"""
+    _read_response(_url())
+    configure_response_cache(refresh=True)
+    for _ in range(3):
+        _read_response(_url())
+
+    assert response_cache._cache_total_bytes == _cache_dir_bytes(response_cache_dir)
+
+
+def test_partial_read_is_not_cached(fake_server, response_cache_dir):
+    """最後まで読み込まずに閉じたレスポンスはキャッシュしない"""
+    with open_api_response(_url(), chunk_size=16) as stream:
+        stream.readline()
+    _read_response(_url())
+
+    assert len(fake_server.request_log) == 2
+    assert len(list(response_cache_dir.glob("*.json"))) == 1
+    assert not list(response_cache_dir.glob("*.tmp"))
+
+
+def test_error_body_is_not_cached(server_factory, response_cache_dir):
+    """STATUSがエラーのレスポンスはステータスコード200でもキャッシュしない"""
+    server = server_factory(invalid_stats_ids=["BADTABLE"])
+    for _ in range(2):
+        with pytest.raises(SystemExit):
+            fetch_all_stats_data_pages(_url("BADTABLE"))
+
+    assert len(server.request_log) == 2
+    assert not list(response_cache_dir.glob("*.json"))
+
+
+def test_invalid_app_id_is_not_served_to_valid_app_id(server_factory):
+    """不正なappIdのエラーをキャッシュせず、正しいappIdでの再実行は取得できる"""
+    server = server_factory(app_id=APP_ID)
+    with pytest.raises(SystemExit):
+        fetch_all_stats_data_pages(_url(app_id="wrong-app-id"))
+
+    df = fetch_all_stats_data_pages(_url())
+    assert len(df) == 1
+    assert len(server.request_log) == 2
+
+
+def test_no_data_is_cached(server_factory):
+    """該当データ無し（STATUS=1）はキャッシュする"""
+    server = server_factory(total_rows=0)
+    fetch_all_stats_data_pages(_url())
+    fetch_all_stats_data_pages(_url())
+
+    assert len(server.request_log) == 1
+
+
+@pytest.mark.parametrize("head_text, status", [
+    ('"RESULT"\n"STATUS","ERROR_MSG","DATE"\n"0","正常に終了しました。","2020-12-01"\n', "0"),
+    ('\ufeff"RESULT"\n"STATUS","ERROR_MSG","DATE"\n"100","認証に失敗しました。","2020-12-01"\n', "100"),
+    ('"TABLE_INF","TITLE"\n"0000020201","統計表"\n', None),
+])
+def test_api_response_status(head_text, status):
+    """レスポンスの先頭のRESULTセクションからSTATUSを取得する"""
+    assert api_response_status(head_text) == status
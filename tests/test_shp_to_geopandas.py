@@ -0,0 +1,72 @@
+import pytest
+
+from e_stat.lib import ShapeToGeoPandas
+from e_stat.lib.shp_to_geopandas import _where_clause
+
+
+@pytest.fixture
+def zip_path(server_factory, tmp_path):
+    """4つの市区町村（101〜104）の小地域のshpが格納されたzip"""
+    server = server_factory(shapefile_polygons=40)
+    path = tmp_path / "h27ka01.zip"
+    path.write_bytes(server.shapefile_response("01"))
+    return path
+
+
+@pytest.mark.parametrize("engine", ["geopandas", "pyogrio"])
+def test_read_all(zip_path, engine):
+    """条件を指定しなければ全カラム・全行を読み込む"""
+    gdf = ShapeToGeoPandas(str(zip_path), engine=engine).gdf
+
+    assert len(gdf) == 40
+    assert {"KEY_CODE", "PREF", "CITY", "S_NAME"} <= set(gdf.columns)
+
+
+@pytest.mark.parametrize("engine", ["geopandas", "pyogrio"])
+def test_columns(zip_path, engine):
+    """columnsを指定すると指定したカラムとジオメトリのみを読み込む"""
+    gdf = ShapeToGeoPandas(str(zip_path), columns=["KEY_CODE", "CITY"], engine=engine).gdf
+
+    assert list(gdf.columns) == ["KEY_CODE", "CITY", "geometry"]
+    assert len(gdf) == 40
+
+
+@pytest.mark.parametrize("engine", ["geopandas", "pyogrio"])
+def test_filters(zip_path, engine):
+    """filtersを指定すると値が一致する行のみを読み込む"""
+    gdf = ShapeToGeoPandas(str(zip_path), filters={"CITY": ["101", "103"]}, engine=engine).gdf
+
+    assert sorted(set(gdf["CITY"])) == ["101", "103"]
+    assert len(gdf) == 20
+
+
+@pytest.mark.parametrize("engine", ["geopandas", "pyogrio"])
+def test_bbox(zip_path, engine):
+    """bboxを指定すると範囲に交わるポリゴンのみを読み込む"""
+    # 1行目（6ポリゴン）の左下の2ポリゴンの内側
+    gdf = ShapeToGeoPandas(str(zip_path), bbox=(139.001, 35.001, 139.019, 35.009), engine=engine).gdf
+
+    assert sorted(gdf["KEY_CODE"]) == ["01101000000", "01101000001"]
+
+
+def test_engines_match(zip_path):
+    """pyogrioとgeopandasで同じ行・カラムを読み込む"""
+    options = {"columns": ["KEY_CODE", "CITY"], "filters": {"CITY": ["102"]}}
+    by_pyogrio = ShapeToGeoPandas(str(zip_path), engine="pyogrio", **options).gdf
+    by_geopandas = ShapeToGeoPandas(str(zip_path), engine="geopandas", **options).gdf
+
+    assert list(by_pyogrio.columns) == list(by_geopandas.columns)
+    assert list(by_pyogrio["KEY_CODE"]) == list(by_geopandas["KEY_CODE"])
+    assert all(a.equals(b) for a, b in zip(by_pyogrio.geometry, by_geopandas.geometry))
+
+
+def test_where_clause():
+    """値は引用符で囲み、引用符はエスケープする"""
+    assert _where_clause({"CITY": ["101", "102"], "S_NAME": ["O'Hara"]}) == \
+        "\"CITY\" IN ('101','102') AND \"S_NAME\" IN ('O''Hara')"
+
+
+def test_invalid_engine(zip_path):
+    """読み込み方式が不正なら異常終了する"""
+    with pytest.raises(SystemExit):
+        ShapeToGeoPandas(str(zip_path), engine="fiona")
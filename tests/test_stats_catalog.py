@@ -0,0 +1,163 @@
+import sqlite3
+from datetime import date
+
+import pytest
+
+from e_stat.lib import StatsCatalog, StatsMetaData, read_stats_table_ids
+from tests.conftest import APP_ID, endpoint_requests
+
+GOV_STATS_CODE = "00200502"
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    return StatsCatalog(APP_ID, str(tmp_path / "stats_catalog.sqlite3"))
+
+
+def _set_synced_date(catalog, synced_date):
+    with sqlite3.connect(str(catalog.catalog_path)) as conn:
+        conn.execute("UPDATE sync_state SET SYNCED_DATE = ?", (synced_date,))
+
+
+def test_first_sync_stores_all_tables(server_factory, catalog):
+    """初回の同期は全件を取得して格納する"""
+    server = server_factory(stats_list_rows=5)
+    result = catalog.sync([GOV_STATS_CODE])
+
+    assert result == {"codes": 1, "tables": 5, "errors": {}}
+    assert len(catalog.stats_table_ids_df(GOV_STATS_CODE)) == 5
+    assert catalog.synced_dates() == {GOV_STATS_CODE: date.today().strftime("%Y%m%d")}
+    assert "updatedDate" not in endpoint_requests(server, "getSimpleStatsList")[0]
+
+
+def test_incremental_sync_requests_updated_tables(server_factory, catalog):
+    """2回目以降は前回の同期日以降に更新された統計表のみを取得し、削除された統計表は残る"""
+    server = server_factory(stats_list_rows=5)
+    catalog.sync([GOV_STATS_CODE])
+    _set_synced_date(catalog, "20200101")
+    server.stats_list_rows = 3
+    server.reset_metrics()
+    result = catalog.sync([GOV_STATS_CODE])
+
+    requests = endpoint_requests(server, "getSimpleStatsList")
+    assert len(requests) == 1
+    assert f"updatedDate=20200101-{date.today().strftime('%Y%m%d')}" in requests[0]
+    assert result["tables"] == 3
+    assert len(catalog.stats_table_ids_df(GOV_STATS_CODE)) == 5
+
+
+def test_incremental_sync_without_updates(server_factory, catalog):
+    """更新された統計表が無い（STATUS=1）場合は格納済みの統計表をそのまま残す"""
+    server = server_factory(stats_list_rows=5)
+    catalog.sync([GOV_STATS_CODE])
+    server.reset_metrics()
+    result = catalog.sync([GOV_STATS_CODE])
+
+    # 同じ日の再実行もレスポンスキャッシュを使わずにリクエストする
+    assert len(endpoint_requests(server, "getSimpleStatsList")) == 1
+    assert result == {"codes": 1, "tables": 0, "errors": {}}
+    assert len(catalog.stats_table_ids_df(GOV_STATS_CODE)) == 5
+
+
+def test_full_sync_replaces_tables(server_factory, catalog):
+    """full=Trueならレスポンスキャッシュを使わずに全件を取得し、削除された統計表を反映する"""
+    server = server_factory(stats_list_rows=5)
+    catalog.sync([GOV_STATS_CODE], full=True)
+    server.stats_list_rows = 3
+    server.reset_metrics()
+    result = catalog.sync([GOV_STATS_CODE], full=True)
+
+    requests = endpoint_requests(server, "getSimpleStatsList")
+    assert len(requests) == 1
+    assert "updatedDate" not in requests[0]
+    assert result["tables"] == 3
+    assert len(catalog.stats_table_ids_df(GOV_STATS_CODE)) == 3
+
+
+def test_sync_error_is_recorded(server_factory, catalog):
+    """エラーになった政府統計コードは異常終了せずに記録し、次回は全件を取得する"""
+    server_factory(app_id="other-app-id")
+    result = catalog.sync([GOV_STATS_CODE])
+
+    assert list(result["errors"]) == [GOV_STATS_CODE]
+    assert result["errors"][GOV_STATS_CODE].startswith("STATUS=100")
+    assert catalog.synced_dates() == {}
+
+
+def test_find_tables(server_factory, catalog):
+    """政府統計コード・統計表題・集計地域区分で統計表を検索する"""
+    server_factory(stats_list_rows=3)
+    catalog.sync([GOV_STATS_CODE, "00200521"])
+
+    assert len(catalog.find_tables()) == 6
+    assert list(catalog.find_tables(gov_stats_code="00200521")["TABLE_INF"]) == \
+        ["0020052100001", "0020052100002", "0020052100003"]
+    assert list(catalog.find_tables(title="0020050200002")["TABLE_INF"]) == ["0020050200002"]
+    assert catalog.find_tables(collect_area="都道府県").empty
+    assert len(catalog.find_tables(updated_since="2020-03-06", limit=4)) == 4
+
+
+def test_unsynced_code_exits(catalog):
+    """カタログに同期されていない政府統計コードは異常終了する"""
+    with pytest.raises(SystemExit):
+        catalog.stats_table_ids_df(GOV_STATS_CODE)
+
+
+def test_prefetch_meta(server_factory, catalog):
+    """格納済みの統計表は取得せず、full=Trueならレスポンスキャッシュを使わずに取得し直す"""
+    server = server_factory(meta_class_rows=3, invalid_stats_ids=["BADTABLE"])
+    result = catalog.prefetch_meta(["0000020201", "BADTABLE"])
+
+    assert result["fetched"] == 1
+    assert list(result["errors"]) == ["BADTABLE"]
+    assert catalog.class_codes("0000020201", "area") == ["01100", "01101", "01102"]
+    assert catalog.class_codes("BADTABLE", "area") is None
+
+    server.reset_metrics()
+    assert catalog.prefetch_meta(["0000020201"])["stored"] == 1
+    assert not server.request_log
+
+    server.meta_class_rows = 2
+    catalog.prefetch_meta(["0000020201"], full=True)
+    assert len(server.request_log) == 1
+    assert catalog.class_codes("0000020201", "area") == ["01100", "01101"]
+
+
+def test_meta_data_from_catalog(server_factory, catalog):
+    """catalogを指定したStatsMetaDataは格納済みならAPIにリクエストせずにカタログから読み込む"""
+    server = server_factory(meta_class_rows=2)
+    fetched = StatsMetaData(APP_ID, "0000020201", catalog=catalog).stats_meta_data_df
+    server.reset_metrics()
+
+    stored = StatsMetaData(APP_ID, "0000020201", catalog=catalog).stats_meta_data_df
+
+    assert not server.request_log
+    assert list(stored["CLASS_CODE"]) == list(fetched["CLASS_CODE"])
+    assert catalog.class_codes("0000020201", "cat01") == ["A1101", "A1102"]
+    assert catalog.class_codes("0000020201", "cat02") == []
+
+
+def test_full_sync_removes_meta_state(server_factory, catalog):
+    """全件の同期でe-Stat側から削除された統計表は、格納済みのメタ情報も削除する"""
+    server = server_factory(stats_list_rows=3, meta_class_rows=1)
+    catalog.sync([GOV_STATS_CODE])
+    catalog.prefetch_meta(["0020050200001", "0020050200003"])
+    assert catalog.class_codes("0020050200003", "area") == ["01100"]
+
+    server.stats_list_rows = 2
+    catalog.sync([GOV_STATS_CODE], full=True)
+
+    assert catalog.stored_meta_ids() == {"0020050200001"}
+    assert catalog.class_codes("0020050200003", "area") is None
+
+
+@pytest.mark.parametrize("file_name, content", [
+    ("jobs.csv", "stats_table_id,areas\n0000020201,01100\n0000020202,01100\n0000020201,01101\n"),
+    ("stats_ids.csv", "TABLE_INF,TITLE\n0000020201,a\n0000020202,b\n"),
+    ("ids.txt", "0000020201\n\n 0000020202 \n0000020201\n")])
+def test_read_stats_table_ids(tmp_path, file_name, content):
+    """ジョブ定義ファイル・idsの出力・テキストから重複を除いた統計表IDを読み込む"""
+    path = tmp_path / file_name
+    path.write_text(content, encoding="utf-8")
+
+    assert read_stats_table_ids(str(path)) == ["0000020201", "0000020202"]
@@ -0,0 +1,78 @@
+import json
+
+import pandas as pd
+import pytest
+
+from e_stat.lib import StatsData, StatsDataBatch, StatsDataJob, read_stats_data_jobs
+
+JOBS = [
+    StatsDataJob("0000020201", ["01100", "01101"], ["A1101", "A1102"], ["2000", "2005"]),
+    StatsDataJob("0000020202", ["13101"], ["A1101"], ["2015"]),
+    StatsDataJob("0000020203", ["27100", "27102", "27103"], ["B1101"], ["2010"]),
+]
+
+
+def test_fetch_matches_sequential(fake_server, tmp_path):
+    """ジョブごとの結果が、StatsDataで逐次取得した結果と一致する"""
+    df = StatsDataBatch("test-app-id", JOBS).fetch()
+
+    expected = pd.concat([
+        StatsData("test-app-id", job.stats_table_id, str(tmp_path), job.areas, job.class_codes, job.years)
+        .stats_df.assign(stats_table_id=job.stats_table_id) for job in JOBS], ignore_index=True)
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_max_concurrency(server_factory):
+    """同時に実行するリクエスト数がmax_concurrencyを超えない"""
+    server = server_factory(latency=0.1)
+    jobs = [JOBS[0]._replace(stats_table_id=f"00000202{i:02d}") for i in range(6)]
+    StatsDataBatch("test-app-id", jobs, max_concurrency=2, requests_per_second=0).fetch()
+
+    assert len(server.request_log) == 6
+    assert server.max_in_flight == 2
+
+
+def test_rate_limit(fake_server):
+    """同じホストへのリクエストの間隔がrequests_per_secondの逆数以上になる"""
+    jobs = [JOBS[0]._replace(stats_table_id=f"00000202{i:02d}") for i in range(5)]
+    StatsDataBatch("test-app-id", jobs, max_concurrency=5, requests_per_second=20).fetch()
+
+    times = sorted(fake_server.request_times)
+    assert len(times) == 5
+    # 送信間隔は0.05秒。個々の受信時刻はスレッドの切り替えで揺らぐため、最初から最後までの間隔で比較する
+    assert times[-1] - times[0] >= 4 * 0.05 * 0.8
+
+
+def test_read_jobs_csv_with_empty_cell(tmp_path):
+    """csvの空欄は空のリストとして読み込む"""
+    path = tmp_path / "jobs.csv"
+    path.write_text(
+        "stats_table_id,areas,class_codes,years\n"
+        "0000020201,\"01100,01101\",A1101,2015\n"
+        "0000020202,,A1101,2015\n", encoding="utf-8")
+    jobs = read_stats_data_jobs(str(path))
+
+    assert jobs == [
+        StatsDataJob("0000020201", ["01100", "01101"], ["A1101"], ["2015"]),
+        StatsDataJob("0000020202", [], ["A1101"], ["2015"])]
+
+
+def test_read_jobs_json(tmp_path):
+    """jsonのリスト・数値の指定をコードのリストとして読み込む"""
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps([
+        {"stats_table_id": "0000020201", "areas": ["01100"], "class_codes": "A1101,A1102", "years": 2015},
+        {"stats_table_id": "0000020202", "areas": None, "class_codes": ["A1101"], "years": [2010, 2015]}]))
+    jobs = read_stats_data_jobs(str(path))
+
+    assert jobs == [
+        StatsDataJob("0000020201", ["01100"], ["A1101", "A1102"], ["2015"]),
+        StatsDataJob("0000020202", [], ["A1101"], ["2010", "2015"])]
+
+
+def test_read_jobs_missing_key(tmp_path):
+    """必須のキーが無い場合はシステムを終了する"""
+    path = tmp_path / "jobs.jsonl"
+    path.write_text(json.dumps({"stats_table_id": "0000020201"}) + "\n")
+    with pytest.raises(SystemExit):
+        read_stats_data_jobs(str(path))
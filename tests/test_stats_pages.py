@@ -0,0 +1,91 @@
+import pytest
+
+from e_stat.lib import StatsData
+from e_stat.utils import build_stats_data_url, fetch_all_stats_data_pages, iter_stats_data_pages, \
+    split_stats_data_response
+from tests.conftest import APP_ID, endpoint_requests
+
+
+def _url(areas=("01100", "01101"), class_codes=("A1101", "A1102"), years=(2000, 2005), stats_table_id="0000020201"):
+    return build_stats_data_url(APP_ID, stats_table_id, list(areas), list(class_codes), list(years))
+
+
+def test_follow_next_key(server_factory):
+    """NEXT_KEYをたどって全ページを取得し、ページの順に結合する"""
+    server = server_factory(page_size=3)
+    df = fetch_all_stats_data_pages(_url())
+
+    assert len(df) == 8
+    assert df["value"].tolist() == [str(i) for i in range(8)]
+    requests = endpoint_requests(server, "getSimpleStatsData")
+    assert len(requests) == 3
+    assert "startPosition" not in requests[0]
+    assert "startPosition=4" in requests[1]
+    assert "startPosition=7" in requests[2]
+
+
+def test_single_page_without_next_key(fake_server):
+    """NEXT_KEYが無ければ1回だけリクエストする"""
+    df = fetch_all_stats_data_pages(_url())
+
+    assert len(df) == 8
+    assert len(endpoint_requests(fake_server, "getSimpleStatsData")) == 1
+
+
+def test_status_1_returns_empty_df(server_factory):
+    """該当データ無し（STATUS=1）は異常終了せずに空のデータフレームを返す"""
+    server_factory(total_rows=0)
+    dfs = list(iter_stats_data_pages(_url()))
+
+    assert len(dfs) == 1
+    assert dfs[0].empty
+
+
+def test_error_status_exits(server_factory):
+    """STATUSがエラーのレスポンスは異常終了する"""
+    server_factory(invalid_stats_ids=["BADTABLE"])
+    with pytest.raises(SystemExit):
+        fetch_all_stats_data_pages(_url(stats_table_id="BADTABLE"))
+
+
+def test_stats_data_iter_pages(server_factory, tmp_path):
+    """fetch=Falseなら初期化時に取得せず、iter_pagesでページごとに取得する"""
+    server = server_factory(page_size=5)
+    stats_data = StatsData(
+        APP_ID, "0000020201", str(tmp_path), ["01100", "01101"], ["A1101", "A1102"], [2000, 2005], fetch=False)
+
+    assert stats_data.stats_df is None
+    assert not server.request_log
+    assert [len(df) for df in stats_data.iter_pages()] == [5, 3]
+
+
+def test_split_section_header_response():
+    """セクションヘッダからNEXT_KEYを読み取り、VALUEセクションのcsvを切り出す"""
+    text = "\r\n".join([
+        '"RESULT"',
+        '"STATUS","ERROR_MSG","DATE"',
+        '"0","正常に終了しました。","2020-12-01T00:00:00.000+09:00"',
+        '"RESULT_INF"',
+        '"TOTAL_NUMBER","FROM_NUMBER","TO_NUMBER","NEXT_KEY"',
+        '"250000","1","100000","100001"',
+        '"VALUE"',
+        '"area_code","value"',
+        '"01100","1"',
+        ''])
+    csv_str, next_key = split_stats_data_response(text)
+
+    assert next_key == "100001"
+    assert csv_str == '"area_code","value"\r\n"01100","1"\r\n'
+
+
+def test_split_last_page_response():
+    """最終ページ（NEXT_KEYが空）はNoneを返す"""
+    text = "\n".join([
+        '"RESULT_INF"',
+        '"TOTAL_NUMBER","FROM_NUMBER","TO_NUMBER","NEXT_KEY"',
+        '"2","1","2",""',
+        '"VALUE"',
+        '"area_code","value"',
+        ''])
+
+    assert split_stats_data_response(text) == ('"area_code","value"\n', None)
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from e_stat.utils import apply_stats_schema, pivot_stats_df
+
+
+def _stats_df(rows):
+    """(cat01_code, area_code, time_code, value)のタプルのリストから全カラムstrの統計データのdfを生成する"""
+    return pd.DataFrame([
+        {"tab_code": "020", "cat01_code": cat01, "area_code": area, "time_code": time, "unit": "人", "value": value}
+        for cat01, area, time, value in rows])
+
+
+@pytest.fixture
+def stats_df():
+    return _stats_df([
+        ("A1101", "01101", "2015100000", "10"),
+        ("A1101", "01102", "2015100000", "20"),
+        ("A1102", "01101", "2015100000", "x"),
+        ("A1101", "01101", "2010100000", "5"),
+    ])
+
+
+def test_pivot_dense(stats_df):
+    """地域を行、(項目, 年度)の存在する組み合わせを列にする"""
+    matrix = pivot_stats_df(apply_stats_schema(stats_df), sparse=False)
+
+    assert matrix.shape == (2, 3)
+    # 秘匿の値（x）は値の無い要素として扱い、列は残す
+    assert matrix.nnz == 3
+    assert not matrix.sparse
+    assert matrix.row_labels.tolist() == ["01101", "01102"]
+    assert matrix.column_names() == ["A1101_2010", "A1101_2015", "A1102_2015"]
+    np.testing.assert_array_equal(matrix.to_numpy(), [[5, 10, np.nan], [np.nan, 20, np.nan]])
+
+
+def test_pivot_untyped_keeps_strings(stats_df):
+    """型付きでないdfは値を文字列のまま配置し、値の無い要素はNoneにする"""
+    df = pivot_stats_df(stats_df).to_frame(sparse=False)
+
+    assert df.loc["01101", "A1102_2015"] == "x"
+    assert pd.isna(df.loc["01102", "A1101_2010"])
+
+
+def test_pivot_sparse_matches_dense(stats_df):
+    """疎行列と密行列は同じ値になる"""
+    typed_df = apply_stats_schema(stats_df)
+    dense = pivot_stats_df(typed_df, sparse=False)
+    sparse = pivot_stats_df(typed_df, sparse=True)
+
+    assert sparse.sparse
+    np.testing.assert_array_equal(sparse.to_numpy(), dense.to_numpy())
+    for actual, expected in zip(sparse.to_coo(), dense.to_coo()):
+        np.testing.assert_array_equal(actual, expected)
+    sparse_frame = sparse.to_frame()
+    assert all(isinstance(dtype, pd.SparseDtype) for dtype in sparse_frame.dtypes)
+    pd.testing.assert_frame_equal(sparse_frame.sparse.to_dense(), dense.to_frame(), check_dtype=False)
+
+
+def test_sparse_by_density():
+    """値のある組み合わせの割合がしきい値未満なら疎行列にする"""
+    rows = [("A1101", f"01{100 + i:03d}", "2015100000", str(i)) for i in range(10)]
+    rows += [(f"A{1102 + i}", "01100", "2015100000", "1") for i in range(10)]
+    matrix = pivot_stats_df(apply_stats_schema(_stats_df(rows)))
+
+    assert matrix.shape == (10, 11)
+    assert matrix.density < 0.3
+    assert matrix.sparse
+
+
+def test_pivot_extra_code_column(stats_df):
+    """値が2種類以上ある他の`*_code`カラム（表章項目等）も列にする"""
+    df = pd.concat([stats_df, stats_df.assign(tab_code="030")], ignore_index=True)
+    matrix = pivot_stats_df(df)
+
+    assert matrix.shape == (2, 6)
+    assert matrix.column_names()[0] == "020_A1101_2010"
+
+
+def test_pivot_duplicate_cells_exit(stats_df):
+    """同じ地域・列に複数の値があれば異常終了する"""
+    df = pd.concat([stats_df, stats_df.assign(tab_code="030")], ignore_index=True)
+    with pytest.raises(SystemExit):
+        pivot_stats_df(df, columns=["cat01_code", "time_code"])
+
+
+def test_pivot_empty_df():
+    """該当データが無い（カラムなし）dfは空の行列にする"""
+    matrix = pivot_stats_df(pd.DataFrame())
+
+    assert matrix.shape == (0, 0)
+    assert matrix.to_frame().empty
+
+
+def test_to_parquet(stats_df, tmp_path):
+    """dfを介さずに書き出したParquetは横持ちのdfと同じ内容になる"""
+    pytest.importorskip("pyarrow")
+    matrix = pivot_stats_df(apply_stats_schema(stats_df), sparse=True)
+    path = matrix.to_parquet(str(tmp_path / "stats_wide.parquet"))
+    df = pd.read_parquet(str(path))
+
+    assert df.columns.tolist() == ["area_code", "A1101_2010", "A1101_2015", "A1102_2015"]
+    pd.testing.assert_frame_equal(
+        df.set_index("area_code"), matrix.to_frame(sparse=False), check_dtype=False, check_index_type=False)
@@ -0,0 +1,105 @@
+import geopandas as gpd
+import pytest
+from shapely.geometry import box
+
+from e_stat.lib import MergeBoundaryStats, StatsCatalog, StatsData, StatsDataBatch, StatsDataJob, StatsQueryValidator
+from tests.conftest import APP_ID, endpoint_requests
+
+STATS_TABLE_ID = "0000020201"
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    return StatsCatalog(APP_ID, str(tmp_path / "stats_catalog.sqlite3"))
+
+
+@pytest.fixture
+def server(server_factory):
+    # 分類事項は表章項目・項目・地域・時間軸がそれぞれ3件（地域は01100〜01102、年度は2000〜2002）
+    return server_factory(meta_class_rows=3, invalid_stats_ids=["BADTABLE"])
+
+
+def test_prune(server, catalog):
+    """pruneは存在しないコードを除き、見積もりのデータ件数を返す"""
+    query = StatsQueryValidator(APP_ID, STATS_TABLE_ID, catalog).validate(
+        ["01100", "99999"], ["A1101", "A1102"], [2000, 1990], "prune")
+
+    assert query.areas == ["01100"]
+    assert query.class_codes == ["A1101", "A1102"]
+    assert query.years == ["2000"]
+    assert query.invalid == {"areas": ["99999"], "years": ["1990"]}
+    # 絞り込まない表章項目の3件 × 地域1件 × 項目2件 × 年度1件
+    assert query.rows_per_combination == 3
+    assert query.estimated_rows == 6
+
+
+def test_empty_condition_counts_all_codes(server, catalog):
+    """空の条件は統計表の全コードとして見積もる"""
+    query = StatsQueryValidator(APP_ID, STATS_TABLE_ID, catalog).validate([], ["A1101"], [2000])
+
+    assert query.invalid == {}
+    assert query.estimated_rows == 3 * 3 * 1 * 1
+
+
+def test_strict_exits_before_request(server, catalog, tmp_path):
+    """strictは存在しないコードがあれば統計データをリクエストせずに終了する"""
+    with pytest.raises(SystemExit):
+        StatsData(APP_ID, STATS_TABLE_ID, str(tmp_path), ["99999"], ["A1101"], [2000], validation="strict",
+                  catalog=catalog)
+    assert not endpoint_requests(server, "getSimpleStatsData")
+
+
+def test_metadata_is_fetched_once(server, catalog):
+    """未格納の統計表はメタ情報を1回だけ取得してカタログに格納する"""
+    StatsQueryValidator(APP_ID, STATS_TABLE_ID, catalog)
+    StatsQueryValidator(APP_ID, STATS_TABLE_ID, catalog)
+
+    assert len(endpoint_requests(server, "getSimpleMetaInfo")) == 1
+
+
+def test_stats_data_prune(server, catalog, tmp_path):
+    """StatsDataは存在しないコードを除いてリクエストし、有効なコードが無ければリクエストしない"""
+    sd = StatsData(APP_ID, STATS_TABLE_ID, str(tmp_path), ["01100", "99999"], ["A1101"], [2000], validation="prune",
+                   catalog=catalog)
+    assert sd.stats_df["area_code"].tolist() == ["01100"]
+    assert "99999" not in endpoint_requests(server, "getSimpleStatsData")[0]
+
+    server.reset_metrics()
+    sd = StatsData(APP_ID, STATS_TABLE_ID, str(tmp_path), ["99999"], ["A1101"], [2000], validation="prune",
+                   catalog=catalog)
+    assert sd.stats_df.empty
+    assert not endpoint_requests(server, "getSimpleStatsData")
+
+
+def test_batch_prune_skips_failed_metadata(server, catalog):
+    """バッチのpruneはメタ情報を取得できない統計表のジョブを除き、他のジョブを取得する"""
+    jobs = [StatsDataJob("BADTABLE", ["01100"], ["A1101"], ["2000"]),
+            StatsDataJob(STATS_TABLE_ID, ["01100", "99999"], ["A1101"], ["2000"])]
+    df = StatsDataBatch(APP_ID, jobs, validation="prune", catalog=catalog).fetch()
+
+    assert df["stats_table_id"].unique().tolist() == [STATS_TABLE_ID]
+    assert df["area_code"].tolist() == ["01100"]
+    requests = endpoint_requests(server, "getSimpleStatsData")
+    assert len(requests) == 1
+    assert "BADTABLE" not in requests[0]
+
+
+def test_batch_strict_exits_before_request(server, catalog):
+    """バッチのstrictはメタ情報を取得できない統計表があれば、統計データをリクエストせずに終了する"""
+    jobs = [StatsDataJob(STATS_TABLE_ID, ["01100"], ["A1101"], ["2000"]),
+            StatsDataJob("BADTABLE", ["01100"], ["A1101"], ["2000"])]
+    with pytest.raises(SystemExit):
+        StatsDataBatch(APP_ID, jobs, validation="strict", catalog=catalog).fetch()
+    assert not endpoint_requests(server, "getSimpleStatsData")
+
+
+def test_merge_boundary_stats_prune(server, catalog):
+    """MergeBoundaryStatsは存在しないコードを除いて取得し、結合する"""
+    boundary_gdf = gpd.GeoDataFrame({"AREA_CODE": ["01100", "01101"]},
+                                    geometry=[box(0, 0, 1, 1), box(1, 0, 2, 1)], crs="EPSG:4612")
+    mbs = MergeBoundaryStats(APP_ID, STATS_TABLE_ID, boundary_gdf, ["01100", "01101", "99999"], "A1101", "2000",
+                             validation="prune", catalog=catalog)
+
+    assert sorted(mbs.merged_df["AREA_CODE"].unique()) == ["01100", "01101"]
+    assert "99999" not in endpoint_requests(server, "getSimpleStatsData")[0]
+
@@ -0,0 +1,74 @@
+import pandas as pd
+
+from e_stat.utils import apply_stats_schema, build_stats_data_url, concat_stats_dfs, fetch_all_stats_data_pages
+from tests.conftest import APP_ID
+
+
+def _stats_df(values, area_codes=None):
+    area_codes = area_codes or [f"01{i:03d}" for i in range(100, 100 + len(values))]
+    return pd.DataFrame({"area_code": area_codes, "unit": ["人"] * len(values), "value": values}, dtype=object)
+
+
+def test_integer_values_are_int64():
+    """整数のみのvalueはInt64になり、特殊記号は欠損値としてvalue_markerに残る"""
+    typed = apply_stats_schema(_stats_df(["100", "-", "***", None, "x"]))
+
+    assert list(typed.columns) == ["area_code", "unit", "value", "value_marker"]
+    assert str(typed["value"].dtype) == "Int64"
+    assert typed["value"].tolist()[0] == 100
+    assert typed["value"].isna().tolist() == [False, True, True, True, True]
+    assert typed["value_marker"].isna().tolist() == [True, False, False, True, False]
+    assert typed["value_marker"].dropna().tolist() == ["-", "***", "x"]
+
+
+def test_decimal_values_are_float64():
+    """小数を含むvalueはfloat64になる"""
+    typed = apply_stats_schema(_stats_df(["1.5", "2", "…"]))
+
+    assert typed["value"].dtype == "float64"
+    assert typed["value"].tolist()[:2] == [1.5, 2.0]
+    assert typed["value_marker"].tolist()[2] == "…"
+
+
+def test_unknown_marker_is_kept():
+    """定義済み以外の数値に変換できない値もvalue_markerに残る"""
+    typed = apply_stats_schema(_stats_df(["1", "秘匿"]))
+
+    assert typed["value"].isna().tolist() == [False, True]
+    assert "秘匿" in typed["value_marker"].cat.categories
+    assert typed["value_marker"].tolist()[1] == "秘匿"
+
+
+def test_other_columns_are_category():
+    """value以外のカラムはカテゴリになる"""
+    typed = apply_stats_schema(_stats_df(["1", "2"]))
+
+    assert isinstance(typed["area_code"].dtype, pd.CategoricalDtype)
+    assert isinstance(typed["unit"].dtype, pd.CategoricalDtype)
+
+
+def test_concat_aligns_categories_and_value():
+    """カテゴリは和集合に、Int64とfloat64が混在するvalueはfloat64に揃えて結合する"""
+    first = apply_stats_schema(_stats_df(["1", "2"], ["01100", "01101"]))
+    second = apply_stats_schema(_stats_df(["0.5"], ["01102"]))
+
+    merged = concat_stats_dfs([first, pd.DataFrame(), second])
+
+    assert isinstance(merged["area_code"].dtype, pd.CategoricalDtype)
+    assert merged["area_code"].tolist() == ["01100", "01101", "01102"]
+    assert merged["value"].dtype == "float64"
+    assert merged["value"].tolist() == [1.0, 2.0, 0.5]
+
+
+def test_fetch_typed_pages(server_factory):
+    """複数ページの型付きの統計データは型を保ったまま結合される"""
+    server_factory(page_size=4)
+    url = build_stats_data_url(APP_ID, "0000020201", ["01100", "01101", "01102"], ["A1101", "A1102"], [2000])
+
+    df = fetch_all_stats_data_pages(url, typed=True)
+
+    assert len(df) == 6
+    assert str(df["value"].dtype) == "Int64"
+    assert df["value"].tolist() == list(range(6))
+    assert isinstance(df["area_code"].dtype, pd.CategoricalDtype)
+    assert df["value_marker"].isna().all()
@@ -0,0 +1,121 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+from e_stat.__main__ import main
+from e_stat.lib import StatsCatalog
+from e_stat.utils import NGRAM_SIZE, normalize_text, text_ngrams
+from tests.conftest import APP_ID
+
+GOV_STATS_CODE = "00200502"
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    return StatsCatalog(APP_ID, str(tmp_path / "stats_catalog.sqlite3"))
+
+
+def _class_df(*names):
+    return pd.DataFrame({
+        "CLASS_OBJ_ID": ["cat01"] * len(names), "CLASS_OBJ_NAME": ["項目"] * len(names),
+        "CLASS_CODE": [f"A{1101 + i}" for i in range(len(names))], "CLASS_NAME": list(names)})
+
+
+def _store_tables(catalog, titles):
+    """統計表題を指定して統計表情報をカタログに格納する"""
+    df = pd.DataFrame({"TABLE_INF": list(titles), "STAT_CODE": GOV_STATS_CODE, "STAT_NAME": "統計体系",
+                       "TITLE": list(titles.values())})
+    with catalog._connect() as conn:
+        catalog._write_tables(conn, GOV_STATS_CODE, df, replace=True)
+
+
+def test_normalize_text():
+    """全角英数字・全角空白は半角に統一し、小文字にして空白を除く"""
+    assert normalize_text("Ａ　人口・世帯 ＡＢＣ") == "a人口・世帯abc"
+    assert normalize_text(None) == ""
+
+
+def test_text_ngrams():
+    """n文字ずつに分割し、n文字未満の文字列はそのまま1要素とする"""
+    assert text_ngrams("人口総数") == {"人口", "口総", "総数"}
+    assert text_ngrams("人") == {"人"}
+    assert text_ngrams("") == set()
+
+
+def test_search_and(catalog):
+    """空白区切りの検索語は全てを含む統計表のみ返し、統計表題に一致した検索語が多いほど上位にする"""
+    _store_tables(catalog, {"0000000001": "Ａ　人口・世帯", "0000000002": "Ｂ　自然環境", "0000000003": "人口動態"})
+    catalog.store_class_inf("0000000002", _class_df("総人口", "面積"))
+
+    assert list(catalog.search("人口")["TABLE_INF"]) == ["0000000001", "0000000003", "0000000002"]
+    assert list(catalog.search("人口 世帯")["TABLE_INF"]) == ["0000000001"]
+    found = catalog.search("人口 自然")
+    assert list(found["TABLE_INF"]) == ["0000000002"]
+    assert found["MATCHED_CLASSES"][0] == ["cat01:A1101 総人口"]
+    assert catalog.search("人口 交通").empty
+
+
+def test_search_normalizes_width(catalog):
+    """全角・半角、大文字・小文字の違いを無視する"""
+    _store_tables(catalog, {"0000000001": "Ａ　人口・世帯", "0000000002": "b 自然環境"})
+
+    assert list(catalog.search("a人口")["TABLE_INF"]) == ["0000000001"]
+    assert list(catalog.search("Ｂ自然")["TABLE_INF"]) == ["0000000002"]
+    assert list(catalog.search("ａ　人口")["TABLE_INF"]) == ["0000000001"]
+
+
+def test_search_short_term(catalog):
+    """n文字未満の検索語は索引を使わずに部分一致で検索する"""
+    assert NGRAM_SIZE == 2
+    _store_tables(catalog, {"0000000001": "Ａ　人口・世帯", "0000000002": "Ｂ　自然環境"})
+
+    assert list(catalog.search("環")["TABLE_INF"]) == ["0000000002"]
+    assert list(catalog.search("ａ 世帯")["TABLE_INF"]) == ["0000000001"]
+
+
+def test_full_sync_removes_deleted_tables(server_factory, catalog):
+    """全件の同期でe-Stat側から削除された統計表は、分類事項・検索索引からも削除する"""
+    server = server_factory(stats_list_rows=3)
+    catalog.sync([GOV_STATS_CODE])
+    catalog.store_class_inf("0020050200003", _class_df("総人口"))
+    assert list(catalog.search("総人口")["TABLE_INF"]) == ["0020050200003"]
+
+    server.stats_list_rows = 2
+    catalog.sync([GOV_STATS_CODE], full=True)
+
+    assert list(catalog.find_tables()["TABLE_INF"]) == ["0020050200001", "0020050200002"]
+    assert catalog.search("総人口").empty
+    assert catalog.search("0020050200003").empty
+    with sqlite3.connect(str(catalog.catalog_path)) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM class_inf").fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM search_docs WHERE TABLE_INF = '0020050200003'").fetchone()[0] == 0
+
+
+def test_rebuild_search_index(catalog):
+    """索引が無いカタログは初回の検索時に索引を作成する"""
+    _store_tables(catalog, {"0000000001": "Ａ　人口・世帯"})
+    catalog.store_class_inf("0000000001", _class_df("総人口"))
+    with sqlite3.connect(str(catalog.catalog_path)) as conn:
+        conn.execute("DELETE FROM search_grams")
+        conn.execute("DELETE FROM search_docs")
+
+    assert list(catalog.search("総人口")["TABLE_INF"]) == ["0000000001"]
+
+
+@pytest.mark.parametrize("use_catalog", [False, True])
+def test_meta_catalog_option(server_factory, tmp_path, use_catalog):
+    """metaは--catalogを指定した場合のみ分類事項をカタログに格納する"""
+    server_factory(meta_class_rows=2)
+    catalog_path = tmp_path / "stats_catalog.sqlite3"
+    args = ["meta", "-st", "0000020201", "-o", str(tmp_path / "created"), "--catalog_path", str(catalog_path)]
+
+    result = CliRunner().invoke(main, args + (["--catalog"] if use_catalog else []))
+
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "created" / "meta_data.csv").is_file()
+    assert catalog_path.exists() == use_catalog
+    if use_catalog:
+        found = StatsCatalog(APP_ID, str(catalog_path)).search("項目A1101")
+        assert found["MATCHED_CLASSES"][0] == ["cat01:A1101 項目A1101"]
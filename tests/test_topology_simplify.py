@@ -0,0 +1,123 @@
+import math
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import Polygon, box
+from shapely.ops import unary_union
+
+from e_stat.lib import GdfDissolve
+from e_stat.utils import build_shared_arcs, count_vertices, simplify_coverage, zoom_to_tolerance
+
+GRID_SIZE = 4
+
+
+def _lattice_point(i, j):
+    """格子点（外周以外は位置をずらす）"""
+    if 0 < i < GRID_SIZE and 0 < j < GRID_SIZE:
+        return i + 0.3 * math.sin(3 * i + j), j + 0.3 * math.cos(i + 2 * j)
+    return float(i), float(j)
+
+
+def _edge(p, q, step=0.02):
+    """2つの格子点を結ぶ入り組んだ辺の頂点（隣接するポリゴンとは同じ座標を逆順で共有する）"""
+    if p > q:
+        return _edge(q, p, step)[::-1]
+    (x0, y0), (x1, y1) = p, q
+    n = max(1, int(math.hypot(x1 - x0, y1 - y0) / step))
+    points = [(x0 + (x1 - x0) * k / n, y0 + (y1 - y0) * k / n) for k in range(n + 1)]
+    # 端点以外を辺と直交する方向に波状にずらす
+    length = math.hypot(x1 - x0, y1 - y0)
+    nx, ny = (y0 - y1) / length, (x1 - x0) / length
+    for k in range(1, n):
+        offset = 0.04 * math.sin(3 * math.pi * k / n)
+        points[k] = (points[k][0] + nx * offset, points[k][1] + ny * offset)
+    return points
+
+
+def _coverage():
+    """隙間・重なりの無い、頂点数の多い入り組んだ境界のポリゴン群"""
+    polygons = []
+    for i in range(GRID_SIZE):
+        for j in range(GRID_SIZE):
+            corners = [_lattice_point(i, j), _lattice_point(i + 1, j), _lattice_point(i + 1, j + 1),
+                       _lattice_point(i, j + 1)]
+            ring = []
+            for p, q in zip(corners, corners[1:] + corners[:1]):
+                ring += _edge(p, q)[:-1]
+            polygons.append(Polygon(ring))
+    return polygons
+
+
+def _assert_no_gap_or_overlap(original, simplified):
+    union = unary_union(simplified)
+    # 外周の簡略化による面積の変化のみで、内側に隙間が無い
+    assert union.area == pytest.approx(unary_union(original).area, rel=1e-3)
+    assert union.geom_type == "Polygon" and not list(union.interiors)
+    assert sum(g.area for g in simplified) == pytest.approx(union.area, rel=1e-9)
+    for i, a in enumerate(simplified):
+        for b in simplified[i + 1:]:
+            assert a.intersection(b).area < 1e-9
+
+
+def test_simplify_coverage_keeps_shared_edges():
+    """簡略化しても隣接するポリゴン間に隙間・重なりが生じない"""
+    geometries = _coverage()
+
+    simplified = simplify_coverage(geometries, [0.05, 0.2])
+
+    for tolerance, result in simplified.items():
+        assert len(result) == len(geometries)
+        assert all(g.is_valid and not g.is_empty for g in result)
+        assert sum(map(count_vertices, result)) < sum(map(count_vertices, geometries)) / 2
+        _assert_no_gap_or_overlap(geometries, result)
+        # 元の順序のまま、元のポリゴンとほぼ同じ範囲になる
+        for original, g in zip(geometries, result):
+            assert original.intersection(g).area > 0.9 * original.area
+
+
+def test_per_polygon_simplify_leaves_gaps():
+    """ポリゴンごとに簡略化すると隙間・重なりが生じる（共有辺を使う理由）"""
+    geometries = _coverage()
+    simplified = [g.simplify(0.2, preserve_topology=True) for g in geometries]
+
+    overlap = sum(g.area for g in simplified) - unary_union(simplified).area
+    gap = unary_union(geometries).area - unary_union(simplified).area
+    assert overlap > 1e-3 or gap > 1e-3
+
+
+def test_hole_is_not_filled():
+    """ポリゴン群に囲まれた穴（湖等）は面として割り当てない"""
+    ring = [box(0, 0, 3, 1), box(2, 1, 3, 3), box(0, 2, 2, 3), box(0, 1, 1, 2)]
+
+    simplified = simplify_coverage(ring, [0.01])[0.01]
+
+    assert unary_union(simplified).area == pytest.approx(8)
+    assert not unary_union(simplified).contains(box(1.2, 1.2, 1.8, 1.8))
+
+
+def test_shared_arcs_are_split_at_nodes():
+    """共有辺は1本のアークになり、3つ以上のポリゴンが接する点で分割される"""
+    arcs = build_shared_arcs([box(0, 0, 1, 1), box(1, 0, 2, 1)])
+
+    assert sorted(round(arc.length, 6) for arc in arcs) == [1, 3, 3]
+
+
+def test_gdf_dissolve_simplify_poly():
+    """GdfDissolve.simplify_polyは属性を保ったまま許容距離ごとのgdfを返す"""
+    geometries = _coverage()
+    gdf = gpd.GeoDataFrame({"KEY_CODE": [str(i) for i in range(len(geometries))]}, geometry=geometries,
+                           crs="EPSG:4612")
+    dissolve = GdfDissolve(gdf, ["KEY_CODE", "geometry"])
+
+    simplified = dissolve.simplify_poly([zoom_to_tolerance(12)])
+
+    result = simplified[zoom_to_tolerance(12)]
+    assert list(result["KEY_CODE"]) == list(dissolve.new_gdf["KEY_CODE"])
+    assert result.crs == gdf.crs
+    _assert_no_gap_or_overlap(list(gdf.geometry), list(result.geometry))
+
+
+def test_zoom_to_tolerance():
+    """ズームレベルが1上がるごとに許容距離は半分になる"""
+    assert zoom_to_tolerance(0) == pytest.approx(360 / 256)
+    assert zoom_to_tolerance(10) == pytest.approx(zoom_to_tolerance(9) / 2)
@@ -0,0 +1,95 @@
+import geopandas as gpd
+import pandas as pd
+import pytest
+from shapely.geometry import box
+
+from e_stat.utils import output_file_from_df, register_writer, writer_formats
+from e_stat.utils import writers
+
+
+@pytest.fixture
+def stats_df():
+    return pd.DataFrame({"area_code": ["01100", "01101"], "value": ["10", "20"]})
+
+
+@pytest.fixture
+def boundary_gdf():
+    return gpd.GeoDataFrame(
+        {"AREA_CODE": ["01100", "01101"], "CITY_NAME": ["札幌市", "中央区"]},
+        geometry=[box(0, 0, 1, 1), box(1, 0, 2, 1)], crs="EPSG:4612")
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """テストで登録した出力形式をテスト後に取り除く"""
+    monkeypatch.setattr(writers, "_WRITERS", dict(writers._WRITERS))
+    return writers._WRITERS
+
+
+def test_register_writer(registry, stats_df, tmp_path):
+    """登録した書き出し関数が出力形式名で呼び出される"""
+    written = []
+
+    @register_writer("txt", ".txt")
+    def _write_txt(df, output_path):
+        written.append((len(df), output_path))
+
+    path = output_file_from_df(stats_df, str(tmp_path / "out"), "stats", "txt")
+
+    assert path == tmp_path / "out" / "stats.txt"
+    assert written == [(2, path)]
+    assert "txt" in writer_formats()
+
+
+def test_writer_formats_geometry():
+    """ジオメトリ必須の形式はgeometry=Trueの場合のみ含む"""
+    assert set(writer_formats()) == {"csv", "parquet", "feather"}
+    assert set(writer_formats(geometry=True)) == {"csv", "geojson", "parquet", "geoparquet", "feather", "fgb"}
+
+
+def test_unknown_format_exits(stats_df, tmp_path):
+    with pytest.raises(SystemExit):
+        output_file_from_df(stats_df, str(tmp_path), "stats", "xlsx")
+
+
+def test_geometry_required_exits(stats_df, tmp_path):
+    """ジオメトリを持たないデータはジオメトリ必須の形式で書き出せない"""
+    with pytest.raises(SystemExit):
+        output_file_from_df(stats_df, str(tmp_path), "stats", "geojson")
+
+
+@pytest.mark.parametrize("fmt, reader", [
+    ("csv", lambda path: pd.read_csv(path, dtype=str)),
+    ("parquet", pd.read_parquet),
+    ("feather", pd.read_feather),
+])
+def test_write_table(stats_df, tmp_path, fmt, reader):
+    """統計データを各形式で書き出し、同じ内容を読み込める"""
+    path = output_file_from_df(stats_df, str(tmp_path), "stats", fmt)
+
+    pd.testing.assert_frame_equal(reader(str(path)), stats_df)
+
+
+@pytest.mark.parametrize("fmt, reader", [
+    ("geojson", gpd.read_file),
+    ("parquet", gpd.read_parquet),
+    ("geoparquet", gpd.read_parquet),
+    ("feather", gpd.read_feather),
+    ("fgb", gpd.read_file),
+])
+def test_write_geometry(boundary_gdf, tmp_path, fmt, reader):
+    """境界データを各形式で書き出し、ジオメトリと属性を読み込める"""
+    path = output_file_from_df(boundary_gdf, str(tmp_path), "boundary", fmt)
+    # FlatGeobufは空間インデックスの順に並ぶため、コードの順に並べ替えて比較する
+    gdf = reader(str(path)).sort_values("AREA_CODE", ignore_index=True)
+
+    assert gdf["AREA_CODE"].tolist() == boundary_gdf["AREA_CODE"].tolist()
+    assert gdf.geometry.geom_equals(boundary_gdf.geometry).all()
+
+
+def test_parquet_and_geoparquet_do_not_collide(boundary_gdf, tmp_path):
+    """parquetとgeoparquetを同時に指定しても別のファイルに書き出す"""
+    paths = [output_file_from_df(boundary_gdf, str(tmp_path), "boundary", fmt) for fmt in ("parquet", "geoparquet")]
+
+    assert [path.name for path in paths] == ["boundary.parquet", "boundary.geo.parquet"]
+    assert all(path.is_file() for path in paths)